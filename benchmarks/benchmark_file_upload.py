@@ -0,0 +1,43 @@
+"""Uploads files of growing size from a generator to a local FakeSlack, measuring time and peak memory
+
+Run with `$ python3 -m benchmarks.benchmark_file_upload` from the repository root. Content from a generator is
+spooled to a temporary file first, then streamed to the upload URL a chunk at a time, so the peak memory traced
+should stay around spool_size however large the file, while the resident set size barely moves.
+"""
+import resource
+import time
+import tracemalloc
+
+from slack import WebClient
+
+from simple_slack_bot.file_uploader import FileUploader
+from tests.common.fake_slack import FakeSlack
+
+SIZES_MB = [10, 100, 500]
+CHUNK = bytes(range(256)) * 4096  # 1MB
+
+
+def chunks(size_mb: int):
+    for _ in range(size_mb):
+        yield CHUNK
+
+
+def main():
+    with FakeSlack() as fake_slack:
+        client = WebClient("benchmark token", base_url=fake_slack.api_url)
+        uploader = FileUploader(chunk_size=1 << 20, spool_size=8 << 20)
+        print(f"{'size MB':>10} {'seconds':>10} {'MB/s':>10} {'peak MB':>10} {'max rss MB':>10}")
+        for size_mb in SIZES_MB:
+            tracemalloc.start()
+            start = time.perf_counter()
+            uploader.upload(client, chunks(size_mb), filename=f"{size_mb}.bin")
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            peak_mb = peak / (1 << 20)
+            print(f"{size_mb:>10} {elapsed:>10.2f} {size_mb / elapsed:>10.1f} {peak_mb:>10.1f} {max_rss:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
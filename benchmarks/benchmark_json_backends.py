@@ -0,0 +1,88 @@
+"""Times decoding incoming events with each JSON backend, and with and without lazy user and channel lookups
+
+Run with `$ python3 -m benchmarks.benchmark_json_backends` from the repository root. Prints the cost per event, in
+microseconds, of decoding alone, of building the SlackEvent the way SlackSocket does, resolving its user, channel
+and mentions against a directory of DIRECTORY_SIZE users and channels, and of building a LazySlackEvent, which
+resolves nothing until a callback reads it.
+"""
+import json
+import timeit
+
+from slacksocket.client import SlackSocket
+from slacksocket.models import Channel, SlackEvent, User
+from slacksocket.webclient import Directory
+
+from simple_slack_bot.fast_slack_socket import LazySlackEvent
+from simple_slack_bot.json_backend import BACKEND_NAMES, load_backend
+
+EVENTS = 10_000
+DIRECTORY_SIZE = 1_000
+REPEATS = 5
+
+
+class DirectorySlackSocket:
+    """Looks users and channels up the way SlackSocket does, against an in memory directory"""
+
+    def __init__(self):
+        self.user = User({"id": "U0FAKEBOT", "name": "bot"})
+        self._users = Directory()
+        self._users.update([User({"id": f"U{index:08d}", "name": f"user{index}"}) for index in range(DIRECTORY_SIZE)])
+        self._channels = Directory()
+        self._channels.update(
+            [Channel({"id": f"C{index:08d}", "name": f"channel{index}"}) for index in range(DIRECTORY_SIZE)]
+        )
+
+    def lookup_user(self, match):
+        return self._users.match("id", match)
+
+    def lookup_channel(self, match):
+        return self._channels.match("id", match)
+
+    _process_event = SlackSocket._process_event
+
+
+def sample_events():
+    return [
+        json.dumps(
+            {
+                "type": "message",
+                "channel": f"C{index % DIRECTORY_SIZE:08d}",
+                "user": f"U{index * 7 % DIRECTORY_SIZE:08d}",
+                "text": f"message number {index} for <@U{index % DIRECTORY_SIZE:08d}>",
+                "ts": f"1600000000.{index:06d}",
+                "client_msg_id": f"0b1f7c5e-{index:04d}-4a1e-9a53-3c4f1b7c0d{index % 100:02d}",
+                "team": "T00000001",
+                "blocks": [{"type": "rich_text", "elements": [{"type": "text", "text": f"message number {index}"}]}],
+            }
+        )
+        for index in range(EVENTS)
+    ]
+
+
+def microseconds_per_event(function, events) -> float:
+    return min(timeit.repeat(lambda: [function(event) for event in events], number=1, repeat=REPEATS)) / EVENTS * 1e6
+
+
+def main():
+    events = sample_events()
+    slack_socket = DirectorySlackSocket()
+
+    print(f"{EVENTS} events, {DIRECTORY_SIZE} users and channels in the directory, microseconds per event")
+    print(f"{'backend':>8} {'decode':>10} {'SlackEvent':>12} {'LazySlackEvent':>16}")
+    for name in BACKEND_NAMES:
+        try:
+            backend = load_backend(name)
+        except ImportError:
+            print(f"{name:>8} {'not installed':>10}")
+            continue
+
+        decode = microseconds_per_event(backend.loads, events)
+        eager = microseconds_per_event(
+            lambda event: slack_socket._process_event(SlackEvent(backend.loads(event))), events
+        )
+        lazy = microseconds_per_event(lambda event: LazySlackEvent(backend.loads(event), event, slack_socket), events)
+        print(f"{name:>8} {decode:>10.2f} {eager:>12.2f} {lazy:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Times the dice engine against the original one randint per die loop, for growing numbers of dice
+
+Run with `$ python3 benchmark_dice_engine.py`. The engine's latency should stay in the low milliseconds up to
+100000 dice, while the loop grows linearly with every die.
+"""
+import random
+import timeit
+
+from dice_engine import DiceExpression, numpy
+
+DICE_COUNTS = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+REPEATS = 5
+
+
+def loop_roll(dice_num: int, dice_value: int) -> int:
+    total = 0
+    for _ in range(dice_num):
+        total += random.randint(1, dice_value)
+    return total
+
+
+def best_of(statement) -> float:
+    return min(timeit.repeat(statement, number=1, repeat=REPEATS)) * 1000
+
+
+def main():
+    print(f"numpy installed: {numpy is not None}")
+    print(f"{'dice':>10} {'loop ms':>10} {'engine ms':>10} {'parsed ms':>10}")
+    for dice_count in DICE_COUNTS:
+        expression = DiceExpression(f"{dice_count}d20")
+        loop_ms = best_of(lambda: loop_roll(dice_count, 20))
+        engine_ms = best_of(lambda: DiceExpression(f"{dice_count}d20").roll())
+        parsed_ms = best_of(expression.roll)
+        print(f"{dice_count:>10} {loop_ms:>10.3f} {engine_ms:>10.3f} {parsed_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,28 @@
-import random
-
+from dice_engine import DiceError, DiceExpression
+from simple_slack_bot.rate_limiter import RateLimiter
 from simple_slack_bot.simple_slack_bot import SimpleSlackBot, SlackRequest
 
 
 simple_slack_bot = SimpleSlackBot(debug=True)
 
 
-@simple_slack_bot.register("message")
-def roll_callback(request: SlackRequest):
-    """This function is called every time a message is sent to a channel out Bot is in
+@simple_slack_bot.command(
+    "roll",
+    help_text="rolls dice, for example roll 2d6 or roll 4d6k3 + 2",
+    rate_limit=RateLimiter(rate=0.2, burst=3, key="user_channel"),
+)
+def roll_callback(request: SlackRequest, *expression: str):
+    """This function is called every time a message starting with roll is sent to a channel our Bot is in
     :param request: the SlackRequest we receive along with the event. See the README.md for full documentation
+    :param expression: the words of the dice expression to roll
     """
-    if request.message.lower().startswith("roll"):
-        dice_num_and_value = request.message.lower().split("roll")[1]
-
-        try:
-            dice_num = int(dice_num_and_value.split("d")[0])
-            dice_value = int(dice_num_and_value.split("d")[1])
-        except ValueError:
-            request.write("Invalid format detected. Please call this bot using roll [int]d[int]")
-            return
-
-        total = 0
-        rolls = []
-
-        if dice_num > 25:
-            request.write("We will not process more than 25 dice rolls.")
-            return
-
-        for _ in range(dice_num):
-            roll = random.randint(1, dice_value)
-            total += roll
-            rolls.append(roll)
+    try:
+        result = DiceExpression(" ".join(expression)).roll()
+    except DiceError as dice_error:
+        request.write(f"Invalid format detected, {dice_error}. Please call this bot using roll [int]d[int]")
+        return
 
-        request.write(f"Rolled {dice_num_and_value} and got {str(total)} ({rolls})")
+    request.write(str(result))
 
 
 def main():
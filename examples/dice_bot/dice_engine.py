@@ -0,0 +1,249 @@
+import random
+import re
+import typing
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # pragma: no cover - the engine falls back to the standard library
+    numpy = None
+
+# the most dice a single expression may roll, which bounds the time spent on any one message
+MAX_DICE = 10_000_000
+# the most sides a die may have, which keeps every roll and total well within an int64
+MAX_SIDES = 1_000_000_000
+# dice are sampled in batches of this size, so memory use stays flat however many are rolled
+BATCH_SIZE = 1_000_000
+# exploding dice stop exploding after this many rounds, as a d1 would otherwise explode forever
+MAX_EXPLOSIONS = 100
+# individual rolls are only kept for display when an expression rolls at most this many dice
+MAX_SHOWN_ROLLS = 25
+
+TERM_RE = re.compile(
+    r"""\s*(?P<sign>[+-])?\s*(?:
+        (?P<count>\d*)d(?P<sides>\d+|%)(?P<explode>!)?(?:k(?P<keep_kind>[hl]?)(?P<keep>\d+))?
+        |(?P<constant>\d+)
+    )\s*""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+class DiceError(ValueError):
+    """Raised when a dice expression can't be parsed or is too large to roll"""
+
+
+class DiceTerm:
+    """NdM, optionally exploding (NdM!) and keeping the highest (NdMkK or NdMkhK) or lowest (NdMklK) K dice"""
+
+    __slots__ = ("count", "sides", "explode", "keep", "keep_highest")
+
+    def __init__(self, count: int, sides: int, explode: bool = False, keep: int = None, keep_highest: bool = True):
+        if count < 1 or sides < 1:
+            raise DiceError("dice need a count and sides of at least 1")
+        if count > MAX_DICE:
+            raise DiceError(f"we will not roll more than {MAX_DICE} dice")
+        if sides > MAX_SIDES:
+            raise DiceError(f"we will not roll dice with more than {MAX_SIDES} sides")
+        if keep is not None and not 1 <= keep <= count:
+            raise DiceError("can only keep between 1 and the number of dice rolled")
+
+        self.count = count
+        self.sides = sides
+        self.explode = explode
+        self.keep = keep
+        self.keep_highest = keep_highest
+
+    def __str__(self) -> str:
+        keep = "" if self.keep is None else ("k" if self.keep_highest else "kl") + str(self.keep)
+        return f"{self.count}d{self.sides}{'!' if self.explode else ''}{keep}"
+
+
+class TermResult:
+    """The outcome of rolling a single DiceTerm"""
+
+    __slots__ = ("term", "total", "rolled", "minimum", "maximum", "rolls")
+
+    def __init__(self, term: DiceTerm, total: int, rolled: int, minimum: int, maximum: int, rolls: list = None):
+        self.term = term
+        self.total = total
+        self.rolled = rolled
+        self.minimum = minimum
+        self.maximum = maximum
+        self.rolls = rolls
+
+    @property
+    def mean(self) -> float:
+        return self.total / (self.term.keep or self.rolled)
+
+
+class RollResult:
+    """The outcome of evaluating a whole DiceExpression"""
+
+    def __init__(self, expression: "DiceExpression", total: int, terms: typing.List[typing.Tuple[int, TermResult]]):
+        self.expression = expression
+        self.total = total
+        self.terms = terms
+
+    def __str__(self) -> str:
+        details = []
+        for sign, term_result in self.terms:
+            prefix = "-" if sign < 0 else ""
+            if term_result.rolls is not None:
+                details.append(f"{prefix}{term_result.term}: {term_result.rolls}")
+            else:
+                details.append(
+                    f"{prefix}{term_result.term}: {term_result.rolled} dice rolled, min {term_result.minimum}, "
+                    f"max {term_result.maximum}, mean {term_result.mean:.2f}"
+                )
+        return f"Rolled {self.expression} and got {self.total}" + (f" ({'; '.join(details)})" if details else "")
+
+
+class DiceExpression:
+    """A dice expression such as 4d6k3+2, parsed once into its terms and constant so it can be rolled cheaply"""
+
+    def __init__(self, source: str):
+        """Parses a dice expression
+        :param source: the expression, made of NdM terms and integers joined by + and -
+        :raises DiceError: If the expression can't be parsed or rolls too many dice
+        """
+        self.source = source.strip()
+        self.terms: typing.List[typing.Tuple[int, DiceTerm]] = []
+        self.constant = 0
+
+        position = 0
+        while position < len(source):
+            match = TERM_RE.match(source, position)
+            if match is None or match.end() == position or (position and not match.group("sign")):
+                raise DiceError(f"could not parse {source!r}")
+            position = match.end()
+
+            sign = -1 if match.group("sign") == "-" else 1
+            if match.group("constant") is not None:
+                self.constant += sign * int(match.group("constant"))
+                continue
+
+            sides = 100 if match.group("sides") == "%" else int(match.group("sides"))
+            keep = match.group("keep")
+            term = DiceTerm(
+                count=int(match.group("count") or 1),
+                sides=sides,
+                explode=bool(match.group("explode")),
+                keep=int(keep) if keep else None,
+                keep_highest=match.group("keep_kind").lower() != "l" if keep else True,
+            )
+            self.terms.append((sign, term))
+
+        if not self.terms:
+            raise DiceError(f"{source!r} rolls no dice")
+        if sum(term.count for _, term in self.terms) > MAX_DICE:
+            raise DiceError(f"we will not roll more than {MAX_DICE} dice")
+
+    def __str__(self) -> str:
+        return self.source
+
+    def roll(self, rng: typing.Any = None) -> RollResult:
+        """Rolls every term of this expression
+        :param rng: a numpy Generator when numpy is installed, a random.Random otherwise, created if not given
+        :return: the total and the outcome of each term
+        """
+        if rng is None:
+            rng = numpy.random.default_rng() if numpy is not None else random.Random()
+
+        show_rolls = sum(term.count for _, term in self.terms) <= MAX_SHOWN_ROLLS
+        total = self.constant
+        results = []
+        for sign, term in self.terms:
+            term_result = roll_term(term, rng, show_rolls)
+            total += sign * term_result.total
+            results.append((sign, term_result))
+        return RollResult(self, total, results)
+
+
+def _sample(rng: typing.Any, sides: int, count: int):
+    """Rolls count dice with the given sides in one call
+    :return: a numpy array when rolling with numpy, a list otherwise
+    """
+    if numpy is not None and not isinstance(rng, random.Random):
+        return rng.integers(1, sides + 1, size=count, dtype=numpy.int64)
+    return rng.choices(range(1, sides + 1), k=count)
+
+
+def _batch_rolls(term: DiceTerm, rng: typing.Any) -> typing.Iterator[typing.Any]:
+    """Yields the rolls of a term in batches, each exploding die adding its re-rolls to the roll that exploded"""
+    remaining = term.count
+    while remaining:
+        size = min(remaining, BATCH_SIZE)
+        remaining -= size
+        rolls = _sample(rng, term.sides, size)
+
+        if term.explode and term.sides > 1:
+            if numpy is not None and not isinstance(rng, random.Random):
+                exploding = numpy.flatnonzero(rolls == term.sides)
+                for _ in range(MAX_EXPLOSIONS):
+                    if not exploding.size:
+                        break
+                    extra = _sample(rng, term.sides, exploding.size)
+                    rolls[exploding] += extra
+                    exploding = exploding[extra == term.sides]
+            else:
+                exploding = [index for index, roll in enumerate(rolls) if roll == term.sides]
+                for _ in range(MAX_EXPLOSIONS):
+                    if not exploding:
+                        break
+                    extra = _sample(rng, term.sides, len(exploding))
+                    for index, roll in zip(exploding, extra):
+                        rolls[index] += roll
+                    exploding = [index for index, roll in zip(exploding, extra) if roll == term.sides]
+
+        yield rolls
+
+
+def _kept(rolls, keep: int, highest: bool):
+    """Keeps the highest or lowest rolls, without sorting everything"""
+    if keep >= len(rolls):
+        return rolls
+    if numpy is not None and isinstance(rolls, numpy.ndarray):
+        if highest:
+            return numpy.partition(rolls, len(rolls) - keep)[len(rolls) - keep :]
+        return numpy.partition(rolls, keep - 1)[:keep]
+    return sorted(rolls, reverse=highest)[:keep]
+
+
+def roll_term(term: DiceTerm, rng: typing.Any, show_rolls: bool = False) -> TermResult:
+    """Rolls a single term, batch by batch, keeping only running summaries unless the rolls are to be shown
+    :param term: the term to roll
+    :param rng: a numpy Generator or a random.Random
+    :param show_rolls: whether to keep every individual roll
+    :return: the outcome of the term
+    """
+    total = 0
+    minimum = None
+    maximum = None
+    kept = None
+    shown = [] if show_rolls else None
+
+    for rolls in _batch_rolls(term, rng):
+        if shown is not None:
+            shown.extend(int(roll) for roll in rolls)
+        if isinstance(rolls, list):
+            batch_minimum, batch_maximum = min(rolls), max(rolls)
+        else:
+            batch_minimum, batch_maximum = int(rolls.min()), int(rolls.max())
+        minimum = batch_minimum if minimum is None else min(minimum, batch_minimum)
+        maximum = batch_maximum if maximum is None else max(maximum, batch_maximum)
+
+        if term.keep is None:
+            total += int(sum(rolls)) if isinstance(rolls, list) else int(rolls.sum())
+        else:
+            # only the best keep rolls so far are carried from one batch to the next
+            if kept is None:
+                candidates = rolls
+            elif isinstance(rolls, list):
+                candidates = list(kept) + rolls
+            else:
+                candidates = numpy.concatenate([kept, rolls])
+            kept = _kept(candidates, term.keep, term.keep_highest)
+
+    if kept is not None:
+        total = int(sum(kept)) if isinstance(kept, list) else int(kept.sum())
+
+    return TermResult(term, total, term.count, minimum, maximum, shown)
@@ -3,9 +3,10 @@ from simple_slack_bot.simple_slack_bot import SimpleSlackBot
 simple_slack_bot = SimpleSlackBot(debug=True)
 
 
-@simple_slack_bot.register("message")
-def pong_callback(request):
-    if request.message and request.message.lower() == "ping":
+@simple_slack_bot.command("ping")
+def pong_callback(request, *words):
+    # only a bare ping is answered, as "ping me later" isn't meant for us
+    if not words:
         request.write("Pong")
 
 
@@ -0,0 +1,217 @@
+import collections
+import csv
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import typing
+
+# magic, byte order, number of speakers, number of lines, size of the speaker table in bytes
+HEADER = struct.Struct("<8s8sIIQ")
+MAGIC = b"QCORPUS1"
+
+
+class SpeakerMatcher:
+    """Aho-Corasick automaton finding every speaker name mentioned in a message in a single pass over its text.
+
+    Names only match on word boundaries, so "jim" matches "Jim!" but not "jimmy".
+    """
+
+    def __init__(self, names: typing.Iterable[str]):
+        """Compiles the automaton for the given names
+        :param names: lower cased speaker names, which may contain spaces
+        """
+        self._goto: typing.List[typing.Dict[str, int]] = [{}]
+        self._fail: typing.List[int] = [0]
+        self._output: typing.List[typing.List[str]] = [[]]
+
+        for name in names:
+            if name:
+                self._add(name)
+        self._link()
+
+    def _add(self, name: str):
+        state = 0
+        for character in name:
+            next_state = self._goto[state].get(character)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][character] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(name)
+
+    def _link(self):
+        # breadth first, so every failure link points at an already linked, shallower state
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and character not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(character, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> typing.List[str]:
+        """Finds the names mentioned in a text
+        :param text: the text to search, matched case insensitively
+        :return: the names found, longest first where they overlap, in order of appearance and without repeats
+        """
+        text = text.lower()
+        matches = []
+        state = 0
+
+        for end, character in enumerate(text, 1):
+            while state and character not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(character, 0)
+
+            for name in self._output[state]:
+                start = end - len(name)
+                before_ok = start == 0 or not text[start - 1].isalnum()
+                after_ok = end == len(text) or not text[end].isalnum()
+                if before_ok and after_ok:
+                    matches.append((start, -len(name), name))
+
+        found = []
+        covered_until = 0
+        for start, negative_length, name in sorted(matches):
+            if start >= covered_until and name not in found:
+                found.append(name)
+                covered_until = start - negative_length
+        return found
+
+
+class QuoteCorpus:
+    """Every line of a script, stored by speaker in a memory-mapped binary index.
+
+    The index holds all lines as one contiguous UTF-8 buffer, grouped by speaker, and an array of offsets into it,
+    so opening it costs a single mmap and a line is only decoded when it is picked.
+    """
+
+    def __init__(self, index_path: str):
+        """Opens a prebuilt index, see build_index
+        :param index_path: path of the binary index
+        """
+        with open(index_path, "rb") as index_file:
+            self._mmap = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, byte_order, _, line_count, table_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or byte_order.rstrip(b"\0").decode() != sys.byteorder:
+            raise ValueError(f"{index_path} is not an index built for this machine")
+
+        table_start = HEADER.size
+        offsets_start = _align(table_start + table_size)
+        blob_start = offsets_start + (line_count + 1) * 8
+
+        # speaker name -> (index of their first line, number of lines)
+        self.speakers: typing.Dict[str, typing.Tuple[int, int]] = {
+            name: (first, count)
+            for name, first, count in json.loads(self._mmap[table_start : table_start + table_size])
+        }
+        self._offsets = memoryview(self._mmap)[offsets_start:blob_start].cast("Q")
+        self._blob = memoryview(self._mmap)[blob_start:]
+        self.matcher = SpeakerMatcher(self.speakers)
+
+    @classmethod
+    def load(cls, csv_path: str, index_path: str) -> "QuoteCorpus":
+        """Opens the index of a script, building it first if it is missing or older than the script
+        :param csv_path: path of the script, with line text in the fifth and speaker in the sixth column
+        :param index_path: path of the binary index
+        :return: the opened QuoteCorpus
+        """
+        if not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(csv_path):
+            build_index(csv_path, index_path)
+        return cls(index_path)
+
+    def line(self, index: int) -> str:
+        """Decodes a single line
+        :param index: the position of the line in the index
+        :return: the line's text
+        """
+        return str(self._blob[self._offsets[index] : self._offsets[index + 1]], "utf-8")
+
+    def random_line(self, speaker: str, rng: typing.Optional[random.Random] = None) -> typing.Union[str, None]:
+        """Picks a random line of a speaker
+        :param speaker: the lower cased speaker name
+        :param rng: the source of randomness, defaults to the random module
+        :return: one of their lines, or None if they never spoke
+        """
+        if speaker not in self.speakers:
+            return None
+        first, count = self.speakers[speaker]
+        return self.line(first + (rng or random).randrange(count))
+
+    def mentioned_speakers(self, text: str) -> typing.List[str]:
+        """Finds the speakers mentioned in a message
+        :param text: the message text
+        :return: the lower cased speaker names, in order of appearance
+        """
+        return self.matcher.find(text)
+
+    def close(self):
+        self._offsets.release()
+        self._blob.release()
+        self._mmap.close()
+
+
+def _align(position: int) -> int:
+    return (position + 7) // 8 * 8
+
+
+def build_index(csv_path: str, index_path: str):
+    """Builds the binary index of a script, grouping its lines by speaker
+    :param csv_path: path of the script, with line text in the fifth and speaker in the sixth column
+    :param index_path: path of the binary index to write
+    """
+    # first pass: the order of each speaker's lines, stored as row numbers rather than strings
+    rows_by_speaker: typing.Dict[str, typing.List[int]] = {}
+    with open(csv_path, "r", encoding="utf-8", newline="") as csv_file:
+        for row_number, row in enumerate(csv.reader(csv_file)):
+            speaker = row[5].strip().lower()
+            if row_number == 0 and speaker == "speaker":
+                continue  # header
+            rows_by_speaker.setdefault(sys.intern(speaker), []).append(row_number)
+
+    speakers = []
+    line_count = 0
+    row_positions: typing.Dict[int, int] = {}
+    for speaker, row_numbers in rows_by_speaker.items():
+        speakers.append((speaker, line_count, len(row_numbers)))
+        for row_number in row_numbers:
+            row_positions[row_number] = line_count
+            line_count += 1
+
+    # second pass: encode lines, placing each at its position so every speaker's lines are contiguous
+    encoded: typing.List[bytes] = [b""] * line_count
+    with open(csv_path, "r", encoding="utf-8", newline="") as csv_file:
+        for row_number, row in enumerate(csv.reader(csv_file)):
+            if row_number in row_positions:
+                encoded[row_positions[row_number]] = row[4].encode("utf-8")
+
+    table = json.dumps(speakers).encode("utf-8")
+    offsets = [0]
+    for line in encoded:
+        offsets.append(offsets[-1] + len(line))
+
+    temporary_path = index_path + ".tmp"
+    with open(temporary_path, "wb") as index_file:
+        index_file.write(HEADER.pack(MAGIC, sys.byteorder.encode(), len(speakers), line_count, len(table)))
+        index_file.write(table)
+        index_file.write(b"\0" * (_align(HEADER.size + len(table)) - HEADER.size - len(table)))
+        index_file.write(struct.pack(f"={len(offsets)}Q", *offsets))
+        for line in encoded:
+            index_file.write(line)
+    os.replace(temporary_path, index_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python3 quote_corpus.py SCRIPT_CSV INDEX_PATH")
+    build_index(sys.argv[1], sys.argv[2])
@@ -1,13 +1,13 @@
-import csv
-import random
-import typing
-
+from quote_corpus import QuoteCorpus
 from simple_slack_bot.simple_slack_bot import SimpleSlackBot
 
+SCRIPT_PATH = "the_office_lines_scripts.csv"
+INDEX_PATH = "the_office_lines_scripts.idx"
+
 simple_slack_bot = SimpleSlackBot(debug=True)
 
-# character's name will be the key while the value will a list of all their lines
-character_lines: typing.Dict[str, typing.List[str]] = {}
+# every character's lines, loaded by main
+corpus: QuoteCorpus = None
 
 
 @simple_slack_bot.register("message")
@@ -16,33 +16,18 @@ def office_callback(request):
     :param request: the request object that came with the message event
     """
 
-    if request.message is not None:
-        for token in request.message.split(' '):
-            if token.lower() in character_lines:
-                character_name = token.lower()
-                random_index = random.randint(0, len(character_lines[character_name]) - 1)
-                request.write(character_name.capitalize() + ": " + character_lines[character_name][random_index])
-
-
-def read_in_characters_lines():
-    """Stores all characters' lines into a dictionary
-    """
-
-    with open(r"the_office_lines_scripts.csv", "r", encoding='utf-8') as csvfile:
-        csv_f = csv.reader(csvfile)
-        print(csv_f)
-
-        for _, _, _, _, line_text, speaker, _ in csv_f:
-            speaker = speaker.lower()
-            if speaker in character_lines:
-                character_lines[speaker].append(line_text)
-            else:
-                character_lines[speaker] = []
-                character_lines[speaker].append(line_text)
+    if request.message:
+        replies = [
+            character_name.title() + ": " + corpus.random_line(character_name)
+            for character_name in corpus.mentioned_speakers(request.message)
+        ]
+        if replies:
+            request.write("\n".join(replies))
 
 
 def main():
-    read_in_characters_lines()
+    global corpus
+    corpus = QuoteCorpus.load(SCRIPT_PATH, INDEX_PATH)
     print("bot ready!")
     simple_slack_bot.start()
 
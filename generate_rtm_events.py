@@ -0,0 +1,114 @@
+# Utility Script generating simple_slack_bot/rtm_events.py from the schema in rtm_events.json
+#
+# Run it after changing the schema, for example when slack_rtm_events_parser.py finds a new event type:
+#
+#   python3 generate_rtm_events.py
+
+import json
+import keyword
+import os
+import typing
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_PATH = os.path.join(HERE, "rtm_events.json")
+MODULE_PATH = os.path.join(HERE, "simple_slack_bot", "rtm_events.py")
+
+HEADER = '''"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+# Generated by generate_rtm_events.py from rtm_events.json, do not edit by hand.
+
+# pylint: disable=too-many-lines
+
+import typing
+
+from .rtm_event import RtmEvent, UnknownRtmEvent
+'''
+
+FOOTER = '''
+
+def parse_event(data: typing.Mapping[str, typing.Any]) -> RtmEvent:
+    """Parse a raw event into the class generated for its type.
+
+    :param data: the raw SlackEvent
+    :return: the event, an UnknownRtmEvent if its type isn't in the schema
+    """
+
+    return EVENT_CLASSES.get(data.get("type"), UnknownRtmEvent).from_dict(data)
+'''
+
+
+def class_name(event_type: str) -> str:
+    """Get the name of the class generated for an event type, such as ChannelCreatedEvent for channel_created."""
+    return "".join(word.capitalize() for word in event_type.split("_")) + "Event"
+
+
+def attribute_name(field: str) -> str:
+    """Get the attribute a field is kept in, renaming fields that are Python keywords."""
+    return field + "_" if keyword.iskeyword(field) else field
+
+
+def wrap(prefix: str, items: typing.List[str], suffix: str, indent: str) -> typing.List[str]:
+    """Lay a tuple of strings out over as many lines as it takes to keep within 120 characters."""
+    single = prefix + ", ".join(items) + ("," if len(items) == 1 else "") + suffix
+    if len(indent + single) <= 120:
+        return [indent + single]
+
+    lines = [indent + prefix]
+    line = indent + "    "
+    for item in items:
+        if len(line) + len(item) + 1 > 120:
+            lines.append(line.rstrip())
+            line = indent + "    "
+        line += item + ", "
+    lines.append(line.rstrip())
+    lines.append(indent + suffix)
+    return lines
+
+
+def render(schema: typing.Dict[str, typing.Dict[str, typing.Any]]) -> str:
+    """Render the module for a schema."""
+    lines = [HEADER]
+    for event_type, definition in sorted(schema.items()):
+        fields = [json.dumps(field) for field in definition["fields"]]
+        attributes = [json.dumps(attribute_name(field)) for field in definition["fields"]]
+        lines.append("")
+        lines.append(f"class {class_name(event_type)}(RtmEvent):")
+        lines.append(f'    """{definition["description"]}"""')
+        lines.append("")
+        lines.extend(wrap("__slots__ = (", attributes, ")", "    "))
+        lines.append("")
+        lines.append(f'    type = "{event_type}"')
+        lines.extend(wrap("_fields = (", fields, ")", "    "))
+        if attributes == fields:
+            lines.append("    _attributes = _fields")
+        else:
+            lines.extend(wrap("_attributes = (", attributes, ")", "    "))
+        lines.append("")
+
+    lines.append("")
+    lines.append("EVENT_CLASSES: typing.Dict[str, typing.Type[RtmEvent]] = {")
+    for event_type in sorted(schema):
+        lines.append(f'    "{event_type}": {class_name(event_type)},')
+    lines.append("}")
+    lines.append("")
+    lines.append("EVENT_TYPES = frozenset(EVENT_CLASSES)")
+    lines.append(FOOTER)
+    return "\n".join(lines)
+
+
+def main():
+    with open(SCHEMA_PATH) as schema_file:
+        schema = json.load(schema_file)
+
+    with open(MODULE_PATH, "w") as module_file:
+        module_file.write(render(schema))
+
+    print(f"generated {len(schema)} event classes into {MODULE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
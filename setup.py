@@ -132,6 +132,9 @@ setup(
         "wheel",
         "websocket-client==0.56",  # required to define as our dependency has a dependency which broke backwards compatibility
     ],
+    extras_require={
+        "fast": ["orjson"],  # faster decoding of incoming events
+    },
     python_requires='>=3.7',
     cmdclass={
         'verify': VerifyVersionCommand,
@@ -0,0 +1,236 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import functools
+import heapq
+import logging
+import time
+import traceback
+import typing
+
+from .job_scheduler import JobScheduler
+from .rate_limiter import RateLimiter
+from .slack_request import SlackRequest
+
+if typing.TYPE_CHECKING:
+    from .simple_slack_bot import SimpleSlackBot  # pylint: disable=cyclic-import
+
+logger = logging.getLogger(__name__)
+
+
+class Tenant:
+    """One bot adopted by a BotHost, calling its callbacks and jobs while keeping its failures to itself.
+
+    Exceptions raised by one of its callbacks or jobs are caught, logged and counted. Once max_failures happen in a
+    row the tenant is suspended for suspend_for seconds, during which its events and jobs are skipped, so a broken
+    bot can't flood the logs or hold up the others.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        simple_slack_bot: "SimpleSlackBot",
+        max_failures: int = 5,
+        suspend_for: float = 60.0,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a Tenant.
+
+        :param name: the name of the bot, used when logging
+        :param simple_slack_bot: the bot whose registrations are called
+        :param max_failures: How many callbacks or jobs may fail in a row before the tenant is suspended
+        :param suspend_for: How long, in seconds, a tenant stays suspended
+        :param clock: Function returning the current time in seconds, injectable for testing
+        """
+        self.name = name
+        # named after the bot, as is the span of each callback traced
+        self.__name__ = name
+        self.simple_slack_bot = simple_slack_bot
+        self.max_failures = max_failures
+        self.suspend_for = suspend_for
+        self._clock = clock
+
+        self.suspended_until = 0.0
+        self.consecutive_failures = 0
+        self.calls = 0
+        self.failures = 0
+        self.skipped = 0
+        self.suspensions = 0
+
+    @property
+    def suspended(self) -> bool:
+        """Get whether the tenant is currently suspended."""
+        return self._clock() < self.suspended_until
+
+    def __call__(self, request: SlackRequest):
+        """Call every callback the bot registered to the type of the request.
+
+        :param request: the SlackRequest made by the host
+        """
+
+        if self.suspended:
+            self.skipped += 1
+            return
+
+        registrations = getattr(self.simple_slack_bot, "_registrations", {})
+        for callback in registrations.get(request.type, ()):
+            self._call(getattr(callback, "__name__", repr(callback)), callback, request)
+
+    def run_job(self, callback: typing.Callable[..., typing.Any], *_: typing.Any):
+        """Run one of the jobs of the bot, called with the bot rather than the host.
+
+        :param callback: the job
+        """
+
+        if self.suspended:
+            self.skipped += 1
+            return
+
+        self._call(getattr(callback, "__name__", repr(callback)), callback, self.simple_slack_bot)
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """Get the counters describing this Tenant.
+
+        :return: the callbacks and jobs called, failed and skipped while suspended, the suspensions so far and
+            whether the tenant is suspended
+        """
+
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "suspensions": self.suspensions,
+            "suspended": self.suspended,
+        }
+
+    def _call(self, name: str, callback: typing.Callable[..., typing.Any], *arguments: typing.Any):
+        """Call a callback or job, counting and logging its failure.
+
+        :param name: the name of the callback or job
+        :param callback: the callback or job
+        :param arguments: passed on to it
+        """
+
+        self.calls += 1
+        try:
+            callback(*arguments)
+        except Exception:  # pylint: disable=broad-except
+            self.failures += 1
+            self.consecutive_failures += 1
+            logger.exception("exception in %s of bot %s. Exception %s", name, self.name, traceback.format_exc())
+            if self.consecutive_failures >= self.max_failures:
+                self.suspend()
+        else:
+            self.consecutive_failures = 0
+
+    def suspend(self):
+        """Skip the events and jobs of the bot for suspend_for seconds."""
+
+        self.suspended_until = self._clock() + self.suspend_for
+        self.consecutive_failures = 0
+        self.suspensions += 1
+        logger.error(
+            "bot %s failed %s times in a row, suspended for %ss", self.name, self.max_failures, self.suspend_for
+        )
+
+
+class BotHost:
+    """Run several bots in one process, sharing one SimpleSlackBot's connection, WebClient and callback pools.
+
+    Each bot is an ordinary SimpleSlackBot, typically the one created by its module, whose registrations, commands
+    and jobs are adopted by the host. The host reads the SlackSocket, filters, deduplicates and schedules events
+    once for all of them, then hands each event to every bot registered to its type, as a Tenant, optionally
+    throttled by a per bot quota. The adopted bots never connect themselves, so each costs little more than its
+    callbacks.
+
+    Bots must be registered before they are adopted, as their jobs and the event types they listen to are taken
+    over at that point.
+    """
+
+    def __init__(self, simple_slack_bot: "SimpleSlackBot"):
+        """Initialize a BotHost.
+
+        :param simple_slack_bot: the bot owning the connection, which may register callbacks of its own
+        """
+        self.simple_slack_bot = simple_slack_bot
+        self.tenants: typing.Dict[str, Tenant] = {}
+
+    def adopt(
+        self,
+        name: str,
+        simple_slack_bot: "SimpleSlackBot",
+        quota: RateLimiter = None,
+        max_failures: int = 5,
+        suspend_for: float = 60.0,
+    ) -> Tenant:
+        """Adopt a bot, routing the events it registered for to it and running its jobs.
+
+        :param name: a name for the bot, unique within the host
+        :param simple_slack_bot: the bot to adopt
+        :param quota: optionally throttles the events reaching the bot, see RateLimiter
+        :param max_failures: How many callbacks or jobs may fail in a row before the bot is suspended
+        :param suspend_for: How long, in seconds, a bot stays suspended
+        :return: the Tenant wrapping the bot
+        :raises ValueError: If a bot of that name was already adopted
+        """
+        # pylint: disable=protected-access
+
+        if name in self.tenants:
+            raise ValueError(f"a bot named {name} was already adopted")
+
+        host = self.simple_slack_bot
+        tenant = Tenant(name, simple_slack_bot, max_failures, suspend_for)
+
+        # one pool of threads and processes, one conversation and workspace state for every bot
+        simple_slack_bot._callback_executor.share(host._callback_executor)
+        simple_slack_bot._conversation_store = host._conversation_store
+        simple_slack_bot._workspace_state = host._workspace_state
+        # callbacks the bot defers, say when one of its own rate limiters holds an event back, are run by the host
+        for deferred in simple_slack_bot._deferred_callbacks:
+            heapq.heappush(host._deferred_callbacks, (deferred[0], next(host._deferred_sequence), deferred[2]))
+        simple_slack_bot._deferred_callbacks = host._deferred_callbacks
+        simple_slack_bot._deferred_sequence = host._deferred_sequence
+
+        handler: typing.Callable[..., typing.Any] = tenant
+        if quota is not None:
+            handler = host._rate_limited(tenant, quota)
+        for event_type in getattr(simple_slack_bot, "_registrations", {}):
+            host.register(event_type)(handler)
+
+        for job in simple_slack_bot._job_scheduler.jobs():
+            job.callback = functools.partial(tenant.run_job, job.callback)
+            host._job_scheduler.add(job)
+        simple_slack_bot._job_scheduler = JobScheduler()
+
+        self.tenants[name] = tenant
+        logger.info("adopted bot %s", name)
+        return tenant
+
+    def start(self):
+        """Connect once for every bot and begin listening."""
+
+        self.simple_slack_bot.once(0, self._share_connection, name="share connection with adopted bots")
+        self.simple_slack_bot.start()
+
+    def stats(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Get the counters describing each adopted bot.
+
+        :return: the stats of each Tenant, by name
+        """
+
+        return {name: tenant.stats() for name, tenant in self.tenants.items()}
+
+    def _share_connection(self, host: "SimpleSlackBot"):
+        """Point the adopted bots at the WebClient of the host, once connected, for their helpers to use.
+
+        :param host: the bot owning the connection
+        """
+        # pylint: disable=protected-access
+
+        for tenant in self.tenants.values():
+            tenant.simple_slack_bot._python_slackclient = host._python_slackclient
+            tenant.simple_slack_bot._bot_id = getattr(host, "_bot_id", None)
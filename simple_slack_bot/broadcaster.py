@@ -0,0 +1,252 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import concurrent.futures
+import hashlib
+import json
+import logging
+import math
+import threading
+import time
+import typing
+
+from slack import WebClient
+from slack.errors import SlackApiError
+
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastResult:
+    """The outcome of posting a broadcast to one channel."""
+
+    __slots__ = ("channel", "ok", "ts", "error", "attempts", "resumed")
+
+    def __init__(
+        self,
+        channel: str,
+        ok: bool,
+        ts: str = None,
+        error: str = None,
+        attempts: int = 0,
+        resumed: bool = False,
+    ):
+        """Initialize a BroadcastResult.
+
+        :param channel: the channel id
+        :param ok: whether the message was posted
+        :param ts: the ts of the posted message
+        :param error: why the message could not be posted
+        :param attempts: how many times posting was tried
+        :param resumed: whether the message was posted by an earlier run, according to the journal
+        """
+        self.channel = channel
+        self.ok = ok
+        self.ts = ts
+        self.error = error
+        self.attempts = attempts
+        self.resumed = resumed
+
+    def __repr__(self) -> str:
+        outcome = f"ts={self.ts}" if self.ok else f"error={self.error}"
+        return f"BroadcastResult({self.channel}, {outcome}, attempts={self.attempts})"
+
+
+class BroadcastReport:
+    """The outcome of a broadcast, per channel."""
+
+    def __init__(self, results: typing.Dict[str, BroadcastResult], elapsed: float):
+        """Initialize a BroadcastReport.
+
+        :param results: the result for each channel
+        :param elapsed: how long the broadcast took, in seconds
+        """
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def sent(self) -> typing.List[str]:
+        """Get the channels the message was posted to, including by an earlier run."""
+        return [channel for channel, result in self.results.items() if result.ok]
+
+    @property
+    def failed(self) -> typing.List[str]:
+        """Get the channels the message could not be posted to, which a later run with the same journal retries."""
+        return [channel for channel, result in self.results.items() if not result.ok]
+
+    def __repr__(self) -> str:
+        return f"BroadcastReport(sent={len(self.sent)}, failed={len(self.failed)}, elapsed={self.elapsed:.1f}s)"
+
+
+class Broadcaster:
+    """Post the same message to many channels concurrently, within Slack's rate limits.
+
+    Posts are made from a thread pool, each first taking a token from a single RateLimiter shared by the threads.
+    A post answered with a 429 is retried after the Retry-After Slack asks for, and every thread holds off until
+    then. With a journal, each channel posted to is appended to a file as it succeeds, and channels already in the
+    journal are skipped, so a broadcast that failed part way can be run again to finish it. Entries are recorded
+    along with a digest of the message, so only a broadcast of the same message resumes from them, and one journal
+    can be kept for every broadcast.
+    """
+
+    def __init__(
+        self,
+        python_slackclient: WebClient,
+        max_workers: int = 4,
+        rate: float = 1.0,
+        burst: int = 1,
+        max_retries: int = 3,
+        journal_path: str = None,
+        progress: typing.Callable[[BroadcastResult, int, int], typing.Any] = None,
+    ):
+        """Initialize a Broadcaster.
+
+        :param python_slackclient: the WebClient posting the messages
+        :param max_workers: How many posts may be in flight at once
+        :param rate: How many posts per second to make at most, across all channels
+        :param burst: How many posts may be made at once before rate applies
+        :param max_retries: How many times a post answered with a 429 or a network error is retried
+        :param journal_path: Optionally where the channels posted to are recorded, so the broadcast can be resumed
+        :param progress: Optionally called as progress(result, done, total) as each channel is finished
+        """
+        if max_workers < 1 or max_retries < 0:
+            raise ValueError("max_workers must be at least 1 and max_retries can't be negative")
+
+        self.python_slackclient = python_slackclient
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(
+            rate, burst, key=lambda _: "broadcast", policy=RateLimiter.POLICY_DEFER, max_delay=math.inf
+        )
+        self.max_retries = max_retries
+        self.journal_path = journal_path
+        self.progress = progress
+
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+
+    def broadcast(self, content: str, channels: typing.Iterable[str], **kwargs: typing.Any) -> BroadcastReport:
+        """Post a message to every channel, blocking until done.
+
+        :param content: The text you wish to send
+        :param channels: the ids of the channels to post to, duplicates are posted to once
+        :param kwargs: any other arguments for chat.postMessage, such as blocks
+        :return: the result for each channel
+        """
+
+        start = time.monotonic()
+        channels = list(dict.fromkeys(channels))
+        digest = self.digest(content, kwargs)
+        results = {
+            channel: BroadcastResult(channel, True, ts, resumed=True) for channel, ts in self._journaled(digest)
+        }
+        pending = [channel for channel in channels if channel not in results]
+        results = {channel: results[channel] for channel in channels if channel in results}
+
+        logger.info("broadcasting to %s channels, %s already posted to", len(channels), len(results))
+
+        done = len(results)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="simple-slack-bot-broadcast"
+        ) as executor:
+            futures = [executor.submit(self._post, channel, content, kwargs) for channel in pending]
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                results[result.channel] = result
+                done += 1
+                if result.ok:
+                    self._journal(digest, result)
+                if self.progress is not None:
+                    self.progress(result, done, len(channels))
+
+        report = BroadcastReport({channel: results[channel] for channel in channels}, time.monotonic() - start)
+        logger.info("broadcast finished: %s", report)
+        return report
+
+    def _post(self, channel: str, content: str, kwargs: typing.Dict[str, typing.Any]) -> BroadcastResult:
+        """Post the message to one channel, retrying rate limited and failed requests.
+
+        :param channel: the channel id
+        :param content: The text you wish to send
+        :param kwargs: any other arguments for chat.postMessage
+        :return: the result for the channel
+        """
+
+        attempts = 0
+        while True:
+            self._wait_for_turn()
+            attempts += 1
+            try:
+                response = self.python_slackclient.chat_postMessage(channel=channel, text=content, **kwargs)
+                return BroadcastResult(channel, True, response.get("ts"), attempts=attempts)
+            except SlackApiError as slack_api_error:
+                status = getattr(slack_api_error.response, "status_code", None)
+                if status != 429:
+                    error = slack_api_error.response.get("error")
+                    return BroadcastResult(channel, False, error=error, attempts=attempts)
+                error = "ratelimited"
+                retry_after = float(slack_api_error.response.headers.get("Retry-After", 1))
+                with self._lock:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                logger.warning("rate limited posting to %s, holding off for %s seconds", channel, retry_after)
+            except Exception as exception:  # pylint: disable=broad-except
+                error = str(exception)
+                logger.warning("failed posting to %s: %s", channel, error)
+
+            if attempts > self.max_retries:
+                return BroadcastResult(channel, False, error=error, attempts=attempts)
+
+    def _wait_for_turn(self):
+        """Block until Slack's Retry-After has passed and the RateLimiter allows another post."""
+
+        with self._lock:
+            delay = max(self._paused_until - time.monotonic(), 0.0) + self.rate_limiter.acquire("broadcast")
+        if delay > 0:
+            time.sleep(delay)
+
+    @staticmethod
+    def digest(content: str, kwargs: typing.Dict[str, typing.Any]) -> str:
+        """Build the digest identifying a message in the journal.
+
+        :param content: The text of the message
+        :param kwargs: any other arguments for chat.postMessage, such as blocks
+        :return: the hex SHA-256 digest of the text and arguments
+        """
+
+        message = json.dumps({"text": content, **kwargs}, sort_keys=True, default=str)
+        return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+    def _journaled(self, digest: str) -> typing.List[typing.Tuple[str, str]]:
+        """Read the channels earlier runs posted the same message to from the journal.
+
+        :param digest: the digest of the message, see digest
+        :return: the channels and the ts of their message
+        """
+
+        if self.journal_path is None:
+            return []
+
+        try:
+            with open(self.journal_path) as journal:
+                entries = [json.loads(line) for line in journal if line.strip()]
+        except FileNotFoundError:
+            return []
+
+        return [(entry["channel"], entry["ts"]) for entry in entries if entry.get("message") == digest]
+
+    def _journal(self, digest: str, result: BroadcastResult):
+        """Record in the journal that a channel was posted to.
+
+        :param digest: the digest of the message, see digest
+        :param result: the result for the channel
+        """
+
+        if self.journal_path is None:
+            return
+
+        with open(self.journal_path, "a") as journal:
+            journal.write(json.dumps({"message": digest, "channel": result.channel, "ts": result.ts}) + "\n")
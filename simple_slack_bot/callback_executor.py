@@ -0,0 +1,327 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import concurrent.futures
+import functools
+import logging
+import os
+import sys
+import threading
+import traceback
+import typing
+
+from slacksocket.models import SlackEvent  # type: ignore
+
+from .file_uploader import Source
+from .slack_request import SlackRequest
+from .tracer import NULL_TRACE
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_INLINE = "inline"
+EXECUTION_THREAD = "thread"
+EXECUTION_PROCESS = "process"
+EXECUTIONS = (EXECUTION_INLINE, EXECUTION_THREAD, EXECUTION_PROCESS)
+
+# the name of the SlackRequest method a callback called in another process, followed by its arguments
+Action = typing.Tuple[typing.Any, ...]
+
+
+class RequestSnapshot(SlackRequest):
+    """A picklable copy of a SlackRequest, for callbacks running in another process.
+
+    Holds a plain copy of the SlackEvent and no WebClient. Writes and uploads are recorded as actions, which the
+    process that received the event applies through the original SlackRequest once the callback returns, so uploads
+    return None here and can only be given paths or bytes. Nothing else reaching the Web API is supported.
+    """
+
+    def __init__(self, slack_event: SlackEvent):
+        """Initialize a RequestSnapshot.
+
+        :param slack_event: the SlackEvent to copy
+        """
+        super().__init__(None, SlackEvent(dict(slack_event)))
+        self.actions: typing.List[Action] = []
+
+    def write(self, content: str, channel: typing.Optional[str] = None):
+        """Record writing the content to the channel.
+
+        :param content: The text you wish to send
+        :param channel: By default send to same channel request came from, if any
+        """
+
+        self.actions.append(("write", content, channel))
+
+    def upload(
+        self,
+        source: Source,
+        filename: str = None,
+        title: str = None,
+        initial_comment: str = None,
+        channel: typing.Optional[str] = None,
+    ) -> None:
+        """Record uploading a file to the channel, see SlackRequest.upload.
+
+        :param source: the content, a path or bytes
+        :param filename: the name of the file, defaults to the name of the path
+        :param title: the title of the file, defaults to its name
+        :param initial_comment: Optionally a message shared along with the file
+        :param channel: By default send to same channel request came from, and in the same thread
+        :raises RuntimeError: If the source is neither a path nor bytes
+        """
+
+        self._check_source(source)
+        self.actions.append(("upload", source, filename, title, initial_comment, channel))
+
+    def upload_many(
+        self, sources: typing.Iterable[typing.Union[Source, typing.Tuple[Source, str]]], channel: str = None
+    ) -> None:
+        """Record uploading several files to the channel at once, see SlackRequest.upload_many.
+
+        :param sources: the content of each file, a path or bytes, or the content and name of each file
+        :param channel: By default send to same channel request came from, and in the same thread
+        :raises RuntimeError: If one of the sources is neither a path nor bytes
+        """
+
+        sources = list(sources)
+        for source in sources:
+            self._check_source(source[0] if isinstance(source, tuple) else source)
+        self.actions.append(("upload_many", sources, channel))
+
+    @staticmethod
+    def _check_source(source: Source):
+        """Check the content of a file can be sent back to the process applying the upload.
+
+        :param source: the content of the file
+        :raises RuntimeError: If the source is neither a path nor bytes
+        """
+
+        if not isinstance(source, (str, os.PathLike, bytes, bytearray)):
+            raise RuntimeError("callbacks run in a process can only upload paths or bytes")
+
+
+def run_snapshot(callback: typing.Callable, snapshot: RequestSnapshot) -> typing.List[Action]:
+    """Call a callback with a RequestSnapshot, in a pool process.
+
+    :param callback: the callback, which must be importable by name to be sent to the process
+    :param snapshot: the RequestSnapshot to call it with
+    :return: the actions the callback recorded
+    """
+
+    callback(snapshot)
+    return snapshot.actions
+
+
+class CallbackExecutor:
+    """Run callbacks inline, in a thread pool or in a process pool, so slow callbacks don't block the listen loop.
+
+    Both pools are persistent, created on first use and shared by every callback asking for them. Callbacks run in
+    the process pool get a RequestSnapshot rather than the SlackRequest, and their writes are applied once they
+    return, so they must be defined at the top level of a module.
+    """
+
+    def __init__(self, max_threads: int = None, max_processes: int = None):
+        """Initialize a CallbackExecutor.
+
+        :param max_threads: The size of the thread pool, defaults to the ThreadPoolExecutor default
+        :param max_processes: The size of the process pool, defaults to the number of CPUs
+        """
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self._thread_pool: typing.Union[concurrent.futures.ThreadPoolExecutor, None] = None
+        self._process_pool: typing.Union[concurrent.futures.ProcessPoolExecutor, None] = None
+
+        self._pending: typing.Set[concurrent.futures.Future] = set()
+        self._pending_lock = threading.Lock()
+        self._shared: typing.Union["CallbackExecutor", None] = None
+
+    def wrap(self, callback: typing.Callable, execution: str) -> typing.Callable[[SlackRequest], typing.Any]:
+        """Wrap a callback so it runs as asked when called with a SlackRequest.
+
+        :param callback: the callback to wrap
+        :param execution: one of inline, thread or process
+        :return: the wrapped callback
+        :raises ValueError: If execution is not one of inline, thread or process
+        """
+
+        if execution not in EXECUTIONS:
+            raise ValueError(f"execution must be one of {', '.join(EXECUTIONS)}, not {execution}")
+
+        if execution == EXECUTION_INLINE:
+            return callback
+
+        name = getattr(callback, "__name__", repr(callback))
+
+        if execution == EXECUTION_THREAD:
+
+            @functools.wraps(callback)
+            def threaded_callback(request: SlackRequest, *arguments: typing.Any):
+                # Interactions, also run in threads, aren't traced
+                end_span = getattr(request, "trace", NULL_TRACE).begin("pool", callback=name, execution=execution)
+                future = self._track(self._threads().submit(callback, request, *arguments))
+                future.add_done_callback(functools.partial(self._log_exception, callback))
+                future.add_done_callback(functools.partial(self._end_span, end_span))
+
+            return threaded_callback
+
+        @functools.wraps(callback)
+        def process_callback(request: SlackRequest):
+            end_span = request.trace.begin("pool", callback=name, execution=execution)
+            future = self._track(self._processes().submit(run_snapshot, callback, RequestSnapshot(request.slack_event)))
+            future.add_done_callback(functools.partial(self._apply_actions, callback, request))
+            future.add_done_callback(functools.partial(self._end_span, end_span))
+
+        return process_callback
+
+    @property
+    def pending(self) -> int:
+        """Get the number of callbacks submitted to a pool that haven't finished yet."""
+        return len(self._pending)
+
+    def share(self, executor: "CallbackExecutor"):
+        """Run callbacks in the pools of another CallbackExecutor from now on, where they are counted as pending.
+
+        :param executor: the CallbackExecutor whose pools are used
+        """
+
+        self._shared = executor
+
+    def _track(self, future: concurrent.futures.Future) -> concurrent.futures.Future:
+        """Count a submitted callback as pending until it finishes.
+
+        :param future: the Future of its call
+        :return: the same Future
+        """
+
+        if self._shared is not None:
+            return self._shared._track(future)  # pylint: disable=protected-access
+
+        def finished(_: concurrent.futures.Future):
+            with self._pending_lock:
+                self._pending.discard(future)
+
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(finished)
+        return future
+
+    def shutdown(self, wait: bool = True, timeout: float = None):
+        """Stop both pools, if started. They are started again should another callback need them.
+
+        :param wait: whether to wait for the callbacks already submitted to finish
+        :param timeout: Optionally the longest, in seconds, to wait for them. Those still running then are left to
+            finish on their own, and those not started yet are cancelled, from Python 3.9
+        """
+
+        if wait and timeout is not None:
+            with self._pending_lock:
+                pending = list(self._pending)
+            _, not_done = concurrent.futures.wait(pending, timeout)
+            if not_done:
+                logger.warning(
+                    "%s callbacks still running after %ss, no longer waiting for them", len(not_done), timeout
+                )
+                wait = False
+
+        # only Python 3.9 and later can cancel what the pools haven't started
+        cancel = {"cancel_futures": True} if not wait and sys.version_info >= (3, 9) else {}
+        thread_pool, self._thread_pool = self._thread_pool, None
+        process_pool, self._process_pool = self._process_pool, None
+        # processes first, as their writes are applied from a thread
+        if process_pool is not None:
+            process_pool.shutdown(wait=wait, **cancel)
+        if thread_pool is not None:
+            thread_pool.shutdown(wait=wait, **cancel)
+
+    def _threads(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Get the thread pool, starting it if needed.
+
+        :return: the thread pool
+        """
+
+        if self._shared is not None:
+            return self._shared._threads()  # pylint: disable=protected-access
+        if self._thread_pool is None:
+            self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_threads, thread_name_prefix="simple-slack-bot-callback"
+            )
+        return self._thread_pool
+
+    def _processes(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Get the process pool, starting it if needed.
+
+        :return: the process pool
+        """
+
+        if self._shared is not None:
+            return self._shared._processes()  # pylint: disable=protected-access
+        if self._process_pool is None:
+            self._process_pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_processes)
+        return self._process_pool
+
+    @staticmethod
+    def _log_exception(callback: typing.Callable, future: concurrent.futures.Future) -> bool:
+        """Log the Exception a callback raised, if any, or that it was cancelled.
+
+        :param callback: the callback that ran
+        :param future: the Future of its call
+        :return: True if the callback raised or was cancelled, False otherwise
+        """
+
+        if future.cancelled():
+            logger.warning("callback %s was cancelled before it ran", getattr(callback, "__name__", callback))
+            return True
+
+        exception = future.exception()
+        if exception is None:
+            return False
+
+        logger.error(
+            "exception processing callback %s",
+            getattr(callback, "__name__", callback),
+            exc_info=(type(exception), exception, exception.__traceback__),
+        )
+        return True
+
+    @staticmethod
+    def _end_span(end_span: typing.Callable[..., typing.Any], future: concurrent.futures.Future):
+        """End the span timing a callback in a pool, from its submit until it finished.
+
+        :param end_span: the function ending the span, from Trace.begin
+        :param future: the Future of its call
+        """
+
+        if future.cancelled():
+            end_span(error="cancelled")
+        elif future.exception() is not None:
+            end_span(error=repr(future.exception()))
+        else:
+            end_span()
+
+    def _apply_actions(self, callback: typing.Callable, request: SlackRequest, future: concurrent.futures.Future):
+        """Apply the writes and uploads a callback recorded in a pool process, through the original SlackRequest.
+
+        Catches and logs all Exceptions raised applying an action, so the others are still applied.
+
+        :param callback: the callback that ran
+        :param request: the SlackRequest the callback was called for
+        :param future: the Future of its call, holding the recorded actions
+        """
+
+        if self._log_exception(callback, future):
+            return
+
+        for name, *arguments in future.result():
+            try:
+                getattr(request, name)(*arguments)
+            except Exception:  # pylint: disable=broad-except
+                logger.error(
+                    "exception applying %s of callback %s. Exception %s",
+                    name,
+                    getattr(callback, "__name__", callback),
+                    traceback.format_exc(),
+                )
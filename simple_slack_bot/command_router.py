@@ -0,0 +1,264 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import inspect
+import logging
+import traceback
+import typing
+
+from .slack_request import SlackRequest
+
+logger = logging.getLogger(__name__)
+
+TRUE_WORDS = frozenset(("true", "yes", "1"))
+FALSE_WORDS = frozenset(("false", "no", "0"))
+
+
+def to_bool(word: str) -> bool:
+    """Convert a word to a bool, as bool itself would take any word but an empty one as True.
+
+    :param word: true, yes or 1, or false, no or 0, in any case
+    :return: the bool
+    :raises ValueError: If the word is none of those
+    """
+
+    lowered = word.lower()
+    if lowered in TRUE_WORDS:
+        return True
+    if lowered in FALSE_WORDS:
+        return False
+    raise ValueError(f"expected one of {', '.join(sorted(TRUE_WORDS | FALSE_WORDS))}, not {word!r}")
+
+
+class CommandParameter:
+    """A single argument of a Command, read once from the callback's signature."""
+
+    __slots__ = ("name", "converter", "required", "default", "variadic")
+
+    def __init__(self, parameter: inspect.Parameter):
+        """Initialize a CommandParameter.
+
+        :param parameter: the parameter of the callback this argument is passed as
+        """
+        self.name = parameter.name
+        if parameter.annotation is inspect.Parameter.empty:
+            self.converter: typing.Callable[[str], typing.Any] = str
+        elif parameter.annotation is bool:
+            self.converter = to_bool
+        else:
+            self.converter = parameter.annotation
+        self.variadic = parameter.kind is inspect.Parameter.VAR_POSITIONAL
+        self.required = parameter.default is inspect.Parameter.empty and not self.variadic
+        self.default = parameter.default
+
+    @property
+    def usage(self) -> str:
+        """Get how this argument is shown in a usage message.
+
+        :return: the usage of this argument
+        """
+
+        if self.variadic:
+            return f"[{self.name}...]"
+        if self.required:
+            return f"<{self.name}>"
+        return f"[{self.name}]"
+
+
+class Command:
+    """A command word bound to its callback and the parameters parsed from that callback's signature."""
+
+    __slots__ = ("name", "callback", "parameters", "min_arguments", "max_arguments", "usage")
+
+    def __init__(self, name: str, callback: typing.Callable, help_text: str = None):
+        """Initialize a Command.
+
+        :param name: the command word, as typed after the prefix
+        :param callback: the function called as callback(request, *arguments)
+        :param help_text: an optional description appended to the usage message
+        :raises TypeError: If the callback takes keyword only arguments, which can't be typed in a message
+        """
+        self.name = name
+        self.callback = callback
+
+        # the first parameter receives the SlackRequest
+        signature_parameters = list(inspect.signature(callback).parameters.values())[1:]
+        for parameter in signature_parameters:
+            if parameter.kind in (inspect.Parameter.KEYWORD_ONLY, inspect.Parameter.VAR_KEYWORD):
+                raise TypeError(f"command {name} can not take keyword only argument {parameter.name}")
+
+        self.parameters = [CommandParameter(parameter) for parameter in signature_parameters]
+        self.min_arguments = sum(1 for parameter in self.parameters if parameter.required)
+        if any(parameter.variadic for parameter in self.parameters):
+            self.max_arguments = None
+        else:
+            self.max_arguments = len(self.parameters)
+
+        usage = " ".join([name] + [parameter.usage for parameter in self.parameters])
+        self.usage = f"Usage: {usage}" + (f" - {help_text}" if help_text else "")
+
+    @property
+    def expected_arguments(self) -> str:
+        """Get how many arguments this Command takes, in words.
+
+        :return: such as "2", "1 to 3" or "at least 1"
+        """
+
+        if self.max_arguments is None:
+            return f"at least {self.min_arguments}"
+        if self.max_arguments == self.min_arguments:
+            return str(self.min_arguments)
+        return f"{self.min_arguments} to {self.max_arguments}"
+
+    def convert(self, words: typing.List[str]) -> typing.List[typing.Any]:
+        """Convert the words typed after the command word into the callback's arguments.
+
+        :param words: the whitespace separated words following the command word
+        :return: the converted arguments, in order
+        :raises ValueError: If the wrong number of words were given or a word could not be converted
+        """
+
+        if len(words) < self.min_arguments or (
+            self.max_arguments is not None and len(words) > self.max_arguments
+        ):
+            raise ValueError(f"expected {self.expected_arguments} arguments")
+
+        arguments = []
+        for index, parameter in enumerate(self.parameters):
+            if parameter.variadic:
+                arguments.extend(parameter.converter(word) for word in words[index:])
+                break
+            if index < len(words):
+                arguments.append(parameter.converter(words[index]))
+            else:
+                arguments.append(parameter.default)
+
+        return arguments
+
+
+class CommandRouter:
+    """Route "command args" style messages to the Command registered for their command word.
+
+    Every command is parsed from its callback's signature once, at registration. Routing a message is then a prefix
+    check, a check of its first character against the first characters of all command words and a single dictionary
+    lookup, so messages that aren't commands are rejected almost for free.
+    """
+
+    def __init__(self, prefix: str = "", case_sensitive: bool = False):
+        """Initialize a CommandRouter.
+
+        :param prefix: What every command must start with, for example "!"
+        :param case_sensitive: Whether command words must match in case
+        """
+        self.prefix = prefix
+        self.case_sensitive = case_sensitive
+        self._commands: typing.Dict[str, Command] = {}
+        self._first_characters: typing.Set[str] = set()
+
+    def add(self, name: str, callback: typing.Callable, help_text: str = None) -> Command:
+        """Register a callback to a command word.
+
+        :param name: the command word
+        :param callback: the function called as callback(request, *arguments)
+        :param help_text: an optional description appended to the usage message
+        :return: the registered Command
+        :raises ValueError: If the command word is empty, contains whitespace or is already registered
+        """
+
+        if not name or name.split() != [name]:
+            raise ValueError(f"invalid command word {name!r}")
+
+        key = name if self.case_sensitive else name.lower()
+        if key in self._commands:
+            raise ValueError(f"command {name} is already registered")
+
+        command = Command(name, callback, help_text)
+        self._commands[key] = command
+        self._first_characters.add(key[0])
+        return command
+
+    def commands(self) -> typing.Dict[str, Command]:
+        """Get a copy of the registered commands.
+
+        :return: the Commands, by command word
+        """
+
+        return dict(self._commands)
+
+    def replace(self, commands: typing.Dict[str, Command]):
+        """Replace every registered command at once, such as with the copy commands returned.
+
+        :param commands: the Commands, by command word
+        """
+
+        self._commands = dict(commands)
+        self._first_characters = {key[0] for key in self._commands}
+
+    def parse(self, text: typing.Union[str, None]) -> typing.Union[typing.Tuple[Command, typing.List[str]], None]:
+        """Find the Command a message is addressed to.
+
+        :param text: the text of the message
+        :return: the Command and the words following the command word, or None if this isn't a command
+        """
+
+        if not text or not text.startswith(self.prefix):
+            return None
+
+        body = text[len(self.prefix) :]
+        if not body:
+            return None
+
+        first_character = body[0] if self.case_sensitive else body[0].lower()
+        if first_character not in self._first_characters:
+            return None
+
+        words = body.split()
+        command_word = words[0] if self.case_sensitive else words[0].lower()
+        command = self._commands.get(command_word)
+        if command is None:
+            return None
+
+        return command, words[1:]
+
+    def route(self, request: SlackRequest) -> bool:
+        """Call the Command this request's message is addressed to, replying with its usage if the arguments are bad.
+
+        :param request: the SlackRequest of a message event
+        :return: True if the message was a command, False otherwise
+        """
+
+        parsed = self.parse(request.slack_event.get("text"))
+        if parsed is None:
+            return False
+
+        command, words = parsed
+        try:
+            arguments = command.convert(words)
+        except (ValueError, TypeError):
+            logger.debug("bad arguments %s for command %s: %s", words, command.name, traceback.format_exc())
+            request.write(command.usage)
+            return True
+
+        command.callback(request, *arguments)
+        return True
+
+    def __contains__(self, name: str) -> bool:
+        """Check whether a command word is registered.
+
+        :param name: the command word
+        :return: True if it is registered, False otherwise
+        """
+
+        return (name if self.case_sensitive else name.lower()) in self._commands
+
+    def __len__(self) -> int:
+        """Get the number of registered commands.
+
+        :return: the number of registered commands
+        """
+
+        return len(self._commands)
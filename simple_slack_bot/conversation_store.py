@@ -0,0 +1,270 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import collections
+import logging
+import shelve
+import sys
+import threading
+import time
+import typing
+
+logger = logging.getLogger(__name__)
+
+
+class Conversation:
+    """The state of one thread, with when it was last used."""
+
+    __slots__ = ("touched", "state")
+
+    def __init__(self, touched: float, state: typing.Dict[str, typing.Any] = None):
+        """Initialize a Conversation.
+
+        :param touched: when the conversation was last used, in seconds
+        :param state: the state kept for the thread, empty by default
+        """
+        self.touched = touched
+        self.state = {} if state is None else state
+
+
+class ConversationStore:
+    """Keep state for conversations held in threads, keyed on (channel, thread_ts), in bounded memory.
+
+    Conversations are kept in an OrderedDict ordered by last use. Those unused for longer than the ttl are expired,
+    and the least recently used are evicted once beyond capacity, either dropped or, when a spill path is given,
+    written to a shelve file and read back the next time the thread is active. The ttl applies to spilled
+    conversations too: expired ones are never written, and are removed when the file is opened.
+
+    A store belongs to one process. When running several worker processes, see ScaleOut, each worker has a store of
+    its own, holding the conversations whose threads are sent to it. As the workers would share it, don't give a
+    spill path then.
+    """
+
+    DEFAULT_CAPACITY = 1000
+    DEFAULT_TTL_SECONDS = 24 * 60 * 60.0
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        spill_path: str = None,
+        clock: typing.Callable[[], float] = time.time,
+    ):
+        """Initialize a ConversationStore.
+
+        :param capacity: The maximum number of conversations kept in memory
+        :param ttl_seconds: How long, in seconds, an unused conversation is kept
+        :param spill_path: Optionally where conversations evicted from memory are kept, instead of dropping them.
+            Anything still in memory is written there on close, so conversations survive restarts
+        :param clock: Function returning the current time in seconds, injectable for testing. Wall clock time by
+            default, as spilled conversations outlive the process
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self.spill_path = spill_path
+        self._clock = clock
+        self._conversations: "collections.OrderedDict[typing.Tuple[str, str], Conversation]" = collections.OrderedDict()
+        self._spill: typing.Union[shelve.Shelf, None] = None
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.spilled = 0
+        self.unspilled = 0
+
+    @staticmethod
+    def _spill_key(key: typing.Tuple[str, str]) -> str:
+        """Build the shelve key of a conversation.
+
+        :param key: the (channel, thread_ts) of the conversation
+        :return: the shelve key
+        """
+
+        return "\0".join(key)
+
+    def get(
+        self, channel: str, thread_ts: str, create: bool = True
+    ) -> typing.Union[typing.Dict[str, typing.Any], None]:
+        """Get the state of a conversation, marking it as used.
+
+        The state is a dict kept by reference, so changes made to it are kept.
+
+        :param channel: the channel the thread is in
+        :param thread_ts: the ts of the message starting the thread
+        :param create: whether to start a conversation if there is none
+        :return: the state of the conversation, or None if there is none and create is False
+        """
+
+        key = (channel, thread_ts)
+
+        with self._lock:
+            now = self._clock()
+            conversation = self._conversations.get(key)
+            if conversation is None:
+                conversation = self._unspill(key)
+
+            if conversation is not None and now - conversation.touched > self.ttl_seconds:
+                self.expired += 1
+                self._conversations.pop(key, None)
+                conversation = None
+
+            if conversation is None:
+                self.misses += 1
+                if not create:
+                    return None
+                conversation = Conversation(now)
+            else:
+                self.hits += 1
+                conversation.touched = now
+
+            self._conversations[key] = conversation
+            self._conversations.move_to_end(key)
+            self._evict(now)
+            return conversation.state
+
+    def discard(self, channel: str, thread_ts: str):
+        """Forget a conversation, for example once it has ended.
+
+        :param channel: the channel the thread is in
+        :param thread_ts: the ts of the message starting the thread
+        """
+
+        key = (channel, thread_ts)
+
+        with self._lock:
+            self._conversations.pop(key, None)
+            spill = self._open_spill()
+            if spill is not None:
+                spill.pop(self._spill_key(key), None)
+
+    def close(self):
+        """Write every conversation still in memory and not yet expired to the spill file, if any, and close it."""
+
+        with self._lock:
+            spill = self._open_spill()
+            if spill is None:
+                return
+
+            now = self._clock()
+            for key, conversation in self._conversations.items():
+                if now - conversation.touched > self.ttl_seconds:
+                    self.expired += 1
+                    continue
+                spill[self._spill_key(key)] = (conversation.touched, conversation.state)
+            self._conversations.clear()
+            spill.close()
+            self._spill = None
+
+    def _open_spill(self) -> typing.Union[shelve.Shelf, None]:
+        """Get the spill file, opening it if needed and removing the conversations expired since it was written.
+
+        :return: the spill file, or None if conversations aren't spilled
+        """
+
+        if self._spill is None and self.spill_path is not None:
+            self._spill = shelve.open(self.spill_path)
+            now = self._clock()
+            expired = [key for key, (touched, _) in self._spill.items() if now - touched > self.ttl_seconds]
+            for key in expired:
+                del self._spill[key]
+            self.expired += len(expired)
+        return self._spill
+
+    def _unspill(self, key: typing.Tuple[str, str]) -> typing.Union[Conversation, None]:
+        """Read a conversation back from the spill file, removing it from there.
+
+        :param key: the (channel, thread_ts) of the conversation
+        :return: the conversation, or None if it wasn't spilled
+        """
+
+        spill = self._open_spill()
+        if spill is None:
+            return None
+
+        spilled = spill.pop(self._spill_key(key), None)
+        if spilled is None:
+            return None
+
+        self.unspilled += 1
+        touched, state = spilled
+        return Conversation(touched, state)
+
+    def _evict(self, now: float):
+        """Expire the conversations unused for longer than the ttl, then evict the least recently used beyond capacity.
+
+        :param now: the current time in seconds
+        """
+
+        # conversations are ordered by last use, so expired ones are at the front
+        while self._conversations:
+            key, conversation = next(iter(self._conversations.items()))
+            if now - conversation.touched <= self.ttl_seconds:
+                break
+            del self._conversations[key]
+            self.expired += 1
+
+        while len(self._conversations) > self.capacity:
+            key, conversation = self._conversations.popitem(last=False)
+            self.evicted += 1
+
+            spill = self._open_spill()
+            if spill is not None:
+                spill[self._spill_key(key)] = (conversation.touched, conversation.state)
+                self.spilled += 1
+            else:
+                logger.debug("dropping the least recently used conversation %s", key)
+
+    def __len__(self) -> int:
+        """Get the number of conversations kept in memory.
+
+        :return: the number of conversations kept in memory
+        """
+
+        return len(self._conversations)
+
+    def memory_bytes(self) -> int:
+        """Estimate the memory used by the conversations kept in memory.
+
+        Counts the conversations, their keys, their state dicts and the keys and values directly in those, but not
+        anything nested deeper.
+
+        :return: the estimated size in bytes
+        """
+
+        with self._lock:
+            size = sys.getsizeof(self._conversations)
+            for key, conversation in self._conversations.items():
+                size += sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key)
+                size += sys.getsizeof(conversation) + sys.getsizeof(conversation.state)
+                for name, value in conversation.state.items():
+                    size += sys.getsizeof(name) + sys.getsizeof(value)
+            return size
+
+    def stats(self) -> typing.Dict[str, float]:
+        """Get the counters describing this ConversationStore.
+
+        :return: the hits, misses, hit rate, expired, evicted, spilled and unspilled conversations, the current size
+            and estimated memory use
+        """
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "spilled": self.spilled,
+            "unspilled": self.unspilled,
+            "size": len(self),
+            "memory_bytes": self.memory_bytes(),
+        }
@@ -0,0 +1,177 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import collections
+import logging
+import time
+import typing
+
+logger = logging.getLogger(__name__)
+
+
+class EventDeduplicator:
+    """Drop Slack events we have already seen within a bounded time window.
+
+    Slack delivers events at least once, so after reconnects the same event can arrive twice. Seen keys are kept
+    in a ring buffer ordered by arrival, mirrored by a set for O(1) membership checks. Keys older than the window,
+    or beyond the capacity, are evicted from the front of the ring buffer, which bounds memory.
+    """
+
+    DEFAULT_WINDOW_SECONDS = 300.0
+    DEFAULT_CAPACITY = 10000
+
+    def __init__(
+        self,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        capacity: int = DEFAULT_CAPACITY,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an EventDeduplicator.
+
+        :param window_seconds: How long, in seconds, a seen event key is remembered
+        :param capacity: The maximum number of event keys remembered at once
+        :param clock: Function returning the current time in seconds, injectable for testing
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+        self._clock = clock
+        self._ring: typing.Deque[typing.Tuple[float, typing.Hashable]] = collections.deque()
+        self._seen: typing.Set[typing.Hashable] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.unkeyed = 0
+
+    @staticmethod
+    def key_for(slack_event: typing.Mapping) -> typing.Union[typing.Hashable, None]:
+        """Build the key identifying a Slack event across redeliveries.
+
+        Prefers the Events API event_id, then the client_msg_id attached to user messages, and finally the
+        type, channel and ts triple, as ts is unique per channel.
+
+        :param slack_event: the raw SlackEvent to build a key for
+        :return: the key, or None if this event carries nothing to identify it by
+        """
+
+        event_id = slack_event.get("event_id")
+        if event_id:
+            return ("event_id", event_id)
+
+        client_msg_id = slack_event.get("client_msg_id")
+        if client_msg_id:
+            return ("client_msg_id", client_msg_id)
+
+        ts = slack_event.get("ts")
+        if ts:
+            return ("ts", slack_event.get("type"), slack_event.get("channel"), ts)
+
+        return None
+
+    def is_duplicate(self, slack_event: typing.Mapping) -> bool:
+        """Check whether this Slack event was already seen, remembering it if it was not.
+
+        :param slack_event: the raw SlackEvent to check
+        :return: True if the event was seen within the window, False otherwise
+        """
+
+        key = self.key_for(slack_event)
+        if key is None:
+            self.unkeyed += 1
+            return False
+
+        now = self._clock()
+        self._evict(now)
+
+        if key in self._seen:
+            self.hits += 1
+            logger.debug("dropping duplicate event with key %s", key)
+            return True
+
+        self.misses += 1
+        self._remember(key, now)
+        return False
+
+    def keys(self) -> typing.List[typing.Hashable]:
+        """Get the event keys currently remembered, oldest first.
+
+        :return: the remembered event keys
+        """
+
+        self._evict(self._clock())
+        return [key for _, key in self._ring]
+
+    def seed(self, keys: typing.Iterable[typing.Hashable]):
+        """Remember event keys seen elsewhere, such as by the process we are taking over from.
+
+        :param keys: the event keys to remember, as if they were seen now
+        """
+
+        now = self._clock()
+        for key in keys:
+            if key not in self._seen:
+                self._remember(key, now)
+
+    def forget(self, slack_events: typing.Iterable[typing.Mapping]):
+        """Forget Slack events that were seen but never handled, so a redelivery, or the next process, handles them.
+
+        :param slack_events: the raw SlackEvents to forget
+        """
+
+        keys = {self.key_for(slack_event) for slack_event in slack_events} - {None}
+        if not keys & self._seen:
+            return
+
+        self._seen -= keys
+        self._ring = collections.deque(entry for entry in self._ring if entry[1] not in keys)
+
+    def _remember(self, key: typing.Hashable, now: float):
+        """Remember a key, forgetting the oldest key if we are beyond capacity.
+
+        :param key: the event key to remember
+        :param now: the current time in seconds
+        """
+
+        self._seen.add(key)
+        self._ring.append((now, key))
+        if len(self._ring) > self.capacity:
+            _, oldest_key = self._ring.popleft()
+            self._seen.discard(oldest_key)
+
+    def _evict(self, now: float):
+        """Forget every key that has fallen out of the time window.
+
+        :param now: the current time in seconds
+        """
+
+        expires_before = now - self.window_seconds
+        while self._ring and self._ring[0][0] < expires_before:
+            _, key = self._ring.popleft()
+            self._seen.discard(key)
+
+    def __len__(self) -> int:
+        """Get the number of event keys currently remembered.
+
+        :return: the number of remembered event keys
+        """
+
+        return len(self._ring)
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Get the counters describing this EventDeduplicator.
+
+        :return: the hits, misses, unkeyed events and current size
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "unkeyed": self.unkeyed,
+            "size": len(self),
+        }
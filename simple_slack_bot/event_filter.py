@@ -0,0 +1,93 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import logging
+import typing
+
+logger = logging.getLogger(__name__)
+
+
+class EventFilter:
+    """Decide, from the raw SlackEvent alone, whether an event should be dropped before it is dispatched.
+
+    Our own messages, other bots' messages and messages from ignored users are dropped before a SlackRequest is
+    ever built for them, which avoids reply loops in channels shared with other bots.
+    """
+
+    IGNORED_SELF = "self"
+    IGNORED_BOT = "bot"
+    IGNORED_USER = "user"
+
+    def __init__(
+        self,
+        ignore_self: bool = True,
+        ignore_bots: bool = False,
+        ignored_user_ids: typing.Iterable[str] = (),
+    ):
+        """Initialize an EventFilter.
+
+        :param ignore_self: Whether to drop events caused by this bot
+        :param ignore_bots: Whether to drop events caused by any bot
+        :param ignored_user_ids: User ids whose events are always dropped
+        """
+        self.ignore_self = ignore_self
+        self.ignore_bots = ignore_bots
+        self.ignored_user_ids: typing.Set[str] = set(ignored_user_ids)
+        self.self_ids: typing.Set[str] = set()
+
+        self.filtered: typing.Dict[str, int] = {
+            self.IGNORED_SELF: 0,
+            self.IGNORED_BOT: 0,
+            self.IGNORED_USER: 0,
+        }
+
+    def set_self_ids(self, *self_ids: typing.Optional[str]):
+        """Set the bot and user ids this bot posts as, once they are known after connecting.
+
+        :param self_ids: the ids identifying this bot, None values are skipped
+        """
+
+        self.self_ids = {self_id for self_id in self_ids if self_id}
+
+    def reason_to_ignore(self, slack_event: typing.Mapping) -> typing.Union[str, None]:
+        """Get why this Slack event should be dropped, if it should be.
+
+        :param slack_event: the raw SlackEvent to inspect
+        :return: one of the IGNORED_ constants, or None if the event should be dispatched
+        """
+
+        user = slack_event.get("user")
+        if isinstance(user, dict):
+            # team_join and user_change carry the whole user rather than its id
+            user = user.get("id")
+        bot_id = slack_event.get("bot_id")
+
+        if self.ignore_self and (user in self.self_ids or bot_id in self.self_ids):
+            return self.IGNORED_SELF
+
+        if self.ignore_bots and (bot_id or slack_event.get("subtype") == "bot_message"):
+            return self.IGNORED_BOT
+
+        if user in self.ignored_user_ids:
+            return self.IGNORED_USER
+
+        return None
+
+    def should_ignore(self, slack_event: typing.Mapping) -> bool:
+        """Check whether this Slack event should be dropped, counting it if so.
+
+        :param slack_event: the raw SlackEvent to inspect
+        :return: True if the event should be dropped, False otherwise
+        """
+
+        reason = self.reason_to_ignore(slack_event)
+        if reason is None:
+            return False
+
+        self.filtered[reason] += 1
+        logger.debug("ignoring event from %s", reason)
+        return True
@@ -0,0 +1,146 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import collections
+import logging
+import typing
+
+logger = logging.getLogger(__name__)
+
+
+class EventScheduler:
+    """Queue Slack events by priority class so interactive events are never stuck behind bulk ones.
+
+    Every event type maps to a priority class, 0 being the most important. Each class has its own bounded queue and
+    events are always handed out from the most important non-empty class first, in arrival order within a class.
+
+    When a class' queue is full its oldest event is shed to make room. Once the total number of queued events
+    reaches the overload threshold, events of the sheddable classes are shed on arrival instead of being queued.
+    """
+
+    PRIORITY_INTERACTIVE = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_BULK = 2
+
+    DEFAULT_PRIORITIES: typing.Dict[str, int] = {
+        "message": PRIORITY_INTERACTIVE,
+        "reaction_added": PRIORITY_INTERACTIVE,
+        "reaction_removed": PRIORITY_INTERACTIVE,
+        "presence_change": PRIORITY_BULK,
+        "manual_presence_change": PRIORITY_BULK,
+        "user_typing": PRIORITY_BULK,
+        "user_change": PRIORITY_BULK,
+        "dnd_updated_user": PRIORITY_BULK,
+        "emoji_changed": PRIORITY_BULK,
+        "pong": PRIORITY_BULK,
+    }
+    DEFAULT_CAPACITIES: typing.Dict[int, int] = {
+        PRIORITY_INTERACTIVE: 1000,
+        PRIORITY_NORMAL: 1000,
+        PRIORITY_BULK: 200,
+    }
+    DEFAULT_OVERLOAD_THRESHOLD = 500
+
+    def __init__(
+        self,
+        priorities: typing.Dict[str, int] = None,
+        default_priority: int = PRIORITY_NORMAL,
+        capacities: typing.Dict[int, int] = None,
+        overload_threshold: int = DEFAULT_OVERLOAD_THRESHOLD,
+        sheddable_priorities: typing.Iterable[int] = (PRIORITY_BULK,),
+    ):
+        """Initialize an EventScheduler.
+
+        :param priorities: Overrides of the priority class for each event type, merged over DEFAULT_PRIORITIES
+        :param default_priority: The priority class of event types not found in priorities
+        :param capacities: Overrides of the queue capacity for each priority class, merged over DEFAULT_CAPACITIES
+        :param overload_threshold: The total number of queued events from which sheddable events are shed on arrival
+        :param sheddable_priorities: The priority classes shed on arrival while overloaded
+        """
+        self.priorities = dict(self.DEFAULT_PRIORITIES)
+        self.priorities.update(priorities or {})
+        self.default_priority = default_priority
+
+        self.capacities = dict(self.DEFAULT_CAPACITIES)
+        self.capacities.update(capacities or {})
+        self.overload_threshold = overload_threshold
+        self.sheddable_priorities = frozenset(sheddable_priorities)
+
+        classes = set(self.capacities) | set(self.priorities.values()) | {default_priority}
+        self._queues: typing.Dict[int, typing.Deque[typing.Mapping]] = {
+            priority: collections.deque() for priority in sorted(classes)
+        }
+        self._size = 0
+
+        self.shed: typing.Dict[int, int] = {priority: 0 for priority in self._queues}
+
+    def priority_of(self, slack_event: typing.Mapping) -> int:
+        """Get the priority class of a Slack event.
+
+        :param slack_event: the raw SlackEvent to classify
+        :return: the priority class, 0 being the most important
+        """
+
+        return self.priorities.get(slack_event.get("type"), self.default_priority)
+
+    def put(self, slack_event: typing.Mapping) -> bool:
+        """Queue a Slack event, shedding events if its priority class is full or we are overloaded.
+
+        :param slack_event: the raw SlackEvent to queue
+        :return: True if the event was queued, False if it was shed
+        """
+
+        priority = self.priority_of(slack_event)
+
+        if self._size >= self.overload_threshold and priority in self.sheddable_priorities:
+            self.shed[priority] += 1
+            logger.debug("overloaded, shedding event of type %s", slack_event.get("type"))
+            return False
+
+        queue = self._queues[priority]
+        capacity = self.capacities.get(priority)
+        if capacity is not None and len(queue) >= capacity:
+            queue.popleft()
+            self._size -= 1
+            self.shed[priority] += 1
+            logger.warning("priority class %s is full, shedding its oldest event", priority)
+
+        queue.append(slack_event)
+        self._size += 1
+        return True
+
+    def get(self) -> typing.Union[typing.Mapping, None]:
+        """Take the next Slack event to dispatch.
+
+        :return: the oldest event of the most important non-empty priority class, or None if nothing is queued
+        """
+
+        for queue in self._queues.values():
+            if queue:
+                self._size -= 1
+                return queue.popleft()
+
+        return None
+
+    def __len__(self) -> int:
+        """Get the number of queued Slack events.
+
+        :return: the number of queued events across all priority classes
+        """
+
+        return self._size
+
+    def stats(self) -> typing.Dict[str, typing.Dict[int, int]]:
+        """Get the counters describing this EventScheduler.
+
+        :return: the number of queued and shed events for each priority class
+        """
+
+        return {
+            "queued": {priority: len(queue) for priority, queue in self._queues.items()},
+            "shed": dict(self.shed),
+        }
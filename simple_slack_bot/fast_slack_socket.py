@@ -0,0 +1,187 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import functools
+import logging
+import threading
+import typing
+
+import slacksocket.client  # type: ignore
+import slacksocket.config  # type: ignore
+import slacksocket.webclient  # type: ignore
+from slacksocket import SlackSocket  # type: ignore
+from slacksocket.models import SlackEvent, mentions_re  # type: ignore
+
+from .json_backend import JsonBackend, load_backend
+
+logger = logging.getLogger(__name__)
+
+# held while a FastSlackSocket with its own API URL is created, see FastSlackSocket.__init__
+_web_client_lock = threading.Lock()
+
+
+class RoutedWebClient(slacksocket.webclient.WebClient):
+    """The WebClient of a SlackSocket, calling the Web API at a URL of its own rather than at slack.com."""
+
+    def __init__(self, token: str, timeout: int, api_url: str):
+        """Initialize a RoutedWebClient.
+
+        :param token: the token to authenticate with Slack
+        :param timeout: the longest, in seconds, to keep retrying a call, forever if 0
+        :param api_url: the URL the Web API methods are found under, ending with a slash
+        """
+        self.api_url = api_url
+        super().__init__(token, timeout)
+
+    def _do_once(self, method: str, url: str, **params: typing.Any) -> typing.Any:
+        """Make a call once, at our API URL, overriding WebClient's.
+
+        :param method: the HTTP method
+        :param url: the URL of the Web API method, under slack.com
+        :param params: the arguments of the call
+        :return: the decoded response
+        """
+
+        if url.startswith(slacksocket.config.slack):
+            url = self.api_url + url[len(slacksocket.config.slack) :]
+        return super()._do_once(method, url, **params)
+
+
+class LazySlackEvent(SlackEvent):
+    """A SlackEvent that keeps the text it was decoded from and looks up its user and channel only when read.
+
+    SlackSocket resolves the user, channel and mentions of every event against its directory as soon as the event
+    arrives, refreshing the whole directory from the Web API whenever an id is missing from it. Most events are
+    never asked for those objects, so here each is looked up the first time it is read. The raw text is also kept,
+    so serializing the event again, as SlackRequest.__str__ does, costs nothing.
+    """
+
+    # pylint: disable=super-init-not-called,attribute-defined-outside-init
+
+    def __init__(self, data: typing.Dict[str, typing.Any], raw: str, slack_socket: typing.Any = None):
+        """Initialize a LazySlackEvent.
+
+        :param data: the decoded event
+        :param raw: the text the event was decoded from
+        :param slack_socket: looks up users and channels when they are read, none are looked up if not given
+        """
+        dict.__init__(self, data)
+        self.raw = raw
+        self._slack_socket = slack_socket
+        self._resolved: typing.Dict[str, typing.Any] = {}
+
+        self.type = self.get("type")
+        self.ts = self.get("ts")
+
+    def _lookup(self, name: str, lookup: typing.Callable[[str], typing.Any]) -> typing.Any:
+        """Look up the user or channel of this event once, remembering the result.
+
+        :param name: user or channel
+        :param lookup: looks the id up, returning the directory item
+        :return: the directory item, or None if there is no id or no SlackSocket to look it up with
+        """
+
+        if name not in self._resolved:
+            match = self.get(name)
+            self._resolved[name] = lookup(match) if match and self._slack_socket is not None else None
+        return self._resolved[name]
+
+    @property
+    def user(self) -> typing.Any:
+        """Get the User who sent this event, looked up on first read."""
+        return self._lookup("user", lambda match: self._slack_socket.lookup_user(match))
+
+    @user.setter
+    def user(self, value: typing.Any):
+        self._resolved["user"] = value
+
+    @property
+    def channel(self) -> typing.Any:
+        """Get the Channel this event was sent in, looked up on first read."""
+        return self._lookup("channel", lambda match: self._slack_socket.lookup_channel(match))
+
+    @channel.setter
+    def channel(self, value: typing.Any):
+        self._resolved["channel"] = value
+
+    @property
+    def mentions(self) -> typing.List[typing.Any]:
+        """Get the Users mentioned in the text of this event, looked up on first read."""
+        if "mentions" not in self._resolved:
+            user_ids = mentions_re.findall(self.get("text", ""))
+            if self._slack_socket is not None:
+                self._resolved["mentions"] = [self._slack_socket.lookup_user(user_id) for user_id in user_ids]
+            else:
+                self._resolved["mentions"] = user_ids
+        return self._resolved["mentions"]
+
+    @mentions.setter
+    def mentions(self, value: typing.List[typing.Any]):
+        self._resolved["mentions"] = value
+
+    @property
+    def mentions_me(self) -> bool:
+        """Check whether the text of this event mentions us."""
+        if "mentions_me" not in self._resolved:
+            me = getattr(self._slack_socket, "user", None)
+            self._resolved["mentions_me"] = me is not None and me.id in mentions_re.findall(self.get("text", ""))
+        return self._resolved["mentions_me"]
+
+    @mentions_me.setter
+    def mentions_me(self, value: bool):
+        self._resolved["mentions_me"] = value
+
+    @property
+    def json(self) -> str:
+        """Get the JSON text of this event, as received."""
+        return self.raw
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        """Pickle as the decoded event and its text, without the SlackSocket.
+
+        :return: how to rebuild this event
+        """
+
+        return (self.__class__, (dict(self), self.raw))
+
+
+class FastSlackSocket(SlackSocket):
+    """A SlackSocket decoding events with a faster JSON backend into LazySlackEvents."""
+
+    def __init__(
+        self, slacktoken: str, connect_timeout: int = 0, json_backend: JsonBackend = None, api_url: str = None
+    ):
+        """Initialize a FastSlackSocket.
+
+        :param slacktoken: the token to authenticate with Slack
+        :param connect_timeout: the longest, in seconds, to wait for the connection to succeed, forever if 0
+        :param json_backend: decodes events, defaults to the fastest backend installed
+        :param api_url: Optionally the URL the Web API methods are found under, ending with a slash, for this
+            FastSlackSocket only
+        """
+        self.json_backend = json_backend if json_backend is not None else load_backend()
+        if api_url is None:
+            super().__init__(slacktoken, connect_timeout)
+            return
+
+        # SlackSocket creates its WebClient, and logs in with it, as it is initialized, so it is handed a
+        # RoutedWebClient for the time being. Its URLs stay its own from then on, leaving every other SlackSocket be.
+        with _web_client_lock:
+            web_client_class = slacksocket.client.WebClient
+            slacksocket.client.WebClient = functools.partial(RoutedWebClient, api_url=api_url)
+            try:
+                super().__init__(slacktoken, connect_timeout)
+            finally:
+                slacksocket.client.WebClient = web_client_class
+
+    def _event_handler(self, event_json: str):
+        """Decode an event received on the websocket and queue it, overriding SlackSocket's.
+
+        :param event_json: the text of the event
+        """
+
+        self._eventq.put(LazySlackEvent(self.json_backend.loads(event_json), event_json, self))
@@ -0,0 +1,278 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import concurrent.futures
+import contextlib
+import http.client
+import io
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+import typing
+import urllib.parse
+
+from slack import WebClient
+from slack.errors import SlackApiError
+
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# a path, bytes, a binary file object or an iterable of bytes, such as a generator
+Source = typing.Union[str, os.PathLike, bytes, bytearray, typing.BinaryIO, typing.Iterable[bytes]]
+
+
+class UploadError(Exception):
+    """Raised when Slack refuses an upload, or its content can't be sent."""
+
+
+class FileUploader:
+    """Upload files to Slack through the external upload flow, streaming them in chunks.
+
+    Each upload asks files.getUploadURLExternal for a URL, sends the content to it chunk_size bytes at a time, then
+    shares the file with files.completeUploadExternal. As Slack needs the length first, content whose length can't
+    be told up front, such as a generator, is spooled to a temporary file first, in memory up to spool_size bytes.
+    Whatever the size of the file, no more than chunk_size bytes of it, or spool_size while spooling, are held in
+    memory at once.
+
+    Web API calls take a token from a single RateLimiter shared by every upload, however many run at once, and
+    calls answered with a 429 are retried after the Retry-After Slack asks for.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1 << 20,
+        spool_size: int = 8 << 20,
+        max_workers: int = 4,
+        rate: float = 1.0,
+        burst: int = 4,
+        max_retries: int = 3,
+        timeout: float = 60.0,
+    ):
+        """Initialize a FileUploader.
+
+        :param chunk_size: How many bytes to read and send at a time
+        :param spool_size: How many bytes of content of unknown length to hold in memory before spooling to disk
+        :param max_workers: How many uploads upload_many runs at once
+        :param rate: How many Web API calls per second to make at most, across all uploads
+        :param burst: How many Web API calls may be made at once before rate applies
+        :param max_retries: How many times a Web API call answered with a 429 is retried
+        :param timeout: The longest, in seconds, to wait on the upload URL between two chunks
+        :raises ValueError: If any of the settings are out of range
+        """
+        if chunk_size < 1 or max_workers < 1 or max_retries < 0:
+            raise ValueError("chunk_size and max_workers must be at least 1 and max_retries can't be negative")
+
+        self.chunk_size = chunk_size
+        self.spool_size = spool_size
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(
+            rate, burst, key=lambda _: "upload", policy=RateLimiter.POLICY_DEFER, max_delay=math.inf
+        )
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+
+        self.uploaded = 0
+        self.bytes_sent = 0
+
+    def upload(
+        self,
+        python_slackclient: WebClient,
+        source: Source,
+        filename: str = None,
+        channel: str = None,
+        thread_ts: str = None,
+        title: str = None,
+        initial_comment: str = None,
+    ) -> typing.Dict[str, typing.Any]:
+        """Upload a file and share it, blocking until done.
+
+        :param python_slackclient: the WebClient making the Web API calls
+        :param source: the content, a path, bytes, a binary file object or an iterable of bytes
+        :param filename: the name of the file, defaults to the name of the path or file object
+        :param channel: Optionally the channel to share the file in, otherwise it is uploaded privately
+        :param thread_ts: Optionally the thread to share the file in
+        :param title: the title of the file, defaults to its name
+        :param initial_comment: Optionally a message shared along with the file
+        :return: the file, as returned by files.completeUploadExternal
+        :raises ValueError: If there is no filename and none can be told from the source
+        :raises UploadError: If Slack refused the upload
+        """
+
+        filename = filename or self._name_of(source)
+        if not filename:
+            raise ValueError("filename is needed when uploading bytes or an iterable")
+
+        with self._opened(source) as (content, length):
+            upload = self._call(python_slackclient, "files.getUploadURLExternal", filename=filename, length=length)
+            self._send(upload["upload_url"], content, length)
+
+        shared = {"files": json.dumps([{"id": upload["file_id"], "title": title or filename}])}
+        if channel is not None:
+            shared["channel_id"] = channel
+        if thread_ts:
+            shared["thread_ts"] = thread_ts
+        if initial_comment is not None:
+            shared["initial_comment"] = initial_comment
+        completed = self._call(python_slackclient, "files.completeUploadExternal", **shared)
+
+        self.uploaded += 1
+        logger.info("uploaded %s, %s bytes, as %s", filename, length, upload["file_id"])
+        return completed["files"][0]
+
+    def upload_many(
+        self, python_slackclient: WebClient, uploads: typing.Iterable[typing.Dict[str, typing.Any]]
+    ) -> typing.List[typing.Union[typing.Dict[str, typing.Any], Exception]]:
+        """Upload several files at once, blocking until all are done.
+
+        :param python_slackclient: the WebClient making the Web API calls
+        :param uploads: the arguments of upload for each file, such as {"source": "report.csv", "channel": "C1"}
+        :return: for each upload, in order, the file or the Exception that failed it
+        """
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="simple-slack-bot-upload"
+        ) as executor:
+            futures = [executor.submit(self.upload, python_slackclient, **upload) for upload in uploads]
+            return [future.exception() or future.result() for future in futures]
+
+    @staticmethod
+    def _name_of(source: Source) -> typing.Union[str, None]:
+        """Tell the name of a file from its source.
+
+        :param source: the content
+        :return: the base name of the path or file object, or None
+        """
+
+        if isinstance(source, (str, os.PathLike)):
+            return os.path.basename(os.fspath(source))
+        name = getattr(source, "name", None)
+        return os.path.basename(name) if isinstance(name, str) else None
+
+    @contextlib.contextmanager
+    def _opened(self, source: Source) -> typing.Iterator[typing.Tuple[typing.BinaryIO, int]]:
+        """Open the content of a source as a binary file object positioned at its start, along with its length.
+
+        File objects passed in are left open.
+
+        :param source: the content
+        :return: a context manager giving the file object and its length in bytes
+        """
+
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as file_object:
+                yield file_object, os.fstat(file_object.fileno()).st_size
+            return
+
+        if isinstance(source, (bytes, bytearray)):
+            yield io.BytesIO(source), len(source)
+            return
+
+        if hasattr(source, "read") and getattr(source, "seekable", lambda: False)():
+            file_object = typing.cast(typing.BinaryIO, source)
+            start = file_object.tell()
+            length = file_object.seek(0, os.SEEK_END) - start
+            file_object.seek(start)
+            yield file_object, length
+            return
+
+        with self._spool(source) as spooled:
+            length = spooled.tell()
+            spooled.seek(0)
+            yield typing.cast(typing.BinaryIO, spooled), length
+
+    def _spool(self, source: Source) -> typing.IO:
+        """Copy content of unknown length to a temporary file, in memory while it is small.
+
+        :param source: a file object that can't seek, or an iterable of bytes
+        :return: the temporary file, positioned at its end
+        """
+
+        spooled = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        if hasattr(source, "read"):
+            reader = typing.cast(typing.BinaryIO, source)
+            chunks: typing.Iterable[bytes] = iter(lambda: reader.read(self.chunk_size), b"")
+        else:
+            chunks = typing.cast(typing.Iterable[bytes], source)
+        for chunk in chunks:
+            spooled.write(chunk)
+        return spooled
+
+    def _send(self, upload_url: str, content: typing.BinaryIO, length: int):
+        """Stream the content to the upload URL, a chunk at a time.
+
+        :param upload_url: the URL given by files.getUploadURLExternal
+        :param content: the content, positioned at its start
+        :param length: the length of the content in bytes
+        :raises UploadError: If the upload URL refused the content, or fewer than length bytes could be read
+        """
+
+        parts = urllib.parse.urlsplit(upload_url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(parts.netloc, timeout=self.timeout)
+        try:
+            connection.putrequest("POST", parts.path + (f"?{parts.query}" if parts.query else ""))
+            connection.putheader("Content-Type", "application/octet-stream")
+            connection.putheader("Content-Length", str(length))
+            connection.endheaders()
+
+            remaining = length
+            while remaining > 0:
+                chunk = content.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    raise UploadError(f"content ended {remaining} bytes short of its length")
+                connection.send(chunk)
+                remaining -= len(chunk)
+                with self._lock:
+                    self.bytes_sent += len(chunk)
+
+            response = connection.getresponse()
+            body = response.read()
+            if response.status != 200:
+                raise UploadError(f"upload URL answered {response.status}: {body[:200]!r}")
+        finally:
+            connection.close()
+
+    def _call(self, python_slackclient: WebClient, method: str, **arguments: typing.Any) -> typing.Any:
+        """Make a Web API call, within the rate limit, retrying it when rate limited.
+
+        :param python_slackclient: the WebClient making the call
+        :param method: the Web API method, such as files.completeUploadExternal
+        :param arguments: its arguments
+        :return: the response
+        :raises UploadError: If Slack answered with an error, or still rate limited us after max_retries
+        """
+
+        attempts = 0
+        while True:
+            self._wait_for_turn()
+            attempts += 1
+            try:
+                return python_slackclient.api_call(method, params=arguments)
+            except SlackApiError as slack_api_error:
+                if getattr(slack_api_error.response, "status_code", None) != 429 or attempts > self.max_retries:
+                    error = slack_api_error.response.get("error")
+                    raise UploadError(f"{method} failed: {error}") from slack_api_error
+                retry_after = float(slack_api_error.response.headers.get("Retry-After", 1))
+                with self._lock:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                logger.warning("rate limited calling %s, holding off for %s seconds", method, retry_after)
+
+    def _wait_for_turn(self):
+        """Block until Slack's Retry-After has passed and the RateLimiter allows another Web API call."""
+
+        with self._lock:
+            delay = max(self._paused_until - time.monotonic(), 0.0) + self.rate_limiter.acquire("upload")
+        if delay > 0:
+            time.sleep(delay)
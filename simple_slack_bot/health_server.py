@@ -0,0 +1,161 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import json
+import logging
+import threading
+import time
+import typing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+Health = typing.Dict[str, typing.Any]
+
+
+class HealthServer:
+    """Serve the health of a SimpleSlackBot over HTTP, for orchestrators to probe.
+
+    Runs on a thread of its own, answering from counters the bot keeps as it goes, so a probe never waits on the
+    listen loop and never slows it down. It answers GET requests to:
+
+    * /health, always 200, with everything as JSON
+    * /ready, 200 if the socket is connected and dispatch is keeping up, 503 otherwise
+    * /live, 200 unless dispatch has been stuck or the socket disconnected for too long, 503 otherwise
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_dispatch_lag: float = 30.0,
+        max_queue_depth: int = 500,
+        max_stall: float = 120.0,
+        max_disconnected: float = 120.0,
+        clock: typing.Callable[[], float] = time.time,
+    ):
+        """Initialize a HealthServer.
+
+        :param host: the address to listen on, 0.0.0.0 to be reachable from other hosts
+        :param port: the port to listen on, 0 for any free port
+        :param max_dispatch_lag: Not ready beyond this many seconds between an event being posted and dispatched
+        :param max_queue_depth: Not ready beyond this many events waiting for dispatch
+        :param max_stall: Not live once events have waited this many seconds without any being dispatched
+        :param max_disconnected: Not live once the socket has been disconnected for this many seconds
+        :param clock: Function returning the current time in seconds since the epoch, injectable for testing
+        """
+        self.host = host
+        self.port = port
+        self.max_dispatch_lag = max_dispatch_lag
+        self.max_queue_depth = max_queue_depth
+        self.max_stall = max_stall
+        self.max_disconnected = max_disconnected
+        self.clock = clock
+
+        self._health: typing.Callable[[], Health] = dict
+        self._server: typing.Union[ThreadingHTTPServer, None] = None
+        self._disconnected_since: typing.Union[float, None] = None
+
+    def start(self, health: typing.Callable[[], Health]):
+        """Start serving on a thread of its own.
+
+        :param health: returns the current health, typically SimpleSlackBot.health
+        """
+
+        self._health = health
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        # when asked for any free port, report the one we got
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="simple-slack-bot-health", daemon=True).start()
+        logger.info("serving health on http://%s:%s/health", self.host, self.port)
+
+    def stop(self):
+        """Stop serving."""
+
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    def check(self) -> Health:
+        """Get the current health along with the readiness and liveness verdicts.
+
+        :return: the health, with ready and live added, and the reasons when either is False
+        """
+
+        health = dict(self._health())
+        now = self.clock()
+
+        if health.get("connection") == "connected":
+            self._disconnected_since = None
+        elif self._disconnected_since is None:
+            self._disconnected_since = now
+        disconnected_for = now - self._disconnected_since if self._disconnected_since is not None else 0.0
+        health["disconnected_for"] = disconnected_for
+
+        not_ready = []
+        if health.get("connection") != "connected":
+            not_ready.append("not connected")
+        if health.get("queue_depth", 0) > self.max_queue_depth:
+            not_ready.append(f"queue depth above {self.max_queue_depth}")
+        if health.get("dispatch_lag", 0.0) > self.max_dispatch_lag:
+            not_ready.append(f"dispatch lag above {self.max_dispatch_lag}s")
+
+        not_live = []
+        if not health.get("listening"):
+            not_live.append("not listening")
+        if health.get("stalled_for", 0.0) > self.max_stall:
+            not_live.append(f"dispatch stalled for over {self.max_stall}s")
+        if disconnected_for > self.max_disconnected:
+            not_live.append(f"disconnected for over {self.max_disconnected}s")
+
+        health["ready"] = not not_ready
+        health["live"] = not not_live
+        health["reasons"] = not_ready + not_live
+        return health
+
+    def _handler(self) -> typing.Type[BaseHTTPRequestHandler]:
+        """Build the request handler class, bound to this HealthServer.
+
+        :return: the request handler class
+        """
+
+        health_server = self
+
+        class HealthRequestHandler(BaseHTTPRequestHandler):
+            """Answer health probes."""
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Answer a probe."""
+
+                path = self.path.split("?", 1)[0].rstrip("/")
+                if path not in ("/health", "/ready", "/live"):
+                    self.send_error(404)
+                    return
+
+                try:
+                    health = health_server.check()
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("could not check health")
+                    self.send_error(500)
+                    return
+
+                healthy = path == "/health" or health[path[1:]]
+                body = json.dumps(health).encode("utf-8")
+                self.send_response(200 if healthy else 503)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: typing.Any):  # pylint: disable=redefined-builtin
+                """Log probes at debug level rather than to stderr."""
+
+                logger.debug("health probe: " + format, *args)
+
+        return HealthRequestHandler
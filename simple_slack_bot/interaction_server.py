@@ -0,0 +1,392 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+import typing
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .response_client import ResponseClient
+
+logger = logging.getLogger(__name__)
+
+KIND_SLASH_COMMAND = "slash_command"
+KIND_BLOCK_ACTION = "block_action"
+
+
+class Interaction:
+    """A slash command or a click on an interactive element, such as a button, as handed to its callback.
+
+    Slash commands carry command and text, block actions carry action_id and value. Both can be answered through
+    respond, which posts to their response_url, or write, which posts to a channel as the bot.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        payload: typing.Dict[str, typing.Any],
+        response_client: ResponseClient,
+        python_slackclient: typing.Any = None,
+        action: typing.Dict[str, typing.Any] = None,
+    ):
+        """Initialize an Interaction.
+
+        :param kind: one of slash_command or block_action
+        :param payload: the form fields of a slash command, or the payload of a block action
+        :param response_client: posts to the response_url
+        :param python_slackclient: the WebClient write posts through
+        :param action: for block actions, the action taken, one of payload["actions"]
+        """
+        self.kind = kind
+        self.payload = payload
+        self.action = action or {}
+        self._response_client = response_client
+        self._python_slackclient = python_slackclient
+
+    @property
+    def command(self) -> typing.Union[str, None]:
+        """Get the slash command, such as /roll."""
+        return self.payload.get("command")
+
+    @property
+    def text(self) -> typing.Union[str, None]:
+        """Get the text typed after the slash command."""
+        return self.payload.get("text")
+
+    @property
+    def action_id(self) -> typing.Union[str, None]:
+        """Get the action_id of the element clicked."""
+        return self.action.get("action_id")
+
+    @property
+    def value(self) -> typing.Union[str, None]:
+        """Get the value of the element clicked, or of the option selected."""
+        return self.action.get("value") or self.action.get("selected_option", {}).get("value")
+
+    @property
+    def user_id(self) -> typing.Union[str, None]:
+        """Get the id of the user who typed the command or clicked."""
+        return self.payload.get("user_id") or self.payload.get("user", {}).get("id")
+
+    @property
+    def channel_id(self) -> typing.Union[str, None]:
+        """Get the id of the channel the command was typed or the element clicked in."""
+        return self.payload.get("channel_id") or (self.payload.get("channel") or {}).get("id")
+
+    @property
+    def response_url(self) -> typing.Union[str, None]:
+        """Get the URL responses are posted to."""
+        return self.payload.get("response_url")
+
+    @property
+    def trigger_id(self) -> typing.Union[str, None]:
+        """Get the trigger_id, needed to open a modal."""
+        return self.payload.get("trigger_id")
+
+    def respond(
+        self,
+        text: str,
+        in_channel: bool = False,
+        replace_original: bool = False,
+        blocks: typing.List[typing.Dict[str, typing.Any]] = None,
+    ) -> int:
+        """Answer through the response_url.
+
+        :param text: The text you wish to send
+        :param in_channel: Whether everyone in the channel sees it, rather than only the user
+        :param replace_original: For block actions, whether it replaces the message holding the element clicked
+        :param blocks: Optionally the blocks of the message, with text as its fallback
+        :return: the HTTP status of the response
+        :raises ValueError: If there is no response_url
+        """
+
+        if self.response_url is None:
+            raise ValueError("this interaction has no response_url")
+
+        message: typing.Dict[str, typing.Any] = {
+            "text": text,
+            "response_type": "in_channel" if in_channel else "ephemeral",
+        }
+        if replace_original:
+            message["replace_original"] = True
+        if blocks is not None:
+            message["blocks"] = blocks
+
+        status, _ = self._response_client.post(self.response_url, message)
+        return status
+
+    def write(self, content: str, channel: str = None):
+        """Write a message as the bot, like SlackRequest.write.
+
+        :param content: The text you wish to send
+        :param channel: By default send to the channel of the interaction
+        """
+
+        self._python_slackclient.chat_postMessage(channel=channel or self.channel_id, text=content)
+
+    def __repr__(self) -> str:
+        """Get a representation of this Interaction, for logging."""
+        return f"Interaction({self.kind}, {self.command or self.action_id}, user={self.user_id})"
+
+
+class InteractionServer:
+    """Receive slash commands and interactions from Slack over HTTP, acknowledging them at once.
+
+    Slack expects an answer within 3 seconds, so every request is checked against the signing secret, answered
+    with an empty 200, and only then handed to its callback. Point both the Request URL of your slash commands and
+    the Interactivity Request URL of your app at path, which must be reachable from Slack, for example through a
+    reverse proxy.
+    """
+
+    def __init__(
+        self,
+        signing_secret: str = None,
+        host: str = "127.0.0.1",
+        port: int = 3000,
+        path: str = "/slack",
+        max_age: float = 300.0,
+        max_body: int = 1 << 20,
+        response_client: ResponseClient = None,
+        clock: typing.Callable[[], float] = time.time,
+    ):
+        """Initialize an InteractionServer.
+
+        :param signing_secret: The Signing Secret of your Slack app, falls back to the SLACK_SIGNING_SECRET
+            environment variable
+        :param host: the address to listen on, 0.0.0.0 to be reachable from other hosts
+        :param port: the port to listen on, 0 for any free port
+        :param path: the path Slack posts to
+        :param max_age: How old, in seconds, a request may be before it is refused as a possible replay
+        :param max_body: The largest request, in bytes, accepted
+        :param response_client: posts to response URLs, defaults to a ResponseClient with default settings
+        :param clock: Function returning the current time in seconds since the epoch, injectable for testing
+        :raises ValueError: If there is no signing secret
+        """
+        if signing_secret is None:
+            signing_secret = os.environ.get("SLACK_SIGNING_SECRET")
+        if not signing_secret:
+            raise ValueError("SLACK_SIGNING_SECRET not passed to InteractionServer or set as environment variable")
+
+        self._signing_secret = signing_secret.encode("utf-8")
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_age = max_age
+        self.max_body = max_body
+        if response_client is None:
+            response_client = ResponseClient()
+        self.response_client = response_client
+        self.clock = clock
+
+        self._callbacks: typing.Dict[typing.Tuple[str, str], typing.Callable[[Interaction], typing.Any]] = {}
+        self._python_slackclient: typing.Any = None
+        self._server: typing.Union[ThreadingHTTPServer, None] = None
+
+        self.received = 0
+        self.refused = 0
+        self.unhandled = 0
+
+    def add(self, kind: str, name: str, callback: typing.Callable[[Interaction], typing.Any]):
+        """Register a callback to a slash command or an action_id.
+
+        :param kind: one of slash_command or block_action
+        :param name: the slash command, such as /roll, or the action_id
+        :param callback: the function called as callback(interaction)
+        :raises ValueError: If something is already registered to it
+        """
+
+        if (kind, name) in self._callbacks:
+            raise ValueError(f"{kind} {name} is already registered")
+        self._callbacks[(kind, name)] = callback
+
+    def callbacks(self) -> typing.Dict[typing.Tuple[str, str], typing.Callable[[Interaction], typing.Any]]:
+        """Get a copy of the registered callbacks.
+
+        :return: the callbacks, by kind and name
+        """
+
+        return dict(self._callbacks)
+
+    def replace(self, callbacks: typing.Dict[typing.Tuple[str, str], typing.Callable[[Interaction], typing.Any]]):
+        """Replace every registered callback at once, such as with the copy callbacks returned.
+
+        :param callbacks: the callbacks, by kind and name
+        """
+
+        self._callbacks = dict(callbacks)
+
+    def start(self, python_slackclient: typing.Any = None):
+        """Start serving on a thread of its own.
+
+        :param python_slackclient: the WebClient Interaction.write posts through
+        """
+
+        self._python_slackclient = python_slackclient
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        # when asked for any free port, report the one we got
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="simple-slack-bot-interactions", daemon=True).start()
+        logger.info("receiving interactions on http://%s:%s%s", self.host, self.port, self.path)
+
+    def stop(self):
+        """Stop serving, and close the connections kept for responses."""
+
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        self.response_client.close()
+
+    def verify(self, body: bytes, timestamp: typing.Union[str, None], signature: typing.Union[str, None]) -> bool:
+        """Check a request was signed by Slack with our signing secret, recently.
+
+        :param body: the raw body of the request
+        :param timestamp: its X-Slack-Request-Timestamp header
+        :param signature: its X-Slack-Signature header
+        :return: True if it was, False otherwise
+        """
+
+        if not timestamp or not signature:
+            return False
+        try:
+            if abs(self.clock() - int(timestamp)) > self.max_age:
+                return False
+        except ValueError:
+            return False
+
+        base = b"v0:" + timestamp.encode("utf-8") + b":" + body
+        expected = "v0=" + hmac.new(self._signing_secret, base, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+    def parse(self, body: bytes) -> typing.List[typing.Tuple[typing.Tuple[str, str], Interaction]]:
+        """Turn a request into the interactions it holds, each with the key of the callback it goes to.
+
+        :param body: the raw, form encoded body of the request
+        :return: the interactions, one for a slash command and one for each action of a block action
+        :raises ValueError: If the body isn't a slash command or a JSON payload of the shape Slack sends
+        """
+
+        fields = dict(urllib.parse.parse_qsl(body.decode("utf-8")))
+
+        if "command" in fields:
+            interaction = Interaction(KIND_SLASH_COMMAND, fields, self.response_client, self._python_slackclient)
+            return [((KIND_SLASH_COMMAND, fields["command"]), interaction)]
+
+        payload = json.loads(fields.get("payload") or "{}")
+        if not isinstance(payload, dict):
+            raise ValueError("the payload isn't a JSON object")
+        if payload.get("type") != "block_actions":
+            logger.debug("ignoring interaction of type %s", payload.get("type"))
+            return []
+
+        actions = payload.get("actions", [])
+        if not isinstance(actions, list) or not all(isinstance(action, dict) for action in actions):
+            raise ValueError("the actions of the payload aren't a list of JSON objects")
+
+        return [
+            (
+                (KIND_BLOCK_ACTION, action.get("action_id")),
+                Interaction(KIND_BLOCK_ACTION, payload, self.response_client, self._python_slackclient, action),
+            )
+            for action in actions
+        ]
+
+    def dispatch(self, interactions: typing.List[typing.Tuple[typing.Tuple[str, str], Interaction]]):
+        """Call the callback of each interaction, catching and logging what they raise.
+
+        :param interactions: the interactions, as returned by parse
+        """
+
+        for key, interaction in interactions:
+            callback = self._callbacks.get(key)
+            if callback is None:
+                self.unhandled += 1
+                logger.warning("nothing registered to %s %s", *key)
+                continue
+            try:
+                callback(interaction)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("exception processing %s", interaction)
+
+    def _handler(self) -> typing.Type[BaseHTTPRequestHandler]:
+        """Build the request handler class, bound to this InteractionServer.
+
+        :return: the request handler class
+        """
+
+        interaction_server = self
+
+        class InteractionRequestHandler(BaseHTTPRequestHandler):
+            """Acknowledge interactions, then dispatch them."""
+
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                """Answer a request from Slack."""
+
+                if self.path.split("?", 1)[0].rstrip("/") != interaction_server.path.rstrip("/"):
+                    self._answer(404)
+                    return
+
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # the body can't be told apart from the next request
+                    self.close_connection = True
+                    self._answer(400)
+                    return
+                if length > interaction_server.max_body:
+                    self.close_connection = True
+                    self._answer(413)
+                    return
+
+                body = self.rfile.read(length)
+                if not interaction_server.verify(
+                    body, self.headers.get("X-Slack-Request-Timestamp"), self.headers.get("X-Slack-Signature")
+                ):
+                    interaction_server.refused += 1
+                    logger.warning("refused a request with a bad or stale signature")
+                    self._answer(401)
+                    return
+
+                try:
+                    interactions = interaction_server.parse(body)
+                except ValueError:
+                    self._answer(400)
+                    return
+
+                interaction_server.received += 1
+                # acknowledge before the callbacks run, however long they take
+                self._answer(200)
+                self.wfile.flush()
+                interaction_server.dispatch(interactions)
+
+            def _answer(self, status: int):
+                """Send an empty response.
+
+                :param status: the HTTP status
+                """
+
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args: typing.Any):  # pylint: disable=redefined-builtin
+                """Log requests at debug level rather than to stderr."""
+
+                logger.debug("interaction request: " + format, *args)
+
+        return InteractionRequestHandler
@@ -0,0 +1,326 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import datetime
+import heapq
+import itertools
+import logging
+import time
+import traceback
+import typing
+
+logger = logging.getLogger(__name__)
+
+# the name, lowest and highest value of each field of a cron expression
+CRON_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+
+class CronSchedule:
+    """When a cron expression, such as "0 9 * * 1-5" for 9am on weekdays, is due.
+
+    Supports the five standard fields, minute hour day month weekday, each either *, a number, a range, a list of
+    those, or any of them with a /step. Weekdays run from 0, Sunday, to 6, with 7 also meaning Sunday. As with
+    cron, when both day and weekday are restricted a time matches if either does.
+    """
+
+    def __init__(self, expression: str):
+        """Parse a cron expression.
+
+        :param expression: the five fields, separated by whitespace
+        :raises ValueError: If the expression can't be parsed
+        """
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"cron expressions have {len(CRON_FIELDS)} fields, got {expression!r}")
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse_field(field, name, lowest, highest)
+            for field, (name, lowest, highest) in zip(fields, CRON_FIELDS)
+        )
+        self.weekdays = frozenset(weekday % 7 for weekday in weekdays)
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse_field(field: str, name: str, lowest: int, highest: int) -> typing.FrozenSet[int]:
+        """Parse one field of a cron expression.
+
+        :param field: the field, such as 1-5 or */15
+        :param name: the name of the field, for error messages
+        :param lowest: the lowest value allowed
+        :param highest: the highest value allowed
+        :return: every value the field matches
+        :raises ValueError: If the field can't be parsed or is out of range
+        """
+
+        values: typing.Set[int] = set()
+        for part in field.split(","):
+            span, _, step = part.partition("/")
+            try:
+                if span == "*":
+                    start, end = lowest, highest
+                elif "-" in span:
+                    start, end = (int(value) for value in span.split("-", 1))
+                else:
+                    start = end = int(span)
+                    if step:
+                        end = highest
+                increment = int(step) if step else 1
+            except ValueError:
+                raise ValueError(f"could not parse the {name} field {field!r}") from None
+
+            if not lowest <= start <= end <= highest or increment < 1:
+                raise ValueError(f"the {name} field {field!r} is out of range {lowest}-{highest}")
+            values.update(range(start, end + 1, increment))
+
+        return frozenset(values)
+
+    def _day_matches(self, moment: datetime.datetime) -> bool:
+        """Check whether a date matches the day, weekday and month fields.
+
+        :param moment: the date to check
+        :return: True if it matches, False otherwise
+        """
+
+        if moment.month not in self.months:
+            return False
+
+        day_matches = moment.day in self.days
+        # Python counts weekdays from Monday, cron from Sunday
+        weekday_matches = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_matches and weekday_matches
+        return day_matches or weekday_matches
+
+    def next_after(self, moment: datetime.datetime) -> datetime.datetime:
+        """Get the first time this schedule is due, strictly after a moment.
+
+        :param moment: the moment to start from
+        :return: the next due time, to the minute
+        :raises ValueError: If the schedule is never due, such as on February 30th
+        """
+
+        candidate = moment.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        # every day of the week and of the month comes around within a few years
+        limit = candidate + datetime.timedelta(days=5 * 366)
+
+        while candidate < limit:
+            if not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + datetime.timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += datetime.timedelta(minutes=1)
+            else:
+                return candidate
+
+        raise ValueError(f"{self.expression!r} is never due")
+
+    def __str__(self) -> str:
+        return self.expression
+
+
+class Job:
+    """A callback run once, every so many seconds or on a CronSchedule."""
+
+    __slots__ = ("name", "callback", "interval", "cron", "due", "runs", "cancelled")
+
+    def __init__(
+        self,
+        name: str,
+        callback: typing.Callable[..., typing.Any],
+        due: float,
+        interval: float = None,
+        cron: CronSchedule = None,
+    ):
+        """Initialize a Job.
+
+        :param name: a name for the job, used when logging
+        :param callback: the function to run
+        :param due: when the job next runs, in seconds since the epoch
+        :param interval: for periodic jobs, the seconds between runs
+        :param cron: for cron jobs, their schedule
+        """
+        self.name = name
+        self.callback = callback
+        self.due = due
+        self.interval = interval
+        self.cron = cron
+        self.runs = 0
+        self.cancelled = False
+
+    def reschedule(self, now: float) -> bool:
+        """Move the job to its next run, skipping any runs missed while it was late.
+
+        :param now: the current time in seconds since the epoch
+        :return: True if the job runs again, False if it ran once and is done
+        """
+
+        if self.interval is not None:
+            while self.due <= now:
+                self.due += self.interval
+            return True
+
+        if self.cron is not None:
+            self.due = self.cron.next_after(datetime.datetime.fromtimestamp(now)).timestamp()
+            return True
+
+        return False
+
+    def cancel(self):
+        """Stop the job from running again."""
+
+        self.cancelled = True
+
+
+class JobScheduler:
+    """Run jobs when they are due, from the listen loop of a SimpleSlackBot.
+
+    Jobs are kept in a heap ordered by when they are next due, so the loop only ever looks at the first one and
+    can sleep until it is due, however many jobs are waiting. Cancelled jobs stay in the heap and are skipped once
+    they reach the front.
+    """
+
+    def __init__(self, clock: typing.Callable[[], float] = time.time):
+        """Initialize a JobScheduler.
+
+        :param clock: Function returning the current time in seconds since the epoch, injectable for testing
+        """
+        self._clock = clock
+        self._heap: typing.List[typing.Tuple[float, int, Job]] = []
+        self._sequence = itertools.count()
+
+    def once(self, delay: float, callback: typing.Callable[..., typing.Any], name: str = None) -> Job:
+        """Run a callback once, after a delay.
+
+        :param delay: how long to wait, in seconds
+        :param callback: the function to run
+        :param name: a name for the job, defaults to the name of the callback
+        :return: the Job, which can be cancelled
+        """
+
+        return self._add(Job(self._name(callback, name), callback, self._clock() + delay))
+
+    def every(
+        self, interval: float, callback: typing.Callable[..., typing.Any], name: str = None, delay: float = None
+    ) -> Job:
+        """Run a callback every interval seconds.
+
+        :param interval: the seconds between runs
+        :param callback: the function to run
+        :param name: a name for the job, defaults to the name of the callback
+        :param delay: how long to wait before the first run, defaults to interval
+        :return: the Job, which can be cancelled
+        :raises ValueError: If interval isn't positive
+        """
+
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        due = self._clock() + (interval if delay is None else delay)
+        return self._add(Job(self._name(callback, name), callback, due, interval=interval))
+
+    def cron(self, expression: str, callback: typing.Callable[..., typing.Any], name: str = None) -> Job:
+        """Run a callback on a cron schedule, in local time.
+
+        :param expression: the cron expression, see CronSchedule
+        :param callback: the function to run
+        :param name: a name for the job, defaults to the name of the callback
+        :return: the Job, which can be cancelled
+        :raises ValueError: If the expression can't be parsed or is never due
+        """
+
+        schedule = CronSchedule(expression)
+        due = schedule.next_after(datetime.datetime.fromtimestamp(self._clock())).timestamp()
+        return self._add(Job(self._name(callback, name), callback, due, cron=schedule))
+
+    def add(self, job: Job) -> Job:
+        """Add a Job made elsewhere, such as one taken from another JobScheduler.
+
+        :param job: the job to add, run when it is next due
+        :return: the job
+        """
+
+        return self._add(job)
+
+    def run_due(self, *arguments: typing.Any) -> typing.Union[float, None]:
+        """Run every job that is due, rescheduling the periodic ones.
+
+        Catches and logs all Exceptions raised by the jobs.
+
+        :param arguments: passed on to every job
+        :return: the seconds until the next job is due, or None if there are no jobs
+        """
+
+        while self._heap:
+            due, _, job = self._heap[0]
+            if job.cancelled:
+                heapq.heappop(self._heap)
+                continue
+
+            now = self._clock()
+            if due > now:
+                return due - now
+
+            heapq.heappop(self._heap)
+            job.runs += 1
+            try:
+                job.callback(*arguments)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("exception running job %s. Exception %s", job.name, traceback.format_exc())
+
+            if not job.cancelled and job.reschedule(self._clock()):
+                self._push(job)
+
+        return None
+
+    def jobs(self) -> typing.List[Job]:
+        """Get the jobs waiting to run, soonest first.
+
+        :return: the jobs that weren't cancelled
+        """
+
+        return [job for _, _, job in sorted(self._heap) if not job.cancelled]
+
+    def __len__(self) -> int:
+        """Get the number of jobs waiting to run.
+
+        :return: the number of jobs that weren't cancelled
+        """
+
+        return sum(1 for _, _, job in self._heap if not job.cancelled)
+
+    @staticmethod
+    def _name(callback: typing.Callable[..., typing.Any], name: typing.Union[str, None]) -> str:
+        """Get the name of a job.
+
+        :param callback: the function the job runs
+        :param name: the name given, if any
+        :return: the name given, or the name of the callback
+        """
+
+        return name if name is not None else getattr(callback, "__name__", repr(callback))
+
+    def _add(self, job: Job) -> Job:
+        """Add a job and log when it is first due.
+
+        :param job: the job to add
+        :return: the job
+        """
+
+        self._push(job)
+        logger.debug("scheduled job %s, first due at %s", job.name, datetime.datetime.fromtimestamp(job.due))
+        return job
+
+    def _push(self, job: Job):
+        """Push a job on the heap, by when it is due.
+
+        :param job: the job to push
+        """
+
+        heapq.heappush(self._heap, (job.due, next(self._sequence), job))
@@ -0,0 +1,80 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import importlib
+import json
+import logging
+import typing
+
+logger = logging.getLogger(__name__)
+
+# the backends we know of, fastest first
+BACKEND_NAMES = ("orjson", "ujson", "json")
+
+
+class JsonBackend:
+    """A JSON library, wrapped so every backend decodes from and encodes to str the same way."""
+
+    def __init__(
+        self,
+        name: str,
+        loads: typing.Callable[[typing.Union[str, bytes]], typing.Any],
+        dumps: typing.Callable[[typing.Any], str],
+    ):
+        """Initialize a JsonBackend.
+
+        :param name: the name of the library
+        :param loads: decodes a JSON document
+        :param dumps: encodes a JSON document, as a str
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self) -> str:
+        return f"JsonBackend({self.name})"
+
+
+def _orjson_dumps(orjson: typing.Any) -> typing.Callable[[typing.Any], str]:
+    """Build a dumps for orjson, which encodes to bytes.
+
+    :param orjson: the orjson module
+    :return: the dumps function
+    """
+
+    def dumps(document: typing.Any) -> str:
+        return orjson.dumps(document).decode("utf-8")
+
+    return dumps
+
+
+def load_backend(name: str = None) -> JsonBackend:
+    """Load a JSON backend.
+
+    :param name: one of orjson, ujson or json. Defaults to the fastest one installed
+    :return: the backend
+    :raises ValueError: If name is not a backend we know of
+    :raises ImportError: If the backend asked for is not installed
+    """
+
+    if name is not None and name not in BACKEND_NAMES:
+        raise ValueError(f"json backend must be one of {', '.join(BACKEND_NAMES)}, not {name}")
+
+    for candidate in BACKEND_NAMES if name is None else (name,):
+        try:
+            module = importlib.import_module(candidate)
+        except ImportError:
+            if candidate == name:
+                raise
+            continue
+
+        dumps = _orjson_dumps(module) if candidate == "orjson" else module.dumps
+        logger.debug("using the %s json backend", candidate)
+        return JsonBackend(candidate, module.loads, dumps)
+
+    # the standard library is always there
+    return JsonBackend("json", json.loads, json.dumps)
@@ -0,0 +1,68 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import importlib
+import logging
+import os
+import types
+import typing
+
+logger = logging.getLogger(__name__)
+
+
+class ModuleWatcher:
+    """Notice when the source files of modules change, by their modification time and size.
+
+    Only the files are looked at, a stat each per check, so checking often is cheap. A module whose file can't be
+    read, say while an editor is saving it, is skipped until it can be.
+    """
+
+    def __init__(self, modules: typing.Iterable[typing.Union[str, types.ModuleType]]):
+        """Initialize a ModuleWatcher.
+
+        :param modules: the modules to watch, or their names, which are imported if they weren't already
+        :raises ValueError: If one of the modules has no source file, such as a built in module
+        """
+        self.modules: typing.List[types.ModuleType] = []
+        self._signatures: typing.Dict[str, typing.Tuple[int, int]] = {}
+
+        for module in modules:
+            if isinstance(module, str):
+                module = importlib.import_module(module)
+            if getattr(module, "__file__", None) is None:
+                raise ValueError(f"module {module.__name__} has no source file to watch")
+            self.modules.append(module)
+            self._signatures[module.__name__] = self._signature(module)
+
+    def changed(self) -> typing.List[types.ModuleType]:
+        """Get the modules whose source file changed since the last check.
+
+        :return: the modules changed, in the order they were given
+        """
+
+        changed = []
+        for module in self.modules:
+            signature = self._signature(module)
+            if signature is not None and signature != self._signatures[module.__name__]:
+                self._signatures[module.__name__] = signature
+                logger.debug("module %s changed", module.__name__)
+                changed.append(module)
+        return changed
+
+    @staticmethod
+    def _signature(module: types.ModuleType) -> typing.Union[typing.Tuple[int, int], None]:
+        """Get the modification time and size of the source file of a module.
+
+        :param module: the module
+        :return: its modification time, in nanoseconds, and size, or None if its file can't be read
+        """
+
+        try:
+            stat = os.stat(typing.cast(str, module.__file__))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,130 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import errno
+import json
+import logging
+import os
+import signal
+import time
+import typing
+
+from .event_deduplicator import EventDeduplicator
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessHandoff:
+    """Hand the Slack connection from a running bot process to its replacement without missing events.
+
+    The replacement connects first, so Slack is already delivering events to it, then asks the running process,
+    found through a pid file, to stop with SIGTERM. The running process stops reading, drains what it already read
+    and writes the keys of the events it handled next to the pid file. Once it has exited, the replacement seeds its
+    EventDeduplicator with those keys and starts dispatching, so events received by both processes are only handled
+    once.
+    """
+
+    def __init__(self, pid_file: str, timeout: float = 30.0, poll_interval: float = 0.1):
+        """Initialize a ProcessHandoff.
+
+        :param pid_file: Where the pid of the process currently owning the connection is kept
+        :param timeout: The longest, in seconds, to wait for the previous process to exit
+        :param poll_interval: How often, in seconds, to check whether the previous process has exited
+        """
+        self.pid_file = pid_file
+        self.seen_file = pid_file + ".seen"
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def is_running(pid: int) -> bool:
+        """Check whether a process is running.
+
+        :param pid: the process id to check
+        :return: True if the process exists, False otherwise
+        """
+
+        try:
+            os.kill(pid, 0)
+        except OSError as os_error:
+            return os_error.errno == errno.EPERM
+        return True
+
+    def read_pid(self) -> typing.Union[int, None]:
+        """Read the pid of the process currently owning the connection.
+
+        :return: the pid, or None if there is no readable pid file
+        """
+
+        try:
+            with open(self.pid_file) as pid_file:
+                return int(pid_file.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def take_over(self, event_deduplicator: EventDeduplicator) -> bool:
+        """Stop the previous process, wait for it to exit and record ourselves as the owner of the connection.
+
+        Must be called once connected, so no events are missed while the previous process shuts down.
+
+        :param event_deduplicator: seeded with the keys of the events the previous process handled
+        :return: True if the previous process, if any, exited in time, False otherwise
+        """
+
+        previous_pid = self.read_pid()
+        exited = True
+
+        if previous_pid is not None and previous_pid != os.getpid() and self.is_running(previous_pid):
+            logger.info("handing off from process %s", previous_pid)
+            os.kill(previous_pid, signal.SIGTERM)
+
+            deadline = time.monotonic() + self.timeout
+            while self.is_running(previous_pid):
+                if time.monotonic() >= deadline:
+                    logger.warning(
+                        "process %s did not exit within %s seconds, continuing", previous_pid, self.timeout
+                    )
+                    exited = False
+                    break
+                time.sleep(self.poll_interval)
+
+        seeded = self._load_seen_keys(event_deduplicator)
+        logger.info("took over the connection, ignoring %s events already handled", seeded)
+
+        with open(self.pid_file, "w") as pid_file:
+            pid_file.write(str(os.getpid()))
+
+        return exited
+
+    def hand_over(self, event_deduplicator: EventDeduplicator):
+        """Write the keys of the events we handled for our replacement.
+
+        :param event_deduplicator: holds the keys of the events we handled
+        """
+
+        temporary_file = self.seen_file + ".tmp"
+        with open(temporary_file, "w") as seen_file:
+            json.dump(event_deduplicator.keys(), seen_file)
+        os.replace(temporary_file, self.seen_file)
+
+    def _load_seen_keys(self, event_deduplicator: EventDeduplicator) -> int:
+        """Seed an EventDeduplicator with the keys written by the previous process, consuming them.
+
+        :param event_deduplicator: the EventDeduplicator to seed
+        :return: the number of keys seeded
+        """
+
+        try:
+            with open(self.seen_file) as seen_file:
+                keys = json.load(seen_file)
+            os.remove(self.seen_file)
+        except (OSError, ValueError):
+            return 0
+
+        # JSON turned the key tuples into lists
+        event_deduplicator.seed(tuple(key) for key in keys)
+        return len(keys)
@@ -0,0 +1,181 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import collections
+import logging
+import time
+import typing
+
+logger = logging.getLogger(__name__)
+
+
+def _text_command_word(slack_event: typing.Mapping) -> str:
+    """Get the first word of an event's text, which is the command word for command style messages.
+
+    :param slack_event: the raw SlackEvent
+    :return: the lower cased first word, or an empty String if there is no text
+    """
+
+    words = (slack_event.get("text") or "").split(None, 1)
+    return words[0].lower() if words else ""
+
+
+KEY_FUNCTIONS: typing.Dict[str, typing.Callable[[typing.Mapping], typing.Hashable]] = {
+    "user": lambda slack_event: slack_event.get("user"),
+    "channel": lambda slack_event: slack_event.get("channel"),
+    "user_channel": lambda slack_event: (slack_event.get("user"), slack_event.get("channel")),
+    "user_command": lambda slack_event: (slack_event.get("user"), _text_command_word(slack_event)),
+}
+
+
+class TokenBucket:
+    """The state of a single token bucket, kept to two floats."""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        """Initialize a TokenBucket.
+
+        :param tokens: the number of tokens currently in the bucket, negative when tokens are owed
+        :param updated: the time, in seconds, tokens was last brought up to date
+        """
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    """Throttle inbound events with one token bucket per key, such as per user or per channel.
+
+    Each bucket holds up to burst tokens and refills at rate tokens per second. An event takes one token. Events
+    finding their bucket empty are either dropped or, with the defer policy, given the time to wait until their
+    token is available, as long as that is within max_delay seconds.
+
+    Buckets live in an insertion ordered dict that is used as an LRU. A bucket that has refilled completely is
+    indistinguishable from a missing one, so idle buckets are expired from the front, as are buckets beyond max_keys.
+    """
+
+    POLICY_DROP = "drop"
+    POLICY_DEFER = "defer"
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        key: typing.Union[str, typing.Callable[[typing.Mapping], typing.Hashable]] = "user",
+        policy: str = POLICY_DROP,
+        max_delay: float = 60.0,
+        max_keys: int = 10000,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a RateLimiter.
+
+        :param rate: How many events per second each key may sustain
+        :param burst: How many events a key may send at once after being idle
+        :param key: One of user, channel, user_channel or user_command, or a function building the key from a
+            raw SlackEvent
+        :param policy: Whether excess events are dropped or deferred
+        :param max_delay: The longest, in seconds, an event may be deferred before it is dropped instead
+        :param max_keys: The maximum number of buckets kept at once
+        :param clock: Function returning the current time in seconds, injectable for testing
+        :raises ValueError: If any of the settings are out of range or unknown
+        """
+        if rate <= 0 or burst < 1 or max_keys < 1:
+            raise ValueError("rate must be positive while burst and max_keys must be at least 1")
+        if policy not in (self.POLICY_DROP, self.POLICY_DEFER):
+            raise ValueError(f"unknown policy {policy}")
+        if isinstance(key, str) and key not in KEY_FUNCTIONS:
+            raise ValueError(f"unknown key {key}, expected one of {sorted(KEY_FUNCTIONS)}")
+
+        self.rate = rate
+        self.burst = burst
+        self.key_function = KEY_FUNCTIONS[key] if isinstance(key, str) else key
+        self.policy = policy
+        self.max_delay = max_delay
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: "collections.OrderedDict[typing.Hashable, TokenBucket]" = collections.OrderedDict()
+
+        self.allowed = 0
+        self.deferred = 0
+        self.dropped = 0
+
+    def key_for(self, slack_event: typing.Mapping) -> typing.Hashable:
+        """Build the key whose bucket this Slack event draws from.
+
+        :param slack_event: the raw SlackEvent
+        :return: the bucket key
+        """
+
+        return self.key_function(slack_event)
+
+    def acquire(self, key: typing.Hashable) -> typing.Union[float, None]:
+        """Take a token from a key's bucket.
+
+        :param key: the bucket key
+        :return: 0.0 if the event may run now, the seconds to wait if it was deferred, or None if it was dropped
+        """
+
+        now = self._clock()
+        self._expire(now)
+
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            bucket = TokenBucket(self.burst, now)
+        else:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+        self._buckets[key] = bucket
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            self.allowed += 1
+            return 0.0
+
+        delay = (1 - bucket.tokens) / self.rate
+        if self.policy == self.POLICY_DEFER and delay <= self.max_delay:
+            # the token is owed, so later events queue up behind this one
+            bucket.tokens -= 1
+            self.deferred += 1
+            return delay
+
+        self.dropped += 1
+        logger.debug("rate limit exceeded for %s, dropping event", key)
+        return None
+
+    def _expire(self, now: float):
+        """Forget buckets that have refilled completely, and the least recently used beyond max_keys.
+
+        :param now: the current time in seconds
+        """
+
+        while self._buckets:
+            key, bucket = next(iter(self._buckets.items()))
+            idle_full = bucket.tokens + (now - bucket.updated) * self.rate >= self.burst
+            if not idle_full and len(self._buckets) < self.max_keys:
+                return
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        """Get the number of buckets currently kept.
+
+        :return: the number of buckets
+        """
+
+        return len(self._buckets)
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Get the counters describing this RateLimiter.
+
+        :return: the allowed, deferred and dropped events and the number of buckets kept
+        """
+
+        return {
+            "allowed": self.allowed,
+            "deferred": self.deferred,
+            "dropped": self.dropped,
+            "keys": len(self),
+        }
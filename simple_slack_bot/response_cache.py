@@ -0,0 +1,219 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import collections
+import functools
+import logging
+import threading
+import time
+import typing
+
+from .slack_request import SlackRequest
+
+logger = logging.getLogger(__name__)
+
+# the writes a callback made, as (content, channel) pairs
+Writes = typing.Tuple[typing.Tuple[str, typing.Optional[str]], ...]
+
+
+def default_key(request: SlackRequest) -> typing.Union[typing.Hashable, None]:
+    """Build the cache key of a request from its channel and its text, ignoring case and extra whitespace.
+
+    :param request: the request to build a key for
+    :return: the key, or None if the request has no text to key on
+    """
+
+    text = request.slack_event.get("text")
+    if not text:
+        return None
+    return (request.slack_event.get("channel"), " ".join(text.lower().split()))
+
+
+class RecordingRequest:
+    """Stand in for a SlackRequest, passing everything through to it while recording what is written."""
+
+    def __init__(self, request: SlackRequest):
+        """Initialize a RecordingRequest.
+
+        :param request: the SlackRequest to pass through to
+        """
+        self._request = request
+        self.writes: typing.List[typing.Tuple[str, typing.Optional[str]]] = []
+
+    def __getattr__(self, name: str) -> typing.Any:
+        """Get an attribute of the SlackRequest.
+
+        :param name: the attribute name
+        :return: the attribute of the SlackRequest
+        """
+
+        return getattr(self._request, name)
+
+    def write(self, content: str, channel: typing.Optional[str] = None):
+        """Write the content to the channel, recording it.
+
+        :param content: The text you wish to send
+        :param channel: By default send to same channel request came from, if any
+        """
+
+        self.writes.append((content, channel))
+        self._request.write(content, channel)
+
+
+class ResponseCache:
+    """Memoize the replies of a callback answering the same question with the same reply, such as a FAQ.
+
+    Used as a decorator below register or command. The first request for a key runs the callback and records what
+    it writes, later requests for the same key replay those writes without running it. Keys are kept in an
+    OrderedDict in last use order, expiring after a ttl and evicting the least recently used beyond capacity.
+    Callbacks that raise are never cached, and those that write nothing only when cache_empty is set.
+    """
+
+    DEFAULT_CAPACITY = 1000
+    DEFAULT_TTL_SECONDS = 300.0
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        key: typing.Callable[[SlackRequest], typing.Union[typing.Hashable, None]] = default_key,
+        cache_empty: bool = False,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a ResponseCache.
+
+        :param capacity: The maximum number of replies kept
+        :param ttl_seconds: How long, in seconds, a reply is replayed before the callback runs again
+        :param key: Function building the cache key of a request, or None to bypass the cache for that request.
+            Defaults to the channel and the normalized text
+        :param cache_empty: Whether to also cache that a callback wrote nothing, so it doesn't run again either
+        :param clock: Function returning the current time in seconds, injectable for testing
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self.key = key
+        self.cache_empty = cache_empty
+        self._clock = clock
+        self._replies: "collections.OrderedDict[typing.Hashable, typing.Tuple[float, Writes]]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.callback_name: typing.Union[str, None] = None
+
+        self.hits = 0
+        self.empty_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def __call__(self, callback: typing.Callable) -> typing.Callable[..., typing.Any]:
+        """Wrap a callback so its replies are cached.
+
+        :param callback: the callback to cache the replies of
+        :return: the caching callback
+        """
+
+        self.callback_name = getattr(callback, "__name__", repr(callback))
+
+        @functools.wraps(callback)
+        def caching_callback(request: SlackRequest, *arguments: typing.Any):
+            key = self.key(request)
+            if key is None:
+                self.bypassed += 1
+                return callback(request, *arguments)
+
+            writes = self._lookup(key)
+            if writes is not None:
+                for content, channel in writes:
+                    request.write(content, channel)
+                return None
+
+            recording_request = RecordingRequest(request)
+            result = callback(recording_request, *arguments)
+            if recording_request.writes or self.cache_empty:
+                self._store(key, tuple(recording_request.writes))
+            return result
+
+        return caching_callback
+
+    def _lookup(self, key: typing.Hashable) -> typing.Union[Writes, None]:
+        """Get the writes cached for a key, counting the hit or miss.
+
+        :param key: the cache key
+        :return: the cached writes, or None if there are none or they expired
+        """
+
+        with self._lock:
+            cached = self._replies.get(key)
+            if cached is not None and self._clock() - cached[0] > self.ttl_seconds:
+                del self._replies[key]
+                self.expired += 1
+                cached = None
+
+            if cached is None:
+                self.misses += 1
+                return None
+
+            self._replies.move_to_end(key)
+            if cached[1]:
+                self.hits += 1
+            else:
+                self.empty_hits += 1
+            logger.debug("replaying the cached reply of %s for %s", self.callback_name, key)
+            return cached[1]
+
+    def _store(self, key: typing.Hashable, writes: Writes):
+        """Cache the writes made for a key, evicting the least recently used beyond capacity.
+
+        :param key: the cache key
+        :param writes: the writes the callback made
+        """
+
+        with self._lock:
+            self._replies[key] = (self._clock(), writes)
+            self._replies.move_to_end(key)
+            while len(self._replies) > self.capacity:
+                self._replies.popitem(last=False)
+                self.evicted += 1
+
+    def clear(self):
+        """Forget every cached reply, for example once the answers they came from have changed."""
+
+        with self._lock:
+            self._replies.clear()
+
+    def __len__(self) -> int:
+        """Get the number of replies cached.
+
+        :return: the number of replies cached
+        """
+
+        return len(self._replies)
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """Get the counters describing this ResponseCache.
+
+        :return: the callback name, hits, empty hits, misses, hit ratio, bypassed requests, expired and evicted
+            replies and the current size
+        """
+
+        lookups = self.hits + self.empty_hits + self.misses
+        return {
+            "callback": self.callback_name,
+            "hits": self.hits,
+            "empty_hits": self.empty_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.empty_hits) / lookups if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "size": len(self),
+        }
@@ -0,0 +1,141 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import http.client
+import json
+import logging
+import threading
+import typing
+import urllib.parse
+
+logger = logging.getLogger(__name__)
+
+# what a kept alive connection raises when the server closed it meanwhile
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionError)
+
+
+class ResponseClient:
+    """Post JSON to the response_url of slash commands and interactions, over kept alive connections.
+
+    Every response_url of a workspace points at the same host, so connections are pooled by host and reused
+    across responses, saving a TCP and TLS handshake for each. Up to max_connections idle connections are kept per
+    host. A kept connection the server closed meanwhile is replaced once, transparently.
+    """
+
+    def __init__(self, max_connections: int = 4, timeout: float = 10.0):
+        """Initialize a ResponseClient.
+
+        :param max_connections: How many idle connections to keep per host
+        :param timeout: The longest, in seconds, to wait on a response
+        """
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._idle: typing.Dict[typing.Tuple[str, str], typing.List[http.client.HTTPConnection]] = {}
+
+        self.posted = 0
+        self.connections = 0
+
+    def post(self, url: str, payload: typing.Dict[str, typing.Any]) -> typing.Tuple[int, bytes]:
+        """Post a JSON payload.
+
+        :param url: the response_url
+        :param payload: the message, such as {"text": "done"}
+        :return: the HTTP status and body of the response
+        :raises ValueError: If the url is neither http nor https
+        :raises OSError: If the host can't be reached
+        """
+
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"can not post to {url}")
+
+        key = (parts.scheme, parts.netloc)
+        target = parts.path + (f"?{parts.query}" if parts.query else "") or "/"
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8"}
+
+        connection, reused = self._take(key)
+        try:
+            try:
+                status, content = self._request(connection, target, body, headers)
+            except STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                connection.close()
+                connection, _ = self._take(key, fresh=True)
+                status, content = self._request(connection, target, body, headers)
+        except BaseException:
+            connection.close()
+            raise
+
+        self._give_back(key, connection)
+        self.posted += 1
+        if status >= 400:
+            logger.warning("response to %s failed with %s: %s", parts.path, status, content[:200])
+        return status, content
+
+    def close(self):
+        """Close every idle connection."""
+
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _request(
+        self, connection: http.client.HTTPConnection, target: str, body: bytes, headers: typing.Dict[str, str]
+    ) -> typing.Tuple[int, bytes]:
+        """Make one request over a connection, reading the whole response so the connection can be reused.
+
+        :param connection: the connection
+        :param target: the path and query to post to
+        :param body: the encoded payload
+        :param headers: the request headers
+        :return: the HTTP status and body of the response
+        """
+
+        connection.request("POST", target, body=body, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+
+    def _take(
+        self, key: typing.Tuple[str, str], fresh: bool = False
+    ) -> typing.Tuple[http.client.HTTPConnection, bool]:
+        """Take an idle connection to a host, or open a new one.
+
+        :param key: the scheme and host
+        :param fresh: whether to open a new connection even if one is idle
+        :return: the connection, and whether it was reused
+        """
+
+        if not fresh:
+            with self._lock:
+                idle = self._idle.get(key)
+                if idle:
+                    return idle.pop(), True
+
+        scheme, netloc = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        self.connections += 1
+        return connection_class(netloc, timeout=self.timeout), False
+
+    def _give_back(self, key: typing.Tuple[str, str], connection: http.client.HTTPConnection):
+        """Keep a connection for the next response to its host, unless enough are kept already.
+
+        :param key: the scheme and host
+        :param connection: the connection
+        """
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_connections:
+                idle.append(connection)
+                return
+        connection.close()
@@ -0,0 +1,95 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import typing
+
+
+class RtmEvent:
+    """A Slack RTM event with its fields as attributes, the base of the classes generated into rtm_events.
+
+    Each subclass holds the fields its event type documents in slots rather than a dict, so a parsed event is a
+    fraction of the size of the dict it was parsed from. Fields that were not sent are None, and any field outside
+    the documented ones is kept in extra, so nothing is lost.
+    """
+
+    __slots__ = ("extra",)
+
+    # set by each generated subclass
+    type: str = ""
+    _fields: typing.Tuple[str, ...] = ()
+    _attributes: typing.Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: typing.Mapping[str, typing.Any]) -> "RtmEvent":
+        """Parse an event.
+
+        :param data: the raw SlackEvent
+        :return: the event
+        """
+
+        event = cls.__new__(cls)
+        for field, attribute in zip(cls._fields, cls._attributes):
+            setattr(event, attribute, data.get(field))
+
+        extra = {key: value for key, value in data.items() if key not in cls._fields and key != "type"}
+        event.extra = extra or None
+        return event
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        """Get the event as a dict, as it was received except for fields that were None.
+
+        :return: the raw SlackEvent
+        """
+
+        data = {"type": self.type}
+        for field, attribute in zip(self._fields, self._attributes):
+            value = getattr(self, attribute)
+            if value is not None:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def get(self, field: str, default: typing.Any = None) -> typing.Any:
+        """Get a field by its name in the event, as with a dict.
+
+        :param field: the name of the field
+        :param default: returned if the field was not sent
+        :return: the value of the field
+        """
+
+        if field == "type":
+            return self.type
+        if field in self._fields:
+            value = getattr(self, self._attributes[self._fields.index(field)])
+            return default if value is None else value
+        return (self.extra or {}).get(field, default)
+
+    def __eq__(self, other: typing.Any) -> bool:
+        return isinstance(other, RtmEvent) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        sent = ", ".join(f"{key}={value!r}" for key, value in self.to_dict().items() if key != "type")
+        return f"{self.__class__.__name__}({sent})"
+
+
+class UnknownRtmEvent(RtmEvent):
+    """An event of a type missing from the schema, with every field in extra."""
+
+    __slots__ = ("type",)
+
+    @classmethod
+    def from_dict(cls, data: typing.Mapping[str, typing.Any]) -> "RtmEvent":
+        """Parse an event.
+
+        :param data: the raw SlackEvent
+        :return: the event
+        """
+
+        event = super().from_dict(data)
+        event.type = data.get("type", "")
+        return event
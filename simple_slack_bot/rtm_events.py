@@ -0,0 +1,888 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+# Generated by generate_rtm_events.py from rtm_events.json, do not edit by hand.
+
+# pylint: disable=too-many-lines
+
+import typing
+
+from .rtm_event import RtmEvent, UnknownRtmEvent
+
+
+class AccountsChangedEvent(RtmEvent):
+    """The list of accounts a user is signed into has changed."""
+
+    __slots__ = ()
+
+    type = "accounts_changed"
+    _fields = ()
+    _attributes = _fields
+
+
+class BotAddedEvent(RtmEvent):
+    """A bot user was added."""
+
+    __slots__ = ("bot",)
+
+    type = "bot_added"
+    _fields = ("bot",)
+    _attributes = _fields
+
+
+class BotChangedEvent(RtmEvent):
+    """A bot user was changed."""
+
+    __slots__ = ("bot",)
+
+    type = "bot_changed"
+    _fields = ("bot",)
+    _attributes = _fields
+
+
+class ChannelArchiveEvent(RtmEvent):
+    """A channel was archived."""
+
+    __slots__ = ("channel", "user")
+
+    type = "channel_archive"
+    _fields = ("channel", "user")
+    _attributes = _fields
+
+
+class ChannelCreatedEvent(RtmEvent):
+    """A channel was created."""
+
+    __slots__ = ("channel",)
+
+    type = "channel_created"
+    _fields = ("channel",)
+    _attributes = _fields
+
+
+class ChannelDeletedEvent(RtmEvent):
+    """A channel was deleted."""
+
+    __slots__ = ("channel",)
+
+    type = "channel_deleted"
+    _fields = ("channel",)
+    _attributes = _fields
+
+
+class ChannelHistoryChangedEvent(RtmEvent):
+    """Bulk updates were made to a channel's history."""
+
+    __slots__ = ("latest", "ts", "event_ts")
+
+    type = "channel_history_changed"
+    _fields = ("latest", "ts", "event_ts")
+    _attributes = _fields
+
+
+class ChannelJoinedEvent(RtmEvent):
+    """You joined a channel."""
+
+    __slots__ = ("channel",)
+
+    type = "channel_joined"
+    _fields = ("channel",)
+    _attributes = _fields
+
+
+class ChannelLeftEvent(RtmEvent):
+    """You left a channel."""
+
+    __slots__ = ("channel",)
+
+    type = "channel_left"
+    _fields = ("channel",)
+    _attributes = _fields
+
+
+class ChannelMarkedEvent(RtmEvent):
+    """Your channel read marker was updated."""
+
+    __slots__ = ("channel", "ts")
+
+    type = "channel_marked"
+    _fields = ("channel", "ts")
+    _attributes = _fields
+
+
+class ChannelRenameEvent(RtmEvent):
+    """A channel was renamed."""
+
+    __slots__ = ("channel",)
+
+    type = "channel_rename"
+    _fields = ("channel",)
+    _attributes = _fields
+
+
+class ChannelUnarchiveEvent(RtmEvent):
+    """A channel was unarchived."""
+
+    __slots__ = ("channel", "user")
+
+    type = "channel_unarchive"
+    _fields = ("channel", "user")
+    _attributes = _fields
+
+
+class CommandsChangedEvent(RtmEvent):
+    """A slash command has been added or changed."""
+
+    __slots__ = ("event_ts",)
+
+    type = "commands_changed"
+    _fields = ("event_ts",)
+    _attributes = _fields
+
+
+class DesktopNotificationEvent(RtmEvent):
+    """A desktop notification was shown."""
+
+    __slots__ = ("title", "subtitle", "msg", "ts", "content", "channel", "launchUri", "avatarImage", "event_ts")
+
+    type = "desktop_notification"
+    _fields = ("title", "subtitle", "msg", "ts", "content", "channel", "launchUri", "avatarImage", "event_ts")
+    _attributes = _fields
+
+
+class DndUpdatedEvent(RtmEvent):
+    """Do not Disturb settings changed for the current user."""
+
+    __slots__ = ("user", "dnd_status")
+
+    type = "dnd_updated"
+    _fields = ("user", "dnd_status")
+    _attributes = _fields
+
+
+class DndUpdatedUserEvent(RtmEvent):
+    """Do not Disturb settings changed for a member."""
+
+    __slots__ = ("user", "dnd_status")
+
+    type = "dnd_updated_user"
+    _fields = ("user", "dnd_status")
+    _attributes = _fields
+
+
+class EmailDomainChangedEvent(RtmEvent):
+    """The workspace email domain has changed."""
+
+    __slots__ = ("email_domain", "event_ts")
+
+    type = "email_domain_changed"
+    _fields = ("email_domain", "event_ts")
+    _attributes = _fields
+
+
+class EmojiChangedEvent(RtmEvent):
+    """A custom emoji has been added or changed."""
+
+    __slots__ = ("subtype", "name", "names", "value", "event_ts")
+
+    type = "emoji_changed"
+    _fields = ("subtype", "name", "names", "value", "event_ts")
+    _attributes = _fields
+
+
+class ExternalOrgMigrationFinishedEvent(RtmEvent):
+    """An enterprise grid migration has finished on an external workspace."""
+
+    __slots__ = ("team", "date_started", "date_finished")
+
+    type = "external_org_migration_finished"
+    _fields = ("team", "date_started", "date_finished")
+    _attributes = _fields
+
+
+class ExternalOrgMigrationStartedEvent(RtmEvent):
+    """An enterprise grid migration has started on an external workspace."""
+
+    __slots__ = ("team", "date_started")
+
+    type = "external_org_migration_started"
+    _fields = ("team", "date_started")
+    _attributes = _fields
+
+
+class FileChangeEvent(RtmEvent):
+    """A file was changed."""
+
+    __slots__ = ("file_id", "file")
+
+    type = "file_change"
+    _fields = ("file_id", "file")
+    _attributes = _fields
+
+
+class FileCommentAddedEvent(RtmEvent):
+    """A file comment was added."""
+
+    __slots__ = ("comment", "file_id", "file")
+
+    type = "file_comment_added"
+    _fields = ("comment", "file_id", "file")
+    _attributes = _fields
+
+
+class FileCommentDeletedEvent(RtmEvent):
+    """A file comment was deleted."""
+
+    __slots__ = ("comment", "file_id", "file")
+
+    type = "file_comment_deleted"
+    _fields = ("comment", "file_id", "file")
+    _attributes = _fields
+
+
+class FileCommentEditedEvent(RtmEvent):
+    """A file comment was edited."""
+
+    __slots__ = ("comment", "file_id", "file")
+
+    type = "file_comment_edited"
+    _fields = ("comment", "file_id", "file")
+    _attributes = _fields
+
+
+class FileCreatedEvent(RtmEvent):
+    """A file was created."""
+
+    __slots__ = ("file_id", "file")
+
+    type = "file_created"
+    _fields = ("file_id", "file")
+    _attributes = _fields
+
+
+class FileDeletedEvent(RtmEvent):
+    """A file was deleted."""
+
+    __slots__ = ("file_id", "event_ts")
+
+    type = "file_deleted"
+    _fields = ("file_id", "event_ts")
+    _attributes = _fields
+
+
+class FilePrivateEvent(RtmEvent):
+    """A file was made private."""
+
+    __slots__ = ("file_id", "file")
+
+    type = "file_private"
+    _fields = ("file_id", "file")
+    _attributes = _fields
+
+
+class FilePublicEvent(RtmEvent):
+    """A file was made public."""
+
+    __slots__ = ("file_id", "file")
+
+    type = "file_public"
+    _fields = ("file_id", "file")
+    _attributes = _fields
+
+
+class FileSharedEvent(RtmEvent):
+    """A file was shared."""
+
+    __slots__ = ("file_id", "file")
+
+    type = "file_shared"
+    _fields = ("file_id", "file")
+    _attributes = _fields
+
+
+class FileUnsharedEvent(RtmEvent):
+    """A file was unshared."""
+
+    __slots__ = ("file_id", "file")
+
+    type = "file_unshared"
+    _fields = ("file_id", "file")
+    _attributes = _fields
+
+
+class GoodbyeEvent(RtmEvent):
+    """The server intends to close the connection soon."""
+
+    __slots__ = ()
+
+    type = "goodbye"
+    _fields = ()
+    _attributes = _fields
+
+
+class GroupArchiveEvent(RtmEvent):
+    """A private channel was archived."""
+
+    __slots__ = ("channel",)
+
+    type = "group_archive"
+    _fields = ("channel",)
+    _attributes = _fields
+
+
+class GroupCloseEvent(RtmEvent):
+    """You closed a private channel."""
+
+    __slots__ = ("user", "channel")
+
+    type = "group_close"
+    _fields = ("user", "channel")
+    _attributes = _fields
+
+
+class GroupDeletedEvent(RtmEvent):
+    """A private channel was deleted."""
+
+    __slots__ = ("channel",)
+
+    type = "group_deleted"
+    _fields = ("channel",)
+    _attributes = _fields
+
+
+class GroupHistoryChangedEvent(RtmEvent):
+    """Bulk updates were made to a private channel's history."""
+
+    __slots__ = ("latest", "ts", "event_ts")
+
+    type = "group_history_changed"
+    _fields = ("latest", "ts", "event_ts")
+    _attributes = _fields
+
+
+class GroupJoinedEvent(RtmEvent):
+    """You joined a private channel."""
+
+    __slots__ = ("channel",)
+
+    type = "group_joined"
+    _fields = ("channel",)
+    _attributes = _fields
+
+
+class GroupLeftEvent(RtmEvent):
+    """You left a private channel."""
+
+    __slots__ = ("channel",)
+
+    type = "group_left"
+    _fields = ("channel",)
+    _attributes = _fields
+
+
+class GroupMarkedEvent(RtmEvent):
+    """A private channel read marker was updated."""
+
+    __slots__ = ("channel", "ts")
+
+    type = "group_marked"
+    _fields = ("channel", "ts")
+    _attributes = _fields
+
+
+class GroupOpenEvent(RtmEvent):
+    """You opened a private channel."""
+
+    __slots__ = ("user", "channel")
+
+    type = "group_open"
+    _fields = ("user", "channel")
+    _attributes = _fields
+
+
+class GroupRenameEvent(RtmEvent):
+    """A private channel was renamed."""
+
+    __slots__ = ("channel",)
+
+    type = "group_rename"
+    _fields = ("channel",)
+    _attributes = _fields
+
+
+class GroupUnarchiveEvent(RtmEvent):
+    """A private channel was unarchived."""
+
+    __slots__ = ("channel",)
+
+    type = "group_unarchive"
+    _fields = ("channel",)
+    _attributes = _fields
+
+
+class HelloEvent(RtmEvent):
+    """The client has successfully connected to the server."""
+
+    __slots__ = ()
+
+    type = "hello"
+    _fields = ()
+    _attributes = _fields
+
+
+class ImCloseEvent(RtmEvent):
+    """You closed a DM."""
+
+    __slots__ = ("user", "channel")
+
+    type = "im_close"
+    _fields = ("user", "channel")
+    _attributes = _fields
+
+
+class ImCreatedEvent(RtmEvent):
+    """A DM was created."""
+
+    __slots__ = ("user", "channel")
+
+    type = "im_created"
+    _fields = ("user", "channel")
+    _attributes = _fields
+
+
+class ImHistoryChangedEvent(RtmEvent):
+    """Bulk updates were made to a DM's history."""
+
+    __slots__ = ("latest", "ts", "event_ts")
+
+    type = "im_history_changed"
+    _fields = ("latest", "ts", "event_ts")
+    _attributes = _fields
+
+
+class ImMarkedEvent(RtmEvent):
+    """A direct message read marker was updated."""
+
+    __slots__ = ("channel", "ts")
+
+    type = "im_marked"
+    _fields = ("channel", "ts")
+    _attributes = _fields
+
+
+class ImOpenEvent(RtmEvent):
+    """You opened a DM."""
+
+    __slots__ = ("user", "channel")
+
+    type = "im_open"
+    _fields = ("user", "channel")
+    _attributes = _fields
+
+
+class ManualPresenceChangeEvent(RtmEvent):
+    """You manually updated your presence."""
+
+    __slots__ = ("presence",)
+
+    type = "manual_presence_change"
+    _fields = ("presence",)
+    _attributes = _fields
+
+
+class MemberJoinedChannelEvent(RtmEvent):
+    """A user joined a public or private channel."""
+
+    __slots__ = ("user", "channel", "channel_type", "team", "inviter")
+
+    type = "member_joined_channel"
+    _fields = ("user", "channel", "channel_type", "team", "inviter")
+    _attributes = _fields
+
+
+class MemberLeftChannelEvent(RtmEvent):
+    """A user left a public or private channel."""
+
+    __slots__ = ("user", "channel", "channel_type", "team")
+
+    type = "member_left_channel"
+    _fields = ("user", "channel", "channel_type", "team")
+    _attributes = _fields
+
+
+class MessageEvent(RtmEvent):
+    """A message was sent to a channel."""
+
+    __slots__ = (
+        "channel", "user", "text", "ts", "thread_ts", "subtype", "bot_id", "team", "client_msg_id", "event_ts",
+        "blocks", "attachments", "files", "edited", "message", "previous_message", "suppress_notification",
+    )
+
+    type = "message"
+    _fields = (
+        "channel", "user", "text", "ts", "thread_ts", "subtype", "bot_id", "team", "client_msg_id", "event_ts",
+        "blocks", "attachments", "files", "edited", "message", "previous_message", "suppress_notification",
+    )
+    _attributes = _fields
+
+
+class PinAddedEvent(RtmEvent):
+    """A pin was added to a channel."""
+
+    __slots__ = ("user", "channel_id", "item", "event_ts")
+
+    type = "pin_added"
+    _fields = ("user", "channel_id", "item", "event_ts")
+    _attributes = _fields
+
+
+class PinRemovedEvent(RtmEvent):
+    """A pin was removed from a channel."""
+
+    __slots__ = ("user", "channel_id", "item", "has_pins", "event_ts")
+
+    type = "pin_removed"
+    _fields = ("user", "channel_id", "item", "has_pins", "event_ts")
+    _attributes = _fields
+
+
+class PongEvent(RtmEvent):
+    """The server answered a ping."""
+
+    __slots__ = ("reply_to", "time")
+
+    type = "pong"
+    _fields = ("reply_to", "time")
+    _attributes = _fields
+
+
+class PrefChangeEvent(RtmEvent):
+    """You have updated your preferences."""
+
+    __slots__ = ("name", "value")
+
+    type = "pref_change"
+    _fields = ("name", "value")
+    _attributes = _fields
+
+
+class PresenceChangeEvent(RtmEvent):
+    """A member's presence changed."""
+
+    __slots__ = ("user", "users", "presence")
+
+    type = "presence_change"
+    _fields = ("user", "users", "presence")
+    _attributes = _fields
+
+
+class ReactionAddedEvent(RtmEvent):
+    """A member has added an emoji reaction to an item."""
+
+    __slots__ = ("user", "reaction", "item_user", "item", "event_ts")
+
+    type = "reaction_added"
+    _fields = ("user", "reaction", "item_user", "item", "event_ts")
+    _attributes = _fields
+
+
+class ReactionRemovedEvent(RtmEvent):
+    """A member removed an emoji reaction."""
+
+    __slots__ = ("user", "reaction", "item_user", "item", "event_ts")
+
+    type = "reaction_removed"
+    _fields = ("user", "reaction", "item_user", "item", "event_ts")
+    _attributes = _fields
+
+
+class ReconnectUrlEvent(RtmEvent):
+    """A URL to reconnect to, experimental."""
+
+    __slots__ = ("url",)
+
+    type = "reconnect_url"
+    _fields = ("url",)
+    _attributes = _fields
+
+
+class StarAddedEvent(RtmEvent):
+    """A member has starred an item."""
+
+    __slots__ = ("user", "item", "event_ts")
+
+    type = "star_added"
+    _fields = ("user", "item", "event_ts")
+    _attributes = _fields
+
+
+class StarRemovedEvent(RtmEvent):
+    """A member removed a star."""
+
+    __slots__ = ("user", "item", "event_ts")
+
+    type = "star_removed"
+    _fields = ("user", "item", "event_ts")
+    _attributes = _fields
+
+
+class SubteamCreatedEvent(RtmEvent):
+    """A User Group has been added to the workspace."""
+
+    __slots__ = ("subteam",)
+
+    type = "subteam_created"
+    _fields = ("subteam",)
+    _attributes = _fields
+
+
+class SubteamMembersChangedEvent(RtmEvent):
+    """The membership of an existing User Group has changed."""
+
+    __slots__ = (
+        "subteam_id", "team_id", "date_previous_update", "date_update", "added_users", "added_users_count",
+        "removed_users", "removed_users_count",
+    )
+
+    type = "subteam_members_changed"
+    _fields = (
+        "subteam_id", "team_id", "date_previous_update", "date_update", "added_users", "added_users_count",
+        "removed_users", "removed_users_count",
+    )
+    _attributes = _fields
+
+
+class SubteamSelfAddedEvent(RtmEvent):
+    """You have been added to a User Group."""
+
+    __slots__ = ("subteam_id",)
+
+    type = "subteam_self_added"
+    _fields = ("subteam_id",)
+    _attributes = _fields
+
+
+class SubteamSelfRemovedEvent(RtmEvent):
+    """You have been removed from a User Group."""
+
+    __slots__ = ("subteam_id",)
+
+    type = "subteam_self_removed"
+    _fields = ("subteam_id",)
+    _attributes = _fields
+
+
+class SubteamUpdatedEvent(RtmEvent):
+    """An existing User Group has been updated or its members changed."""
+
+    __slots__ = ("subteam",)
+
+    type = "subteam_updated"
+    _fields = ("subteam",)
+    _attributes = _fields
+
+
+class TeamDomainChangeEvent(RtmEvent):
+    """The workspace domain has changed."""
+
+    __slots__ = ("url", "domain")
+
+    type = "team_domain_change"
+    _fields = ("url", "domain")
+    _attributes = _fields
+
+
+class TeamJoinEvent(RtmEvent):
+    """A new member has joined."""
+
+    __slots__ = ("user",)
+
+    type = "team_join"
+    _fields = ("user",)
+    _attributes = _fields
+
+
+class TeamMigrationStartedEvent(RtmEvent):
+    """The workspace is being migrated between servers."""
+
+    __slots__ = ()
+
+    type = "team_migration_started"
+    _fields = ()
+    _attributes = _fields
+
+
+class TeamPlanChangeEvent(RtmEvent):
+    """The account billing plan has changed."""
+
+    __slots__ = ("plan", "can_add_ura", "paid_features")
+
+    type = "team_plan_change"
+    _fields = ("plan", "can_add_ura", "paid_features")
+    _attributes = _fields
+
+
+class TeamPrefChangeEvent(RtmEvent):
+    """A preference has been updated."""
+
+    __slots__ = ("name", "value")
+
+    type = "team_pref_change"
+    _fields = ("name", "value")
+    _attributes = _fields
+
+
+class TeamProfileChangeEvent(RtmEvent):
+    """The workspace profile fields have been updated."""
+
+    __slots__ = ("profile",)
+
+    type = "team_profile_change"
+    _fields = ("profile",)
+    _attributes = _fields
+
+
+class TeamProfileDeleteEvent(RtmEvent):
+    """The workspace profile fields have been deleted."""
+
+    __slots__ = ("profile",)
+
+    type = "team_profile_delete"
+    _fields = ("profile",)
+    _attributes = _fields
+
+
+class TeamProfileReorderEvent(RtmEvent):
+    """The workspace profile fields have been reordered."""
+
+    __slots__ = ("profile",)
+
+    type = "team_profile_reorder"
+    _fields = ("profile",)
+    _attributes = _fields
+
+
+class TeamRenameEvent(RtmEvent):
+    """The workspace name has changed."""
+
+    __slots__ = ("name",)
+
+    type = "team_rename"
+    _fields = ("name",)
+    _attributes = _fields
+
+
+class UserChangeEvent(RtmEvent):
+    """A member's data has changed."""
+
+    __slots__ = ("user",)
+
+    type = "user_change"
+    _fields = ("user",)
+    _attributes = _fields
+
+
+class UserTypingEvent(RtmEvent):
+    """A channel member is typing a message."""
+
+    __slots__ = ("channel", "user")
+
+    type = "user_typing"
+    _fields = ("channel", "user")
+    _attributes = _fields
+
+
+EVENT_CLASSES: typing.Dict[str, typing.Type[RtmEvent]] = {
+    "accounts_changed": AccountsChangedEvent,
+    "bot_added": BotAddedEvent,
+    "bot_changed": BotChangedEvent,
+    "channel_archive": ChannelArchiveEvent,
+    "channel_created": ChannelCreatedEvent,
+    "channel_deleted": ChannelDeletedEvent,
+    "channel_history_changed": ChannelHistoryChangedEvent,
+    "channel_joined": ChannelJoinedEvent,
+    "channel_left": ChannelLeftEvent,
+    "channel_marked": ChannelMarkedEvent,
+    "channel_rename": ChannelRenameEvent,
+    "channel_unarchive": ChannelUnarchiveEvent,
+    "commands_changed": CommandsChangedEvent,
+    "desktop_notification": DesktopNotificationEvent,
+    "dnd_updated": DndUpdatedEvent,
+    "dnd_updated_user": DndUpdatedUserEvent,
+    "email_domain_changed": EmailDomainChangedEvent,
+    "emoji_changed": EmojiChangedEvent,
+    "external_org_migration_finished": ExternalOrgMigrationFinishedEvent,
+    "external_org_migration_started": ExternalOrgMigrationStartedEvent,
+    "file_change": FileChangeEvent,
+    "file_comment_added": FileCommentAddedEvent,
+    "file_comment_deleted": FileCommentDeletedEvent,
+    "file_comment_edited": FileCommentEditedEvent,
+    "file_created": FileCreatedEvent,
+    "file_deleted": FileDeletedEvent,
+    "file_private": FilePrivateEvent,
+    "file_public": FilePublicEvent,
+    "file_shared": FileSharedEvent,
+    "file_unshared": FileUnsharedEvent,
+    "goodbye": GoodbyeEvent,
+    "group_archive": GroupArchiveEvent,
+    "group_close": GroupCloseEvent,
+    "group_deleted": GroupDeletedEvent,
+    "group_history_changed": GroupHistoryChangedEvent,
+    "group_joined": GroupJoinedEvent,
+    "group_left": GroupLeftEvent,
+    "group_marked": GroupMarkedEvent,
+    "group_open": GroupOpenEvent,
+    "group_rename": GroupRenameEvent,
+    "group_unarchive": GroupUnarchiveEvent,
+    "hello": HelloEvent,
+    "im_close": ImCloseEvent,
+    "im_created": ImCreatedEvent,
+    "im_history_changed": ImHistoryChangedEvent,
+    "im_marked": ImMarkedEvent,
+    "im_open": ImOpenEvent,
+    "manual_presence_change": ManualPresenceChangeEvent,
+    "member_joined_channel": MemberJoinedChannelEvent,
+    "member_left_channel": MemberLeftChannelEvent,
+    "message": MessageEvent,
+    "pin_added": PinAddedEvent,
+    "pin_removed": PinRemovedEvent,
+    "pong": PongEvent,
+    "pref_change": PrefChangeEvent,
+    "presence_change": PresenceChangeEvent,
+    "reaction_added": ReactionAddedEvent,
+    "reaction_removed": ReactionRemovedEvent,
+    "reconnect_url": ReconnectUrlEvent,
+    "star_added": StarAddedEvent,
+    "star_removed": StarRemovedEvent,
+    "subteam_created": SubteamCreatedEvent,
+    "subteam_members_changed": SubteamMembersChangedEvent,
+    "subteam_self_added": SubteamSelfAddedEvent,
+    "subteam_self_removed": SubteamSelfRemovedEvent,
+    "subteam_updated": SubteamUpdatedEvent,
+    "team_domain_change": TeamDomainChangeEvent,
+    "team_join": TeamJoinEvent,
+    "team_migration_started": TeamMigrationStartedEvent,
+    "team_plan_change": TeamPlanChangeEvent,
+    "team_pref_change": TeamPrefChangeEvent,
+    "team_profile_change": TeamProfileChangeEvent,
+    "team_profile_delete": TeamProfileDeleteEvent,
+    "team_profile_reorder": TeamProfileReorderEvent,
+    "team_rename": TeamRenameEvent,
+    "user_change": UserChangeEvent,
+    "user_typing": UserTypingEvent,
+}
+
+EVENT_TYPES = frozenset(EVENT_CLASSES)
+
+
+def parse_event(data: typing.Mapping[str, typing.Any]) -> RtmEvent:
+    """Parse a raw event into the class generated for its type.
+
+    :param data: the raw SlackEvent
+    :return: the event, an UnknownRtmEvent if its type isn't in the schema
+    """
+
+    return EVENT_CLASSES.get(data.get("type"), UnknownRtmEvent).from_dict(data)
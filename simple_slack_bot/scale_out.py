@@ -0,0 +1,440 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import fcntl
+import itertools
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import traceback
+import typing
+import zlib
+
+from slack.errors import SlackApiError
+from slack.web.slack_response import SlackResponse
+from slacksocket.models import SlackEvent  # type: ignore
+
+if typing.TYPE_CHECKING:
+    from .simple_slack_bot import SimpleSlackBot  # pylint: disable=cyclic-import
+
+logger = logging.getLogger(__name__)
+
+# what a worker says first on connecting to the leader, telling apart the connection it receives events on from the
+# one it makes Web API calls through
+ROLE_EVENTS = "events"
+ROLE_CALLS = "calls"
+
+
+class OutboundWebClient:
+    """Stand in for the WebClient in worker processes, having the leader make every Web API call.
+
+    Each call is sent to the leader, which makes it with its own WebClient and sends back the response, so the call
+    returns a SlackResponse, or raises the SlackApiError, just as it would in the leader, while anything else the
+    leader raised is raised as a RuntimeError. Only the data, headers and status of responses are sent back, so they
+    can't be paginated. Calls from several threads take turns over the connection.
+    """
+
+    def __init__(self, connection: multiprocessing.connection.Connection):
+        """Initialize an OutboundWebClient.
+
+        :param connection: the connection to the leader, used for nothing else
+        """
+        self._connection = connection
+        self._lock = threading.Lock()
+
+    def __getattr__(self, method: str) -> typing.Callable[..., typing.Any]:
+        """Get a function having the leader make calls of a WebClient method.
+
+        :param method: the WebClient method name, such as chat_postMessage
+        :return: the function making the call
+        """
+
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        def make_call(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            with self._lock:
+                self._connection.send((method, args, kwargs))
+                outcome, value = self._connection.recv()
+
+            if outcome == "response":
+                return SlackResponse(client=None, req_args={}, **value)
+            if outcome == "slack_api_error":
+                raise SlackApiError(f"{method} failed in the leader", SlackResponse(client=None, req_args={}, **value))
+            if outcome == "error":
+                raise RuntimeError(f"{method} failed in the leader: {value}")
+            return value
+
+        return make_call
+
+
+class ScaleOut:
+    """Run the callbacks of a SimpleSlackBot in several processes, so CPU heavy callbacks can use every core.
+
+    A supervisor forks workers + 1 members. Whichever member holds an exclusive lock on a lock file is the leader:
+    it owns the SlackSocket, filters and deduplicates events as usual, and sends each event to a worker over a
+    Unix socket. Events of the same conversation, a message and the replies in its thread, always go to the same
+    worker while the workers stay the same, other events go round robin. Workers run the registered callbacks and
+    send the Web API calls made through their SlackRequest back over a second socket, for the leader to make,
+    waiting for its response. The lock is released by the kernel when the leader dies, so a worker takes it over
+    and reconnects to Slack, while the supervisor replaces the dead member.
+
+    Registrations must be made before run is called, as they are inherited by the forked members. Each member keeps
+    its own state from then on: conversations and cached replies are kept by the worker their conversation goes to,
+    and a RateLimiter allows its rate in each worker rather than across them all, which for a per user limit means
+    in each conversation's worker.
+    """
+
+    def __init__(
+        self,
+        simple_slack_bot: "SimpleSlackBot",
+        workers: int = 2,
+        poll_interval: float = 0.1,
+        restart_delay: float = 1.0,
+    ):
+        """Initialize a ScaleOut.
+
+        :param simple_slack_bot: the bot whose callbacks are run
+        :param workers: the number of processes running callbacks, besides the leader
+        :param poll_interval: How often, in seconds, workers check whether they were asked to stop
+        :param restart_delay: How often, in seconds, the supervisor checks for members to replace
+        """
+        if workers <= 0:
+            raise ValueError("workers must be a positive integer")
+
+        self.simple_slack_bot = simple_slack_bot
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.restart_delay = restart_delay
+
+        self._context = multiprocessing.get_context("fork")
+        self._leader_pid = self._context.Value("i", 0)
+        self._stopping = False
+        self._directory: typing.Union[str, None] = None
+        self._members: typing.List[multiprocessing.process.BaseProcess] = []
+
+    @property
+    def leader_pid(self) -> typing.Union[int, None]:
+        """Get the pid of the member currently owning the Slack connection.
+
+        :return: the pid, or None if no member has led yet
+        """
+
+        return self._leader_pid.value or None
+
+    @property
+    def lock_file(self) -> str:
+        """Get the path of the lock file held by the leader.
+
+        :return: the path of the lock file
+        """
+
+        return os.path.join(typing.cast(str, self._directory), "leader.lock")
+
+    @property
+    def address(self) -> str:
+        """Get the path of the Unix socket the leader listens on for workers.
+
+        :return: the path of the Unix socket
+        """
+
+        return os.path.join(typing.cast(str, self._directory), "leader.sock")
+
+    def run(self):
+        """Start the members and replace the ones that die, until asked to stop with SIGINT or SIGTERM."""
+
+        self._directory = tempfile.mkdtemp(prefix="simple-slack-bot-")
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+
+        try:
+            self._members = [self._start_member() for _ in range(self.workers + 1)]
+            logger.info("started %s members", len(self._members))
+
+            while not self._stopping:
+                for index, member in enumerate(self._members):
+                    if not member.is_alive() and not self._stopping:
+                        logger.warning("member %s exited with %s, replacing it", member.pid, member.exitcode)
+                        self._members[index] = self._start_member()
+                time.sleep(self.restart_delay)
+        finally:
+            for member in self._members:
+                if member.is_alive():
+                    os.kill(member.pid, signal.SIGTERM)
+            for member in self._members:
+                member.join()
+            shutil.rmtree(self._directory, ignore_errors=True)
+            logger.info("stopped all members")
+
+    def _stop(self, signal_number: int, _frame: typing.Any):
+        """Ask this process to stop, from a signal handler.
+
+        :param signal_number: the signal received
+        """
+
+        logger.info("received signal %s, stopping", signal_number)
+        self._stopping = True
+
+    def _start_member(self) -> multiprocessing.process.BaseProcess:
+        """Fork a new member.
+
+        :return: the started member process
+        """
+
+        member = self._context.Process(target=self._member, daemon=True)
+        member.start()
+        return member
+
+    def _member(self):
+        """Work as a worker until the lock file can be locked, then lead until stopped."""
+
+        self._stopping = False
+        self._members = []
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+
+        self.simple_slack_bot.connect_web_client()
+
+        with open(self.lock_file, "a") as lock_file:
+            while not self._stopping:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    self._work()
+                    continue
+
+                self._lead()
+                return
+
+    def _work(self):
+        """Run callbacks for the events sent by the leader, until the leader goes away or we are asked to stop."""
+
+        opened: typing.List[multiprocessing.connection.Connection] = []
+        try:
+            for role in (ROLE_EVENTS, ROLE_CALLS):
+                opened.append(multiprocessing.connection.Client(self.address, family="AF_UNIX"))
+                opened[-1].send(role)
+        except OSError:
+            # the leader isn't listening yet, or just died
+            for connection in opened:
+                connection.close()
+            time.sleep(self.poll_interval)
+            return
+
+        connection, calls = opened
+
+        outbound_web_client = OutboundWebClient(calls)
+        logger.info("worker %s connected to the leader", os.getpid())
+
+        with connection, calls:
+            while not self._stopping:
+                timeout = self.poll_interval
+                next_deferred_due = self.simple_slack_bot.run_deferred_callbacks()
+                if next_deferred_due is not None:
+                    timeout = min(timeout, next_deferred_due)
+
+                try:
+                    if not connection.poll(timeout):
+                        continue
+                    raw_slack_event, trace_context = connection.recv()
+                except (EOFError, OSError):
+                    logger.info("worker %s lost the leader", os.getpid())
+                    return
+
+                # the trace the leader started on receiving the SlackEvent, continued here
+                trace = self.simple_slack_bot._tracer.resume(trace_context)  # pylint: disable=protected-access
+                self.simple_slack_bot.dispatch_slack_event(SlackEvent(raw_slack_event), outbound_web_client, trace)
+
+    def _lead(self):
+        """Own the Slack connection, sending events to the workers and making their Web API calls."""
+
+        logger.info("member %s is now leading", os.getpid())
+        self._leader_pid.value = os.getpid()
+
+        # the lock guarantees whoever left this socket behind is dead
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        listener = multiprocessing.connection.Listener(self.address, family="AF_UNIX")
+
+        connections: typing.List[multiprocessing.connection.Connection] = []
+        connections_lock = threading.Lock()
+        threading.Thread(target=self._accept, args=(listener, connections, connections_lock), daemon=True).start()
+
+        # SlackSocket must be created from the main thread, as it installs its own signal handlers
+        self.simple_slack_bot.connect()
+        self.simple_slack_bot.dispatch_slack_event = self._forwarder(connections, connections_lock)
+        self.simple_slack_bot.listen()
+
+        listener.close()
+        with connections_lock:
+            for connection in connections:
+                connection.close()
+
+    def _accept(
+        self,
+        listener: multiprocessing.connection.Listener,
+        connections: typing.List[multiprocessing.connection.Connection],
+        connections_lock: threading.Lock,
+    ):
+        """Accept workers, sending events over the one connection of each and making the calls sent over the other.
+
+        :param listener: the listener workers connect to
+        :param connections: the connections to workers, added to as they connect
+        :param connections_lock: guards connections
+        """
+
+        while True:
+            try:
+                connection = listener.accept()
+            except OSError:
+                return
+
+            try:
+                role = connection.recv()
+            except (EOFError, OSError):
+                connection.close()
+                continue
+
+            if role == ROLE_EVENTS:
+                with connections_lock:
+                    connections.append(connection)
+            else:
+                threading.Thread(target=self._make_calls, args=(connection,), daemon=True).start()
+
+    def _make_calls(self, connection: multiprocessing.connection.Connection):
+        """Make the Web API calls sent by a worker, sending back each response, until it disconnects.
+
+        Catches all Exceptions raised by the calls, sending them back to be raised in the worker.
+
+        :param connection: the connection to the worker
+        """
+
+        python_slackclient = self.simple_slack_bot._python_slackclient  # pylint: disable=protected-access
+
+        with connection:
+            while True:
+                try:
+                    method, args, kwargs = connection.recv()
+                except (EOFError, OSError):
+                    return
+
+                try:
+                    outcome = self._outcome(getattr(python_slackclient, method)(*args, **kwargs))
+                except SlackApiError as slack_api_error:
+                    outcome = ("slack_api_error", self._fields(slack_api_error.response))
+                except Exception as exception:  # pylint: disable=broad-except
+                    logger.warning(
+                        "Unexpected exception caught making %s for a worker. Exception: %s",
+                        method,
+                        traceback.format_exc(),
+                    )
+                    outcome = ("error", repr(exception))
+
+                try:
+                    connection.send(outcome)
+                except OSError:
+                    return
+
+    @classmethod
+    def _outcome(cls, response: typing.Any) -> typing.Tuple[str, typing.Any]:
+        """Turn what a WebClient method returned into what is sent back to the worker.
+
+        :param response: the SlackResponse, or whatever else the method returned
+        :return: the kind of outcome and its value
+        """
+
+        if isinstance(response, SlackResponse):
+            return "response", cls._fields(response)
+        return "value", response
+
+    @staticmethod
+    def _fields(response: typing.Any) -> typing.Dict[str, typing.Any]:
+        """Get what a worker needs to rebuild a SlackResponse, leaving out the WebClient it refers to.
+
+        :param response: the SlackResponse
+        :return: its method, URL, data, headers and status
+        """
+
+        return {
+            "http_verb": getattr(response, "http_verb", "POST"),
+            "api_url": getattr(response, "api_url", ""),
+            "data": getattr(response, "data", response),
+            "headers": dict(getattr(response, "headers", None) or {}),
+            "status_code": getattr(response, "status_code", 200),
+        }
+
+    @staticmethod
+    def shard_key(slack_event: typing.Mapping) -> typing.Union[bytes, None]:
+        """Build the key picking the worker of a SlackEvent, the same for every SlackEvent of a conversation.
+
+        A conversation is the thread a SlackEvent was sent in, or the thread replies to a message would start, as
+        for SlackRequest.conversation.
+
+        :param slack_event: the raw SlackEvent
+        :return: the key, or None if the SlackEvent has no channel and ts
+        """
+
+        channel = slack_event.get("channel")
+        thread_ts = slack_event.get("thread_ts") or slack_event.get("ts")
+        if not isinstance(channel, str) or not thread_ts:
+            return None
+        return f"{channel}\0{thread_ts}".encode("utf-8")
+
+    def _forwarder(
+        self,
+        connections: typing.List[multiprocessing.connection.Connection],
+        connections_lock: threading.Lock,
+    ) -> typing.Callable[[SlackEvent], None]:
+        """Build the function sending each SlackEvent to a worker, or dispatching it here if there are none.
+
+        The worker is picked by the conversation of the SlackEvent, see shard_key, or round robin for SlackEvents
+        outside of a conversation. A traced SlackEvent gets a forward span and its trace is finished here, the
+        worker continuing it under a trace of its own with the same trace id.
+
+        :param connections: the connections to workers, removed from as they disconnect
+        :param connections_lock: guards connections
+        :return: the function replacing dispatch_slack_event
+        """
+
+        dispatch_here = self.simple_slack_bot.dispatch_slack_event
+        tracer = self.simple_slack_bot._tracer  # pylint: disable=protected-access
+        turns = itertools.count()
+
+        def forward(slack_event: SlackEvent):
+            trace = tracer.dispatch(slack_event)
+            forwarded = False
+            with trace.span("forward"):
+                while not forwarded:
+                    with connections_lock:
+                        if not connections:
+                            break
+                        key = self.shard_key(slack_event)
+                        turn = zlib.crc32(key) if key is not None else next(turns)
+                        connection = connections[turn % len(connections)]
+
+                    try:
+                        connection.send((dict(slack_event), trace.context))
+                        forwarded = True
+                    except OSError:
+                        with connections_lock:
+                            if connection in connections:
+                                connections.remove(connection)
+
+            if forwarded:
+                trace.finish()
+                return
+
+            logger.warning("no workers connected, dispatching in the leader")
+            dispatch_here(slack_event, trace=trace)
+
+        return forward
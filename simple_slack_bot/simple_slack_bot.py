@@ -3,22 +3,49 @@ which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
 """
 
 
+import difflib
+import functools
+import heapq
+import importlib
 import itertools
 import logging
 import logging.config
 import os
+import queue
 import sys
 import time
 import traceback
+import types
 import typing
 from logging import StreamHandler
 
+import slacksocket.client  # type: ignore
 import slacksocket.errors  # type: ignore
 from slack import WebClient
-from slacksocket import SlackSocket  # type: ignore
 from slacksocket.models import SlackEvent  # type: ignore
 
+from .broadcaster import Broadcaster, BroadcastReport, BroadcastResult
+from .callback_executor import EXECUTION_INLINE, EXECUTION_THREAD, EXECUTIONS, CallbackExecutor
+from .command_router import CommandRouter
+from .conversation_store import ConversationStore
+from .event_deduplicator import EventDeduplicator
+from .event_filter import EventFilter
+from .event_scheduler import EventScheduler
+from .file_uploader import FileUploader
+from .fast_slack_socket import FastSlackSocket
+from .health_server import HealthServer
+from .interaction_server import KIND_BLOCK_ACTION, KIND_SLASH_COMMAND, Interaction, InteractionServer
+from .job_scheduler import Job, JobScheduler
+from .json_backend import load_backend
+from .module_watcher import ModuleWatcher
+from .process_handoff import ProcessHandoff
+from .rate_limiter import RateLimiter
+from .rtm_events import EVENT_TYPES
+from .scale_out import ScaleOut
 from .slack_request import SlackRequest
+from .socket_reader import SocketReader
+from .tracer import NullTrace, Trace, Tracer
+from .workspace_state import WorkspaceState
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +60,13 @@ class SimpleSlackBot:
     KEYBOARD_INTERRUPT_EXCEPTION_LOG_MESSAGE = "KeyboardInterrupt exception caught."
     SYSTEM_INTERRUPT_EXCEPTION_LOG_MESSAGE = "SystemExit exception caught."
 
+    CONNECTION_STATES = {
+        slacksocket.client.STATE_STOPPED: "stopped",
+        slacksocket.client.STATE_INITIALIZED: "initialized",
+        slacksocket.client.STATE_CONNECTING: "connecting",
+        slacksocket.client.STATE_CONNECTED: "connected",
+    }
+
     @staticmethod
     def peek(
         iterator: typing.Iterator,
@@ -51,13 +85,59 @@ class SimpleSlackBot:
             return None
         return first, itertools.chain([first], iterator)
 
-    def __init__(self, slack_bot_token: str = None, debug: bool = False):
+    def __init__(
+        self,
+        slack_bot_token: str = None,
+        debug: bool = False,
+        event_deduplicator: EventDeduplicator = None,
+        event_filter: EventFilter = None,
+        event_scheduler: EventScheduler = None,
+        command_router: CommandRouter = None,
+        slack_api_url: str = None,
+        shutdown_timeout: float = 10.0,
+        process_handoff: ProcessHandoff = None,
+        callback_executor: CallbackExecutor = None,
+        conversation_store: ConversationStore = None,
+        job_scheduler: JobScheduler = None,
+        json_backend: str = None,
+        workspace_state: WorkspaceState = None,
+        socket_reader: SocketReader = None,
+        tracer: Tracer = None,
+        health_server: HealthServer = None,
+        interaction_server: InteractionServer = None,
+        file_uploader: FileUploader = None,
+    ):
         """Initialize our Slack bot and slack bot token.
 
         Will exit if the required environment variable is not set.
 
         :param slack_bot_token: The token given by Slack for API authentication
         :param debug: Whether or not to use default a Logging config
+        :param event_deduplicator: Drops redelivered events, defaults to an EventDeduplicator with default settings
+        :param event_filter: Drops our own events before dispatch, defaults to an EventFilter with default settings
+        :param event_scheduler: Orders events by priority before dispatch, defaults to an EventScheduler with default
+            settings
+        :param command_router: Routes messages to commands, defaults to a CommandRouter without a prefix
+        :param slack_api_url: The base URL of the Slack Web API, such as a local fake Slack for testing. Falls back to
+            the SLACK_API_URL environment variable, then to Slack itself
+        :param shutdown_timeout: The longest, in seconds, to spend dispatching already received events, and waiting
+            for callbacks running in threads and processes, when stopping
+        :param process_handoff: Optionally takes the connection over from a previous process before listening
+        :param callback_executor: Runs callbacks registered to a thread or a process, defaults to a
+            CallbackExecutor with default settings
+        :param conversation_store: Keeps the state of conversations held in threads, reachable from
+            SlackRequest.conversation, defaults to a ConversationStore with default settings
+        :param job_scheduler: Runs scheduled and periodic jobs from the listen loop, defaults to a JobScheduler
+        :param json_backend: Decodes incoming events, one of orjson, ujson or json. Defaults to the fastest installed
+        :param workspace_state: Keeps the users and channels the helpers read, updated from events, defaults to a
+            WorkspaceState with default settings
+        :param socket_reader: Optionally reads the socket on a thread of its own, so it is read while callbacks run
+        :param tracer: Traces a sample of events from when they were posted to when they were handled, defaults to
+            a Tracer without an exporter, which traces nothing
+        :param health_server: Optionally serves the health of the bot over HTTP while it listens
+        :param interaction_server: Optionally receives slash commands and interactions over HTTP while it listens
+        :param file_uploader: Uploads the files of SlackRequest.upload, within one rate limit, defaults to a
+            FileUploader with default settings
         """
 
         # fetch a slack_bot_token first checking params, then environment variable otherwise
@@ -71,11 +151,78 @@ class SimpleSlackBot:
                 "ERROR: SLACK_BOT_TOKEN not passed to constructor or set as environment variable"
             )
 
+        # the Slack Web API is only overridden when explicitly configured
+        if slack_api_url is None:
+            slack_api_url = os.environ.get("SLACK_API_URL") or None
+        self._slack_api_url = slack_api_url
+
+        self._shutdown_timeout = shutdown_timeout
+        self._process_handoff = process_handoff
+        self.last_drain_report: typing.Union[typing.Dict[str, float], None] = None
+
         if debug:
             # enable logging additional debug logging
             logger.addHandler(StreamHandler())
             logger.setLevel(logging.DEBUG)
 
+        if event_deduplicator is None:
+            event_deduplicator = EventDeduplicator()
+        self._event_deduplicator = event_deduplicator
+
+        if event_filter is None:
+            event_filter = EventFilter()
+        self._event_filter = event_filter
+
+        if event_scheduler is None:
+            event_scheduler = EventScheduler()
+        self._event_scheduler = event_scheduler
+
+        if command_router is None:
+            command_router = CommandRouter()
+        self._command_router = command_router
+
+        if callback_executor is None:
+            callback_executor = CallbackExecutor()
+        self._callback_executor = callback_executor
+
+        if conversation_store is None:
+            conversation_store = ConversationStore()
+        self._conversation_store = conversation_store
+
+        if job_scheduler is None:
+            job_scheduler = JobScheduler()
+        self._job_scheduler = job_scheduler
+
+        self._json_backend = load_backend(json_backend)
+
+        if workspace_state is None:
+            workspace_state = WorkspaceState()
+        self._workspace_state = workspace_state
+        self._workspace_check_job: typing.Union[Job, None] = None
+
+        self._socket_reader = socket_reader
+
+        if tracer is None:
+            tracer = Tracer()
+        self._tracer = tracer
+
+        # kept up to date as we go, for health to read without blocking
+        self._health_server = health_server
+        self._listening = False
+        self._last_event_at: typing.Union[float, None] = None
+        self._dispatching_since: typing.Union[float, None] = None
+        self._dispatch_lag = 0.0
+
+        self._interaction_server = interaction_server
+
+        if file_uploader is None:
+            file_uploader = FileUploader()
+        self._file_uploader = file_uploader
+
+        # callbacks deferred by a rate limit, as a heap of (due time, sequence number, callback)
+        self._deferred_callbacks: typing.List[typing.Tuple[float, int, typing.Callable[[], typing.Any]]] = []
+        self._deferred_sequence = itertools.count()
+
         logger.info("initialized. Ready to connect")
 
     def connect(self):
@@ -88,9 +235,14 @@ class SimpleSlackBot:
 
         logger.info("Connecting...")
 
-        self._python_slackclient = WebClient(self._slack_bot_token)
-        self._slack_socket = SlackSocket(self._slack_bot_token)
-        self._bot_id = self._python_slackclient.auth_test()["bot_id"]
+        self.connect_web_client()
+        self._slack_socket = FastSlackSocket(
+            self._slack_bot_token, json_backend=self._json_backend, api_url=self._slack_api_url
+        )
+        auth_test_response = self._python_slackclient.auth_test()
+        self._bot_id = auth_test_response["bot_id"]
+        self._event_filter.set_self_ids(self._bot_id, auth_test_response.get("user_id"))
+        self.sync_workspace()
 
         logger.info(
             "Connected. Set bot id to %s with name %s",
@@ -98,19 +250,62 @@ class SimpleSlackBot:
             self.helper_user_id_to_user_name(self._bot_id),
         )
 
-    def register(self, event_type: str) -> typing.Callable[..., typing.Any]:
+    def connect_web_client(self):
+        """Create the WebClient used for Slack Web API calls, without connecting to the underlying SlackSocket."""
+        # pylint: disable=attribute-defined-outside-init
+
+        if self._slack_api_url is None:
+            self._python_slackclient = WebClient(self._slack_bot_token)
+        else:
+            self._python_slackclient = WebClient(self._slack_bot_token, base_url=self._slack_api_url)
+
+    def sync_workspace(self):
+        """Load a snapshot of the workspace for the helpers to read, and schedule checking it for drift."""
+
+        self._workspace_state.load(self._python_slackclient)
+
+        if self._workspace_check_job is None and self._workspace_state.check_interval is not None:
+            self._workspace_check_job = self._job_scheduler.every(
+                self._workspace_state.check_interval, self.check_workspace, name="workspace state check"
+            )
+
+    def check_workspace(self, *_: typing.Any) -> int:
+        """Compare the users and channels the helpers read with a fresh snapshot, adopting the snapshot.
+
+        :return: how many users and channels had drifted
+        """
+
+        return self._workspace_state.check(self._python_slackclient)
+
+    def register(
+        self, event_type: str, rate_limit: RateLimiter = None, execution: str = EXECUTION_INLINE
+    ) -> typing.Callable[..., typing.Any]:
         """Register a callback function to a a event type.
 
-        All supported even types are defined here https://api.slack.com/events-api
+        All supported even types are defined here https://api.slack.com/rtm and listed in rtm_events.json
 
         :param event_type: the type of the event to register
+        :param rate_limit: optionally throttles the events reaching this callback, see RateLimiter
+        :param execution: where the callback runs: inline in the listen loop, in a thread or in a process, see
+            CallbackExecutor
         :return: reference to wrapped function
+        :raises ValueError: If event_type is not an RTM event type, or execution is not one of inline, thread or
+            process
         """
 
+        if event_type not in EVENT_TYPES:
+            suggestions = difflib.get_close_matches(event_type, EVENT_TYPES, n=1)
+            hint = f", did you mean {suggestions[0]}?" if suggestions else ""
+            raise ValueError(f"{event_type} is not an RTM event type{hint}")
+
+        if execution not in EXECUTIONS:
+            raise ValueError(f"execution must be one of {', '.join(EXECUTIONS)}, not {execution}")
+
         def function_wrapper(callback: typing.Callable):
             """Register event before executing wrapped function, referred to as callback.
 
             :param callback: function to execute after runnign wrapped code
+            :return: the callback, unchanged
             """
             # Disable all the attribute-defined-out-init in this function
             # pylint: disable=attribute-defined-outside-init
@@ -122,10 +317,287 @@ class SimpleSlackBot:
             if event_type not in self._registrations:
                 # first registration of this type
                 self._registrations[event_type] = []
-            self._registrations[event_type].append(callback)
+
+            registered_callback = self._callback_executor.wrap(callback, execution)
+            if rate_limit is not None:
+                registered_callback = self._rate_limited(registered_callback, rate_limit)
+            self._registrations[event_type].append(registered_callback)
+
+            # the callback itself stays bound to its name, so it can still be sent to a process
+            return callback
 
         return function_wrapper
 
+    def command(
+        self, name: str, help_text: str = None, rate_limit: RateLimiter = None
+    ) -> typing.Callable[..., typing.Any]:
+        """Register a callback function to a command word, such as "roll" in "roll 2d6".
+
+        The callback is called as callback(request, *arguments). Its parameters after request are filled from the
+        words following the command word, converted by their type annotations, and a usage message is written back
+        whenever they don't fit.
+
+        :param name: the command word
+        :param help_text: an optional description appended to the usage message
+        :param rate_limit: optionally throttles the calls of this command, see RateLimiter
+        :return: reference to wrapped function
+        """
+
+        def function_wrapper(callback: typing.Callable):
+            """Register command before executing wrapped function, referred to as callback.
+
+            :param callback: function to execute after running wrapped code
+            """
+
+            # the router is registered to messages once, with the first command
+            if self._command_router.route not in getattr(self, "_registrations", {}).get("message", []):
+                self.register("message")(self._command_router.route)
+            if rate_limit is None:
+                self._command_router.add(name, callback, help_text)
+            else:
+                self._command_router.add(name, self._rate_limited(callback, rate_limit), help_text)
+
+            return callback
+
+        return function_wrapper
+
+    def slash_command(self, name: str) -> typing.Callable[..., typing.Any]:
+        """Register a callback function to a slash command, such as /roll, called as callback(interaction).
+
+        Slack is acknowledged before the callback runs, in a thread, so it may take its time and answer through
+        interaction.respond. See InteractionServer.
+
+        :param name: the slash command, with its leading slash
+        :return: reference to wrapped function
+        :raises ValueError: If we have no InteractionServer
+        """
+
+        return self._interaction(KIND_SLASH_COMMAND, name)
+
+    def action(self, action_id: str) -> typing.Callable[..., typing.Any]:
+        """Register a callback function to clicks on the interactive elements, such as buttons, of an action_id.
+
+        Called as callback(interaction), like slash_command.
+
+        :param action_id: the action_id of the elements
+        :return: reference to wrapped function
+        :raises ValueError: If we have no InteractionServer
+        """
+
+        return self._interaction(KIND_BLOCK_ACTION, action_id)
+
+    def _interaction(self, kind: str, name: str) -> typing.Callable[..., typing.Any]:
+        """Register a callback function to a slash command or action_id with our InteractionServer.
+
+        :param kind: one of slash_command or block_action
+        :param name: the slash command or action_id
+        :return: reference to wrapped function
+        :raises ValueError: If we have no InteractionServer
+        """
+
+        if self._interaction_server is None:
+            raise ValueError("pass an InteractionServer to SimpleSlackBot to receive slash commands and actions")
+
+        def function_wrapper(callback: typing.Callable[[Interaction], typing.Any]):
+            """Register the wrapped function, referred to as callback.
+
+            :param callback: function to run in a thread once Slack was acknowledged
+            :return: the callback, unchanged
+            """
+
+            self._interaction_server.add(kind, name, self._callback_executor.wrap(callback, EXECUTION_THREAD))
+            return callback
+
+        return function_wrapper
+
+    def every(
+        self, interval: float, name: str = None, delay: float = None
+    ) -> typing.Callable[..., typing.Any]:
+        """Register a job, called as callback(simple_slack_bot) every interval seconds while listening.
+
+        :param interval: the seconds between runs
+        :param name: a name for the job, defaults to the name of the callback
+        :param delay: how long to wait before the first run, defaults to interval
+        :return: reference to wrapped function
+        """
+
+        def function_wrapper(callback: typing.Callable):
+            """Schedule the wrapped function, referred to as callback.
+
+            :param callback: function to run
+            :return: the callback, unchanged
+            """
+
+            self._job_scheduler.every(interval, callback, name, delay)
+            return callback
+
+        return function_wrapper
+
+    def cron(self, expression: str, name: str = None) -> typing.Callable[..., typing.Any]:
+        """Register a job, called as callback(simple_slack_bot) on a cron schedule, in local time, while listening.
+
+        :param expression: the cron expression, such as "0 9 * * 1-5" for 9am on weekdays, see CronSchedule
+        :param name: a name for the job, defaults to the name of the callback
+        :return: reference to wrapped function
+        """
+
+        def function_wrapper(callback: typing.Callable):
+            """Schedule the wrapped function, referred to as callback.
+
+            :param callback: function to run
+            :return: the callback, unchanged
+            """
+
+            self._job_scheduler.cron(expression, callback, name)
+            return callback
+
+        return function_wrapper
+
+    def once(self, delay: float, callback: typing.Callable[..., typing.Any], name: str = None) -> Job:
+        """Schedule a job, called once as callback(simple_slack_bot) after delay seconds, such as a reminder.
+
+        :param delay: how long to wait, in seconds
+        :param callback: the function to run
+        :param name: a name for the job, defaults to the name of the callback
+        :return: the Job, which can be cancelled
+        """
+
+        return self._job_scheduler.once(delay, callback, name)
+
+    def watch(
+        self, *modules: typing.Union[str, types.ModuleType], interval: float = 1.0
+    ) -> Job:
+        """Reload modules of callbacks whenever their source changes, while listening. See reload.
+
+        :param modules: the modules to watch, or their names
+        :param interval: how often, in seconds, to check the modules for changes
+        :return: the Job checking them, which can be cancelled
+        """
+
+        watcher = ModuleWatcher(modules)
+
+        def reload_changed(*_: typing.Any):
+            for module in watcher.changed():
+                self.reload(module)
+
+        return self._job_scheduler.every(interval, reload_changed, name="hot reload")
+
+    def reload(self, module: types.ModuleType) -> bool:
+        """Reload a module of callbacks, swapping what it registers now for what it registered before.
+
+        The callbacks, commands, slash commands, actions and jobs the module registered are set aside, the module is
+        reloaded, registering them anew, and the result replaces them at once. Called from the listen loop, as watch
+        does, no event ever sees half of it, and the connection, caches and queued events are left alone. Should
+        reloading raise, the previous registrations are put back.
+
+        The module must register to a bot it imports rather than creates, or reloading it makes another bot.
+
+        :param module: the module to reload
+        :return: True if it was reloaded, False if reloading raised
+        """
+        # pylint: disable=attribute-defined-outside-init
+
+        name = module.__name__
+
+        def registered_elsewhere(callback: typing.Callable) -> bool:
+            return getattr(callback, "__module__", None) != name
+
+        previous_registrations = getattr(self, "_registrations", {})
+        previous_commands = self._command_router.commands()
+        interaction_server = self._interaction_server
+        previous_interactions = interaction_server.callbacks() if interaction_server is not None else {}
+        previous_jobs = [job for job in self._job_scheduler.jobs() if not registered_elsewhere(job.callback)]
+
+        self._registrations = {
+            event_type: [callback for callback in callbacks if registered_elsewhere(callback)]
+            for event_type, callbacks in previous_registrations.items()
+        }
+        self._command_router.replace(
+            {word: command for word, command in previous_commands.items() if registered_elsewhere(command.callback)}
+        )
+        if interaction_server is not None:
+            interaction_server.replace(
+                {key: callback for key, callback in previous_interactions.items() if registered_elsewhere(callback)}
+            )
+
+        try:
+            importlib.reload(module)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                "could not reload %s, keeping its previous callbacks. Exception %s", name, traceback.format_exc()
+            )
+            self._registrations = previous_registrations
+            self._command_router.replace(previous_commands)
+            if interaction_server is not None:
+                interaction_server.replace(previous_interactions)
+            for job in self._job_scheduler.jobs():
+                if not registered_elsewhere(job.callback) and job not in previous_jobs:
+                    job.cancel()
+            return False
+
+        for job in previous_jobs:
+            job.cancel()
+        logger.info("reloaded %s", name)
+        return True
+
+    def _rate_limited(
+        self, callback: typing.Callable, rate_limiter: RateLimiter
+    ) -> typing.Callable[..., typing.Any]:
+        """Wrap a callback so it only runs when its rate limit allows it, otherwise dropping or deferring it.
+
+        :param callback: the callback to throttle
+        :param rate_limiter: the RateLimiter deciding whether the callback runs
+        :return: the throttled callback
+        """
+
+        @functools.wraps(callback)
+        def rate_limited_callback(request: SlackRequest, *arguments: typing.Any):
+            delay = rate_limiter.acquire(rate_limiter.key_for(request.slack_event))
+            if delay is None:
+                return None
+            if delay > 0:
+                self.defer(delay, functools.partial(callback, request, *arguments))
+                return None
+            return callback(request, *arguments)
+
+        return rate_limited_callback
+
+    def defer(self, delay: float, callback: typing.Callable[[], typing.Any]):
+        """Call a callback, taking no arguments, from the listen loop once delay seconds have passed.
+
+        :param delay: how long to wait, in seconds
+        :param callback: the function to call
+        """
+
+        heapq.heappush(
+            self._deferred_callbacks,
+            (time.monotonic() + delay, next(self._deferred_sequence), callback),
+        )
+
+    def run_deferred_callbacks(self) -> typing.Union[float, None]:
+        """Call every deferred callback that is due.
+
+        Catches and logs all Exceptions raised by the callbacks.
+
+        :return: the seconds until the next deferred callback is due, or None if nothing is deferred
+        """
+
+        while self._deferred_callbacks:
+            due, _, callback = self._deferred_callbacks[0]
+            remaining = due - time.monotonic()
+            if remaining > 0:
+                return remaining
+
+            heapq.heappop(self._deferred_callbacks)
+            try:
+                callback()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(
+                    "exception processing deferred callback. Exception %s", traceback.format_exc()
+                )
+
+        return None
+
     def route_request_to_callbacks(self, request: SlackRequest):
         """Route the request to the correct notify.
 
@@ -144,7 +616,8 @@ class SimpleSlackBot:
         if request.type in self._registrations and request.subtype is None:
             for callback in self._registrations[request.type]:
                 try:
-                    callback(request)
+                    with request.trace.span("callback", callback=getattr(callback, "__name__", repr(callback))):
+                        callback(request)
                 except Exception:  # pylint: disable=broad-except
                     logger.exception(
                         "exception processing event %s . Exception %s",
@@ -152,13 +625,122 @@ class SimpleSlackBot:
                         traceback.format_exc(),
                     )
 
-    def extract_slack_socket_response(self) -> typing.Union[SlackEvent, None]:
+    def enqueue_slack_event(self, slack_event: SlackEvent):
+        """Queue a SlackEvent for dispatch, unless it is filtered out or a redelivery of an event already handled.
+
+        :param slack_event: the SlackEvent read from the underlying _slack_socket
+        """
+
+        self._last_event_at = time.time()
+
+        # before filtering, as the users and channels changed may well be bots
+        self._workspace_state.apply(slack_event)
+
+        if self._event_filter.should_ignore(slack_event):
+            return
+
+        if self._event_deduplicator.is_duplicate(slack_event):
+            return
+
+        self._tracer.receive(slack_event)
+        self._event_scheduler.put(slack_event)
+
+    def dispatch_next_slack_event(self) -> bool:
+        """Wrap the next queued SlackEvent, by priority, in a SlackRequest and route it to callbacks.
+
+        :return: True if an event was dispatched, False if nothing was queued
+        """
+
+        if self._socket_reader is not None:
+            slack_event = self._socket_reader.take()
+        else:
+            slack_event = self._event_scheduler.get()
+        if slack_event is None:
+            return False
+
+        self._dispatching_since = time.time()
+        # event_ts is when the event happened, as is the ts of a message, while the ts of other events, such as
+        # channel_marked, points at an older message
+        happened_at = slack_event.get("event_ts") or (slack_event.get("ts") if slack_event.type == "message" else None)
+        if happened_at:
+            try:
+                self._dispatch_lag = max(self._dispatching_since - float(happened_at), 0.0)
+            except (TypeError, ValueError):
+                pass
+
+        try:
+            self.dispatch_slack_event(slack_event)
+        finally:
+            self._dispatching_since = None
+        return True
+
+    def dispatch_slack_event(
+        self,
+        slack_event: SlackEvent,
+        python_slackclient: typing.Any = None,
+        trace: typing.Union[Trace, NullTrace] = None,
+    ):
+        """Wrap a SlackEvent in a SlackRequest and route it to callbacks.
+
+        :param slack_event: the SlackEvent to dispatch
+        :param python_slackclient: the WebClient the SlackRequest writes through, defaults to ours
+        :param trace: the Trace of the SlackEvent, finished once it is routed, defaults to the one our Tracer started
+            on receiving it
+        """
+
+        if python_slackclient is None:
+            python_slackclient = self._python_slackclient
+
+        if trace is None:
+            trace = self._tracer.dispatch(slack_event)
+        try:
+            self.route_request_to_callbacks(
+                SlackRequest(python_slackclient, slack_event, self._conversation_store, trace, self._file_uploader)
+            )
+        finally:
+            trace.finish()
+
+    def drain_slack_socket(self, max_events: int):
+        """Queue the SlackEvents already received by the underlying _slack_socket, without blocking.
+
+        Catch all SlackSocket exceptions except for ExitError, treating those as warnings.
+
+        :param max_events: the maximum number of events to read, so a busy socket can't starve dispatch
+        """
+
+        for _ in range(max_events):
+            try:
+                slack_event = self._slack_socket.get_event(timeout=0)
+            except queue.Empty:
+                return
+            except (
+                slacksocket.errors.APIError,
+                slacksocket.errors.ConfigError,
+                slacksocket.errors.APINameError,
+                slacksocket.errors.ConnectionError,
+                slacksocket.errors.TimeoutError,
+            ):
+                logging.warning(
+                    "Unexpected exception caught, but we will keep listening. Exception: %s",
+                    traceback.format_exc(),
+                )
+                return
+
+            self.enqueue_slack_event(slack_event)
+
+    def extract_slack_socket_response(
+        self, idle_timeout: float = None
+    ) -> typing.Union[SlackEvent, None]:
         """Extract a useable response from the underlying _slack_socket.
 
         Catch all SlackSocket exceptions except forExitError, treating those as warnings.
+
+        :param idle_timeout: the most seconds to block waiting for an event, blocking until one arrives if None
         """
         try:
-            return self.peek(self._slack_socket.events())
+            if idle_timeout is None:
+                return self.peek(self._slack_socket.events())
+            return self.peek(self._slack_socket.events(idle_timeout=idle_timeout))
         except (
             slacksocket.errors.APIError,
             slacksocket.errors.ConfigError,
@@ -182,28 +764,50 @@ class SimpleSlackBot:
         our application would not respond to a request from the user to stop the program with a CTRL + C.
         """
 
-        read_websocket_delay = 1  # 1 second delay between reading from fire hose
         running = True
+        self._listening = True
+
+        if self._health_server is not None:
+            self._health_server.start(self.health)
+        if self._interaction_server is not None:
+            self._interaction_server.start(getattr(self, "_python_slackclient", None))
+
+        if self._socket_reader is not None:
+            self._socket_reader.start(self._slack_socket, self.enqueue_slack_event, self._event_scheduler)
 
         logger.info("began listening!")
 
         # required to continue to run after experiencing an unexpected exception
         while running:
-            response = None
-
             try:
-                while response is None:
-                    response = self.extract_slack_socket_response()
+                next_deferred_due = self.run_deferred_callbacks()
+                next_job_due = self._job_scheduler.run_due(self)
+                if next_deferred_due is None or (next_job_due is not None and next_job_due < next_deferred_due):
+                    next_deferred_due = next_job_due
+
+                if self._socket_reader is not None:
+                    # the reader fills the EventScheduler meanwhile, we only wait for it when it is empty
+                    self._socket_reader.wait(next_deferred_due)
+                    if self._socket_reader.exited:
+                        raise slacksocket.errors.ExitError("socket reader stopped")
+                else:
+                    # only block on the socket when there is nothing left to dispatch, and no longer than the next
+                    # deferred callback or job allows
+                    if len(self._event_scheduler) == 0:
+                        response = self.extract_slack_socket_response(next_deferred_due)
+                        if response is not None:
+                            slack_event, _ = response
+                            self.enqueue_slack_event(slack_event)
+
+                    # pull in everything that arrived meanwhile, so the scheduler can pick the most important event
+                    self.drain_slack_socket(self._event_scheduler.overload_threshold)
             except slacksocket.errors.ExitError:
                 logging.info(self.KEYBOARD_INTERRUPT_EXCEPTION_LOG_MESSAGE)
                 running = False
                 break  # ensuring the loop stops and execution ceases
 
-            slack_event, _ = response
             try:
-                self.route_request_to_callbacks(SlackRequest(self._python_slackclient, slack_event))
-
-                time.sleep(read_websocket_delay)
+                self.dispatch_next_slack_event()
             except Exception:  # pylint: disable=broad-except
                 logging.warning(
                     "Unexpected exception caught, but we will keep listening. Exception: %s",
@@ -211,17 +815,136 @@ class SimpleSlackBot:
                 )
                 continue  # ensuring the loop continues
 
-    logger.info("stopped listening!")
+        if self._socket_reader is not None:
+            self._socket_reader.stop()
+        self.last_drain_report = self.drain(self._shutdown_timeout)
+        # let callbacks running in threads and processes finish, and their writes be made, within what is left of
+        # the shutdown timeout
+        self._callback_executor.shutdown(
+            timeout=max(self._shutdown_timeout - self.last_drain_report["elapsed"], 0.0)
+        )
+        self._conversation_store.close()
+        self._tracer.shutdown()
+        self._listening = False
+        if self._health_server is not None:
+            self._health_server.stop()
+        if self._interaction_server is not None:
+            self._interaction_server.stop()
+        logger.info("stopped listening!")
+
+    def health(self) -> typing.Dict[str, typing.Any]:
+        """Get the health of the bot, without blocking, from counters kept as it goes. See HealthServer.
+
+        :return: whether we are listening, the connection state and since when, when the last event arrived, how
+            many events wait for dispatch, the dispatch lag, how long the current dispatch has been running and the
+            number of callbacks deferred or running in a thread or process
+        """
+
+        now = time.time()
+        slack_socket = getattr(self, "_slack_socket", None)
+        connection = self.CONNECTION_STATES.get(getattr(slack_socket, "_state", None), "not connected")
+        connected_since = slack_socket.stats().get("connected_since") if slack_socket is not None else None
+        dispatching_since = self._dispatching_since
+        stalled_for = now - dispatching_since if dispatching_since is not None else 0.0
+        queue_depth = len(self._event_scheduler)
+
+        return {
+            "listening": self._listening,
+            "connection": connection,
+            "connected_since": connected_since or None,
+            "last_event_at": self._last_event_at,
+            "seconds_since_last_event": now - self._last_event_at if self._last_event_at is not None else None,
+            "queue_depth": queue_depth,
+            # events waiting behind a stalled dispatch are at least that late, and with none waiting we are caught up
+            "dispatch_lag": max(self._dispatch_lag, stalled_for) if queue_depth else 0.0,
+            "stalled_for": stalled_for,
+            "outbound_backlog": len(self._deferred_callbacks) + self._callback_executor.pending,
+        }
+
+    def drain(self, timeout: float) -> typing.Dict[str, float]:
+        """Dispatch every event already queued, and run deferred callbacks as they come due, until timeout.
+
+        Called once we have stopped reading from the underlying _slack_socket, so nothing already received is lost
+        when stopping, for example on a SIGTERM during a deploy. Anything left once timeout has passed is dropped.
+
+        :param timeout: the longest, in seconds, to spend draining
+        :return: how many events were dispatched and dropped, how many deferred callbacks were dropped and how
+            long draining took
+        """
+
+        start = time.monotonic()
+        deadline = start + timeout
+        dispatched = 0
+
+        logger.info(
+            "draining %s queued events and %s deferred callbacks",
+            len(self._event_scheduler),
+            len(self._deferred_callbacks),
+        )
+
+        while time.monotonic() < deadline:
+            next_deferred_due = self.run_deferred_callbacks()
+
+            if len(self._event_scheduler) > 0:
+                try:
+                    self.dispatch_next_slack_event()
+                except Exception:  # pylint: disable=broad-except
+                    logging.warning(
+                        "Unexpected exception caught while draining. Exception: %s",
+                        traceback.format_exc(),
+                    )
+                dispatched += 1
+            elif next_deferred_due is not None and time.monotonic() + next_deferred_due < deadline:
+                time.sleep(next_deferred_due)
+            else:
+                break
+
+        dropped_deferred = len(self._deferred_callbacks)
+        dropped = []
+        slack_event = self._event_scheduler.get()
+        while slack_event is not None:
+            dropped.append(slack_event)
+            slack_event = self._event_scheduler.get()
+        self._deferred_callbacks.clear()
+        # so they aren't handed over as seen, and the next process handles them when Slack delivers them again
+        self._event_deduplicator.forget(dropped)
+        dropped_events = len(dropped)
+
+        report = {
+            "dispatched": dispatched,
+            "dropped_events": dropped_events,
+            "dropped_deferred": dropped_deferred,
+            "elapsed": time.monotonic() - start,
+        }
+        if dropped_events or dropped_deferred:
+            logger.warning("drain timed out, dropped %s", report)
+        else:
+            logger.info("drained %s", report)
+
+        return report
+
+    def start(self, workers: int = 0):
+        """Connect the Slack bot to the chatroom and begin listening.
+
+        :param workers: when positive, run callbacks in this many worker processes, see ScaleOut
+        """
 
-    def start(self):
-        """Connect the Slack bot to the chatroom and begin listening."""
+        if workers > 0:
+            ScaleOut(self, workers).run()
+            return
 
         self.connect()
         ok_reponse = self._python_slackclient.rtm_start()
 
         if ok_reponse:
             logger.info("started!")
+            if self._process_handoff is not None:
+                self._process_handoff.take_over(self._event_deduplicator)
+
             self.listen()
+
+            if self._process_handoff is not None:
+                self._process_handoff.hand_over(self._event_deduplicator)
         else:
             logger.error(
                 "Connection failed. Are you connected to the internet? Potentially invalid Slack token? "
@@ -230,6 +953,75 @@ class SimpleSlackBot:
 
         logger.info("stopped!")
 
+    def helper_write(self, channel: str, content: str):
+        """Write a message to a channel as the bot, for example from a job.
+
+        :param channel: the id of the channel to write to
+        :param content: The text you wish to send
+        """
+
+        self._python_slackclient.chat_postMessage(channel=channel, text=content)
+
+    def broadcast(
+        self,
+        content: str,
+        channel_ids: typing.Iterable[str],
+        journal_path: str = None,
+        progress: typing.Callable[[BroadcastResult, int, int], typing.Any] = None,
+        max_workers: int = 4,
+        rate: float = 1.0,
+    ) -> BroadcastReport:
+        """Post a message to many channels concurrently, within rate limits, blocking until done. See Broadcaster.
+
+        :param content: The text you wish to send
+        :param channel_ids: the ids of the channels to post to
+        :param journal_path: Optionally where the channels posted to are recorded, so a failed broadcast can be run
+            again to finish it
+        :param progress: Optionally called as progress(result, done, total) as each channel is finished
+        :param max_workers: How many posts may be in flight at once
+        :param rate: How many posts per second to make at most
+        :return: the result for each channel
+        """
+
+        broadcaster = Broadcaster(
+            self._python_slackclient,
+            max_workers=max_workers,
+            rate=rate,
+            journal_path=journal_path,
+            progress=progress,
+        )
+        return broadcaster.broadcast(content, channel_ids)
+
+    def _users(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        """Get all users, from the WorkspaceState once it is loaded, otherwise from the Web API.
+
+        :return: list of users
+        """
+
+        if self._workspace_state.synced:
+            return list(self._workspace_state.users.values())
+        return self._python_slackclient.users_list()["members"]
+
+    def _public_channels(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        """Get all public channels, from the WorkspaceState once it is loaded, otherwise from the Web API.
+
+        :return: list of public channels
+        """
+
+        if self._workspace_state.synced:
+            return list(self._workspace_state.channels.values())
+        return self._python_slackclient.channels_list()["channels"]
+
+    def _private_channels(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        """Get all private channels, from the WorkspaceState once it is loaded, otherwise from the Web API.
+
+        :return: list of private channels
+        """
+
+        if self._workspace_state.synced:
+            return list(self._workspace_state.groups.values())
+        return self._python_slackclient.groups_list()["groups"]
+
     def helper_get_public_channel_ids(self) -> typing.List[str]:
         """Get all public channel ids.
 
@@ -238,15 +1030,13 @@ class SimpleSlackBot:
 
         public_channel_ids = []
 
-        if self._python_slackclient and self._python_slackclient.channels_list():
-            public_channels = self._python_slackclient.channels_list()["channels"]
-            for channel in public_channels:
-                public_channel_ids.append(channel["id"])
+        for channel in self._public_channels():
+            public_channel_ids.append(channel["id"])
 
-            if len(public_channel_ids) == 0:
-                logger.warning("got no public channel ids")
-            else:
-                logger.debug("got public channel ids %s", public_channel_ids)
+        if len(public_channel_ids) == 0:
+            logger.warning("got no public channel ids")
+        else:
+            logger.debug("got public channel ids %s", public_channel_ids)
 
         return public_channel_ids
 
@@ -258,7 +1048,7 @@ class SimpleSlackBot:
 
         private_channel_ids: typing.List[str] = []
 
-        for private_channel in self._python_slackclient.groups_list()["groups"]:
+        for private_channel in self._private_channels():
             private_channel_ids.append(private_channel["id"])
 
         if len(private_channel_ids) == 0:
@@ -276,7 +1066,7 @@ class SimpleSlackBot:
 
         user_ids = []
 
-        for user in self._python_slackclient.users_list()["members"]:
+        for user in self._users():
             user_ids.append(user["id"])
 
         if len(user_ids) == 0:
@@ -294,7 +1084,7 @@ class SimpleSlackBot:
 
         user_names = []
 
-        for user in self._python_slackclient.users_list()["members"]:
+        for user in self._users():
             user_names.append(user["name"])
 
         if len(user_names) == 0:
@@ -313,7 +1103,7 @@ class SimpleSlackBot:
 
         user_ids = []
 
-        for channel in self._python_slackclient.channels_list()["channels"]:
+        for channel in self._public_channels():
             if channel["id"] == channel_id:
                 for user_id in channel["members"]:
                     user_ids.append(user_id)
@@ -332,7 +1122,7 @@ class SimpleSlackBot:
         :return: id representation of original channel name
         """
 
-        for channel in self._python_slackclient.channels_list()["channels"]:
+        for channel in self._public_channels():
             if channel["name"] == name:
                 logger.debug("converted %s to %s", channel["name"], channel["id"])
                 return channel["id"]
@@ -347,7 +1137,7 @@ class SimpleSlackBot:
         :return: id representation of original user name
         """
 
-        for user in self._python_slackclient.users_list()["members"]:
+        for user in self._users():
             if user["name"] == name:
                 logger.debug("converted %s to %s", name, user["id"])
                 return user["id"]
@@ -362,7 +1152,7 @@ class SimpleSlackBot:
         :return: name representation of original channel id
         """
 
-        for channel in self._python_slackclient.channels_list()["channels"]:
+        for channel in self._public_channels():
             if channel["id"] == channel_id:
                 logger.debug("converted %s to %s", channel_id, channel["name"])
                 return channel["name"]
@@ -377,7 +1167,7 @@ class SimpleSlackBot:
         :return: name representation of original user id
         """
 
-        for user in self._python_slackclient.users_list()["members"]:
+        for user in self._users():
             if user["id"] == user_id:
                 logger.debug("converted %s to %s", user_id, user["name"])
                 return user["name"]
@@ -12,6 +12,12 @@ import typing
 from slack import WebClient
 from slacksocket.models import SlackEvent  # type: ignore
 
+from .conversation_store import ConversationStore
+from .file_uploader import FileUploader, Source
+from .rtm_event import RtmEvent
+from .rtm_events import parse_event
+from .tracer import NULL_TRACE, NullTrace, Trace
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,14 +27,29 @@ class SlackRequest:
     Also allows users to write messages, upload content and gain access to the underlying SlackClient
     """
 
-    def __init__(self, python_slackclient: WebClient, slack_event: SlackEvent):
+    def __init__(
+        self,
+        python_slackclient: WebClient,
+        slack_event: SlackEvent,
+        conversation_store: typing.Optional[ConversationStore] = None,
+        trace: typing.Union[Trace, NullTrace] = NULL_TRACE,
+        file_uploader: typing.Optional[FileUploader] = None,
+    ):
         """Initialize a SlackRequest.
 
         :param python_slackclient: the WebClient object for this specific SlackRequest
         :param slack_event: the SlackEvent for this specific SlackRequest
+        :param conversation_store: where the state of the conversation this SlackRequest is part of is kept, if any
+        :param trace: where the handling of this SlackRequest is traced, if it was sampled
+        :param file_uploader: uploads files for upload and upload_many, defaults to a FileUploader with default
+            settings
         """
         self._python_slackclient = python_slackclient
         self.slack_event = slack_event
+        self._conversation_store = conversation_store
+        self._event: typing.Union[RtmEvent, None] = None
+        self.trace = trace
+        self._file_uploader = file_uploader
 
     def get(self, key: str, default_value: typing.Any = None) -> typing.Any:
         """Get value for given key if found otherwise return default value.
@@ -87,6 +108,37 @@ class SlackRequest:
 
         return thread_ts
 
+    @property
+    def event(self) -> RtmEvent:
+        """Get the underlying SlackEvent parsed into the typed class generated for its type, see rtm_events.
+
+        :return: the typed event, parsed on first access
+        """
+
+        if self._event is None:
+            self._event = parse_event(self.slack_event)
+        return self._event
+
+    @property
+    def conversation(self) -> typing.Union[typing.Dict[str, typing.Any], None]:
+        """Get the state of the conversation this SlackEvent is part of, kept between SlackRequests.
+
+        A conversation is the thread this SlackEvent was sent in or, for a message outside a thread, the thread
+        replies to it would start. Changes made to the returned dict are kept.
+
+        :return: the state of the conversation, or None if there is no ConversationStore or no channel and ts
+        """
+
+        if self._conversation_store is None:
+            return None
+
+        channel = self.slack_event.get("channel")
+        thread_ts = self.slack_event.get("thread_ts") or self.slack_event.get("ts")
+        if not channel or not thread_ts:
+            return None
+
+        return self._conversation_store.get(channel, str(thread_ts))
+
     @property
     def message(self) -> typing.Union[str, None]:
         """Get the underlying message from the SlackEvent.
@@ -128,9 +180,10 @@ class SlackRequest:
         if "thread_ts" in self.slack_event:
             kwargs["thread_ts"] = self.slack_event["thread_ts"]
         try:
-            self._python_slackclient.chat_postMessage(
-                channel=actual_channel, text=content, **kwargs
-            )
+            with self.trace.span("write", channel=actual_channel):
+                self._python_slackclient.chat_postMessage(
+                    channel=actual_channel, text=content, **kwargs
+                )
         except Exception:  # pylint: disable=broad-except
             logging.warning(
                 "Unexpected exception caught, but we will keep listening. Exception: %s",
@@ -138,6 +191,76 @@ class SlackRequest:
             )
             logger.warning(traceback.format_exc())
 
+    def upload(
+        self,
+        source: Source,
+        filename: str = None,
+        title: str = None,
+        initial_comment: str = None,
+        channel: typing.Optional[str] = None,
+    ) -> typing.Dict[str, typing.Any]:
+        """Upload a file to the channel, streaming it in chunks. See FileUploader.
+
+        :param source: the content, a path, bytes, a binary file object or an iterable of bytes, such as a generator
+        :param filename: the name of the file, defaults to the name of the path or file object
+        :param title: the title of the file, defaults to its name
+        :param initial_comment: Optionally a message shared along with the file
+        :param channel: By default send to same channel request came from, and in the same thread
+        :return: the file uploaded
+        :raises UploadError: If Slack refused the upload
+        """
+
+        with self.trace.span("upload", channel=channel or self.channel):
+            return self._uploader().upload(
+                self._python_slackclient, source, filename, **self._upload_destination(channel, title, initial_comment)
+            )
+
+    def upload_many(
+        self, sources: typing.Iterable[typing.Union[Source, typing.Tuple[Source, str]]], channel: str = None
+    ) -> typing.List[typing.Union[typing.Dict[str, typing.Any], Exception]]:
+        """Upload several files to the channel at once, each streamed in chunks. See FileUploader.
+
+        :param sources: the content of each file, or the content and name of each file
+        :param channel: By default send to same channel request came from, and in the same thread
+        :return: for each file, in order, the file uploaded or the Exception that failed it
+        """
+
+        uploads = []
+        for source in sources:
+            content, filename = source if isinstance(source, tuple) else (source, None)
+            uploads.append(dict(source=content, filename=filename, **self._upload_destination(channel)))
+
+        with self.trace.span("upload", channel=channel or self.channel, files=len(uploads)):
+            return self._uploader().upload_many(self._python_slackclient, uploads)
+
+    def _uploader(self) -> FileUploader:
+        """Get the FileUploader, making one with default settings if we were given none.
+
+        :return: the FileUploader
+        """
+
+        if self._file_uploader is None:
+            self._file_uploader = FileUploader()
+        return self._file_uploader
+
+    def _upload_destination(
+        self, channel: typing.Optional[str], title: str = None, initial_comment: str = None
+    ) -> typing.Dict[str, typing.Any]:
+        """Get the arguments of FileUploader.upload sharing a file where write would post.
+
+        :param channel: the channel asked for, if any
+        :param title: the title of the file, if any
+        :param initial_comment: the message shared along with the file, if any
+        :return: the channel, thread_ts, title and initial_comment arguments
+        """
+
+        return {
+            "channel": channel or self.channel or None,
+            "thread_ts": None if channel else self.slack_event.get("thread_ts"),
+            "title": title,
+            "initial_comment": initial_comment,
+        }
+
     def __str__(self) -> str:
         """
         Generate the String representation of a SlackRequest.
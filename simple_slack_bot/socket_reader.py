@@ -0,0 +1,246 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import logging
+import queue
+import threading
+import time
+import traceback
+import typing
+
+import slacksocket.errors  # type: ignore
+from slacksocket.models import SlackEvent  # type: ignore
+
+from .event_scheduler import EventScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class SocketReader:
+    """Read events from a SlackSocket on a thread of its own, so slow callbacks never leave the socket unread.
+
+    The reader hands every event to SimpleSlackBot.enqueue_slack_event, which filters, deduplicates and buffers it
+    in the bounded queues of the EventScheduler, while the listen loop takes events out and dispatches them. When
+    more than capacity events are buffered the overflow policy applies:
+
+    * shed: buffer anyway, leaving it to the EventScheduler to shed the oldest or least important events
+    * drop_newest: drop the events arriving until there is room again
+    * block: stop reading until there is room again, leaving events to wait in the SlackSocket
+
+    An alarm is raised, logged and counted once the buffer reaches the high water mark, and cleared once dispatch
+    brings it back down to the low water mark.
+    """
+
+    OVERFLOW_SHED = "shed"
+    OVERFLOW_DROP_NEWEST = "drop_newest"
+    OVERFLOW_BLOCK = "block"
+    OVERFLOWS = (OVERFLOW_SHED, OVERFLOW_DROP_NEWEST, OVERFLOW_BLOCK)
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        high_water: float = 0.8,
+        low_water: float = 0.5,
+        overflow: str = OVERFLOW_SHED,
+        on_alarm: typing.Callable[[bool, int], typing.Any] = None,
+        poll_interval: float = 0.5,
+    ):
+        """Initialize a SocketReader.
+
+        :param capacity: How many events may be buffered before the overflow policy applies
+        :param high_water: The fraction of capacity at which the alarm is raised
+        :param low_water: The fraction of capacity at which the alarm is cleared
+        :param overflow: What to do with events beyond capacity, one of shed, drop_newest or block
+        :param on_alarm: Optionally called as on_alarm(raised, buffered) when the alarm is raised or cleared, from
+            the reader or the listen loop, so it must be quick
+        :param poll_interval: The longest, in seconds, the reader waits on the socket before checking it should stop
+        :raises ValueError: If overflow is unknown, or the water marks aren't 0 < low_water <= high_water <= 1
+        """
+        if overflow not in self.OVERFLOWS:
+            raise ValueError(f"overflow must be one of {', '.join(self.OVERFLOWS)}, not {overflow}")
+        if not 0 < low_water <= high_water <= 1:
+            raise ValueError("water marks must satisfy 0 < low_water <= high_water <= 1")
+
+        self.capacity = capacity
+        self.high_water_mark = max(int(capacity * high_water), 1)
+        self.low_water_mark = int(capacity * low_water)
+        self.overflow = overflow
+        self.on_alarm = on_alarm
+        self.poll_interval = poll_interval
+
+        self._condition = threading.Condition()
+        self._thread: typing.Union[threading.Thread, None] = None
+        self._stopping = False
+        self._buffer: typing.Union[EventScheduler, None] = None
+
+        self.exited = False
+        self.alarmed = False
+        self.read = 0
+        self.dropped = 0
+        self.alarms = 0
+        self.blocked_seconds = 0.0
+        self.peak = 0
+
+    def start(
+        self,
+        slack_socket: typing.Any,
+        enqueue: typing.Callable[[SlackEvent], typing.Any],
+        buffer: EventScheduler,
+    ):
+        """Start reading on a thread of its own.
+
+        :param slack_socket: the SlackSocket to read from
+        :param enqueue: buffers an event read, typically SimpleSlackBot.enqueue_slack_event
+        :param buffer: the EventScheduler enqueue buffers into
+        """
+
+        self._buffer = buffer
+        self._stopping = False
+        self.exited = False
+        self._thread = threading.Thread(
+            target=self._read, args=(slack_socket, enqueue), name="simple-slack-bot-socket-reader", daemon=True
+        )
+        self._thread.start()
+        logger.info("socket reader started")
+
+    def stop(self):
+        """Stop reading and wait for the reader to finish."""
+
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def wait(self, timeout: typing.Union[float, None]) -> bool:
+        """Block until an event is buffered or the socket was closed.
+
+        :param timeout: the most seconds to wait, forever if None
+        :return: True if an event is buffered, False otherwise
+        """
+
+        with self._condition:
+            self._condition.wait_for(lambda: len(self._buffer) > 0 or self.exited, timeout)
+            return len(self._buffer) > 0
+
+    def take(self) -> typing.Union[SlackEvent, None]:
+        """Take the next event to dispatch from the buffer.
+
+        :return: the next event, by priority, or None if nothing is buffered
+        """
+
+        with self._condition:
+            slack_event = self._buffer.get()
+            size = len(self._buffer)
+            if self.alarmed and size <= self.low_water_mark:
+                self.alarmed = False
+                logger.info("socket reader buffer back down to %s events, alarm cleared", size)
+                if self.on_alarm is not None:
+                    self.on_alarm(False, size)
+            # wake the reader if it is blocked on a full buffer
+            self._condition.notify_all()
+            return slack_event
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """Get the counters describing this SocketReader.
+
+        :return: the events read, dropped and buffered, the peak buffered, the alarms raised, whether one is
+            raised, and the seconds spent blocked on a full buffer
+        """
+
+        with self._condition:
+            return {
+                "read": self.read,
+                "dropped": self.dropped,
+                "buffered": len(self._buffer) if self._buffer is not None else 0,
+                "peak": self.peak,
+                "alarms": self.alarms,
+                "alarmed": self.alarmed,
+                "blocked_seconds": self.blocked_seconds,
+            }
+
+    def _read(self, slack_socket: typing.Any, enqueue: typing.Callable[[SlackEvent], typing.Any]):
+        """Read events until stopped or the socket is closed.
+
+        Catch all SlackSocket exceptions except for ExitError, treating those as warnings.
+
+        :param slack_socket: the SlackSocket to read from
+        :param enqueue: buffers an event read
+        """
+
+        while not self._stopping:
+            if self.overflow == self.OVERFLOW_BLOCK:
+                self._wait_for_room()
+                if self._stopping:
+                    break
+
+            try:
+                slack_event = slack_socket.get_event(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+            except slacksocket.errors.ExitError:
+                break
+            except (
+                slacksocket.errors.APIError,
+                slacksocket.errors.ConfigError,
+                slacksocket.errors.APINameError,
+                slacksocket.errors.ConnectionError,
+                slacksocket.errors.TimeoutError,
+            ):
+                logger.warning(
+                    "Unexpected exception caught, but we will keep reading. Exception: %s", traceback.format_exc()
+                )
+                continue
+
+            with self._condition:
+                self.read += 1
+                if self.overflow == self.OVERFLOW_DROP_NEWEST and len(self._buffer) >= self.capacity:
+                    self.dropped += 1
+                    logger.debug("socket reader buffer is full, dropping event of type %s", slack_event.get("type"))
+                    continue
+
+                try:
+                    enqueue(slack_event)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("exception buffering event. Exception %s", traceback.format_exc())
+                    continue
+
+                self._check_high_water()
+                self._condition.notify_all()
+
+        with self._condition:
+            self.exited = True
+            self._condition.notify_all()
+        logger.info("socket reader stopped")
+
+    def _wait_for_room(self):
+        """Block while the buffer is at capacity, for the block overflow policy."""
+
+        with self._condition:
+            if len(self._buffer) < self.capacity:
+                return
+
+            start = time.monotonic()
+            logger.warning("socket reader buffer is full, pausing reading")
+            self._condition.wait_for(lambda: len(self._buffer) < self.capacity or self._stopping)
+            self.blocked_seconds += time.monotonic() - start
+
+    def _check_high_water(self):
+        """Raise the alarm if the buffer reached the high water mark, with the condition held."""
+
+        size = len(self._buffer)
+        self.peak = max(self.peak, size)
+        if not self.alarmed and size >= self.high_water_mark:
+            self.alarmed = True
+            self.alarms += 1
+            logger.warning(
+                "socket reader buffer reached %s of %s events, dispatch is falling behind", size, self.capacity
+            )
+            if self.on_alarm is not None:
+                self.on_alarm(True, size)
@@ -0,0 +1,556 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import collections
+import contextlib
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import typing
+import urllib.request
+
+logger = logging.getLogger(__name__)
+
+Attributes = typing.Dict[str, typing.Any]
+
+
+class Span:
+    """A timed step in handling one Slack event."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "end", "attributes")
+
+    def __init__(
+        self,
+        trace_id: str,
+        span_id: str,
+        parent_id: typing.Union[str, None],
+        name: str,
+        start: float,
+        end: float = None,
+        attributes: Attributes = None,
+    ):
+        """Initialize a Span.
+
+        :param trace_id: the id shared by every span of the event, 32 hex digits
+        :param span_id: the id of this span, 16 hex digits
+        :param parent_id: the id of the span this one is part of, None for the root span
+        :param name: what this span times, such as queue or write
+        :param start: when the step started, in seconds since the epoch
+        :param end: when the step ended, in seconds since the epoch
+        :param attributes: details of the step, such as the channel written to
+        """
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.start = start
+        self.end = end
+        self.attributes = attributes or {}
+
+    @property
+    def duration(self) -> float:
+        """Get how long the step took, in seconds."""
+        return (self.end if self.end is not None else self.start) - self.start
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        """Get the span as a dict, for JSON.
+
+        :return: the span
+        """
+
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration": self.duration,
+            "attributes": self.attributes,
+        }
+
+    def __repr__(self) -> str:
+        return f"Span({self.name}, trace_id={self.trace_id}, duration={self.duration * 1000:.1f}ms)"
+
+
+class Trace:
+    """The spans of one sampled Slack event, rooted at a span running from its ts until it is handled."""
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        start: float,
+        attributes: Attributes = None,
+        trace_id: str = None,
+        parent_id: str = None,
+    ):
+        """Initialize a Trace.
+
+        :param tracer: the Tracer exporting the spans
+        :param name: the name of the root span
+        :param start: when the event happened, in seconds since the epoch
+        :param attributes: details of the event
+        :param trace_id: the id of the trace this one continues, such as in another process, defaults to a new id
+        :param parent_id: the id of the span the root span is part of, when continuing a trace
+        """
+        self._tracer = tracer
+        self.trace_id = trace_id or tracer.new_id(128)
+        self.root = Span(self.trace_id, tracer.new_id(64), parent_id, name, start, attributes=attributes)
+        self.spans: typing.List[Span] = []
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, end: float, **attributes: typing.Any) -> Span:
+        """Add a span that already ended.
+
+        :param name: what the span times
+        :param start: when the step started, in seconds since the epoch
+        :param end: when the step ended, in seconds since the epoch
+        :param attributes: details of the step
+        :return: the span
+        """
+
+        span = Span(self.trace_id, self._tracer.new_id(64), self.root.span_id, name, start, end, attributes)
+        with self._lock:
+            if not self.finished:
+                self.spans.append(span)
+                return span
+        # spans ending after the event was handled, such as writes from a thread, are exported on their own
+        self._tracer.export([span])
+        return span
+
+    @property
+    def context(self) -> typing.Tuple[str, str]:
+        """Get what another process needs to continue this trace, see Tracer.resume.
+
+        :return: the trace id and the id of the root span
+        """
+
+        return self.trace_id, self.root.span_id
+
+    def begin(self, name: str, **attributes: typing.Any) -> typing.Callable[..., Span]:
+        """Start timing a step that ends elsewhere, such as in a callback of a Future.
+
+        :param name: what the span times
+        :param attributes: details of the step
+        :return: the function ending the span, taking more details of the step
+        """
+
+        start = self._tracer.clock()
+
+        def end(**more: typing.Any) -> Span:
+            return self.add(name, start, self._tracer.clock(), **attributes, **more)
+
+        return end
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes: typing.Any) -> typing.Iterator[Attributes]:
+        """Time a step as a span.
+
+        :param name: what the span times
+        :param attributes: details of the step
+        :return: the attributes of the span, which may be added to while it runs
+        """
+
+        start = self._tracer.clock()
+        try:
+            yield attributes
+        except BaseException as exception:
+            attributes["error"] = repr(exception)
+            raise
+        finally:
+            self.add(name, start, self._tracer.clock(), **attributes)
+
+    def finish(self):
+        """End the root span and export every span of the trace."""
+
+        with self._lock:
+            if self.finished:
+                return
+            self.finished = True
+            self.root.end = self._tracer.clock()
+            spans = [self.root] + self.spans
+
+        self._tracer.export(spans)
+
+
+class NullTrace:
+    """Stands in for the Trace of an event that wasn't sampled, recording nothing."""
+
+    trace_id = None
+    context = None
+
+    def add(self, name: str, start: float, end: float, **attributes: typing.Any):
+        """Record nothing."""
+
+    def begin(self, name: str, **attributes: typing.Any) -> typing.Callable[..., None]:
+        """Time nothing.
+
+        :return: a function doing nothing
+        """
+
+        return _end_nothing
+
+    def span(self, name: str, **attributes: typing.Any) -> typing.ContextManager[Attributes]:
+        """Time nothing.
+
+        :return: a context manager doing nothing
+        """
+
+        return contextlib.nullcontext(attributes)
+
+    def finish(self):
+        """Export nothing."""
+
+
+NULL_TRACE = NullTrace()
+
+
+def _end_nothing(**_: typing.Any):
+    """End the span of the NULL_TRACE, doing nothing."""
+
+
+class Tracer:
+    """Trace a sample of Slack events from their ts, when the user posted, to the end of their handling.
+
+    Each sampled event gets a trace id and a root span starting at its ts, with child spans for receive, from ts
+    until the event was read from the socket, queue, until it was dispatched, each callback and each
+    SlackRequest.write. Events that aren't sampled get the NULL_TRACE, which costs next to nothing, so a low
+    sample_rate keeps tracing negligible at high volume. Finished traces go to the exporter.
+    """
+
+    DEFAULT_MAX_ACTIVE = 10000
+
+    def __init__(
+        self,
+        exporter: typing.Any = None,
+        sample_rate: float = 0.01,
+        max_active: int = DEFAULT_MAX_ACTIVE,
+        clock: typing.Callable[[], float] = time.time,
+        rng: random.Random = None,
+    ):
+        """Initialize a Tracer.
+
+        :param exporter: Receives finished spans, such as a JsonFileExporter or an OtlpHttpExporter. Nothing is
+            traced without one
+        :param sample_rate: The fraction of events traced, between 0 and 1
+        :param max_active: How many traces may wait between receive and dispatch, the oldest being forgotten
+        :param clock: Function returning the current time in seconds since the epoch, injectable for testing
+        :param rng: The random number generator sampling and generating ids, injectable for testing
+        :raises ValueError: If sample_rate isn't between 0 and 1
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.max_active = max_active
+        self.clock = clock
+        self._rng = rng if rng is not None else random.Random()
+
+        # traces of events received but not yet dispatched, by the id of the event
+        self._active: typing.MutableMapping[int, typing.Tuple[typing.Mapping, Trace]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        self.sampled = 0
+        self.exported = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Check whether anything is traced."""
+        return self.exporter is not None and self.sample_rate > 0
+
+    def new_id(self, bits: int) -> str:
+        """Generate a random trace or span id.
+
+        :param bits: 128 for trace ids, 64 for span ids
+        :return: the id in hex
+        """
+
+        return f"{self._rng.getrandbits(bits):0{bits // 4}x}"
+
+    def receive(self, slack_event: typing.Mapping):
+        """Start tracing an event as it is read from the socket, if it is sampled.
+
+        :param slack_event: the raw SlackEvent
+        """
+
+        if not self.enabled or self._rng.random() >= self.sample_rate:
+            return
+
+        now = self.clock()
+        try:
+            posted = float(slack_event.get("ts") or now)
+        except (TypeError, ValueError):
+            posted = now
+
+        trace = Trace(self, "event", min(posted, now), {"type": slack_event.get("type")})
+        trace.add("receive", trace.root.start, now)
+
+        with self._lock:
+            self.sampled += 1
+            self._active[id(slack_event)] = (slack_event, trace)
+            while len(self._active) > self.max_active:
+                self._active.popitem(last=False)  # type: ignore
+
+    def dispatch(self, slack_event: typing.Mapping) -> typing.Union[Trace, NullTrace]:
+        """Get the trace of an event as it is dispatched, adding its queue span.
+
+        :param slack_event: the raw SlackEvent
+        :return: its Trace, or the NULL_TRACE if it wasn't sampled
+        """
+
+        if not self._active:
+            return NULL_TRACE
+
+        with self._lock:
+            # the event is kept alongside its trace, so its id can't be reused while the trace waits
+            _, trace = self._active.pop(id(slack_event), (None, NULL_TRACE))
+
+        if isinstance(trace, Trace):
+            trace.add("queue", trace.spans[-1].end, self.clock())
+        return trace
+
+    def resume(
+        self, context: typing.Union[typing.Tuple[str, str], None], name: str = "worker"
+    ) -> typing.Union[Trace, NullTrace]:
+        """Continue, in this process, the trace of an event handed over by another, such as a ScaleOut leader.
+
+        :param context: the Trace.context of the event in the other process, None if it wasn't sampled
+        :param name: the name of the span timing the handling here
+        :return: a Trace whose root span is part of the root span of the other, or the NULL_TRACE
+        """
+
+        if context is None or not self.enabled:
+            return NULL_TRACE
+
+        trace_id, parent_id = context
+        return Trace(self, name, self.clock(), trace_id=trace_id, parent_id=parent_id)
+
+    def export(self, spans: typing.List[Span]):
+        """Hand spans to the exporter, logging rather than raising if it fails.
+
+        :param spans: the spans to export
+        """
+
+        try:
+            self.exporter.export(spans)
+            self.exported += len(spans)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("could not export %s spans", len(spans))
+
+    def shutdown(self):
+        """Flush and close the exporter."""
+
+        if self.exporter is not None and hasattr(self.exporter, "shutdown"):
+            self.exporter.shutdown()
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Get the counters describing this Tracer.
+
+        :return: the number of events sampled, spans exported and traces waiting for dispatch
+        """
+
+        return {"sampled": self.sampled, "exported": self.exported, "active": len(self._active)}
+
+
+class JsonFileExporter:
+    """Append spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        """Initialize a JsonFileExporter.
+
+        :param path: the file to append to
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: typing.List[Span]):
+        """Append spans to the file.
+
+        :param spans: the spans to append
+        """
+
+        lines = "".join(json.dumps(span.to_dict()) + "\n" for span in spans)
+        with self._lock, open(self.path, "a") as spans_file:
+            spans_file.write(lines)
+
+
+class OtlpHttpExporter:
+    """Send spans to an OpenTelemetry collector, as OTLP over HTTP with JSON encoding.
+
+    Spans are batched and sent from a thread of their own, so the listen loop never waits on the collector. Spans
+    that can't be sent are logged and dropped. The thread is started by the first export, again by the first export
+    after a shutdown, so a bot can listen again once it stopped, and by the first export of a forked process, such
+    as a ScaleOut worker.
+    """
+
+    DEFAULT_ENDPOINT = "http://localhost:4318/v1/traces"
+
+    def __init__(
+        self,
+        endpoint: str = DEFAULT_ENDPOINT,
+        service_name: str = "simple-slack-bot",
+        batch_size: int = 512,
+        flush_interval: float = 5.0,
+        timeout: float = 10.0,
+    ):
+        """Initialize an OtlpHttpExporter.
+
+        :param endpoint: the traces endpoint of the collector
+        :param service_name: the service.name the spans are reported under
+        :param batch_size: How many spans are sent at most in one request
+        :param flush_interval: The longest, in seconds, spans wait before being sent
+        :param timeout: The longest, in seconds, to wait for the collector
+        """
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+
+        self._queue: "queue.Queue[typing.Union[Span, None]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: typing.Union[threading.Thread, None] = None
+
+        self.sent = 0
+        self.failed = 0
+
+    def export(self, spans: typing.List[Span]):
+        """Queue spans to be sent.
+
+        :param spans: the spans to send
+        """
+
+        with self._lock:
+            # a forked process inherits the thread, but it doesn't run there
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._send_batches, name="simple-slack-bot-otlp", daemon=True)
+                self._thread.start()
+            for span in spans:
+                self._queue.put(span)
+
+    def shutdown(self):
+        """Send the spans still queued and stop, until spans are exported again."""
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(None)
+        thread.join(self.timeout)
+
+    def _send_batches(self):
+        """Send queued spans in batches, until shut down."""
+
+        batch: typing.List[Span] = []
+        # when the oldest span in the batch has waited flush_interval
+        deadline: typing.Union[float, None] = None
+        while True:
+            try:
+                span = self._queue.get(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self._send(batch)
+                batch, deadline = [], None
+                continue
+
+            if span is None:
+                if batch:
+                    self._send(batch)
+                return
+
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(span)
+            if len(batch) >= self.batch_size:
+                self._send(batch)
+                batch, deadline = [], None
+
+    def _send(self, spans: typing.List[Span]):
+        """Send one batch of spans.
+
+        :param spans: the spans to send
+        """
+
+        body = json.dumps(self.encode(spans)).encode("utf-8")
+        request = urllib.request.Request(
+            self.endpoint, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:  # nosec
+                response.read()
+            self.sent += len(spans)
+        except Exception:  # pylint: disable=broad-except
+            self.failed += len(spans)
+            logger.warning("could not send %s spans to %s", len(spans), self.endpoint, exc_info=True)
+
+    def encode(self, spans: typing.List[Span]) -> typing.Dict[str, typing.Any]:
+        """Encode spans as an OTLP ExportTraceServiceRequest.
+
+        :param spans: the spans to encode
+        :return: the request, ready for JSON encoding
+        """
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": self._attributes({"service.name": self.service_name})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "simple_slack_bot"},
+                            "spans": [self._encode_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _encode_span(self, span: Span) -> typing.Dict[str, typing.Any]:
+        """Encode one span as OTLP.
+
+        :param span: the span to encode
+        :return: the encoded span
+        """
+
+        encoded = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            # SPAN_KIND_SERVER for the event, SPAN_KIND_INTERNAL for its steps
+            "kind": 2 if span.parent_id is None else 1,
+            "startTimeUnixNano": str(int(span.start * 1e9)),
+            "endTimeUnixNano": str(int((span.end if span.end is not None else span.start) * 1e9)),
+            "attributes": self._attributes(span.attributes),
+        }
+        if span.parent_id is not None:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+    @staticmethod
+    def _attributes(attributes: Attributes) -> typing.List[typing.Dict[str, typing.Any]]:
+        """Encode attributes as OTLP key values.
+
+        :param attributes: the attributes to encode
+        :return: the encoded attributes
+        """
+
+        encoded = []
+        for key, value in attributes.items():
+            if isinstance(value, bool):
+                any_value: typing.Dict[str, typing.Any] = {"boolValue": value}
+            elif isinstance(value, int):
+                any_value = {"intValue": str(value)}
+            elif isinstance(value, float):
+                any_value = {"doubleValue": value}
+            else:
+                any_value = {"stringValue": str(value)}
+            encoded.append({"key": key, "value": any_value})
+        return encoded
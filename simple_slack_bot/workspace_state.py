@@ -0,0 +1,295 @@
+"""
+Please refer to the documentation provided in the README.md.
+
+which can be found at the PyPI URL: https://pypi.org/project/simple-slack-bot/
+"""
+
+
+import logging
+import threading
+import time
+import typing
+
+from slack import WebClient
+
+logger = logging.getLogger(__name__)
+
+Item = typing.Dict[str, typing.Any]
+
+
+class WorkspaceState:
+    """A local copy of the users, public channels and private channels of a workspace, kept up to date from events.
+
+    A snapshot is taken once, when connecting. From then on the events Slack sends whenever users or channels
+    change are applied to it as deltas, so reading it never calls the Web API. Every applied change bumps version.
+    Should an event be missed, check compares against a fresh snapshot, adopting it and reporting the drift.
+    """
+
+    DEFAULT_CHECK_INTERVAL = 60 * 60.0
+
+    def __init__(self, check_interval: typing.Optional[float] = DEFAULT_CHECK_INTERVAL):
+        """Initialize a WorkspaceState.
+
+        :param check_interval: How often, in seconds, SimpleSlackBot checks against a fresh snapshot, None to never
+        """
+        self.check_interval = check_interval
+
+        self.users: typing.Dict[str, Item] = {}
+        self.channels: typing.Dict[str, Item] = {}
+        self.groups: typing.Dict[str, Item] = {}
+        self._lock = threading.RLock()
+
+        self.synced = False
+        self.version = 0
+        self.snapshot_at: typing.Union[float, None] = None
+        self.applied = 0
+        self.checks = 0
+        self.drift = 0
+
+        self._handlers: typing.Dict[str, typing.Callable[[typing.Mapping], bool]] = {
+            "team_join": self._put_user,
+            "user_change": self._put_user,
+            "channel_created": self._put_channel,
+            "channel_rename": self._put_channel,
+            "channel_deleted": self._delete_channel,
+            "channel_archive": lambda slack_event: self._set_archived(slack_event, True),
+            "channel_unarchive": lambda slack_event: self._set_archived(slack_event, False),
+            "group_joined": self._put_channel,
+            "group_rename": self._put_channel,
+            "group_left": self._delete_channel,
+            "group_archive": lambda slack_event: self._set_archived(slack_event, True),
+            "group_unarchive": lambda slack_event: self._set_archived(slack_event, False),
+            "member_joined_channel": lambda slack_event: self._set_member(slack_event, True),
+            "member_left_channel": lambda slack_event: self._set_member(slack_event, False),
+        }
+
+    @staticmethod
+    def fetch(python_slackclient: WebClient) -> typing.Tuple[typing.List[Item], typing.List[Item], typing.List[Item]]:
+        """Download a fresh snapshot of the workspace.
+
+        :param python_slackclient: the WebClient to download it with
+        :return: the users, public channels and private channels
+        """
+
+        return (
+            python_slackclient.users_list()["members"],
+            python_slackclient.channels_list()["channels"],
+            python_slackclient.groups_list()["groups"],
+        )
+
+    def load(self, python_slackclient: WebClient):
+        """Replace our copy with a fresh snapshot of the workspace.
+
+        :param python_slackclient: the WebClient to download it with
+        """
+
+        self._adopt(*self.fetch(python_slackclient))
+        logger.info(
+            "loaded %s users, %s public and %s private channels", len(self.users), len(self.channels), len(self.groups)
+        )
+
+    def check(self, python_slackclient: WebClient) -> int:
+        """Compare our copy with a fresh snapshot of the workspace, adopting the snapshot.
+
+        :param python_slackclient: the WebClient to download it with
+        :return: how many users and channels differed
+        """
+
+        users, channels, groups = self.fetch(python_slackclient)
+
+        with self._lock:
+            drift = (
+                self._count_differences(self.users, users)
+                + self._count_differences(self.channels, channels)
+                + self._count_differences(self.groups, groups)
+            )
+            self._adopt(users, channels, groups)
+            self.checks += 1
+            self.drift += drift
+
+        if drift:
+            logger.warning("workspace state had drifted by %s users and channels, adopted a fresh snapshot", drift)
+        else:
+            logger.debug("workspace state is consistent at version %s", self.version)
+        return drift
+
+    def apply(self, slack_event: typing.Mapping) -> bool:
+        """Apply an event to our copy, if it changes users or channels.
+
+        :param slack_event: the raw SlackEvent
+        :return: True if the event changed our copy, False otherwise
+        """
+
+        handler = self._handlers.get(slack_event.get("type"))
+        if handler is None or not self.synced:
+            return False
+
+        with self._lock:
+            changed = handler(slack_event)
+            if changed:
+                self.version += 1
+                self.applied += 1
+        return changed
+
+    def user(self, user_id: str) -> typing.Union[Item, None]:
+        """Get a user by id.
+
+        :param user_id: the user id
+        :return: the user, or None if there is no such user
+        """
+
+        return self.users.get(user_id)
+
+    def channel(self, channel_id: str) -> typing.Union[Item, None]:
+        """Get a public channel by id.
+
+        :param channel_id: the channel id
+        :return: the channel, or None if there is no such public channel
+        """
+
+        return self.channels.get(channel_id)
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        """Get the counters describing this WorkspaceState.
+
+        :return: the version, the number of users, public and private channels, the events applied, the checks made
+            and the drift they found
+        """
+
+        return {
+            "version": self.version,
+            "users": len(self.users),
+            "channels": len(self.channels),
+            "groups": len(self.groups),
+            "applied": self.applied,
+            "checks": self.checks,
+            "drift": self.drift,
+        }
+
+    @staticmethod
+    def _count_differences(ours: typing.Dict[str, Item], theirs: typing.List[Item]) -> int:
+        """Count the items missing from, extra in or different in our copy.
+
+        :param ours: our copy, by id
+        :param theirs: the fresh snapshot
+        :return: the number of differing items
+        """
+
+        theirs_by_id = {item["id"]: item for item in theirs}
+        differences = len(ours.keys() ^ theirs_by_id.keys())
+        for item_id in ours.keys() & theirs_by_id.keys():
+            ours_item, theirs_item = ours[item_id], theirs_by_id[item_id]
+            if ours_item.get("name") != theirs_item.get("name") or ours_item.get("is_archived") != theirs_item.get(
+                "is_archived"
+            ):
+                differences += 1
+        return differences
+
+    def _adopt(self, users: typing.List[Item], channels: typing.List[Item], groups: typing.List[Item]):
+        """Replace our copy.
+
+        :param users: the users
+        :param channels: the public channels
+        :param groups: the private channels
+        """
+
+        with self._lock:
+            self.users = {user["id"]: user for user in users}
+            self.channels = {channel["id"]: channel for channel in channels}
+            self.groups = {group["id"]: group for group in groups}
+            self.synced = True
+            self.version += 1
+            self.snapshot_at = time.time()
+
+    def _put_user(self, slack_event: typing.Mapping) -> bool:
+        """Add or update the user carried by a team_join or user_change event.
+
+        :param slack_event: the raw SlackEvent
+        :return: True if the user was applied
+        """
+
+        user = slack_event.get("user")
+        if not isinstance(user, dict) or "id" not in user:
+            return False
+
+        self.users[user["id"]] = dict(user)
+        return True
+
+    def _channels_for(self, channel_id: str) -> typing.Dict[str, Item]:
+        """Get where a channel id belongs, public channels or private channels.
+
+        :param channel_id: the channel id
+        :return: our copy of the public or private channels
+        """
+
+        return self.groups if channel_id.startswith("G") or channel_id in self.groups else self.channels
+
+    def _put_channel(self, slack_event: typing.Mapping) -> bool:
+        """Add or rename the channel carried by a channel_created, channel_rename, group_joined or group_rename event.
+
+        :param slack_event: the raw SlackEvent
+        :return: True if the channel was applied
+        """
+
+        channel = slack_event.get("channel")
+        if not isinstance(channel, dict) or "id" not in channel:
+            return False
+
+        if slack_event.get("type", "").startswith("group_"):
+            channels = self.groups
+        else:
+            channels = self._channels_for(channel["id"])
+        # channel_rename only carries the id and new name, so keep what we knew
+        merged = dict(channels.get(channel["id"], {}), **channel)
+        merged.setdefault("members", [])
+        channels[channel["id"]] = merged
+        return True
+
+    def _delete_channel(self, slack_event: typing.Mapping) -> bool:
+        """Remove the channel of a channel_deleted or group_left event.
+
+        :param slack_event: the raw SlackEvent
+        :return: True if we knew the channel
+        """
+
+        channel_id = slack_event.get("channel") or ""
+        return self._channels_for(channel_id).pop(channel_id, None) is not None
+
+    def _set_archived(self, slack_event: typing.Mapping, archived: bool) -> bool:
+        """Mark the channel of an archive or unarchive event.
+
+        :param slack_event: the raw SlackEvent
+        :param archived: whether the channel was archived
+        :return: True if we knew the channel
+        """
+
+        channel_id = slack_event.get("channel") or ""
+        channel = self._channels_for(channel_id).get(channel_id)
+        if channel is None:
+            return False
+
+        channel["is_archived"] = archived
+        return True
+
+    def _set_member(self, slack_event: typing.Mapping, joined: bool) -> bool:
+        """Add or remove the user of a member_joined_channel or member_left_channel event to its channel.
+
+        :param slack_event: the raw SlackEvent
+        :param joined: whether the user joined
+        :return: True if we knew the channel and its membership changed
+        """
+
+        channel_id = slack_event.get("channel") or ""
+        channel = self._channels_for(channel_id).get(channel_id)
+        user_id = slack_event.get("user")
+        if channel is None or not user_id:
+            return False
+
+        members = channel.setdefault("members", [])
+        if joined and user_id not in members:
+            members.append(user_id)
+            return True
+        if not joined and user_id in members:
+            members.remove(user_id)
+            return True
+        return False
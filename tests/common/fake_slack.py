@@ -0,0 +1,570 @@
+"""An in-process, fully offline stand-in for Slack's Web API and RTM websocket.
+
+Point a SimpleSlackBot at FakeSlack.api_url and it connects, authenticates and receives events exactly as it would
+against Slack, through the real WebClient and SlackSocket transport code. Tests then inject events, latency, HTTP
+errors such as 429s and disconnects, and inspect every Web API call the bot made.
+
+Files uploaded through the external upload flow are received a chunk at a time and only their length and sha256
+are kept, so uploads of any size can be tested.
+
+It also plays Slack's part for slash commands and interactions: it signs and posts them to a bot's
+InteractionServer, and serves the response_url they carry, recording what is posted to it.
+"""
+
+import base64
+import collections
+import hashlib
+import hmac
+import json
+import socket
+import struct
+import threading
+import time
+import typing
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+class FakeWebSocket:
+    """The server side of a single RTM websocket connection."""
+
+    def __init__(self, connection: socket.socket, reader: typing.BinaryIO):
+        self._connection = connection
+        self._reader = reader
+        self._send_lock = threading.Lock()
+        self.closed = False
+        self.received: typing.List[typing.Any] = []
+
+    def send_text(self, text: str):
+        self._send_frame(OPCODE_TEXT, text.encode("utf-8"))
+
+    def send_many(self, texts: typing.Iterable[str]):
+        """Send several text frames with a single write, to inject events as fast as possible."""
+        self._write(b"".join(self._frame(OPCODE_TEXT, text.encode("utf-8")) for text in texts))
+
+    def close(self):
+        """Drop the connection without a closing handshake, as a network failure would."""
+        if not self.closed:
+            self.closed = True
+            try:
+                self._connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _frame(opcode: int, payload: bytes) -> bytes:
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([length])
+        elif length < 1 << 16:
+            header += bytes([126]) + struct.pack("!H", length)
+        else:
+            header += bytes([127]) + struct.pack("!Q", length)
+        return header + payload
+
+    def _send_frame(self, opcode: int, payload: bytes):
+        self._write(self._frame(opcode, payload))
+
+    def _write(self, data: bytes):
+        with self._send_lock:
+            if self.closed:
+                raise ConnectionError("websocket is closed")
+            self._connection.sendall(data)
+
+    def _read_exactly(self, size: int) -> bytes:
+        data = self._reader.read(size)
+        if data is None or len(data) < size:
+            raise ConnectionError("websocket closed by peer")
+        return data
+
+    def serve(self):
+        """Answer pings and record client messages until the connection is closed by either side."""
+        fragments = b""
+        try:
+            while not self.closed:
+                first, second = self._read_exactly(2)
+                opcode = first & 0x0F
+                length = second & 0x7F
+                if length == 126:
+                    (length,) = struct.unpack("!H", self._read_exactly(2))
+                elif length == 127:
+                    (length,) = struct.unpack("!Q", self._read_exactly(8))
+                mask = self._read_exactly(4) if second & 0x80 else b"\0\0\0\0"
+                payload = bytes(
+                    byte ^ mask[index % 4] for index, byte in enumerate(self._read_exactly(length))
+                )
+
+                if opcode == OPCODE_PING:
+                    self._send_frame(OPCODE_PONG, payload)
+                elif opcode == OPCODE_CLOSE:
+                    self._send_frame(OPCODE_CLOSE, payload[:2])
+                    break
+                elif opcode in (OPCODE_TEXT, OPCODE_BINARY, OPCODE_CONTINUATION):
+                    fragments += payload
+                    if first & 0x80:
+                        self.received.append(json.loads(fragments.decode("utf-8")))
+                        fragments = b""
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            self.closed = True
+
+
+class FakeSlack:
+    """A local Slack workspace serving the Web API under api_url and RTM websockets under websocket_url.
+
+    Use it as a context manager, or call start and stop.
+    """
+
+    DEFAULT_BOT_ID = "B0FAKEBOT"
+    DEFAULT_BOT_USER_ID = "U0FAKEBOT"
+    DEFAULT_SIGNING_SECRET = "fake signing secret"
+
+    def __init__(
+        self,
+        users: typing.List[typing.Dict[str, typing.Any]] = None,
+        channels: typing.List[typing.Dict[str, typing.Any]] = None,
+        groups: typing.List[typing.Dict[str, typing.Any]] = None,
+        bot_id: str = DEFAULT_BOT_ID,
+        bot_user_id: str = DEFAULT_BOT_USER_ID,
+        latency: float = 0.0,
+        signing_secret: str = DEFAULT_SIGNING_SECRET,
+    ):
+        """Create a workspace.
+
+        :param users: users.list members, each with at least id and name, the bot user is always added
+        :param channels: public channels, each with at least id and name
+        :param groups: private channels, each with at least id and name
+        :param bot_id: the bot id returned by auth.test
+        :param bot_user_id: the user id returned by auth.test
+        :param latency: seconds added to every Web API call
+        :param signing_secret: signs the slash commands and interactions sent
+        """
+        self.bot_id = bot_id
+        self.bot_user_id = bot_user_id
+        self.users = [{"id": bot_user_id, "name": "fakebot", "is_bot": True}] + list(users or [])
+        self.channels = list(channels or [])
+        self.groups = list(groups or [])
+        self.latency = latency
+        self.signing_secret = signing_secret
+
+        self.calls: typing.List[typing.Tuple[str, typing.Dict[str, typing.Any]]] = []
+        self.websockets: typing.List[FakeWebSocket] = []
+        self.responses: typing.List[typing.Dict[str, typing.Any]] = []
+        self.files: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        self.response_clients: typing.Set[typing.Tuple[str, int]] = set()
+        self.handlers: typing.Dict[str, typing.Callable[[typing.Dict[str, typing.Any]], typing.Any]] = {
+            "api.test": lambda params: {},
+            "auth.test": self._auth_test,
+            "rtm.start": self._rtm_connect,
+            "rtm.connect": self._rtm_connect,
+            "users.list": lambda params: {"members": self.users},
+            "channels.list": lambda params: {"channels": self.channels},
+            "groups.list": lambda params: {"groups": self.groups},
+            "conversations.list": lambda params: {"channels": self.channels + self.groups},
+            "chat.postMessage": self._chat_post_message,
+            "im.open": lambda params: {"channel": {"id": "D" + params.get("user", "")[1:]}},
+            "files.getUploadURLExternal": self._get_upload_url_external,
+            "files.completeUploadExternal": self._complete_upload_external,
+        }
+
+        self._failures: typing.Dict[str, typing.Deque[typing.Tuple[int, int]]] = collections.defaultdict(
+            collections.deque
+        )
+        self._condition = threading.Condition()
+        self._message_ts = 0
+        self._server: typing.Union[ThreadingHTTPServer, None] = None
+        self._thread: typing.Union[threading.Thread, None] = None
+
+    # lifecycle
+
+    def start(self) -> "FakeSlack":
+        fake_slack = self
+
+        class Handler(FakeSlackRequestHandler):
+            slack = fake_slack
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.disconnect()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeSlack":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def api_url(self) -> str:
+        return f"http://{self.address}/api/"
+
+    @property
+    def websocket_url(self) -> str:
+        return f"ws://{self.address}/rtm"
+
+    # fault injection
+
+    def fail_next(self, method: str, status: int = 429, times: int = 1, retry_after: int = 1):
+        """Make the next calls of a Web API method fail with an HTTP error, by default a 429 rate limit."""
+        with self._condition:
+            for _ in range(times):
+                self._failures[method].append((status, retry_after))
+
+    def disconnect(self):
+        """Drop every open websocket, as a network failure would. Clients are expected to reconnect."""
+        with self._condition:
+            websockets, self.websockets = self.websockets, []
+        for websocket in websockets:
+            websocket.close()
+
+    # events
+
+    def send_event(self, event: typing.Dict[str, typing.Any]):
+        """Send an RTM event to every connected websocket."""
+        self.send_events([event])
+
+    def send_events(self, events: typing.Iterable[typing.Dict[str, typing.Any]], per_second: float = None):
+        """Send RTM events to every connected websocket, as fast as possible or at a steady rate."""
+        texts = [json.dumps(event) for event in events]
+        with self._condition:
+            websockets = [websocket for websocket in self.websockets if not websocket.closed]
+
+        if per_second is None:
+            for websocket in websockets:
+                websocket.send_many(texts)
+            return
+
+        start = time.monotonic()
+        for index, text in enumerate(texts):
+            delay = start + index / per_second - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            for websocket in websockets:
+                websocket.send_text(text)
+
+    # slash commands and interactions
+
+    def response_url(self, name: str = "1") -> str:
+        return f"http://{self.address}/response/{name}"
+
+    def send_interaction(
+        self, url: str, fields: typing.Dict[str, str], timestamp: int = None, signing_secret: str = None
+    ) -> typing.Tuple[int, float]:
+        """Sign and post form fields to an InteractionServer, as Slack does.
+
+        :return: the HTTP status and how many seconds it took to be acknowledged
+        """
+        body = urllib.parse.urlencode(fields).encode("utf-8")
+        timestamp = str(int(time.time()) if timestamp is None else timestamp)
+        secret = (signing_secret or self.signing_secret).encode("utf-8")
+        signature = "v0=" + hmac.new(secret, b"v0:" + timestamp.encode() + b":" + body, hashlib.sha256).hexdigest()
+        request = urllib.request.Request(
+            url,
+            data=body,
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "X-Slack-Request-Timestamp": timestamp,
+                "X-Slack-Signature": signature,
+            },
+        )
+
+        start = time.monotonic()
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                status = response.status
+        except urllib.error.HTTPError as error:
+            status = error.code
+        return status, time.monotonic() - start
+
+    def send_slash_command(
+        self, url: str, command: str, text: str = "", user: str = "U1", channel: str = "C1", **kwargs
+    ) -> typing.Tuple[int, float]:
+        fields = {
+            "command": command,
+            "text": text,
+            "user_id": user,
+            "channel_id": channel,
+            "team_id": "T0FAKETEAM",
+            "response_url": self.response_url(),
+            "trigger_id": "1.2.3",
+        }
+        return self.send_interaction(url, fields, **kwargs)
+
+    def send_block_action(
+        self, url: str, action_id: str, value: str = None, user: str = "U1", channel: str = "C1", **kwargs
+    ) -> typing.Tuple[int, float]:
+        payload = {
+            "type": "block_actions",
+            "user": {"id": user},
+            "channel": {"id": channel},
+            "team": {"id": "T0FAKETEAM"},
+            "response_url": self.response_url(),
+            "trigger_id": "1.2.3",
+            "actions": [{"type": "button", "action_id": action_id, "value": value}],
+        }
+        return self.send_interaction(url, {"payload": json.dumps(payload)}, **kwargs)
+
+    def wait_for_responses(self, count: int, timeout: float = 5.0) -> bool:
+        """Block until at least count responses were posted to response URLs."""
+        return self._wait(lambda: len(self.responses) >= count, timeout)
+
+    def _record_response(self, name: str, client: typing.Tuple[str, int], body: typing.Dict[str, typing.Any]):
+        with self._condition:
+            self.responses.append(dict(body, response_url=name))
+            self.response_clients.add(client)
+            self._condition.notify_all()
+
+    def wait_for_connections(self, count: int = 1, timeout: float = 5.0) -> bool:
+        """Block until at least count websockets are open."""
+        return self._wait(lambda: len([w for w in self.websockets if not w.closed]) >= count, timeout)
+
+    # inspection
+
+    def calls_to(self, method: str) -> typing.List[typing.Dict[str, typing.Any]]:
+        with self._condition:
+            return [params for called, params in self.calls if called == method]
+
+    @property
+    def posted_messages(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        return self.calls_to("chat.postMessage")
+
+    def wait_for_calls(self, method: str, count: int, timeout: float = 5.0) -> bool:
+        """Block until a Web API method was called at least count times."""
+        return self._wait(
+            lambda: sum(1 for called, _ in self.calls if called == method) >= count, timeout
+        )
+
+    def _wait(self, predicate: typing.Callable[[], bool], timeout: float) -> bool:
+        with self._condition:
+            return self._condition.wait_for(predicate, timeout)
+
+    # Web API
+
+    def handle_api_call(
+        self, method: str, params: typing.Dict[str, typing.Any]
+    ) -> typing.Tuple[int, typing.Dict[str, str], typing.Dict[str, typing.Any]]:
+        """Serve a single Web API call.
+
+        :return: the HTTP status, extra headers and JSON body
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._condition:
+            self.calls.append((method, params))
+            self._condition.notify_all()
+            failure = self._failures[method].popleft() if self._failures[method] else None
+
+        if failure is not None:
+            status, retry_after = failure
+            headers = {"Retry-After": str(retry_after)} if status == 429 else {}
+            return status, headers, {"ok": False, "error": "ratelimited" if status == 429 else "fatal_error"}
+
+        handler = self.handlers.get(method)
+        if handler is None:
+            return 200, {}, {"ok": False, "error": "unknown_method"}
+
+        body = handler(params)
+        if "ok" not in body:
+            body = dict(body, ok=True)
+        return 200, {}, body
+
+    def _auth_test(self, params: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        return {
+            "url": f"http://{self.address}/",
+            "team": "fake",
+            "team_id": "T0FAKETEAM",
+            "user": "fakebot",
+            "user_id": self.bot_user_id,
+            "bot_id": self.bot_id,
+        }
+
+    def _rtm_connect(self, params: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        return {
+            "url": self.websocket_url,
+            "self": {"id": self.bot_user_id, "name": "fakebot"},
+            "team": {"id": "T0FAKETEAM", "name": "fake"},
+        }
+
+    def _chat_post_message(self, params: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        with self._condition:
+            self._message_ts += 1
+            ts = f"{int(time.time())}.{self._message_ts:06d}"
+        return {"channel": params.get("channel"), "ts": ts, "message": {"text": params.get("text"), "ts": ts}}
+
+    def _get_upload_url_external(self, params: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        with self._condition:
+            file_id = f"F{len(self.files) + 1:08d}"
+            self.files[file_id] = {"id": file_id, "name": params["filename"], "length": int(params["length"])}
+        return {"upload_url": f"http://{self.address}/upload/{file_id}", "file_id": file_id}
+
+    def _receive_upload(self, file_id: str, chunks: typing.Iterable[bytes]) -> bool:
+        digest = hashlib.sha256()
+        received = 0
+        for chunk in chunks:
+            digest.update(chunk)
+            received += len(chunk)
+        with self._condition:
+            uploaded = self.files.get(file_id)
+            if uploaded is None or uploaded["length"] != received:
+                return False
+            uploaded.update(received=received, sha256=digest.hexdigest())
+        return True
+
+    def _complete_upload_external(self, params: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        files = params["files"]
+        if isinstance(files, str):
+            files = json.loads(files)
+        completed = []
+        with self._condition:
+            for requested in files:
+                uploaded = self.files.get(requested["id"])
+                if uploaded is None or "sha256" not in uploaded:
+                    return {"ok": False, "error": "file_not_found"}
+                uploaded.update(
+                    title=requested.get("title"),
+                    channel=params.get("channel_id"),
+                    thread_ts=params.get("thread_ts"),
+                    initial_comment=params.get("initial_comment"),
+                )
+                completed.append({"id": uploaded["id"], "name": uploaded["name"], "title": uploaded["title"]})
+        return {"files": completed}
+
+    def _register_websocket(self, websocket: FakeWebSocket):
+        with self._condition:
+            self.websockets.append(websocket)
+            self._condition.notify_all()
+
+
+class FakeSlackRequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to a FakeSlack, upgrading requests for the RTM path to websockets."""
+
+    protocol_version = "HTTP/1.1"
+    slack: FakeSlack
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self):
+        if urllib.parse.urlsplit(self.path).path == "/rtm":
+            self._upgrade_to_websocket()
+        else:
+            self._api_call()
+
+    def do_POST(self):
+        path = urllib.parse.urlsplit(self.path).path
+        if path.startswith("/response/"):
+            self._response(path[len("/response/") :])
+        elif path.startswith("/upload/"):
+            self._upload(path[len("/upload/") :])
+        else:
+            self._api_call()
+
+    def _params(self) -> typing.Dict[str, typing.Any]:
+        url = urllib.parse.urlsplit(self.path)
+        params: typing.Dict[str, typing.Any] = dict(urllib.parse.parse_qsl(url.query))
+
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        content_type = self.headers.get("Content-Type", "")
+        if body and content_type.startswith("application/json"):
+            params.update(json.loads(body.decode("utf-8")))
+        elif body and content_type.startswith("application/x-www-form-urlencoded"):
+            params.update(urllib.parse.parse_qsl(body.decode("utf-8")))
+        elif body:
+            params["body"] = body
+
+        authorization = self.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            params.setdefault("token", authorization[len("Bearer ") :])
+        return params
+
+    def _response(self, name: str):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.slack._record_response(name, self.client_address, json.loads(body))  # pylint: disable=protected-access
+        payload = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _upload(self, name: str):
+        remaining = int(self.headers.get("Content-Length") or 0)
+
+        def chunks():
+            nonlocal remaining
+            while remaining > 0:
+                chunk = self.rfile.read(min(remaining, 1 << 16))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+
+        ok = self.slack._receive_upload(name, chunks())  # pylint: disable=protected-access
+        payload = b"OK" if ok else b"length mismatch"
+        self.send_response(200 if ok else 400)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _api_call(self):
+        path = urllib.parse.urlsplit(self.path).path
+        if not path.startswith("/api/"):
+            self.send_error(404)
+            return
+
+        status, headers, body = self.slack.handle_api_call(path[len("/api/") :], self._params())
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _upgrade_to_websocket(self):
+        key = self.headers.get("Sec-WebSocket-Key")
+        if self.headers.get("Upgrade", "").lower() != "websocket" or not key:
+            self.send_error(400)
+            return
+
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest())
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept.decode("ascii"))
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+
+        websocket = FakeWebSocket(self.connection, self.rfile)
+        websocket.send_text(json.dumps({"type": "hello"}))
+        self.slack._register_websocket(websocket)  # pylint: disable=protected-access
+        websocket.serve()
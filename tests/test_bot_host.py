@@ -0,0 +1,192 @@
+import threading
+
+import pytest
+from slacksocket.models import SlackEvent
+
+from simple_slack_bot.bot_host import BotHost, Tenant
+from simple_slack_bot.rate_limiter import RateLimiter
+from simple_slack_bot.simple_slack_bot import SimpleSlackBot
+
+
+class RecordingSlackclient:
+    def __init__(self):
+        self.posted = []
+
+    def chat_postMessage(self, channel, text, **kwargs):
+        self.posted.append((channel, text))
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def message(text, user="U1"):
+    return SlackEvent({"type": "message", "channel": "C1", "user": user, "text": text})
+
+
+def new_bot():
+    return SimpleSlackBot("mock slack bot token")
+
+
+@pytest.fixture
+def host():
+    sut = BotHost(new_bot())
+    sut.simple_slack_bot._python_slackclient = RecordingSlackclient()
+    return sut
+
+
+def dispatch(host, slack_event):
+    host.simple_slack_bot.enqueue_slack_event(slack_event)
+    host.simple_slack_bot.dispatch_next_slack_event()
+
+
+def test_each_bot_gets_its_own_commands_over_one_connection(host):
+    # Given
+    dice = new_bot()
+    office = new_bot()
+
+    @dice.command("roll")
+    def roll(request, dice):
+        request.write(f"rolled {dice}")
+
+    @office.command("quote")
+    def quote(request):
+        request.write("that's what she said")
+
+    host.adopt("dice", dice)
+    host.adopt("office", office)
+
+    # When
+    dispatch(host, message("roll 2d6"))
+    dispatch(host, message("quote"))
+
+    # Then
+    assert [("C1", "rolled 2d6"), ("C1", "that's what she said")] == host.simple_slack_bot._python_slackclient.posted
+    assert {"dice", "office"} == set(host.stats())
+
+
+def test_a_failing_bot_is_suspended_without_affecting_the_others(host):
+    # Given
+    broken = new_bot()
+    ping = new_bot()
+    pongs = []
+
+    @broken.register("message")
+    def explode(request):
+        raise RuntimeError("boom")
+
+    @ping.register("message")
+    def pong(request):
+        pongs.append(request.message)
+
+    tenant = host.adopt("broken", broken, max_failures=2)
+    host.adopt("ping", ping)
+
+    # When
+    for number in range(4):
+        dispatch(host, message(f"ping {number}"))
+
+    # Then
+    assert 4 == len(pongs)
+    assert {"calls": 2, "failures": 2, "skipped": 2, "suspensions": 1, "suspended": True} == tenant.stats()
+
+
+def test_a_suspended_tenant_resumes_after_suspend_for():
+    # Given
+    clock = Clock()
+    calls = []
+    bot = new_bot()
+    bot.register("message")(calls.append)
+    sut = Tenant("ping", bot, suspend_for=10.0, clock=clock)
+    sut.suspend()
+
+    # When
+    request = type("Request", (), {"type": "message"})()
+    sut(request)
+    clock.now += 10.0
+    sut(request)
+
+    # Then
+    assert 1 == len(calls)
+    assert 1 == sut.skipped
+
+
+def test_quota_throttles_one_bot_only(host):
+    # Given
+    chatty = new_bot()
+    quiet = new_bot()
+    seen = {"chatty": 0, "quiet": 0}
+    chatty.register("message")(lambda request: seen.update(chatty=seen["chatty"] + 1))
+    quiet.register("message")(lambda request: seen.update(quiet=seen["quiet"] + 1))
+    host.adopt("chatty", chatty, quota=RateLimiter(rate=0.001, burst=2, key=lambda slack_event: "all"))
+    host.adopt("quiet", quiet)
+
+    # When
+    for number in range(5):
+        dispatch(host, message(f"hello {number}", user=f"U{number}"))
+
+    # Then
+    assert {"chatty": 2, "quiet": 5} == seen
+
+
+def test_jobs_of_adopted_bots_run_on_the_host_with_their_own_bot(host):
+    # Given
+    guest = new_bot()
+    ran_with = []
+    guest.every(60, delay=0)(ran_with.append)
+    host.adopt("guest", guest)
+
+    # When
+    host.simple_slack_bot._job_scheduler.run_due(host.simple_slack_bot)
+
+    # Then
+    assert [guest] == ran_with
+    assert 0 == len(guest._job_scheduler)
+
+
+def test_adopted_bots_share_the_host_thread_pool(host):
+    # Given
+    guest = new_bot()
+    release = threading.Event()
+    guest.register("message", execution="thread")(lambda request: release.wait(5.0))
+    host.adopt("guest", guest)
+
+    # When
+    dispatch(host, message("hello"))
+    pending = host.simple_slack_bot.health()["outbound_backlog"]
+    release.set()
+    host.simple_slack_bot._callback_executor.shutdown()
+
+    # Then
+    assert 1 == pending
+    assert guest._callback_executor._thread_pool is None
+
+
+def test_callbacks_deferred_by_adopted_bots_run_on_the_host(host):
+    # Given
+    guest = new_bot()
+    ran = []
+    guest.defer(0, lambda: ran.append("before adoption"))
+    host.adopt("guest", guest)
+
+    # When
+    guest.defer(0, lambda: ran.append("after adoption"))
+    backlog = host.simple_slack_bot.health()["outbound_backlog"]
+    host.simple_slack_bot.run_deferred_callbacks()
+
+    # Then
+    assert 2 == backlog
+    assert ["before adoption", "after adoption"] == ran
+
+
+def test_adopting_the_same_name_twice_raises_value_error(host):
+    # Given
+    host.adopt("dice", new_bot())
+
+    # Then
+    with pytest.raises(ValueError):
+        host.adopt("dice", new_bot())
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+from slack import WebClient
+
+from simple_slack_bot.broadcaster import Broadcaster
+from tests.common.fake_slack import FakeSlack
+
+CHANNELS = [f"C{index:08d}" for index in range(10)]
+
+
+@pytest.fixture
+def fake_slack():
+    with FakeSlack() as fake_slack:
+        yield fake_slack
+
+
+@pytest.fixture
+def python_slackclient(fake_slack):
+    return WebClient("xoxb-fake", base_url=fake_slack.api_url)
+
+
+def test_broadcast_posts_once_to_every_channel_and_reports_progress(fake_slack, python_slackclient):
+    # Given
+    progress = []
+
+    def record_progress(result, done, total):
+        progress.append((done, total))
+
+    sut = Broadcaster(python_slackclient, rate=1000, progress=record_progress)
+
+    # When
+    report = sut.broadcast("Maintenance tonight", CHANNELS + CHANNELS[:3])
+
+    # Then
+    assert CHANNELS == report.sent
+    assert [] == report.failed
+    assert sorted(CHANNELS) == sorted(posted["channel"] for posted in fake_slack.posted_messages)
+    assert {"Maintenance tonight"} == {posted["text"] for posted in fake_slack.posted_messages}
+    assert all(result.ts for result in report.results.values())
+    assert [(done, 10) for done in range(1, 11)] == progress
+
+
+def test_broadcast_keeps_within_its_rate(python_slackclient):
+    # Given
+    sut = Broadcaster(python_slackclient, max_workers=8, rate=20)
+
+    # When
+    start = time.monotonic()
+    sut.broadcast("hello", CHANNELS)
+
+    # Then
+    assert time.monotonic() - start >= 9 / 20
+
+
+def test_broadcast_retries_rate_limited_posts_after_retry_after(fake_slack, python_slackclient):
+    # Given
+    fake_slack.fail_next("chat.postMessage", status=429, retry_after=1)
+    sut = Broadcaster(python_slackclient, rate=1000)
+
+    # When
+    start = time.monotonic()
+    report = sut.broadcast("hello", CHANNELS[:3])
+
+    # Then
+    assert CHANNELS[:3] == report.sent
+    assert 2 == max(result.attempts for result in report.results.values())
+    assert time.monotonic() - start >= 1
+    assert 4 == len(fake_slack.calls_to("chat.postMessage"))
+
+
+def test_failed_broadcast_resumes_from_its_journal(fake_slack, python_slackclient, tmp_path):
+    # Given
+    journal_path = str(tmp_path / "broadcast.journal")
+    fake_slack.fail_next("chat.postMessage", status=500, times=2)
+    first_run = Broadcaster(python_slackclient, max_workers=1, rate=1000, journal_path=journal_path)
+    first_report = first_run.broadcast("hello", CHANNELS)
+
+    # When
+    second_run = Broadcaster(python_slackclient, rate=1000, journal_path=journal_path)
+    second_report = second_run.broadcast("hello", CHANNELS)
+
+    # Then
+    assert CHANNELS[:2] == first_report.failed
+    assert "fatal_error" == first_report.results[CHANNELS[0]].error
+    assert CHANNELS == second_report.sent
+    assert 8 == sum(result.resumed for result in second_report.results.values())
+    assert CHANNELS[:2] == [call["channel"] for call in fake_slack.calls_to("chat.postMessage")[10:]]
+
+
+def test_a_journal_only_resumes_broadcasts_of_the_same_message(fake_slack, python_slackclient, tmp_path):
+    # Given
+    journal_path = str(tmp_path / "broadcast.journal")
+    Broadcaster(python_slackclient, rate=1000, journal_path=journal_path).broadcast("hello", CHANNELS)
+
+    # When
+    sut = Broadcaster(python_slackclient, rate=1000, journal_path=journal_path)
+    other_text = sut.broadcast("goodbye", CHANNELS)
+    other_blocks = sut.broadcast("goodbye", CHANNELS, blocks=[{"type": "divider"}])
+    same_again = sut.broadcast("goodbye", CHANNELS)
+
+    # Then
+    assert 0 == sum(result.resumed for result in other_text.results.values())
+    assert 0 == sum(result.resumed for result in other_blocks.results.values())
+    assert 10 == sum(result.resumed for result in same_again.results.values())
+    assert ["hello"] * 10 + ["goodbye"] * 20 == [call["text"] for call in fake_slack.calls_to("chat.postMessage")]
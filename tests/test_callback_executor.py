@@ -0,0 +1,235 @@
+import os
+import pickle
+import sys
+import threading
+import time
+
+import pytest
+from slacksocket.models import SlackEvent  # type: ignore
+
+from simple_slack_bot.callback_executor import CallbackExecutor, RequestSnapshot, run_snapshot
+from simple_slack_bot.slack_request import SlackRequest
+from simple_slack_bot.tracer import Tracer
+from tests.test_tracer import ListExporter
+
+
+class RecordingSlackclient:
+    def __init__(self):
+        self.posted = []
+        self.posted_event = threading.Event()
+
+    def chat_postMessage(self, channel, text, **kwargs):
+        self.posted.append((channel, text, kwargs))
+        self.posted_event.set()
+
+
+def slack_event(text="hello"):
+    return SlackEvent({"type": "message", "channel": "C00000001", "text": text, "thread_ts": "1600000000.000001"})
+
+
+def shout(request):
+    request.write(f"{request.message.upper()} from {os.getpid()}")
+
+
+def explode(request):
+    raise RuntimeError("boom")
+
+
+def report(request):
+    request.upload(b"a,b\n1,2\n", "report.csv", title="Report")
+    request.upload_many([b"first", (b"second", "second.txt")], channel="C00000002")
+
+
+class RecordingFileUploader:
+    def __init__(self):
+        self.uploads = []
+
+    def upload(self, python_slackclient, source, filename=None, **destination):
+        self.uploads.append((source, filename, destination["channel"], destination["title"]))
+
+    def upload_many(self, python_slackclient, uploads):
+        self.uploads.extend((upload["source"], upload["filename"], upload["channel"], None) for upload in uploads)
+
+
+def test_request_snapshot_survives_pickling_and_records_writes():
+    # Given
+    sut = pickle.loads(pickle.dumps(RequestSnapshot(slack_event())))
+
+    # When
+    sut.write("one")
+    sut.write("two", channel="C00000002")
+
+    # Then
+    assert "hello" == sut.message
+    assert [("write", "one", None), ("write", "two", "C00000002")] == sut.actions
+
+
+def test_run_snapshot_returns_the_recorded_actions():
+    # Given
+    snapshot = RequestSnapshot(slack_event())
+
+    # When
+    actions = run_snapshot(shout, snapshot)
+
+    # Then
+    assert [("write", f"HELLO from {os.getpid()}", None)] == actions
+
+
+def test_wrap_returns_inline_callbacks_unchanged():
+    # Given
+    sut = CallbackExecutor()
+
+    # When / Then
+    assert shout is sut.wrap(shout, "inline")
+
+
+def test_wrap_rejects_unknown_executions():
+    # Given
+    sut = CallbackExecutor()
+
+    # When / Then
+    with pytest.raises(ValueError):
+        sut.wrap(shout, "elsewhere")
+
+
+def test_wrap_thread_runs_the_callback_in_a_pool_thread():
+    # Given
+    sut = CallbackExecutor(max_threads=1)
+    ran_in = []
+    done = threading.Event()
+
+    def record_thread(request):
+        ran_in.append(threading.current_thread().name)
+        done.set()
+
+    # When
+    sut.wrap(record_thread, "thread")(SlackRequest(RecordingSlackclient(), slack_event()))
+
+    # Then
+    assert done.wait(5)
+    sut.shutdown()
+    assert ran_in[0].startswith("simple-slack-bot-callback")
+
+
+def test_wrap_process_applies_writes_through_the_original_request():
+    # Given
+    sut = CallbackExecutor(max_processes=1)
+    python_slackclient = RecordingSlackclient()
+
+    # When
+    sut.wrap(shout, "process")(SlackRequest(python_slackclient, slack_event()))
+    sut.shutdown()
+
+    # Then
+    assert 1 == len(python_slackclient.posted)
+    channel, text, kwargs = python_slackclient.posted[0]
+    assert "C00000001" == channel
+    assert text.startswith("HELLO from ")
+    assert str(os.getpid()) != text.rsplit(" ", 1)[1]
+    assert {"thread_ts": "1600000000.000001"} == kwargs
+
+
+def test_request_snapshot_refuses_uploads_it_can_not_send_back():
+    # Given
+    sut = RequestSnapshot(slack_event())
+
+    # When / Then
+    with pytest.raises(RuntimeError):
+        sut.upload(iter([b"chunk"]), "generated.txt")
+    with pytest.raises(RuntimeError):
+        sut.upload_many([b"fine", (iter([b"chunk"]), "generated.txt")])
+    assert [] == sut.actions
+
+
+def test_wrap_process_applies_uploads_through_the_original_request():
+    # Given
+    sut = CallbackExecutor(max_processes=1)
+    file_uploader = RecordingFileUploader()
+
+    # When
+    sut.wrap(report, "process")(SlackRequest(RecordingSlackclient(), slack_event(), file_uploader=file_uploader))
+    sut.shutdown()
+
+    # Then
+    assert [
+        (b"a,b\n1,2\n", "report.csv", "C00000001", "Report"),
+        (b"first", None, "C00000002", None),
+        (b"second", "second.txt", "C00000002", None),
+    ] == file_uploader.uploads
+
+
+def test_wrap_process_logs_exceptions_without_writing(caplog):
+    # Given
+    sut = CallbackExecutor(max_processes=1)
+    python_slackclient = RecordingSlackclient()
+
+    # When
+    sut.wrap(explode, "process")(SlackRequest(python_slackclient, slack_event()))
+    sut.shutdown()
+
+    # Then
+    assert [] == python_slackclient.posted
+    assert "exception processing callback explode" in caplog.text
+
+
+def test_shutdown_stops_waiting_once_the_timeout_passes(caplog):
+    # Given
+    sut = CallbackExecutor(max_threads=1)
+    release = threading.Event()
+    ran = []
+    sut.wrap(lambda request: release.wait(10), "thread")(SlackRequest(RecordingSlackclient(), slack_event()))
+    sut.wrap(ran.append, "thread")(SlackRequest(RecordingSlackclient(), slack_event("queued")))
+
+    # When
+    start = time.monotonic()
+    sut.shutdown(timeout=0.1)
+    elapsed = time.monotonic() - start
+    release.set()
+
+    # Then
+    assert elapsed < 5
+    if sys.version_info >= (3, 9):
+        assert [] == ran
+        assert "was cancelled before it ran" in caplog.text
+        assert "Traceback" not in caplog.text
+
+
+def test_pool_spans_time_callbacks_until_they_finish():
+    # Given
+    exporter = ListExporter()
+    tracer = Tracer(exporter, sample_rate=1.0)
+    event = slack_event()
+    tracer.receive(event)
+    request = SlackRequest(RecordingSlackclient(), event, trace=tracer.dispatch(event))
+    sut = CallbackExecutor(max_threads=1)
+
+    def nap(request):
+        time.sleep(0.2)
+        raise RuntimeError("woke up")
+
+    # When
+    with request.trace.span("callback"):
+        sut.wrap(nap, "thread")(request)
+    request.trace.finish()
+    sut.shutdown()
+
+    # Then
+    spans = {span.name: span for span in exporter.spans}
+    assert spans["callback"].duration < 0.2 <= spans["pool"].duration
+    assert {"callback": "nap", "execution": "thread", "error": "RuntimeError('woke up')"} == spans["pool"].attributes
+    assert spans["event"].span_id == spans["pool"].parent_id
+
+
+def test_shutdown_lets_pools_start_again():
+    # Given
+    sut = CallbackExecutor(max_processes=1)
+    python_slackclient = RecordingSlackclient()
+    sut.wrap(shout, "process")(SlackRequest(python_slackclient, slack_event("first")))
+    sut.shutdown()
+
+    # When
+    sut.wrap(shout, "process")(SlackRequest(python_slackclient, slack_event("second")))
+    sut.shutdown()
+
+    # Then
+    assert ["FIRST", "SECOND"] == [text.split(" ")[0] for _, text, _ in python_slackclient.posted]
@@ -0,0 +1,150 @@
+import pytest
+
+from simple_slack_bot.command_router import Command, CommandRouter
+
+
+class MockSlackRequest:
+    def __init__(self, text):
+        self.slack_event = {"type": "message", "text": text}
+        self.written = []
+
+    def write(self, content, channel=None):
+        self.written.append(content)
+
+
+def test_route_calls_command_with_converted_arguments():
+    # Given
+    calls = []
+
+    def add(request, left: int, right: int = 10, *rest: float):
+        calls.append((left, right, rest))
+
+    sut = CommandRouter(prefix="!")
+    sut.add("add", add)
+
+    # When
+    sut.route(MockSlackRequest("!add 1"))
+    sut.route(MockSlackRequest("!ADD 1 2 3.5 4"))
+
+    # Then
+    assert [(1, 10, ()), (1, 2, (3.5, 4.0))] == calls
+
+
+@pytest.mark.parametrize("text", [None, "", "add 1 2", "!", "!subtract 1 2", "! add 1 2"])
+def test_route_ignores_messages_that_are_not_commands(text):
+    # Given
+    def add(request, left: int, right: int):
+        raise AssertionError("should not be called")
+
+    sut = CommandRouter(prefix="!")
+    sut.add("add", add)
+
+    # When
+    actual = sut.route(MockSlackRequest(text))
+
+    # Then
+    assert actual is False
+
+
+@pytest.mark.parametrize("text", ["roll", "roll two", "roll 1 2"])
+def test_route_writes_usage_when_arguments_do_not_fit(text):
+    # Given
+    def roll(request, dice: int):
+        raise AssertionError("should not be called")
+
+    sut = CommandRouter()
+    sut.add("roll", roll, help_text="rolls dice")
+    mock_request = MockSlackRequest(text)
+
+    # When
+    actual = sut.route(mock_request)
+
+    # Then
+    assert actual is True
+    assert ["Usage: roll <dice> - rolls dice"] == mock_request.written
+
+
+def test_route_respects_case_sensitivity():
+    # Given
+    calls = []
+    sut = CommandRouter(case_sensitive=True)
+    sut.add("Ping", lambda request: calls.append(request))
+
+    # When
+    lower_routed = sut.route(MockSlackRequest("ping"))
+    exact_routed = sut.route(MockSlackRequest("Ping"))
+
+    # Then
+    assert lower_routed is False
+    assert exact_routed is True
+    assert 1 == len(calls)
+
+
+def test_add_rejects_duplicate_and_invalid_command_words():
+    # Given
+    sut = CommandRouter()
+    sut.add("ping", lambda request: None)
+
+    # When, Then
+    with pytest.raises(ValueError):
+        sut.add("PING", lambda request: None)
+    with pytest.raises(ValueError):
+        sut.add("two words", lambda request: None)
+    assert "Ping" in sut
+    assert 1 == len(sut)
+
+
+def test_command_rejects_keyword_only_arguments():
+    # Given
+    def callback(request, *, times: int):
+        pass
+
+    # When, Then
+    with pytest.raises(TypeError):
+        Command("repeat", callback)
+
+
+def test_command_usage_marks_optional_and_variadic_arguments():
+    # Given
+    def callback(request, target, count: int = 1, *words):
+        pass
+
+    # When
+    sut = Command("poke", callback)
+
+    # Then
+    assert "Usage: poke <target> [count] [words...]" == sut.usage
+
+
+@pytest.mark.parametrize(
+    "callback, words, expected",
+    [
+        (lambda request, dice: None, ["1", "2"], "expected 1 arguments"),
+        (lambda request, dice, sides=6: None, ["1", "2", "3"], "expected 1 to 2 arguments"),
+        (lambda request, dice, *modifiers: None, [], "expected at least 1 arguments"),
+    ],
+)
+def test_convert_says_how_many_arguments_were_expected(callback, words, expected):
+    # Given
+    sut = Command("roll", callback)
+
+    # When
+    with pytest.raises(ValueError) as error:
+        sut.convert(words)
+
+    # Then
+    assert expected == str(error.value)
+
+
+def test_bool_arguments_only_take_true_or_false_words():
+    # Given
+    def notify(request, enabled: bool):
+        pass
+
+    sut = Command("notify", notify)
+
+    # Then
+    assert [True, True, True] == [sut.convert([word])[0] for word in ["true", "YES", "1"]]
+    assert [False, False, False] == [sut.convert([word])[0] for word in ["False", "no", "0"]]
+    with pytest.raises(ValueError):
+        sut.convert(["maybe"])
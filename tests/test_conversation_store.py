@@ -0,0 +1,157 @@
+import shelve
+
+import pytest
+
+from simple_slack_bot.conversation_store import ConversationStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_keeps_changes_to_the_state():
+    # Given
+    sut = ConversationStore()
+
+    # When
+    sut.get("C1", "1.0")["step"] = 2
+
+    # Then
+    assert {"step": 2} == sut.get("C1", "1.0")
+    assert {} == sut.get("C1", "2.0")
+
+
+def test_get_without_create_returns_none_for_unknown_conversations():
+    # Given
+    sut = ConversationStore()
+
+    # When
+    state = sut.get("C1", "1.0", create=False)
+
+    # Then
+    assert state is None
+    assert 0 == len(sut)
+
+
+def test_least_recently_used_conversation_is_evicted_beyond_capacity():
+    # Given
+    sut = ConversationStore(capacity=2)
+    sut.get("C1", "1.0")["name"] = "first"
+    sut.get("C1", "2.0")["name"] = "second"
+    sut.get("C1", "1.0")
+
+    # When
+    sut.get("C1", "3.0")
+
+    # Then
+    assert 2 == len(sut)
+    assert sut.get("C1", "2.0", create=False) is None
+    assert {"name": "first"} == sut.get("C1", "1.0", create=False)
+    assert 1 == sut.stats()["evicted"]
+
+
+def test_unused_conversations_expire_after_the_ttl():
+    # Given
+    clock = FakeClock()
+    sut = ConversationStore(ttl_seconds=60, clock=clock)
+    sut.get("C1", "1.0")["name"] = "old"
+    clock.now += 30
+    sut.get("C1", "2.0")["name"] = "recent"
+
+    # When
+    clock.now += 45
+
+    # Then
+    assert sut.get("C1", "1.0", create=False) is None
+    assert {"name": "recent"} == sut.get("C1", "2.0", create=False)
+    assert 1 == sut.stats()["expired"]
+
+
+def test_evicted_conversations_are_spilled_to_disk_and_read_back(tmp_path):
+    # Given
+    sut = ConversationStore(capacity=1, spill_path=str(tmp_path / "conversations"))
+    sut.get("C1", "1.0")["name"] = "first"
+
+    # When
+    sut.get("C1", "2.0")["name"] = "second"
+
+    # Then
+    assert 1 == len(sut)
+    assert {"name": "first"} == sut.get("C1", "1.0", create=False)
+    assert {"spilled": 2, "unspilled": 1} == {key: sut.stats()[key] for key in ("spilled", "unspilled")}
+    sut.close()
+
+
+def test_close_spills_every_conversation_so_they_survive_a_restart(tmp_path):
+    # Given
+    spill_path = str(tmp_path / "conversations")
+    sut = ConversationStore(spill_path=spill_path)
+    sut.get("C1", "1.0")["name"] = "kept"
+
+    # When
+    sut.close()
+
+    # Then
+    assert {"name": "kept"} == ConversationStore(spill_path=spill_path).get("C1", "1.0", create=False)
+
+
+def test_expired_conversations_are_never_kept_in_the_spill_file(tmp_path):
+    # Given
+    clock = FakeClock()
+    spill_path = str(tmp_path / "conversations")
+    sut = ConversationStore(capacity=2, ttl_seconds=60, spill_path=spill_path, clock=clock)
+    sut.get("C1", "1.0")["name"] = "spilled"
+    sut.get("C1", "2.0")["name"] = "stale"
+    sut.get("C1", "3.0")["name"] = "fresh"
+    clock.now += 45
+    sut.get("C1", "3.0")
+    clock.now += 30
+    sut.close()
+
+    # When
+    clock.now += 30
+    restarted = ConversationStore(ttl_seconds=60, spill_path=spill_path, clock=clock)
+    restarted.close()
+
+    # Then
+    with shelve.open(spill_path) as spill:
+        assert ["C1\x003.0"] == list(spill)
+    assert 1 == sut.stats()["expired"]
+    assert 1 == restarted.stats()["expired"]
+
+
+def test_discard_forgets_a_conversation():
+    # Given
+    sut = ConversationStore()
+    sut.get("C1", "1.0")["name"] = "done"
+
+    # When
+    sut.discard("C1", "1.0")
+
+    # Then
+    assert sut.get("C1", "1.0", create=False) is None
+
+
+def test_stats_report_hit_rate_and_memory_use():
+    # Given
+    sut = ConversationStore()
+    sut.get("C1", "1.0")["text"] = "x" * 1000
+
+    # When
+    sut.get("C1", "1.0")
+    stats = sut.stats()
+
+    # Then
+    assert 0.5 == stats["hit_rate"]
+    assert 1 == stats["size"]
+    assert stats["memory_bytes"] > 1000
+
+
+def test_capacity_must_be_positive():
+    # When / Then
+    with pytest.raises(ValueError):
+        ConversationStore(capacity=0)
@@ -0,0 +1,143 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples", "dice_bot"))
+
+import dice_engine  # pylint: disable=wrong-import-position
+from dice_engine import DiceError, DiceExpression, DiceTerm, roll_term  # pylint: disable=wrong-import-position
+
+
+@pytest.fixture(params=["stdlib", "numpy"])
+def rng(request, monkeypatch):
+    if request.param == "numpy":
+        numpy = pytest.importorskip("numpy")
+        return numpy.random.default_rng(7)
+    monkeypatch.setattr(dice_engine, "numpy", None)
+    return random.Random(7)
+
+
+def test_expressions_are_parsed_into_terms_and_a_constant():
+    # When
+    sut = DiceExpression(" 4d6k3 - d% + 2d10! + 3d8kl1 ")
+
+    # Then
+    assert [(1, "4d6k3"), (-1, "1d100"), (1, "2d10!"), (1, "3d8kl1")] == [
+        (sign, str(term)) for sign, term in sut.terms
+    ]
+    assert 0 == sut.constant
+
+
+def test_constants_are_summed():
+    # When
+    sut = DiceExpression("1d6+5-2+10")
+
+    # Then
+    assert 13 == sut.constant
+    assert "1d6+5-2+10" == str(sut)
+
+
+@pytest.mark.parametrize("source", ["", "5", "d", "2d6 3d6", "2d6+", "1d6*2", "4d6k5", "0d6", "2d0"])
+def test_expressions_that_are_not_dice_are_refused(source):
+    # Then
+    with pytest.raises(DiceError):
+        DiceExpression(source)
+
+
+def test_sides_and_dice_are_capped():
+    # Then
+    DiceTerm(1, dice_engine.MAX_SIDES)
+    with pytest.raises(DiceError, match="sides"):
+        DiceExpression(f"1d{dice_engine.MAX_SIDES + 1}")
+    with pytest.raises(DiceError, match="dice"):
+        DiceExpression(f"{dice_engine.MAX_DICE}d6+1d6")
+
+
+def test_dice_errors_are_value_errors():
+    # Then
+    with pytest.raises(ValueError):
+        DiceExpression("not dice")
+
+
+def test_totals_add_terms_and_the_constant(rng):
+    # When
+    result = DiceExpression("3d1+2d1-1d1+4").roll(rng)
+
+    # Then
+    assert 8 == result.total
+    assert [[1, 1, 1], [1, 1], [1]] == [term_result.rolls for _, term_result in result.terms]
+    assert "Rolled 3d1+2d1-1d1+4 and got 8 (3d1: [1, 1, 1]; 2d1: [1, 1]; -1d1: [1])" == str(result)
+
+
+def test_rolls_stay_within_the_sides(rng):
+    # When
+    result = roll_term(DiceTerm(2000, 6), rng, show_rolls=True)
+
+    # Then
+    assert {1, 2, 3, 4, 5, 6} == set(result.rolls)
+    assert sum(result.rolls) == result.total
+    assert (1, 6) == (result.minimum, result.maximum)
+
+
+@pytest.mark.parametrize("keep_highest", [True, False])
+def test_keep_totals_only_the_highest_or_lowest_dice(rng, keep_highest):
+    # Given
+    term = DiceTerm(12, 20, keep=3, keep_highest=keep_highest)
+
+    # When
+    result = roll_term(term, rng, show_rolls=True)
+
+    # Then
+    assert sum(sorted(result.rolls, reverse=keep_highest)[:3]) == result.total
+    assert keep_highest == (result.mean > 10.5)
+
+
+def test_keep_carries_the_best_dice_across_batches(rng, monkeypatch):
+    # Given
+    monkeypatch.setattr(dice_engine, "BATCH_SIZE", 7)
+    term = DiceTerm(50, 100, keep=5)
+
+    # When
+    result = roll_term(term, rng, show_rolls=True)
+
+    # Then
+    assert sum(sorted(result.rolls, reverse=True)[:5]) == result.total
+    assert 50 == result.rolled
+
+
+def test_exploding_dice_add_their_rerolls(rng):
+    # When
+    result = roll_term(DiceTerm(1000, 2, explode=True), rng, show_rolls=True)
+
+    # Then
+    assert 1 == result.minimum
+    assert result.maximum > 2
+    assert sum(result.rolls) == result.total
+
+
+def test_large_rolls_only_keep_a_summary(rng):
+    # When
+    result = DiceExpression("100000d6").roll(rng)
+
+    # Then
+    term_result = result.terms[0][1]
+    assert term_result.rolls is None
+    assert 3.4 < term_result.mean < 3.6
+    assert "100000 dice rolled, min 1, max 6" in str(result)
+
+
+def test_stdlib_and_numpy_totals_agree_in_distribution(monkeypatch):
+    # Given
+    numpy = pytest.importorskip("numpy")
+    expression = DiceExpression("20000d10k10000+5")
+
+    # When
+    with_numpy = expression.roll(numpy.random.default_rng(1)).total
+    monkeypatch.setattr(dice_engine, "numpy", None)
+    with_stdlib = expression.roll(random.Random(1)).total
+
+    # Then
+    assert isinstance(with_numpy, int) and isinstance(with_stdlib, int)
+    assert abs(with_numpy - with_stdlib) < 0.01 * with_stdlib
@@ -0,0 +1,106 @@
+import pytest
+
+from simple_slack_bot.event_deduplicator import EventDeduplicator
+
+
+class MockClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_for_prefers_event_id_then_client_msg_id_then_ts():
+    # Given
+    slack_event = {"type": "message", "channel": "C1", "ts": "1.2", "client_msg_id": "abc"}
+
+    # When
+    event_id_key = EventDeduplicator.key_for(dict(slack_event, event_id="Ev1"))
+    client_msg_id_key = EventDeduplicator.key_for(slack_event)
+    ts_key = EventDeduplicator.key_for({"type": "message", "channel": "C1", "ts": "1.2"})
+
+    # Then
+    assert ("event_id", "Ev1") == event_id_key
+    assert ("client_msg_id", "abc") == client_msg_id_key
+    assert ("ts", "message", "C1", "1.2") == ts_key
+
+
+def test_is_duplicate_returns_true_only_for_the_second_delivery():
+    # Given
+    sut = EventDeduplicator()
+    slack_event = {"type": "message", "channel": "C1", "ts": "1.2"}
+
+    # When
+    first = sut.is_duplicate(slack_event)
+    second = sut.is_duplicate(dict(slack_event))
+
+    # Then
+    assert first is False
+    assert second is True
+    assert {"hits": 1, "misses": 1, "unkeyed": 0, "size": 1} == sut.stats()
+
+
+def test_is_duplicate_never_drops_events_without_a_key():
+    # Given
+    sut = EventDeduplicator()
+
+    # When
+    results = [sut.is_duplicate({"type": "hello"}) for _ in range(3)]
+
+    # Then
+    assert [False, False, False] == results
+    assert 3 == sut.unkeyed
+    assert 0 == len(sut)
+
+
+def test_is_duplicate_forgets_keys_once_the_window_has_passed():
+    # Given
+    clock = MockClock()
+    sut = EventDeduplicator(window_seconds=10, clock=clock)
+    slack_event = {"type": "message", "channel": "C1", "ts": "1.2"}
+    sut.is_duplicate(slack_event)
+
+    # When
+    clock.now = 11
+    actual = sut.is_duplicate(slack_event)
+
+    # Then
+    assert actual is False
+    assert 1 == len(sut)
+
+
+def test_is_duplicate_is_bounded_by_capacity():
+    # Given
+    sut = EventDeduplicator(capacity=2)
+
+    # When
+    for ts in ["1", "2", "3"]:
+        sut.is_duplicate({"type": "message", "channel": "C1", "ts": ts})
+
+    # Then
+    assert 2 == len(sut)
+    assert sut.is_duplicate({"type": "message", "channel": "C1", "ts": "1"}) is False
+
+
+def test_forget_lets_an_event_through_again():
+    # Given
+    sut = EventDeduplicator()
+    kept = {"type": "message", "channel": "C1", "ts": "1"}
+    forgotten = {"type": "message", "channel": "C1", "ts": "2"}
+    sut.is_duplicate(kept)
+    sut.is_duplicate(forgotten)
+
+    # When
+    sut.forget([forgotten, {"type": "hello"}])
+
+    # Then
+    assert [("ts", "message", "C1", "1")] == sut.keys()
+    assert sut.is_duplicate(forgotten) is False
+    assert sut.is_duplicate(kept) is True
+
+
+def test_init_raises_value_error_for_non_positive_capacity():
+    # Given, When, Then
+    with pytest.raises(ValueError):
+        EventDeduplicator(capacity=0)
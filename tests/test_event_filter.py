@@ -0,0 +1,54 @@
+from simple_slack_bot.event_filter import EventFilter
+
+
+def test_should_ignore_drops_our_own_messages_by_bot_id_or_user_id():
+    # Given
+    sut = EventFilter()
+    sut.set_self_ids("B1", "U1")
+
+    # When
+    by_bot_id = sut.should_ignore({"type": "message", "bot_id": "B1"})
+    by_user_id = sut.should_ignore({"type": "message", "user": "U1"})
+
+    # Then
+    assert by_bot_id is True
+    assert by_user_id is True
+    assert 2 == sut.filtered[EventFilter.IGNORED_SELF]
+
+
+def test_should_ignore_keeps_other_bots_unless_configured():
+    # Given
+    slack_event = {"type": "message", "bot_id": "B2"}
+
+    # When
+    default_result = EventFilter().should_ignore(slack_event)
+    ignore_bots_result = EventFilter(ignore_bots=True).should_ignore(slack_event)
+
+    # Then
+    assert default_result is False
+    assert ignore_bots_result is True
+
+
+def test_should_ignore_drops_ignored_users():
+    # Given
+    sut = EventFilter(ignored_user_ids=["U2"])
+
+    # When
+    ignored = sut.should_ignore({"type": "message", "user": "U2"})
+    kept = sut.should_ignore({"type": "message", "user": "U3"})
+
+    # Then
+    assert ignored is True
+    assert kept is False
+    assert 1 == sut.filtered[EventFilter.IGNORED_USER]
+
+
+def test_should_ignore_keeps_everything_when_self_ids_are_unknown():
+    # Given
+    sut = EventFilter()
+
+    # When
+    actual = sut.should_ignore({"type": "hello"})
+
+    # Then
+    assert actual is False
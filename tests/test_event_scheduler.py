@@ -0,0 +1,65 @@
+from simple_slack_bot.event_scheduler import EventScheduler
+
+
+def test_get_returns_events_by_priority_class_then_arrival_order():
+    # Given
+    sut = EventScheduler()
+    for slack_event in [
+        {"type": "presence_change", "id": 1},
+        {"type": "channel_created", "id": 2},
+        {"type": "message", "id": 3},
+        {"type": "message", "id": 4},
+    ]:
+        sut.put(slack_event)
+
+    # When
+    actual_ids = [sut.get()["id"] for _ in range(4)]
+
+    # Then
+    assert [3, 4, 2, 1] == actual_ids
+    assert None is sut.get()
+    assert 0 == len(sut)
+
+
+def test_put_sheds_the_oldest_event_when_a_priority_class_is_full():
+    # Given
+    sut = EventScheduler(capacities={EventScheduler.PRIORITY_INTERACTIVE: 2})
+
+    # When
+    for ts in ["1", "2", "3"]:
+        sut.put({"type": "message", "ts": ts})
+
+    # Then
+    assert ["2", "3"] == [sut.get()["ts"], sut.get()["ts"]]
+    assert 1 == sut.shed[EventScheduler.PRIORITY_INTERACTIVE]
+
+
+def test_put_sheds_bulk_events_on_arrival_while_overloaded():
+    # Given
+    sut = EventScheduler(overload_threshold=2)
+    sut.put({"type": "message"})
+    sut.put({"type": "message"})
+
+    # When
+    bulk_accepted = sut.put({"type": "user_typing"})
+    message_accepted = sut.put({"type": "message"})
+
+    # Then
+    assert bulk_accepted is False
+    assert message_accepted is True
+    assert 3 == len(sut)
+    assert 1 == sut.stats()["shed"][EventScheduler.PRIORITY_BULK]
+
+
+def test_priorities_can_be_overridden_per_event_type():
+    # Given
+    sut = EventScheduler(priorities={"user_change": EventScheduler.PRIORITY_INTERACTIVE}, default_priority=5)
+
+    # When
+    user_change_priority = sut.priority_of({"type": "user_change"})
+    unknown_priority = sut.priority_of({"type": "foo"})
+
+    # Then
+    assert EventScheduler.PRIORITY_INTERACTIVE == user_change_priority
+    assert 5 == unknown_priority
+    assert sut.put({"type": "foo"}) is True
@@ -0,0 +1,80 @@
+import pickle
+import queue
+
+from slacksocket.models import User  # type: ignore
+
+from simple_slack_bot.fast_slack_socket import FastSlackSocket, LazySlackEvent
+from simple_slack_bot.json_backend import load_backend
+from simple_slack_bot.slack_request import SlackRequest
+
+RAW = '{"type": "message", "channel": "C00000001", "user": "U00000001", "text": "hi <@U0FAKEBOT>", "ts": "1.0"}'
+
+
+class MockLookupSlackSocket:
+    def __init__(self):
+        self.user = User({"id": "U0FAKEBOT", "name": "bot"})
+        self.lookups = []
+
+    def lookup_user(self, match):
+        self.lookups.append(match)
+        return User({"id": match, "name": "name of " + match})
+
+    def lookup_channel(self, match):
+        self.lookups.append(match)
+        return {"id": match}
+
+
+def test_lazy_slack_event_looks_up_user_and_channel_once_when_read():
+    # Given
+    slack_socket = MockLookupSlackSocket()
+    sut = LazySlackEvent(load_backend().loads(RAW), RAW, slack_socket)
+
+    # When
+    assert "message" == sut.type
+    assert "hi <@U0FAKEBOT>" == sut["text"]
+    looked_up_before_reading = list(slack_socket.lookups)
+    names = [sut.user["name"], sut.user["name"]]
+
+    # Then
+    assert [] == looked_up_before_reading
+    assert ["name of U00000001"] * 2 == names
+    assert {"id": "C00000001"} == sut.channel
+    assert ["U00000001", "C00000001"] == slack_socket.lookups
+    assert sut.mentions_me
+
+
+def test_lazy_slack_event_serializes_as_the_text_it_was_decoded_from():
+    # Given
+    sut = LazySlackEvent(load_backend().loads(RAW), RAW)
+
+    # When / Then
+    assert RAW == sut.json
+    assert RAW == str(SlackRequest(None, sut))
+
+
+def test_lazy_slack_event_pickles_without_its_slack_socket():
+    # Given
+    sut = LazySlackEvent(load_backend().loads(RAW), RAW, MockLookupSlackSocket())
+
+    # When
+    copy = pickle.loads(pickle.dumps(sut))
+
+    # Then
+    assert dict(sut) == dict(copy)
+    assert RAW == copy.json
+    assert copy.user is None
+
+
+def test_fast_slack_socket_queues_lazy_events():
+    # Given
+    sut = FastSlackSocket.__new__(FastSlackSocket)
+    sut.json_backend = load_backend("json")
+    sut._eventq = queue.Queue()
+
+    # When
+    sut._event_handler(RAW)
+
+    # Then
+    event = sut._eventq.get_nowait()
+    assert isinstance(event, LazySlackEvent)
+    assert "U00000001" == event["user"]
@@ -0,0 +1,133 @@
+import hashlib
+import io
+import tracemalloc
+
+import pytest
+from slack import WebClient
+from slacksocket.models import SlackEvent
+
+from simple_slack_bot.file_uploader import FileUploader, UploadError
+from simple_slack_bot.slack_request import SlackRequest
+from tests.common.fake_slack import FakeSlack
+
+CHUNK = bytes(range(256)) * 256
+
+
+def chunks(count):
+    for _ in range(count):
+        yield CHUNK
+
+
+def sha256_of(count):
+    digest = hashlib.sha256()
+    for chunk in chunks(count):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+@pytest.fixture
+def fake_slack():
+    with FakeSlack() as fake_slack:
+        yield fake_slack
+
+
+@pytest.fixture
+def client(fake_slack):
+    return WebClient("mock slack bot token", base_url=fake_slack.api_url)
+
+
+def test_upload_streams_a_path_and_shares_it(fake_slack, client, tmp_path):
+    # Given
+    path = tmp_path / "report.csv"
+    path.write_bytes(CHUNK * 3)
+    sut = FileUploader(chunk_size=1000)
+
+    # When
+    uploaded = sut.upload(client, str(path), channel="C1", thread_ts="1.0", initial_comment="here you go")
+
+    # Then
+    stored = fake_slack.files[uploaded["id"]]
+    assert "report.csv" == stored["name"] == stored["title"]
+    assert sha256_of(3) == stored["sha256"]
+    assert ("C1", "1.0", "here you go") == (stored["channel"], stored["thread_ts"], stored["initial_comment"])
+    assert len(CHUNK) * 3 == sut.bytes_sent
+
+
+@pytest.mark.parametrize(
+    "source",
+    [CHUNK * 2, io.BytesIO(CHUNK * 2), chunks(2), io.BufferedReader(io.BytesIO(CHUNK * 2))],
+    ids=["bytes", "seekable file", "generator", "reader"],
+)
+def test_upload_accepts_bytes_file_objects_and_iterables(fake_slack, client, source):
+    # Given
+    sut = FileUploader(spool_size=1000)
+
+    # When
+    uploaded = sut.upload(client, source, filename="data.bin")
+
+    # Then
+    assert sha256_of(2) == fake_slack.files[uploaded["id"]]["sha256"]
+
+
+def test_upload_needs_a_filename_for_bytes(client):
+    with pytest.raises(ValueError):
+        FileUploader().upload(client, b"data")
+
+
+def test_upload_many_runs_uploads_at_once_and_reports_failures(fake_slack, client):
+    # Given
+    sut = FileUploader(rate=100.0)
+    fake_slack.fail_next("files.completeUploadExternal", status=500)
+
+    # When
+    results = sut.upload_many(client, [{"source": chunks(1), "filename": f"{number}.bin"} for number in range(4)])
+
+    # Then
+    assert 1 == sum(isinstance(result, UploadError) for result in results)
+    assert 3 == sut.uploaded
+
+
+def test_rate_limited_calls_are_retried(fake_slack, client):
+    # Given
+    sut = FileUploader()
+    fake_slack.fail_next("files.getUploadURLExternal", status=429, retry_after=0)
+
+    # When
+    uploaded = sut.upload(client, b"data", filename="data.txt")
+
+    # Then
+    assert "sha256" in fake_slack.files[uploaded["id"]]
+    assert 2 == len(fake_slack.calls_to("files.getUploadURLExternal"))
+
+
+def test_a_large_generator_is_uploaded_in_bounded_memory(fake_slack, client):
+    # Given
+    count = 1024  # 64MB
+    sut = FileUploader(chunk_size=1 << 20, spool_size=1 << 20)
+    tracemalloc.start()
+
+    # When
+    try:
+        uploaded = sut.upload(client, chunks(count), filename="large.bin")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Then
+    assert sha256_of(count) == fake_slack.files[uploaded["id"]]["sha256"]
+    assert peak < 8 << 20
+
+
+def test_request_uploads_to_its_channel_and_thread(fake_slack, client):
+    # Given
+    slack_event = SlackEvent({"type": "message", "channel": "C1", "thread_ts": "2.0", "text": "hi"})
+    sut = SlackRequest(client, slack_event, file_uploader=FileUploader(rate=100.0))
+
+    # When
+    uploaded = sut.upload(b"chart", filename="chart.png", title="Chart")
+    uploaded_many = sut.upload_many([(b"one", "one.txt"), (b"two", "two.txt")])
+
+    # Then
+    stored = fake_slack.files[uploaded["id"]]
+    assert ("C1", "2.0", "Chart") == (stored["channel"], stored["thread_ts"], stored["title"])
+    assert ["one.txt", "two.txt"] == [result["name"] for result in uploaded_many]
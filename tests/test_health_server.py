@@ -0,0 +1,200 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+from slacksocket.models import SlackEvent
+
+from simple_slack_bot.callback_executor import CallbackExecutor
+from simple_slack_bot.health_server import HealthServer
+from simple_slack_bot.simple_slack_bot import SimpleSlackBot
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def healthy(**overrides):
+    health = {
+        "listening": True,
+        "connection": "connected",
+        "queue_depth": 0,
+        "dispatch_lag": 0.0,
+        "stalled_for": 0.0,
+    }
+    health.update(overrides)
+    return health
+
+
+def get(sut, path):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{sut.port}{path}", timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        body = error.read()
+        return error.code, json.loads(body) if error.headers.get("Content-Type") == "application/json" else None
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(health, **kwargs):
+        sut = HealthServer(port=0, **kwargs)
+        sut.start(lambda: health)
+        servers.append(sut)
+        return sut
+
+    yield start
+    for sut in servers:
+        sut.stop()
+
+
+def test_probes_answer_over_http(serve):
+    # Given
+    sut = serve(healthy())
+
+    # When
+    health = get(sut, "/health")
+    ready = get(sut, "/ready")
+    live = get(sut, "/live")
+    missing = get(sut, "/metrics")
+
+    # Then
+    assert 200 == health[0] and health[1]["ready"] and health[1]["live"]
+    assert 200 == ready[0]
+    assert 200 == live[0]
+    assert 404 == missing[0]
+
+
+def test_not_ready_while_disconnected_but_still_live(serve):
+    # Given
+    sut = serve(healthy(connection="connecting"))
+
+    # When
+    health = get(sut, "/health")
+    ready = get(sut, "/ready")
+    live = get(sut, "/live")
+
+    # Then
+    assert 200 == health[0]
+    assert 503 == ready[0]
+    assert ["not connected"] == ready[1]["reasons"]
+    assert 200 == live[0]
+
+
+def test_readiness_thresholds():
+    # Given
+    sut = HealthServer(max_dispatch_lag=10.0, max_queue_depth=100)
+
+    # When
+    sut._health = lambda: healthy(dispatch_lag=11.0, queue_depth=101)
+    health = sut.check()
+
+    # Then
+    assert health["ready"] is False
+    assert ["queue depth above 100", "dispatch lag above 10.0s"] == health["reasons"]
+    assert health["live"] is True
+
+
+def test_liveness_thresholds():
+    # Given
+    clock = Clock()
+    sut = HealthServer(max_stall=60.0, max_disconnected=30.0, clock=clock)
+    sut._health = lambda: healthy(connection="stopped")
+    sut.check()
+
+    # When
+    clock.now += 31.0
+    disconnected = sut.check()
+    sut._health = lambda: healthy(stalled_for=61.0)
+    stalled = sut.check()
+    sut._health = lambda: healthy(listening=False)
+    stopped = sut.check()
+
+    # Then
+    assert disconnected["live"] is False and 31.0 == disconnected["disconnected_for"]
+    assert ["dispatch stalled for over 60.0s"] == stalled["reasons"]
+    assert 0.0 == stalled["disconnected_for"]
+    assert ["not listening"] == stopped["reasons"]
+
+
+def test_bot_health_reflects_queue_and_dispatch_lag():
+    # Given
+    sut = SimpleSlackBot("mock slack bot token")
+    sut._python_slackclient = None
+    sut.register("message")(lambda request: None)
+    before = sut.health()
+
+    # When
+    for _ in range(2):
+        sut.enqueue_slack_event(SlackEvent({"type": "message", "ts": str(time.time() - 5.0), "text": "hi"}))
+    queued = sut.health()
+    sut.dispatch_next_slack_event()
+    behind = sut.health()
+    sut.dispatch_next_slack_event()
+    caught_up = sut.health()
+
+    # Then
+    assert "not connected" == before["connection"]
+    assert before["last_event_at"] is None
+    assert 2 == queued["queue_depth"]
+    assert queued["last_event_at"] is not None
+    assert 1 == behind["queue_depth"]
+    assert 4.0 < behind["dispatch_lag"] < 10.0
+    assert 0.0 == behind["stalled_for"]
+    assert 0 == caught_up["queue_depth"]
+    assert 0.0 == caught_up["dispatch_lag"]
+
+
+def test_dispatch_lag_ignores_the_ts_of_events_other_than_messages():
+    # Given
+    sut = SimpleSlackBot("mock slack bot token")
+    sut._python_slackclient = None
+    sut.register("channel_marked")(lambda request: None)
+    now = time.time()
+
+    # When
+    for channel in ("C1", "C2"):
+        sut.enqueue_slack_event(
+            SlackEvent({"type": "channel_marked", "channel": channel, "ts": str(now - 86400.0), "event_ts": str(now)})
+        )
+    sut.dispatch_next_slack_event()
+    with_event_ts = sut.health()
+    sut.enqueue_slack_event(SlackEvent({"type": "channel_marked", "channel": "C3", "ts": str(now - 86400.0)}))
+    sut.dispatch_next_slack_event()
+    without_event_ts = sut.health()
+
+    # Then
+    assert 1 == with_event_ts["queue_depth"]
+    assert with_event_ts["dispatch_lag"] < 5.0
+    assert 1 == without_event_ts["queue_depth"]
+    assert without_event_ts["dispatch_lag"] < 5.0
+
+
+def test_bot_health_counts_callbacks_still_running_in_a_thread():
+    # Given
+    release = threading.Event()
+    sut = SimpleSlackBot("mock slack bot token", callback_executor=CallbackExecutor())
+    sut._python_slackclient = None
+
+    @sut.register("message", execution="thread")
+    def slow(request):
+        release.wait(5.0)
+
+    # When
+    sut.enqueue_slack_event(SlackEvent({"type": "message", "ts": "1.0", "text": "hi"}))
+    sut.dispatch_next_slack_event()
+    running = sut.health()["outbound_backlog"]
+    release.set()
+    sut._callback_executor.shutdown()
+
+    # Then
+    assert 1 == running
+    assert 0 == sut.health()["outbound_backlog"]
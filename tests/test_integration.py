@@ -0,0 +1,190 @@
+import sys
+import threading
+import time
+
+import pytest
+import slacksocket.client
+import slacksocket.config
+import slacksocket.webclient
+
+from simple_slack_bot.simple_slack_bot import SimpleSlackBot
+from tests.common.fake_slack import FakeSlack
+
+USERS = [{"id": "U00000001", "name": "alice"}, {"id": "U00000002", "name": "bob"}]
+CHANNELS = [{"id": "C00000001", "name": "general", "members": ["U00000001", "U00000002"]}]
+
+
+class RunningBot:
+    def __init__(self, sut):
+        self.sut = sut
+        self.thread = threading.Thread(target=sut.listen, daemon=True)
+
+    def __enter__(self):
+        self.sut.connect()
+        self.thread.start()
+        return self.sut
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.sut._slack_socket.close()
+        self.thread.join(timeout=5)
+        assert not self.thread.is_alive(), "listen should stop once the socket is closed"
+
+
+@pytest.fixture
+def fake_slack():
+    with FakeSlack(users=USERS, channels=CHANNELS) as fake_slack:
+        yield fake_slack
+
+
+def message(index, text="ping", user="U00000001"):
+    return {
+        "type": "message",
+        "channel": "C00000001",
+        "user": user,
+        "text": text,
+        "ts": f"1600000000.{index:06d}",
+        "client_msg_id": f"msg-{index}",
+    }
+
+
+def test_bot_replies_through_the_real_transport(fake_slack):
+    # Given
+    sut = SimpleSlackBot(slack_bot_token="xoxb-fake", slack_api_url=fake_slack.api_url)
+
+    @sut.command("ping")
+    def pong(request):
+        request.write("Pong")
+
+    # When
+    with RunningBot(sut):
+        assert fake_slack.wait_for_connections()
+        fake_slack.send_event(message(1))
+        replied = fake_slack.wait_for_calls("chat.postMessage", 1)
+
+    # Then
+    assert replied
+    assert "Pong" == fake_slack.posted_messages[0]["text"]
+    assert "C00000001" == fake_slack.posted_messages[0]["channel"]
+    assert "xoxb-fake" == fake_slack.calls_to("auth.test")[0]["token"]
+
+
+def test_each_bot_keeps_its_own_api_url(fake_slack):
+    # Given
+    first = SimpleSlackBot(slack_bot_token="xoxb-first", slack_api_url=fake_slack.api_url)
+
+    with FakeSlack(users=USERS, channels=CHANNELS) as other_fake_slack:
+        second = SimpleSlackBot(slack_bot_token="xoxb-second", slack_api_url=other_fake_slack.api_url)
+
+        # When
+        with RunningBot(first), RunningBot(second):
+            assert fake_slack.wait_for_connections() and other_fake_slack.wait_for_connections()
+            second._slack_socket._slack.rtm_url()
+
+        # Then
+        assert ["xoxb-first"] == [call["token"] for call in fake_slack.calls_to("rtm.start")]
+        assert ["xoxb-second"] * 2 == [call["token"] for call in other_fake_slack.calls_to("rtm.start")]
+    assert "https://slack.com/api/rtm.start" == slacksocket.config.urls["rtm"]
+    assert slacksocket.client.WebClient is slacksocket.webclient.WebClient
+
+
+def test_bot_ignores_its_own_messages_and_redeliveries(fake_slack):
+    # Given
+    received = []
+    sut = SimpleSlackBot(slack_bot_token="xoxb-fake", slack_api_url=fake_slack.api_url)
+    sut.register("message")(received.append)
+
+    # When
+    with RunningBot(sut):
+        assert fake_slack.wait_for_connections()
+        fake_slack.send_events(
+            [message(1), message(1), message(2, user=fake_slack.bot_user_id), message(3)]
+        )
+        deadline = time.monotonic() + 5
+        while len(received) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+
+    # Then
+    assert ["msg-1", "msg-3"] == [request.get("client_msg_id") for request in received]
+
+
+def test_bot_keeps_up_with_thousands_of_events(fake_slack):
+    # Given
+    event_count = 2000
+    received = []
+    sut = SimpleSlackBot(slack_bot_token="xoxb-fake", slack_api_url=fake_slack.api_url)
+    sut.register("message")(received.append)
+
+    # When
+    with RunningBot(sut):
+        assert fake_slack.wait_for_connections()
+        start = time.monotonic()
+        fake_slack.send_events([message(index) for index in range(event_count)])
+        while len(received) < event_count and time.monotonic() - start < 10:
+            time.sleep(0.01)
+        elapsed = time.monotonic() - start
+
+    # Then
+    assert event_count == len(received)
+    assert elapsed < 10
+
+
+@pytest.mark.skipif(
+    sys.version_info >= (3, 9),
+    reason="websocket-client 0.56 calls Thread.isAlive, removed in Python 3.9, so SlackSocket can't reconnect",
+)
+def test_bot_reconnects_after_a_disconnect(fake_slack):
+    # Given
+    received = []
+    sut = SimpleSlackBot(slack_bot_token="xoxb-fake", slack_api_url=fake_slack.api_url)
+    sut.register("message")(received.append)
+
+    # When
+    with RunningBot(sut):
+        assert fake_slack.wait_for_connections()
+        fake_slack.disconnect()
+        assert fake_slack.wait_for_connections(timeout=10)
+        fake_slack.send_event(message(1))
+        deadline = time.monotonic() + 5
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    # Then
+    assert 1 == len(received)
+    assert 2 <= len(fake_slack.calls_to("rtm.start"))
+
+
+def test_write_survives_a_rate_limited_post(fake_slack):
+    # Given
+    sut = SimpleSlackBot(slack_bot_token="xoxb-fake", slack_api_url=fake_slack.api_url)
+    fake_slack.fail_next("chat.postMessage", status=429)
+
+    @sut.command("ping")
+    def pong(request):
+        request.write("Pong")
+
+    # When
+    with RunningBot(sut):
+        assert fake_slack.wait_for_connections()
+        fake_slack.send_events([message(1), message(2)])
+        replied = fake_slack.wait_for_calls("chat.postMessage", 2)
+
+    # Then
+    assert replied
+    assert 2 == len(fake_slack.posted_messages)
+
+
+def test_web_api_latency_is_injected(fake_slack):
+    # Given
+    sut = SimpleSlackBot(slack_bot_token="xoxb-fake", slack_api_url=fake_slack.api_url)
+    sut.connect()
+    sut._slack_socket.close()
+    fake_slack.latency = 0.2
+
+    # When
+    start = time.monotonic()
+    sut._python_slackclient.auth_test()
+    elapsed = time.monotonic() - start
+
+    # Then
+    assert elapsed >= 0.2
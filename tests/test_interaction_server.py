@@ -0,0 +1,202 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from simple_slack_bot.interaction_server import InteractionServer
+from simple_slack_bot.response_client import ResponseClient
+from simple_slack_bot.simple_slack_bot import SimpleSlackBot
+from tests.common.fake_slack import FakeSlack
+
+
+class RecordingSlackclient:
+    def __init__(self):
+        self.posted = []
+
+    def chat_postMessage(self, channel, text, **kwargs):
+        self.posted.append((channel, text))
+
+
+@pytest.fixture
+def fake_slack():
+    with FakeSlack() as fake_slack:
+        yield fake_slack
+
+
+@pytest.fixture
+def bot():
+    interaction_server = InteractionServer(FakeSlack.DEFAULT_SIGNING_SECRET, port=0)
+    sut = SimpleSlackBot("mock slack bot token", interaction_server=interaction_server)
+    sut._python_slackclient = RecordingSlackclient()
+    yield sut
+    interaction_server.stop()
+    sut._callback_executor.shutdown()
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def url(interaction_server):
+    return f"http://127.0.0.1:{interaction_server.port}/slack"
+
+
+def test_slash_commands_are_acknowledged_before_their_callback_finishes(fake_slack, bot):
+    # Given
+    release = threading.Event()
+
+    @bot.slash_command("/roll")
+    def roll(interaction):
+        release.wait(5.0)
+        interaction.respond(f"rolled {interaction.text} for <@{interaction.user_id}>", in_channel=True)
+
+    bot._interaction_server.start(bot._python_slackclient)
+
+    # When
+    status, elapsed = fake_slack.send_slash_command(url(bot._interaction_server), "/roll", "2d6", user="U2")
+    release.set()
+
+    # Then
+    assert 200 == status
+    assert elapsed < 1.0
+    assert fake_slack.wait_for_responses(1)
+    assert "rolled 2d6 for <@U2>" == fake_slack.responses[0]["text"]
+    assert "in_channel" == fake_slack.responses[0]["response_type"]
+
+
+def test_block_actions_are_routed_by_action_id(fake_slack, bot):
+    # Given
+    @bot.action("approve")
+    def approve(interaction):
+        interaction.respond(f"approved {interaction.value}", replace_original=True)
+        interaction.write("someone approved")
+
+    bot._interaction_server.start(bot._python_slackclient)
+
+    # When
+    status, _ = fake_slack.send_block_action(url(bot._interaction_server), "approve", value="request-7", channel="C9")
+
+    # Then
+    assert 200 == status
+    assert fake_slack.wait_for_responses(1)
+    assert {"text": "approved request-7", "response_type": "ephemeral", "replace_original": True} == {
+        key: fake_slack.responses[0][key] for key in ("text", "response_type", "replace_original")
+    }
+    bot._callback_executor.shutdown()
+    assert [("C9", "someone approved")] == bot._python_slackclient.posted
+
+
+def test_requests_with_a_bad_or_stale_signature_are_refused(fake_slack, bot):
+    # Given
+    called = []
+    bot.slash_command("/roll")(called.append)
+    bot._interaction_server.start()
+    address = url(bot._interaction_server)
+
+    # When
+    forged, _ = fake_slack.send_slash_command(address, "/roll", signing_secret="not the secret")
+    replayed, _ = fake_slack.send_slash_command(address, "/roll", timestamp=int(time.time()) - 3600)
+    bot._callback_executor.shutdown()
+
+    # Then
+    assert 401 == forged
+    assert 401 == replayed
+    assert [] == called
+    assert 2 == bot._interaction_server.refused
+
+
+@pytest.mark.parametrize("content_length", ["ten", "-5"])
+def test_requests_with_a_bad_content_length_are_rejected(bot, content_length):
+    # Given
+    bot._interaction_server.start()
+    request = f"POST /slack HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Length: {content_length}\r\n\r\n"
+
+    # When
+    with socket.create_connection(("127.0.0.1", bot._interaction_server.port), timeout=5.0) as connection:
+        connection.sendall(request.encode("ascii"))
+        response = connection.makefile("rb").read()
+
+    # Then
+    assert response.startswith(b"HTTP/1.0 400") or response.startswith(b"HTTP/1.1 400")
+
+
+@pytest.mark.parametrize(
+    "payload",
+    ['["block_actions"]', '"block_actions"', '{"type": "block_actions", "actions": ["approve"]}'],
+)
+def test_payloads_not_shaped_as_slack_sends_them_are_rejected(fake_slack, bot, payload):
+    # Given
+    called = []
+    bot.action("approve")(called.append)
+    bot._interaction_server.start()
+
+    # When
+    status, _ = fake_slack.send_interaction(url(bot._interaction_server), {"payload": payload})
+
+    # Then
+    assert 400 == status
+    assert [] == called
+
+
+def test_unregistered_commands_are_still_acknowledged(fake_slack, bot):
+    # Given
+    bot._interaction_server.start()
+
+    # When
+    status, _ = fake_slack.send_slash_command(url(bot._interaction_server), "/nothing")
+
+    # Then
+    assert 200 == status
+    assert wait_until(lambda: 1 == bot._interaction_server.unhandled)
+
+
+def test_responses_reuse_one_connection(fake_slack):
+    # Given
+    sut = ResponseClient()
+
+    # When
+    statuses = [sut.post(fake_slack.response_url(str(number)), {"text": "hi"})[0] for number in range(5)]
+    sut.close()
+
+    # Then
+    assert [200] * 5 == statuses
+    assert 1 == sut.connections
+    assert 1 == len(fake_slack.response_clients)
+
+
+def test_a_connection_closed_by_the_server_is_replaced(fake_slack):
+    # Given
+    sut = ResponseClient()
+    sut.post(fake_slack.response_url(), {"text": "first"})
+    for connections in sut._idle.values():
+        for connection in connections:
+            connection.sock.shutdown(socket.SHUT_RDWR)
+
+    # When
+    status, _ = sut.post(fake_slack.response_url(), {"text": "second"})
+
+    # Then
+    assert 200 == status
+    assert 2 == sut.connections
+
+
+def test_registering_without_an_interaction_server_raises_value_error():
+    # Given
+    sut = SimpleSlackBot("mock slack bot token")
+
+    # Then
+    with pytest.raises(ValueError):
+        sut.slash_command("/roll")
+
+
+def test_a_signing_secret_is_required(monkeypatch):
+    # Given
+    monkeypatch.delenv("SLACK_SIGNING_SECRET", raising=False)
+
+    # Then
+    with pytest.raises(ValueError):
+        InteractionServer()
@@ -0,0 +1,148 @@
+import datetime
+
+import pytest
+
+from simple_slack_bot.job_scheduler import CronSchedule, JobScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime.datetime(2024, 1, 1, 8, 30).timestamp()  # a Monday
+
+    def __call__(self):
+        return self.now
+
+
+def test_cron_schedule_finds_the_next_weekday_morning():
+    # Given
+    sut = CronSchedule("0 9 * * 1-5")
+
+    # When
+    friday_evening = datetime.datetime(2024, 1, 5, 18, 0)
+
+    # Then
+    assert datetime.datetime(2024, 1, 8, 9, 0) == sut.next_after(friday_evening)
+
+
+def test_cron_schedule_supports_steps_and_lists():
+    # Given
+    sut = CronSchedule("*/15 8,17 * * *")
+
+    # When
+    times = [datetime.datetime(2024, 1, 1, 8, 50)]
+    for _ in range(3):
+        times.append(sut.next_after(times[-1]))
+
+    # Then
+    assert ["17:00", "17:15", "17:30"] == [moment.strftime("%H:%M") for moment in times[1:]]
+
+
+def test_cron_schedule_matches_day_or_weekday_when_both_are_restricted():
+    # Given
+    sut = CronSchedule("0 0 13 * 5")
+
+    # When
+    after = datetime.datetime(2024, 1, 1)
+
+    # Then
+    assert datetime.datetime(2024, 1, 5) == sut.next_after(after)  # a Friday before the 13th
+    assert datetime.datetime(2024, 1, 13) == sut.next_after(datetime.datetime(2024, 1, 12, 1))
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "a * * * *", "*/0 * * * *", "0 0 30 2 *"])
+def test_cron_schedule_rejects_invalid_expressions(expression):
+    # When / Then
+    with pytest.raises(ValueError):
+        JobScheduler().cron(expression, print)
+
+
+def test_run_due_runs_jobs_in_order_and_returns_the_wait_until_the_next():
+    # Given
+    clock = FakeClock()
+    sut = JobScheduler(clock=clock)
+    ran = []
+    sut.once(20, lambda bot: ran.append(("late", bot)))
+    sut.once(10, lambda bot: ran.append(("early", bot)))
+
+    # When
+    waits = [sut.run_due("bot")]
+    clock.now += 25
+    waits.append(sut.run_due("bot"))
+
+    # Then
+    assert [10, None] == waits
+    assert [("early", "bot"), ("late", "bot")] == ran
+    assert 0 == len(sut)
+
+
+def test_periodic_jobs_skip_runs_missed_while_late():
+    # Given
+    clock = FakeClock()
+    sut = JobScheduler(clock=clock)
+    ran = []
+    job = sut.every(60, ran.append)
+
+    # When
+    clock.now += 60
+    sut.run_due("bot")
+    clock.now += 300
+    wait = sut.run_due("bot")
+
+    # Then
+    assert 2 == len(ran) == job.runs
+    assert 60 == wait
+
+
+def test_cron_jobs_are_rescheduled_to_their_next_time():
+    # Given
+    clock = FakeClock()
+    sut = JobScheduler(clock=clock)
+    ran = []
+    sut.cron("0 9 * * *", ran.append)
+
+    # When
+    first_wait = sut.run_due("bot")
+    clock.now += first_wait
+    second_wait = sut.run_due("bot")
+
+    # Then
+    assert 30 * 60 == first_wait
+    assert ["bot"] == ran
+    assert 24 * 60 * 60 == second_wait
+
+
+def test_cancelled_jobs_do_not_run():
+    # Given
+    clock = FakeClock()
+    sut = JobScheduler(clock=clock)
+    ran = []
+    job = sut.every(10, ran.append)
+    sut.once(100, ran.append)
+
+    # When
+    job.cancel()
+    wait = sut.run_due("bot")
+
+    # Then
+    assert [] == ran
+    assert 100 == wait
+    assert 1 == len(sut)
+
+
+def test_jobs_raising_keep_their_schedule(caplog):
+    # Given
+    clock = FakeClock()
+    sut = JobScheduler(clock=clock)
+
+    def broken(bot):
+        raise RuntimeError("boom")
+
+    sut.every(10, broken)
+
+    # When
+    clock.now += 10
+    wait = sut.run_due("bot")
+
+    # Then
+    assert 10 == wait
+    assert "exception running job broken" in caplog.text
@@ -0,0 +1,34 @@
+import pytest
+
+from simple_slack_bot.json_backend import load_backend
+
+
+def test_load_backend_defaults_to_the_fastest_installed():
+    # Given
+    pytest.importorskip("orjson")
+
+    # When
+    sut = load_backend()
+
+    # Then
+    assert "orjson" == sut.name
+
+
+@pytest.mark.parametrize("name", ["orjson", "ujson", "json"])
+def test_every_backend_round_trips_text(name):
+    # Given
+    pytest.importorskip(name)
+    sut = load_backend(name)
+
+    # When
+    decoded = sut.loads(sut.dumps({"text": "héllo", "ts": "1.0"}))
+
+    # Then
+    assert {"text": "héllo", "ts": "1.0"} == decoded
+    assert isinstance(sut.dumps({}), str)
+
+
+def test_load_backend_rejects_unknown_backends():
+    # When / Then
+    with pytest.raises(ValueError):
+        load_backend("pickle")
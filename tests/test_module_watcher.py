@@ -0,0 +1,251 @@
+import importlib
+import os
+import sys
+import textwrap
+
+import pytest
+from slacksocket.models import SlackEvent
+
+from simple_slack_bot.interaction_server import KIND_SLASH_COMMAND, Interaction, InteractionServer
+from simple_slack_bot.job_scheduler import JobScheduler
+from simple_slack_bot.module_watcher import ModuleWatcher
+from simple_slack_bot.simple_slack_bot import SimpleSlackBot
+
+# the bot the reloadable modules register to
+CURRENT = {}
+
+HEADER = """
+from tests.test_module_watcher import CURRENT
+
+simple_slack_bot = CURRENT["bot"]
+"""
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingSlackclient:
+    def __init__(self):
+        self.posted = []
+
+    def chat_postMessage(self, channel, text, **kwargs):
+        self.posted.append(text)
+
+
+@pytest.fixture
+def write_module(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    names = []
+
+    def write(name, body):
+        path = tmp_path / f"{name}.py"
+        previous = os.stat(path).st_mtime_ns if path.exists() else 0
+        path.write_text(HEADER + textwrap.dedent(body))
+        # so the change is noticed, and not mistaken for a cached build, however fast the test runs
+        os.utime(path, ns=(previous + 2_000_000_000, previous + 2_000_000_000))
+        names.append(name)
+        return name
+
+    yield write
+    for name in names:
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def bot(clock):
+    CURRENT["bot"] = SimpleSlackBot("mock slack bot token", job_scheduler=JobScheduler(clock=clock))
+    CURRENT["bot"]._python_slackclient = RecordingSlackclient()
+    yield CURRENT["bot"]
+    CURRENT.clear()
+
+
+def say(bot, text):
+    bot.enqueue_slack_event(SlackEvent({"type": "message", "channel": "C1", "user": "U1", "text": text}))
+    bot.dispatch_next_slack_event()
+    return bot._python_slackclient.posted.pop() if bot._python_slackclient.posted else None
+
+
+def test_watcher_notices_changed_modules_once(write_module, bot):
+    # Given
+    name = write_module("watched_callbacks", "")
+    sut = ModuleWatcher([name])
+
+    # When
+    unchanged = sut.changed()
+    write_module(name, "changed = True\n")
+    changed = sut.changed()
+
+    # Then
+    assert [] == unchanged
+    assert [name] == [module.__name__ for module in changed]
+    assert [] == sut.changed()
+
+
+def test_watcher_refuses_modules_without_a_source_file():
+    with pytest.raises(ValueError):
+        ModuleWatcher(["sys"])
+
+
+def test_reload_swaps_callbacks_and_commands(write_module, bot):
+    # Given
+    name = write_module(
+        "greetings",
+        """
+        @simple_slack_bot.command("hello")
+        def hello(request):
+            request.write("hello")
+
+        @simple_slack_bot.register("message")
+        def echo(request):
+            if request.message == "echo":
+                request.write("echo")
+        """,
+    )
+    module = importlib.import_module(name)
+    bot.command("ping")(lambda request: request.write("pong"))
+
+    # When
+    write_module(
+        name,
+        """
+        @simple_slack_bot.command("hello")
+        def hello(request):
+            request.write("hello again")
+        """,
+    )
+    reloaded = bot.reload(module)
+
+    # Then
+    assert reloaded is True
+    assert "hello again" == say(bot, "hello")
+    assert say(bot, "echo") is None
+    assert "pong" == say(bot, "ping")
+    assert 1 == len(bot._registrations["message"])
+
+
+def test_failed_reload_keeps_the_previous_callbacks(write_module, bot):
+    # Given
+    name = write_module(
+        "broken_on_reload",
+        """
+        @simple_slack_bot.command("hello")
+        def hello(request):
+            request.write("hello")
+
+        @simple_slack_bot.every(60)
+        def tick(simple_slack_bot):
+            pass
+        """,
+    )
+    module = importlib.import_module(name)
+
+    # When
+    write_module(
+        name,
+        """
+        @simple_slack_bot.every(60)
+        def tock(simple_slack_bot):
+            pass
+
+        raise RuntimeError("half written")
+        """,
+    )
+    reloaded = bot.reload(module)
+
+    # Then
+    assert reloaded is False
+    assert "hello" == say(bot, "hello")
+    assert ["tick"] == [job.name for job in bot._job_scheduler.jobs()]
+
+
+def test_reload_replaces_jobs(write_module, bot):
+    # Given
+    name = write_module(
+        "jobs",
+        """
+        @simple_slack_bot.every(60)
+        def tick(simple_slack_bot):
+            pass
+        """,
+    )
+    module = importlib.import_module(name)
+
+    # When
+    write_module(
+        name,
+        """
+        @simple_slack_bot.every(60)
+        def tock(simple_slack_bot):
+            pass
+        """,
+    )
+    bot.reload(module)
+
+    # Then
+    assert ["tock"] == [job.name for job in bot._job_scheduler.jobs()]
+
+
+def test_reload_replaces_slash_commands_and_actions(write_module):
+    # Given
+    interaction_server = InteractionServer("mock signing secret")
+    CURRENT["bot"] = bot = SimpleSlackBot("mock slack bot token", interaction_server=interaction_server)
+    answers = []
+    CURRENT["answers"] = answers
+    name = write_module(
+        "interactions",
+        """
+        @simple_slack_bot.slash_command("/roll")
+        def roll(interaction):
+            CURRENT["answers"].append("rolled")
+
+        @simple_slack_bot.action("approve")
+        def approve(interaction):
+            pass
+        """,
+    )
+    module = importlib.import_module(name)
+
+    # When
+    write_module(
+        name,
+        """
+        @simple_slack_bot.slash_command("/roll")
+        def roll(interaction):
+            CURRENT["answers"].append("rolled again")
+        """,
+    )
+    reloaded = bot.reload(module)
+    roll = Interaction(KIND_SLASH_COMMAND, {"command": "/roll"}, interaction_server.response_client)
+    interaction_server.dispatch([((KIND_SLASH_COMMAND, "/roll"), roll)])
+    bot._callback_executor.shutdown()
+    CURRENT.clear()
+
+    # Then
+    assert reloaded is True
+    assert [(KIND_SLASH_COMMAND, "/roll")] == list(interaction_server.callbacks())
+    assert ["rolled again"] == answers
+
+
+def test_watch_reloads_changed_modules_from_the_listen_loop(write_module, bot, clock):
+    # Given
+    name = write_module("watched", 'simple_slack_bot.command("hi")(lambda request: request.write("hi"))\n')
+    importlib.import_module(name)
+    bot.watch(name, interval=60)
+    write_module(name, 'simple_slack_bot.command("hi")(lambda request: request.write("hi there"))\n')
+
+    # When
+    clock.now += 60
+    bot._job_scheduler.run_due(bot)
+
+    # Then
+    assert "hi there" == say(bot, "hi")
@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+import threading
+
+from simple_slack_bot.event_deduplicator import EventDeduplicator
+from simple_slack_bot.process_handoff import ProcessHandoff
+
+
+def test_take_over_records_our_pid_when_there_is_no_previous_process(tmp_path):
+    # Given
+    sut = ProcessHandoff(str(tmp_path / "bot.pid"))
+
+    # When
+    exited = sut.take_over(EventDeduplicator())
+
+    # Then
+    assert exited is True
+    assert os.getpid() == sut.read_pid()
+
+
+def test_take_over_stops_the_previous_process_and_waits_for_it(tmp_path):
+    # Given
+    previous_process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    # reap the previous process as soon as it exits, as its own parent would
+    threading.Thread(target=previous_process.wait, daemon=True).start()
+    sut = ProcessHandoff(str(tmp_path / "bot.pid"), timeout=10, poll_interval=0.01)
+    with open(sut.pid_file, "w") as pid_file:
+        pid_file.write(str(previous_process.pid))
+
+    # When
+    exited = sut.take_over(EventDeduplicator())
+
+    # Then
+    assert exited is True
+    assert previous_process.poll() is not None
+    assert os.getpid() == sut.read_pid()
+
+
+def test_hand_over_passes_handled_event_keys_to_the_next_process(tmp_path):
+    # Given
+    slack_event = {"type": "message", "channel": "C1", "ts": "1.2"}
+    previous_deduplicator = EventDeduplicator()
+    previous_deduplicator.is_duplicate(slack_event)
+    ProcessHandoff(str(tmp_path / "bot.pid")).hand_over(previous_deduplicator)
+    next_deduplicator = EventDeduplicator()
+
+    # When
+    ProcessHandoff(str(tmp_path / "bot.pid")).take_over(next_deduplicator)
+
+    # Then
+    assert next_deduplicator.is_duplicate(slack_event) is True
+    assert not os.path.exists(str(tmp_path / "bot.pid.seen"))
+
+
+def test_hand_over_leaves_out_events_dropped_while_draining(tmp_path):
+    # Given
+    handled = {"type": "message", "channel": "C1", "ts": "1.2"}
+    dropped = {"type": "message", "channel": "C1", "ts": "1.3"}
+    previous_deduplicator = EventDeduplicator()
+    previous_deduplicator.is_duplicate(handled)
+    previous_deduplicator.is_duplicate(dropped)
+    previous_deduplicator.forget([dropped])
+    ProcessHandoff(str(tmp_path / "bot.pid")).hand_over(previous_deduplicator)
+    next_deduplicator = EventDeduplicator()
+
+    # When
+    ProcessHandoff(str(tmp_path / "bot.pid")).take_over(next_deduplicator)
+
+    # Then
+    assert next_deduplicator.is_duplicate(handled) is True
+    assert next_deduplicator.is_duplicate(dropped) is False
+
+
+def test_is_running_is_false_for_an_exited_process():
+    # Given
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+
+    # When
+    actual = ProcessHandoff.is_running(process.pid)
+
+    # Then
+    assert actual is False
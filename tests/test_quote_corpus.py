@@ -0,0 +1,117 @@
+import csv
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples", "the_office_bot"))
+
+from quote_corpus import QuoteCorpus, SpeakerMatcher, build_index  # pylint: disable=wrong-import-position
+
+ROWS = [
+    ("id", "season", "episode", "scene", "line_text", "speaker", "deleted"),
+    ("1", "1", "1", "1", "All right Jim.", "Michael", "False"),
+    ("2", "1", "1", "1", "Oh, I told you.", "Jim", "False"),
+    ("3", "1", "1", "1", "So you've come to the master.", "Michael", "False"),
+    ("4", "1", "1", "2", "Bears. Beets. Battlestar Galactica.", "Jim", "False"),
+    ("5", "1", "1", "2", "Question. What kind of bear is best?", "Dwight", "False"),
+    ("6", "1", "1", "3", "Ça va? ☕", "Michael", "False"),
+]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    csv_path = str(tmp_path / "the-office-lines.csv")
+    with open(csv_path, "w", encoding="utf-8", newline="") as csv_file:
+        csv.writer(csv_file).writerows(ROWS)
+    sut = QuoteCorpus.load(csv_path, str(tmp_path / "the-office-lines.index"))
+    yield sut
+    sut.close()
+
+
+def test_the_index_groups_every_line_by_speaker(corpus):
+    # When
+    lines = {
+        speaker: [corpus.line(first + offset) for offset in range(count)]
+        for speaker, (first, count) in corpus.speakers.items()
+    }
+
+    # Then
+    assert {
+        "michael": ["All right Jim.", "So you've come to the master.", "Ça va? ☕"],
+        "jim": ["Oh, I told you.", "Bears. Beets. Battlestar Galactica."],
+        "dwight": ["Question. What kind of bear is best?"],
+    } == lines
+
+
+def test_random_lines_are_picked_among_the_speakers_lines(corpus):
+    # When
+    picked = {corpus.random_line("jim", random.Random(seed)) for seed in range(20)}
+
+    # Then
+    assert {"Oh, I told you.", "Bears. Beets. Battlestar Galactica."} == picked
+    assert corpus.random_line("jim") in picked
+    assert corpus.random_line("toby") is None
+
+
+def test_the_index_is_rebuilt_once_the_script_is_newer(tmp_path, corpus):
+    # Given
+    csv_path = str(tmp_path / "the-office-lines.csv")
+    index_path = str(tmp_path / "the-office-lines.index")
+    with open(csv_path, "a", encoding="utf-8", newline="") as csv_file:
+        csv.writer(csv_file).writerow(("7", "1", "1", "4", "Why are you the way that you are?", "Toby", "False"))
+    os.utime(index_path, (0, 0))
+
+    # When
+    rebuilt = QuoteCorpus.load(csv_path, index_path)
+
+    # Then
+    assert "Why are you the way that you are?" == rebuilt.random_line("toby")
+    rebuilt.close()
+
+
+def test_an_index_that_is_not_one_is_refused(tmp_path):
+    # Given
+    index_path = str(tmp_path / "not-an.index")
+    with open(index_path, "wb") as index_file:
+        index_file.write(b"\0" * 64)
+
+    # Then
+    with pytest.raises(ValueError):
+        QuoteCorpus(index_path)
+
+
+def test_speakers_only_match_on_word_boundaries():
+    # Given
+    sut = SpeakerMatcher(["jim", "pam"])
+
+    # Then
+    assert ["jim"] == sut.find("Jim!")
+    assert [] == sut.find("jimmy and spam")
+    assert ["pam", "jim"] == sut.find("(Pam) tells jim, then Jim again")
+
+
+def test_multi_word_names_win_over_the_names_they_contain():
+    # Given
+    sut = SpeakerMatcher(["david", "david wallace", "wallace", ""])
+
+    # Then
+    assert ["david wallace"] == sut.find("call David Wallace")
+    assert ["wallace", "david"] == sut.find("Wallace, not David Wallacey")
+
+
+def test_build_index_skips_the_header_row(tmp_path):
+    # Given
+    csv_path = str(tmp_path / "lines.csv")
+    index_path = str(tmp_path / "lines.index")
+    with open(csv_path, "w", encoding="utf-8", newline="") as csv_file:
+        csv.writer(csv_file).writerows(ROWS[:2])
+
+    # When
+    build_index(csv_path, index_path)
+    sut = QuoteCorpus(index_path)
+
+    # Then
+    assert {"michael": (0, 1)} == sut.speakers
+    sut.close()
@@ -0,0 +1,107 @@
+import pytest
+
+from simple_slack_bot.rate_limiter import RateLimiter
+
+
+class MockClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_acquire_allows_a_burst_then_drops():
+    # Given
+    sut = RateLimiter(rate=1, burst=2, clock=MockClock())
+
+    # When
+    results = [sut.acquire("U1") for _ in range(3)]
+
+    # Then
+    assert [0.0, 0.0, None] == results
+    assert {"allowed": 2, "deferred": 0, "dropped": 1, "keys": 1} == sut.stats()
+
+
+def test_acquire_keeps_one_bucket_per_key():
+    # Given
+    sut = RateLimiter(rate=1, clock=MockClock())
+
+    # When
+    first_user = sut.acquire("U1")
+    second_user = sut.acquire("U2")
+
+    # Then
+    assert 0.0 == first_user
+    assert 0.0 == second_user
+
+
+def test_acquire_refills_over_time():
+    # Given
+    clock = MockClock()
+    sut = RateLimiter(rate=2, clock=clock)
+    sut.acquire("U1")
+
+    # When
+    too_soon = sut.acquire("U1")
+    clock.now = 0.5
+    refilled = sut.acquire("U1")
+
+    # Then
+    assert None is too_soon
+    assert 0.0 == refilled
+
+
+def test_acquire_defers_events_behind_each_other_up_to_max_delay():
+    # Given
+    sut = RateLimiter(rate=1, policy=RateLimiter.POLICY_DEFER, max_delay=2, clock=MockClock())
+
+    # When
+    results = [sut.acquire("U1") for _ in range(4)]
+
+    # Then
+    assert [0.0, 1.0, 2.0, None] == results
+    assert 2 == sut.deferred
+    assert 1 == sut.dropped
+
+
+def test_acquire_expires_idle_and_least_recently_used_buckets():
+    # Given
+    clock = MockClock()
+    sut = RateLimiter(rate=1, max_keys=2, clock=clock)
+    sut.acquire("U1")
+    sut.acquire("U2")
+
+    # When
+    sut.acquire("U3")
+    size_at_capacity = len(sut)
+    clock.now = 10
+    sut.acquire("U4")
+
+    # Then
+    assert 2 == size_at_capacity
+    assert 1 == len(sut)
+
+
+def test_key_for_builds_keys_from_the_raw_slack_event():
+    # Given
+    slack_event = {"user": "U1", "channel": "C1", "text": "Roll 2d6"}
+
+    # When
+    user_channel_key = RateLimiter(rate=1, key="user_channel").key_for(slack_event)
+    user_command_key = RateLimiter(rate=1, key="user_command").key_for(slack_event)
+    custom_key = RateLimiter(rate=1, key=lambda event: event["channel"]).key_for(slack_event)
+
+    # Then
+    assert ("U1", "C1") == user_channel_key
+    assert ("U1", "roll") == user_command_key
+    assert "C1" == custom_key
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"rate": 0}, {"rate": 1, "burst": 0}, {"rate": 1, "policy": "foo"}, {"rate": 1, "key": "foo"}]
+)
+def test_init_raises_value_error_for_invalid_settings(kwargs):
+    # Given, When, Then
+    with pytest.raises(ValueError):
+        RateLimiter(**kwargs)
@@ -0,0 +1,167 @@
+import pytest
+from slacksocket.models import SlackEvent  # type: ignore
+
+from simple_slack_bot.response_cache import ResponseCache, default_key
+from simple_slack_bot.simple_slack_bot import SimpleSlackBot
+from simple_slack_bot.slack_request import SlackRequest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingSlackclient:
+    def __init__(self):
+        self.posted = []
+
+    def chat_postMessage(self, channel, text, **kwargs):
+        self.posted.append((channel, text))
+
+
+def request(python_slackclient, text="What are the office hours?", channel="C1"):
+    return SlackRequest(python_slackclient, SlackEvent({"type": "message", "channel": channel, "text": text}))
+
+
+def test_default_key_normalizes_case_and_whitespace():
+    # Given
+    first = request(None, text="What are  the office hours?")
+    second = request(None, text=" what are the OFFICE hours? ")
+
+    # When / Then
+    assert default_key(first) == default_key(second)
+    assert default_key(first) != default_key(request(None, channel="C2"))
+
+
+def test_cached_reply_is_replayed_without_running_the_callback():
+    # Given
+    python_slackclient = RecordingSlackclient()
+    calls = []
+    sut = ResponseCache()
+
+    @sut
+    def office_hours(request):
+        calls.append(request.message)
+        request.write("9 to 5")
+
+    # When
+    office_hours(request(python_slackclient))
+    office_hours(request(python_slackclient, text="what are the office hours?"))
+
+    # Then
+    assert 1 == len(calls)
+    assert [("C1", "9 to 5"), ("C1", "9 to 5")] == python_slackclient.posted
+    assert {"callback": "office_hours", "hits": 1, "misses": 1, "hit_ratio": 0.5} == {
+        key: sut.stats()[key] for key in ("callback", "hits", "misses", "hit_ratio")
+    }
+
+
+def test_replies_expire_after_the_ttl():
+    # Given
+    clock = FakeClock()
+    calls = []
+    sut = ResponseCache(ttl_seconds=60, clock=clock)
+    cached = sut(lambda request: calls.append(request) or request.write("reply"))
+    cached(request(RecordingSlackclient()))
+
+    # When
+    clock.now += 61
+    cached(request(RecordingSlackclient()))
+
+    # Then
+    assert 2 == len(calls)
+    assert 1 == sut.stats()["expired"]
+
+
+def test_least_recently_used_reply_is_evicted_beyond_capacity():
+    # Given
+    calls = []
+    sut = ResponseCache(capacity=2)
+
+    @sut
+    def echo(request):
+        calls.append(request.message)
+        request.write(request.message)
+
+    # When
+    for text in ("a", "b", "a", "c", "b"):
+        echo(request(RecordingSlackclient(), text=text))
+
+    # Then
+    assert ["a", "b", "c", "b"] == calls
+    assert 2 == sut.stats()["evicted"]
+
+
+def test_empty_replies_are_only_cached_when_asked():
+    # Given
+    calls = []
+    not_cached = ResponseCache()(calls.append)
+    cached = ResponseCache(cache_empty=True)(calls.append)
+
+    # When
+    for _ in range(2):
+        not_cached(request(RecordingSlackclient()))
+        cached(request(RecordingSlackclient()))
+
+    # Then
+    assert 3 == len(calls)
+
+
+def test_callbacks_that_raise_are_not_cached():
+    # Given
+    calls = []
+    sut = ResponseCache()
+
+    @sut
+    def flaky(request):
+        calls.append(request)
+        request.write("partial")
+        raise RuntimeError("lookup failed")
+
+    # When
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            flaky(request(RecordingSlackclient()))
+
+    # Then
+    assert 2 == len(calls)
+    assert 0 == len(sut)
+
+
+def test_key_returning_none_bypasses_the_cache():
+    # Given
+    calls = []
+    sut = ResponseCache(key=lambda request: None)
+    cached = sut(lambda request: calls.append(request) or request.write("reply"))
+
+    # When
+    for _ in range(2):
+        cached(request(RecordingSlackclient()))
+
+    # Then
+    assert 2 == len(calls)
+    assert 2 == sut.stats()["bypassed"]
+
+
+def test_cached_command_keeps_its_typed_arguments():
+    # Given
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+    python_slackclient = RecordingSlackclient()
+    calls = []
+
+    @sut.command("square")
+    @ResponseCache()
+    def square(request, number: int):
+        calls.append(number)
+        request.write(str(number * number))
+
+    # When
+    for _ in range(2):
+        sut.route_request_to_callbacks(request(python_slackclient, text="square 12"))
+
+    # Then
+    assert [12] == calls
+    assert [("C1", "144"), ("C1", "144")] == python_slackclient.posted
@@ -0,0 +1,127 @@
+import json
+import sys
+
+import pytest
+
+import generate_rtm_events
+from simple_slack_bot.event_scheduler import EventScheduler
+from simple_slack_bot.rtm_event import UnknownRtmEvent
+from simple_slack_bot.rtm_events import EVENT_TYPES, ChannelCreatedEvent, MessageEvent, parse_event
+from simple_slack_bot.simple_slack_bot import SimpleSlackBot
+from simple_slack_bot.slack_request import SlackRequest
+
+
+def test_generated_module_is_up_to_date_with_the_schema():
+    # Given
+    with open(generate_rtm_events.SCHEMA_PATH) as schema_file:
+        schema = json.load(schema_file)
+
+    # When
+    with open(generate_rtm_events.MODULE_PATH) as module_file:
+        generated = module_file.read()
+
+    # Then
+    assert generate_rtm_events.render(schema) == generated
+    assert set(schema) == EVENT_TYPES
+
+
+def test_parse_event_picks_the_class_for_the_type():
+    # Given
+    data = {"type": "message", "channel": "C1", "user": "U1", "text": "hello", "ts": "1.000"}
+
+    # When
+    event = parse_event(data)
+
+    # Then
+    assert isinstance(event, MessageEvent)
+    assert ("message", "C1", "U1", "hello") == (event.type, event.channel, event.user, event.text)
+    assert event.thread_ts is None
+    assert event.extra is None
+
+
+def test_parsed_events_round_trip_keeping_undocumented_fields():
+    # Given
+    data = {"type": "channel_created", "channel": {"id": "C1", "name": "new"}, "something_new": 1}
+
+    # When
+    event = parse_event(data)
+
+    # Then
+    assert isinstance(event, ChannelCreatedEvent)
+    assert data == event.to_dict()
+    assert 1 == event.get("something_new")
+    assert "C1" == event.get("channel")["id"]
+
+
+def test_unknown_types_parse_into_unknown_events():
+    # Given
+    data = {"type": "brand_new_event", "value": 1}
+
+    # When
+    event = parse_event(data)
+
+    # Then
+    assert isinstance(event, UnknownRtmEvent)
+    assert "brand_new_event" == event.type
+    assert data == event.to_dict()
+
+
+def test_parsed_events_are_smaller_than_dicts():
+    # Given
+    data = {
+        "client_msg_id": "a5f3c1e2-7d4b-4b7e-9c55-6d2a1f0e9b11",
+        "suppress_notification": False,
+        "type": "message",
+        "text": "hello",
+        "user": "U1",
+        "team": "T1",
+        "blocks": [],
+        "channel": "C1",
+        "event_ts": "1.000",
+        "ts": "1.000",
+    }
+
+    # When
+    event = parse_event(data)
+
+    # Then
+    assert not hasattr(event, "__dict__")
+    assert event.extra is None
+    assert sys.getsizeof(event) < sys.getsizeof(data)
+
+
+def test_register_rejects_unknown_event_types_with_a_suggestion():
+    # Given
+    sut = SimpleSlackBot("mock slack bot token")
+
+    # When
+    with pytest.raises(ValueError) as error:
+        sut.register("mesage")
+
+    # Then
+    assert "did you mean message?" in str(error.value)
+
+
+def test_event_types_known_elsewhere_are_in_the_schema():
+    # Given
+    sut = SimpleSlackBot("mock slack bot token")
+
+    # When
+    prioritized = set(EventScheduler.DEFAULT_PRIORITIES)
+
+    # Then
+    assert prioritized <= EVENT_TYPES
+    assert "file_private" in EVENT_TYPES
+    sut.register("file_private")(lambda request: None)
+
+
+def test_slack_request_exposes_the_typed_event():
+    # Given
+    sut = SlackRequest(None, {"type": "reaction_added", "user": "U1", "reaction": "tada"})
+
+    # When
+    event = sut.event
+
+    # Then
+    assert "tada" == event.reaction
+    assert event is sut.event
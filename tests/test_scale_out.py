@@ -0,0 +1,233 @@
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+import pytest
+from slack.errors import SlackApiError
+from slack.web.slack_response import SlackResponse
+from slacksocket.models import SlackEvent
+
+from simple_slack_bot.scale_out import OutboundWebClient, ScaleOut
+from simple_slack_bot.simple_slack_bot import SimpleSlackBot
+from simple_slack_bot.slack_request import SlackRequest
+from simple_slack_bot.tracer import Tracer
+from tests.common.fake_slack import FakeSlack
+from tests.test_integration import CHANNELS, USERS, message
+from tests.test_tracer import ListExporter
+
+
+class LeaderSlackclient:
+    def __init__(self):
+        self.calls = []
+
+    def chat_postMessage(self, channel, text, **kwargs):
+        self.calls.append(("chat_postMessage", channel, text))
+        return SlackResponse(
+            client=self,
+            http_verb="POST",
+            api_url="https://slack.com/api/chat.postMessage",
+            req_args={},
+            data={"ok": True, "channel": channel, "ts": "1.0001"},
+            headers={},
+            status_code=200,
+        )
+
+    def api_call(self, method, params=None):
+        self.calls.append((method, params))
+        response = SlackResponse(
+            client=self,
+            http_verb="POST",
+            api_url=f"https://slack.com/api/{method}",
+            req_args={},
+            data={"ok": False, "error": "ratelimited"},
+            headers={"Retry-After": "3"},
+            status_code=429,
+        )
+        raise SlackApiError("The request to the Slack API failed.", response)
+
+    def conversations_info(self, channel):
+        raise ValueError(f"no such channel {channel}")
+
+
+@pytest.fixture
+def leader():
+    leader_end, worker_end = multiprocessing.Pipe()
+    sut = ScaleOut(SimpleSlackBot(slack_bot_token="xoxb-fake"))
+    sut.simple_slack_bot._python_slackclient = LeaderSlackclient()  # pylint: disable=protected-access
+    making_calls = threading.Thread(target=sut._make_calls, args=(leader_end,))  # pylint: disable=protected-access
+    making_calls.start()
+    yield sut.simple_slack_bot._python_slackclient, OutboundWebClient(worker_end)  # pylint: disable=protected-access
+    worker_end.close()
+    making_calls.join(timeout=5)
+
+
+def test_outbound_web_client_has_the_leader_make_calls(leader):
+    # Given
+    leader_slackclient, outbound_web_client = leader
+    request = SlackRequest(outbound_web_client, message(1))
+
+    # When
+    request.write("Pong")
+    response = outbound_web_client.chat_postMessage(channel="C00000001", text="Ping")
+
+    # Then
+    assert [("chat_postMessage", "C00000001", "Pong"), ("chat_postMessage", "C00000001", "Ping")] == (
+        leader_slackclient.calls
+    )
+    assert "1.0001" == response["ts"]
+    assert 200 == response.status_code
+
+
+def test_outbound_web_client_raises_what_the_leader_got(leader):
+    # Given
+    _, outbound_web_client = leader
+
+    # When
+    with pytest.raises(SlackApiError) as slack_api_error:
+        outbound_web_client.api_call("files.getUploadURLExternal", params={"filename": "a.txt", "length": 1})
+    with pytest.raises(RuntimeError) as runtime_error:
+        outbound_web_client.conversations_info(channel="C404")
+
+    # Then
+    assert 429 == slack_api_error.value.response.status_code
+    assert "ratelimited" == slack_api_error.value.response.get("error")
+    assert "3" == slack_api_error.value.response.headers["Retry-After"]
+    assert "no such channel C404" in str(runtime_error.value)
+
+
+def test_outbound_web_client_has_no_private_attributes():
+    # Given
+    leader_end, worker_end = multiprocessing.Pipe()
+
+    # When / Then
+    with pytest.raises(AttributeError):
+        OutboundWebClient(worker_end)._token  # pylint: disable=protected-access,expression-not-assigned
+    leader_end.close()
+
+
+def test_forwarder_sends_each_conversation_to_one_worker():
+    # Given
+    pipes = [multiprocessing.Pipe() for _ in range(3)]
+    sut = ScaleOut(SimpleSlackBot(slack_bot_token="xoxb-fake"), workers=3)
+    forward = sut._forwarder([sending for _, sending in pipes], threading.Lock())  # pylint: disable=protected-access
+    threads = [message(index) for index in range(20)]
+
+    # When
+    for thread in threads:
+        forward(thread)
+        forward(dict(message(100), thread_ts=thread["ts"]))
+    received = []
+    for receiving, _ in pipes:
+        while receiving.poll():
+            received.append((receiving, receiving.recv()[0]))
+
+    # Then
+    assert 40 == len(received)
+    for thread in threads:
+        assert 1 == len({id(end) for end, event in received if thread["ts"] in (event["ts"], event.get("thread_ts"))})
+    assert 1 < len({id(end) for end, _ in received})
+
+
+def test_workers_continue_the_trace_the_leader_forwarded():
+    # Given
+    exporter = ListExporter()
+    simple_slack_bot = SimpleSlackBot(slack_bot_token="xoxb-fake", tracer=Tracer(exporter, sample_rate=1.0))
+    simple_slack_bot.register("message")(lambda request: request.write("pong"))
+    receiving, sending = multiprocessing.Pipe()
+    sut = ScaleOut(simple_slack_bot, workers=1)
+    forward = sut._forwarder([sending], threading.Lock())  # pylint: disable=protected-access
+    slack_event = SlackEvent(message(1))
+    simple_slack_bot.enqueue_slack_event(slack_event)
+
+    # When
+    forward(simple_slack_bot._event_scheduler.get())  # pylint: disable=protected-access
+    raw_slack_event, trace_context = receiving.recv()
+    trace = simple_slack_bot._tracer.resume(trace_context)  # pylint: disable=protected-access
+    simple_slack_bot.dispatch_slack_event(SlackEvent(raw_slack_event), LeaderSlackclient(), trace)
+
+    # Then
+    names = [span.name for span in exporter.spans]
+    assert ["event", "receive", "queue", "forward", "worker", "write", "callback"] == names
+    leader_root, worker_root = exporter.spans[0], exporter.spans[4]
+    assert {leader_root.trace_id} == {span.trace_id for span in exporter.spans}
+    assert leader_root.span_id == worker_root.parent_id
+    assert all(span.parent_id == worker_root.span_id for span in exporter.spans[5:])
+    assert 0 == simple_slack_bot._tracer.stats()["active"]  # pylint: disable=protected-access
+
+
+def test_forwarder_finishes_the_trace_of_events_dispatched_in_the_leader():
+    # Given
+    exporter = ListExporter()
+    simple_slack_bot = SimpleSlackBot(slack_bot_token="xoxb-fake", tracer=Tracer(exporter, sample_rate=1.0))
+    simple_slack_bot._python_slackclient = LeaderSlackclient()  # pylint: disable=protected-access
+    simple_slack_bot.register("message")(lambda request: request.write("pong"))
+    sut = ScaleOut(simple_slack_bot, workers=1)
+    forward = sut._forwarder([], threading.Lock())  # pylint: disable=protected-access
+    simple_slack_bot.enqueue_slack_event(SlackEvent(message(1)))
+
+    # When
+    forward(simple_slack_bot._event_scheduler.get())  # pylint: disable=protected-access
+
+    # Then
+    assert ["event", "receive", "queue", "forward", "write", "callback"] == [span.name for span in exporter.spans]
+
+
+def test_scale_out_requires_workers():
+    # Given
+    sut = SimpleSlackBot(slack_bot_token="xoxb-fake")
+
+    # When / Then
+    with pytest.raises(ValueError):
+        ScaleOut(sut, workers=0)
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_workers_reply_and_a_worker_takes_over_when_the_leader_dies():
+    # Given
+    with FakeSlack(users=USERS, channels=CHANNELS) as fake_slack:
+        sut = SimpleSlackBot(slack_bot_token="xoxb-fake", slack_api_url=fake_slack.api_url)
+
+        @sut.command("ping")
+        def pong(request):
+            request.write(f"Pong from {os.getpid()}")
+
+        scale_out = ScaleOut(sut, workers=2, restart_delay=0.1)
+        supervisor = multiprocessing.get_context("fork").Process(target=scale_out.run)
+        supervisor.start()
+
+        try:
+            # When
+            assert fake_slack.wait_for_connections(timeout=10)
+            first_leader = scale_out.leader_pid
+            assert wait_for(lambda: len(fake_slack.calls_to("auth.test")) >= 1)
+            time.sleep(0.5)  # let the workers connect to the leader
+            fake_slack.send_events([message(index) for index in range(10)])
+            assert fake_slack.wait_for_calls("chat.postMessage", 10, timeout=10)
+
+            os.kill(first_leader, signal.SIGKILL)
+            assert wait_for(lambda: len(fake_slack.calls_to("rtm.start")) >= 2)
+            assert fake_slack.wait_for_connections(timeout=10)
+            second_leader = scale_out.leader_pid
+            time.sleep(0.5)
+            fake_slack.send_events([message(index) for index in range(10, 20)])
+            assert fake_slack.wait_for_calls("chat.postMessage", 20, timeout=10)
+        finally:
+            os.kill(supervisor.pid, signal.SIGTERM)
+            supervisor.join(timeout=10)
+
+        # Then
+        assert 0 == supervisor.exitcode
+        assert first_leader != second_leader
+        repliers = [posted["text"].rsplit(" ", 1)[1] for posted in fake_slack.posted_messages]
+        assert str(first_leader) not in repliers[:10]
+        assert str(second_leader) not in repliers[10:]
@@ -1,5 +1,8 @@
 import logging
 import os
+import queue
+import threading
+import time
 import typing
 
 import pytest
@@ -8,6 +11,7 @@ from slack import WebClient
 from slacksocket.models import SlackEvent  # type: ignore
 
 import tests.common.mocks
+from simple_slack_bot.rate_limiter import RateLimiter
 from simple_slack_bot.simple_slack_bot import (
     SimpleSlackBot,
     SlackRequest,
@@ -645,3 +649,268 @@ def test_helper_user_id_to_user_name_returns_none_when_nothing_is_found():
     # Then
 
     assert None is actual_user_name
+
+
+def test_enqueue_slack_event_routes_a_redelivered_event_only_once():
+    # Given
+    class Monitor:
+        call_count = 0
+
+        def monitor_if_called(self, request):
+            Monitor.call_count += 1
+
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+    sut._python_slackclient = None
+    monitor = Monitor()
+    sut._registrations = {"message": [monitor.monitor_if_called]}
+    mock_slack_event = SlackEvent({"type": "message", "client_msg_id": "abc", "ts": "1.2"})
+
+    # When
+    sut.enqueue_slack_event(mock_slack_event)
+    sut.enqueue_slack_event(SlackEvent(dict(mock_slack_event)))
+    while sut.dispatch_next_slack_event():
+        pass
+
+    # Then
+    assert 1 == Monitor.call_count
+    assert 1 == sut._event_deduplicator.hits
+
+
+def test_enqueue_slack_event_does_not_build_a_request_for_our_own_messages():
+    # Given
+    def mock_route_request_to_callbacks(request):
+        raise AssertionError("our own message should never be routed")
+
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+    sut._event_filter.set_self_ids("B1")
+    sut.route_request_to_callbacks = mock_route_request_to_callbacks
+
+    # When
+    sut.enqueue_slack_event(SlackEvent({"type": "message", "bot_id": "B1", "ts": "1.2"}))
+    sut.dispatch_next_slack_event()
+
+    # Then
+    assert 1 == sut._event_filter.filtered["self"]
+
+
+def test_listen_dispatches_queued_messages_before_bulk_events(caplog):
+    # Given
+    class MockQueuedSlackSocket:
+        def __init__(self, slack_events):
+            self.slack_events = slack_events
+
+        def events(self):
+            return iter([self.get_event()])
+
+        def get_event(self, timeout=None):
+            if not self.slack_events:
+                if timeout == 0:
+                    raise queue.Empty
+                raise slacksocket.errors.ExitError
+
+            return self.slack_events.pop(0)
+
+    dispatched_types = []
+
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+    sut._python_slackclient = None
+    sut._slack_socket = MockQueuedSlackSocket(
+        [
+            SlackEvent({"type": "presence_change", "user": "U1"}),
+            SlackEvent({"type": "user_typing", "user": "U1"}),
+            SlackEvent({"type": "message", "ts": "1.2"}),
+        ]
+    )
+    sut._registrations = {}
+    for event_type in ["presence_change", "user_typing", "message"]:
+        sut._registrations[event_type] = [lambda request: dispatched_types.append(request.type)]
+
+    # When
+    with caplog.at_level(logging.INFO):
+        sut.listen()
+
+    # Then
+    assert ["message", "presence_change", "user_typing"] == dispatched_types
+    assert SimpleSlackBot.KEYBOARD_INTERRUPT_EXCEPTION_LOG_MESSAGE in caplog.text
+
+
+def test_command_registers_the_command_router_to_messages_once():
+    # Given
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+    rolls = []
+
+    # When
+    @sut.command("roll")
+    def roll(request, dice: int):
+        rolls.append(dice)
+
+    @sut.command("ping")
+    def ping(request):
+        pass
+
+    sut.route_request_to_callbacks(
+        SlackRequest(python_slackclient=None, slack_event=SlackEvent({"type": "message", "text": "roll 6"}))
+    )
+
+    # Then
+    assert 1 == len(sut._registrations["message"])
+    assert [6] == rolls
+    assert roll is not None
+
+
+def test_register_with_rate_limit_drops_excess_events_before_the_callback():
+    # Given
+    calls = []
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+
+    @sut.register("message", rate_limit=RateLimiter(rate=0.001, burst=1))
+    def callback(request):
+        calls.append(request)
+
+    # When
+    for _ in range(3):
+        sut.route_request_to_callbacks(
+            SlackRequest(python_slackclient=None, slack_event=SlackEvent({"type": "message", "user": "U1"}))
+        )
+
+    # Then
+    assert 1 == len(calls)
+
+
+def test_command_with_deferring_rate_limit_runs_excess_calls_once_due():
+    # Given
+    rolls = []
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+    rate_limiter = RateLimiter(rate=1000, policy=RateLimiter.POLICY_DEFER)
+
+    @sut.command("roll", rate_limit=rate_limiter)
+    def roll(request, dice: int):
+        rolls.append(dice)
+
+    for dice in [1, 2]:
+        sut.route_request_to_callbacks(
+            SlackRequest(
+                python_slackclient=None,
+                slack_event=SlackEvent({"type": "message", "user": "U1", "text": f"roll {dice}"}),
+            )
+        )
+    rolls_before_due = list(rolls)
+
+    # When
+    while sut.run_deferred_callbacks() is not None:
+        pass
+
+    # Then
+    assert [1] == rolls_before_due
+    assert [1, 2] == rolls
+    assert 1 == rate_limiter.deferred
+
+
+def test_listen_drains_queued_events_once_the_socket_is_closed():
+    # Given
+    dispatched = []
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+    sut._python_slackclient = None
+    sut._registrations = {"message": [dispatched.append]}
+    for ts in ["1", "2"]:
+        sut.enqueue_slack_event(SlackEvent({"type": "message", "ts": ts}))
+
+    class MockClosedSlackSocket:
+        def get_event(self, timeout=None):
+            raise slacksocket.errors.ExitError
+
+    sut._slack_socket = MockClosedSlackSocket()
+
+    # When
+    sut.listen()
+
+    # Then
+    assert 2 == len(dispatched)
+    assert 2 == sut.last_drain_report["dispatched"]
+    assert 0 == sut.last_drain_report["dropped_events"]
+
+
+def test_listen_stops_within_the_shutdown_timeout_despite_a_hung_callback():
+    # Given
+    release = threading.Event()
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token", shutdown_timeout=0.2)
+    sut._python_slackclient = None
+    sut.register("message", execution="thread")(lambda request: release.wait(10))
+    sut.enqueue_slack_event(SlackEvent({"type": "message", "ts": "1"}))
+
+    class MockClosedSlackSocket:
+        def get_event(self, timeout=None):
+            raise slacksocket.errors.ExitError
+
+    sut._slack_socket = MockClosedSlackSocket()
+
+    # When
+    start = time.monotonic()
+    sut.listen()
+    elapsed = time.monotonic() - start
+    release.set()
+
+    # Then
+    assert elapsed < 5
+    assert 1 == sut.last_drain_report["dispatched"]
+
+
+def test_drain_drops_what_is_left_once_the_timeout_passes():
+    # Given
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+    sut._python_slackclient = None
+    sut._registrations = {}
+    sut.enqueue_slack_event(SlackEvent({"type": "message", "ts": "1"}))
+    sut.defer(60, lambda: None)
+
+    # When
+    report = sut.drain(timeout=0)
+
+    # Then
+    assert 0 == report["dispatched"]
+    assert 1 == report["dropped_events"]
+    assert 1 == report["dropped_deferred"]
+    assert 0 == len(sut._event_scheduler)
+    assert [] == sut._event_deduplicator.keys()
+
+
+def test_register_returns_the_callback_so_it_stays_bound_to_its_name():
+    # Given
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+
+    # When
+    @sut.register("message", execution="process")
+    def heavy(request):
+        pass
+
+    # Then
+    assert "heavy" == heavy.__name__
+    assert heavy is not sut._registrations["message"][0]
+
+
+def test_register_rejects_unknown_executions():
+    # Given
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+
+    # When / Then
+    with pytest.raises(ValueError):
+        sut.register("message", execution="elsewhere")
+
+
+def test_every_runs_the_job_with_the_bot_and_helper_write_posts_as_the_bot():
+    # Given
+    sut = SimpleSlackBot(slack_bot_token="Mock slack bot token")
+    sut._python_slackclient = tests.common.mocks.MockPythonSlackclient()
+
+    @sut.every(3600, delay=0)
+    def digest(simple_slack_bot):
+        simple_slack_bot.helper_write("C00000001", "Daily digest")
+
+    # When
+    wait = sut._job_scheduler.run_due(sut)
+
+    # Then
+    assert digest is not None
+    assert 3500 < wait <= 3600
+    assert "C00000001" == sut._python_slackclient.channel
+    assert "Daily digest" == sut._python_slackclient.text
@@ -8,6 +8,7 @@ from slack import WebClient
 from slacksocket.models import SlackEvent  # type: ignore
 
 import tests.common.mocks
+from simple_slack_bot.conversation_store import ConversationStore
 from simple_slack_bot.simple_slack_bot import (
     SimpleSlackBot,
     SlackRequest,
@@ -220,3 +221,28 @@ def test_str_returns_json_representation_of_slack_event():
 
     # Then
     assert expected_str == actual_str
+
+
+def test_conversation_is_shared_by_a_message_and_the_replies_in_its_thread():
+    # Given
+    conversation_store = ConversationStore()
+    message = SlackRequest(
+        None, SlackEvent({"type": "message", "channel": "C1", "ts": "1.0"}), conversation_store
+    )
+    reply = SlackRequest(
+        None, SlackEvent({"type": "message", "channel": "C1", "ts": "2.0", "thread_ts": "1.0"}), conversation_store
+    )
+
+    # When
+    message.conversation["question"] = "favourite colour"
+
+    # Then
+    assert {"question": "favourite colour"} == reply.conversation
+
+
+def test_conversation_is_none_without_a_conversation_store():
+    # Given
+    sut = SlackRequest(None, SlackEvent({"type": "message", "channel": "C1", "ts": "1.0"}))
+
+    # When / Then
+    assert sut.conversation is None
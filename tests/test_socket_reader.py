@@ -0,0 +1,178 @@
+import queue
+import threading
+import time
+
+import pytest
+import slacksocket.errors
+from slacksocket.models import SlackEvent
+
+from simple_slack_bot.event_scheduler import EventScheduler
+from simple_slack_bot.simple_slack_bot import SimpleSlackBot
+from simple_slack_bot.socket_reader import SocketReader
+
+
+class QueuedSlackSocket:
+    def __init__(self):
+        self.events = queue.Queue()
+
+    def get_event(self, timeout=None):
+        slack_event = self.events.get(timeout=timeout)
+        if isinstance(slack_event, Exception):
+            raise slack_event
+        return slack_event
+
+    def close(self):
+        self.events.put(slacksocket.errors.ExitError("stopped"))
+
+
+def message(ts):
+    return SlackEvent({"type": "message", "ts": str(ts), "text": "hi"})
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def slack_socket():
+    return QueuedSlackSocket()
+
+
+def start(sut, slack_socket, buffer=None):
+    buffer = buffer if buffer is not None else EventScheduler()
+    sut.start(slack_socket, buffer.put, buffer)
+    return buffer
+
+
+def test_reader_buffers_events_by_priority(slack_socket):
+    # Given
+    sut = SocketReader(poll_interval=0.05)
+    start(sut, slack_socket)
+
+    # When
+    slack_socket.events.put(SlackEvent({"type": "user_typing"}))
+    slack_socket.events.put(message(1))
+    assert wait_until(lambda: sut.read == 2)
+
+    # Then
+    assert "message" == sut.take()["type"]
+    assert "user_typing" == sut.take()["type"]
+    assert sut.take() is None
+    sut.stop()
+
+
+def test_drop_newest_drops_events_beyond_capacity(slack_socket):
+    # Given
+    sut = SocketReader(capacity=2, overflow=SocketReader.OVERFLOW_DROP_NEWEST, poll_interval=0.05)
+    buffer = start(sut, slack_socket)
+
+    # When
+    for ts in range(5):
+        slack_socket.events.put(message(ts))
+    assert wait_until(lambda: sut.read == 5)
+
+    # Then
+    assert 2 == len(buffer)
+    assert 3 == sut.stats()["dropped"]
+    assert "0" == sut.take()["ts"]
+    sut.stop()
+
+
+def test_block_leaves_events_in_the_socket_until_there_is_room(slack_socket):
+    # Given
+    sut = SocketReader(capacity=2, overflow=SocketReader.OVERFLOW_BLOCK, poll_interval=0.05)
+    buffer = start(sut, slack_socket)
+    for ts in range(4):
+        slack_socket.events.put(message(ts))
+    assert wait_until(lambda: len(buffer) == 2)
+    time.sleep(0.1)
+
+    # When
+    left_in_socket = slack_socket.events.qsize()
+    taken = [sut.take()["ts"] for _ in range(2)]
+    assert wait_until(lambda: len(buffer) == 2)
+
+    # Then
+    assert 2 == left_in_socket
+    assert ["0", "1"] == taken
+    assert 0 == sut.stats()["dropped"]
+    sut.stop()
+
+
+def test_alarm_is_raised_at_the_high_water_mark_and_cleared_at_the_low(slack_socket):
+    # Given
+    alarms = []
+    sut = SocketReader(
+        capacity=10, high_water=0.5, low_water=0.2, on_alarm=lambda raised, size: alarms.append((raised, size))
+    )
+    start(sut, slack_socket)
+
+    # When
+    for ts in range(6):
+        slack_socket.events.put(message(ts))
+    assert wait_until(lambda: sut.read == 6)
+    while sut.take() is not None:
+        pass
+
+    # Then
+    assert [(True, 5), (False, 2)] == alarms
+    assert 1 == sut.stats()["alarms"]
+    assert 6 == sut.stats()["peak"]
+    sut.stop()
+
+
+def test_wait_returns_once_the_socket_is_closed(slack_socket):
+    # Given
+    sut = SocketReader(poll_interval=0.05)
+    start(sut, slack_socket)
+
+    # When
+    slack_socket.close()
+    has_event = sut.wait(5.0)
+
+    # Then
+    assert has_event is False
+    assert sut.exited is True
+
+
+def test_invalid_settings_raise_value_error():
+    with pytest.raises(ValueError):
+        SocketReader(overflow="explode")
+    with pytest.raises(ValueError):
+        SocketReader(high_water=0.2, low_water=0.5)
+
+
+def test_listen_keeps_reading_the_socket_while_a_callback_is_slow(slack_socket):
+    # Given
+    release = threading.Event()
+    dispatched = []
+    sut = SimpleSlackBot("mock slack bot token", socket_reader=SocketReader(poll_interval=0.05))
+    sut._python_slackclient = None
+    sut._slack_socket = slack_socket
+
+    @sut.register("message")
+    def slow(request):
+        dispatched.append(request.slack_event["ts"])
+        release.wait(5.0)
+
+    listener = threading.Thread(target=sut.listen)
+    listener.start()
+
+    # When
+    for ts in range(3):
+        slack_socket.events.put(message(ts))
+    read_while_blocked = wait_until(lambda: sut._socket_reader.read == 3)
+    dispatched_while_blocked = list(dispatched)
+    release.set()
+    assert wait_until(lambda: len(dispatched) == 3)
+    slack_socket.close()
+    listener.join(5.0)
+
+    # Then
+    assert read_while_blocked is True
+    assert ["0"] == dispatched_while_blocked
+    assert ["0", "1", "2"] == dispatched
+    assert not listener.is_alive()
@@ -0,0 +1,233 @@
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from slacksocket.models import SlackEvent
+
+import tests.common.mocks
+from simple_slack_bot.simple_slack_bot import SimpleSlackBot
+from simple_slack_bot.tracer import NULL_TRACE, JsonFileExporter, OtlpHttpExporter, Tracer
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+class StepClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        self.now += 0.5
+        return self.now
+
+
+def message(ts="999.0"):
+    return SlackEvent({"type": "message", "channel": "C1", "user": "U1", "text": "hi", "ts": ts})
+
+
+def test_a_sampled_event_is_traced_from_its_ts_to_its_reply(tmp_path):
+    # Given
+    path = str(tmp_path / "spans.jsonl")
+    sut = SimpleSlackBot("mock slack bot token", tracer=Tracer(JsonFileExporter(path), sample_rate=1.0))
+    sut._python_slackclient = tests.common.mocks.MockPythonSlackclient()
+
+    @sut.register("message")
+    def reply(request):
+        request.write("hello")
+
+    # When
+    sut.enqueue_slack_event(message())
+    sut.dispatch_next_slack_event()
+
+    # Then
+    with open(path) as spans_file:
+        spans = [json.loads(line) for line in spans_file]
+    root = spans[0]
+    assert ["event", "receive", "queue", "write", "callback"] == [span["name"] for span in spans]
+    assert {root["trace_id"]} == {span["trace_id"] for span in spans}
+    assert all(span["parent_id"] == root["span_id"] for span in spans[1:])
+    assert 999.0 == root["start"]
+    assert {"channel": "C1"} == spans[3]["attributes"]
+    assert {"callback": "reply"} == spans[4]["attributes"]
+
+
+def test_spans_are_timed_by_the_clock():
+    # Given
+    exporter = ListExporter()
+    sut = Tracer(exporter, sample_rate=1.0, clock=StepClock())
+    slack_event = message()
+
+    # When
+    sut.receive(slack_event)
+    trace = sut.dispatch(slack_event)
+    with trace.span("callback"):
+        pass
+    trace.finish()
+
+    # Then
+    assert [("event", 999.0, 1002.5), ("receive", 999.0, 1000.5), ("queue", 1000.5, 1001.0)] == [
+        (span.name, span.start, span.end) for span in exporter.spans[:3]
+    ]
+    assert 0.5 == exporter.spans[3].duration
+
+
+def test_nothing_is_traced_without_an_exporter_or_when_not_sampled():
+    # Given
+    without_exporter = Tracer(sample_rate=1.0)
+    not_sampling = Tracer(ListExporter(), sample_rate=0.0)
+    slack_event = message()
+
+    # When
+    without_exporter.receive(slack_event)
+    not_sampling.receive(slack_event)
+
+    # Then
+    assert NULL_TRACE is without_exporter.dispatch(slack_event)
+    assert NULL_TRACE is not_sampling.dispatch(slack_event)
+
+
+def test_sample_rate_traces_that_fraction_of_events():
+    # Given
+    sut = Tracer(ListExporter(), sample_rate=0.1, rng=random.Random(42))
+
+    # When
+    for ts in range(2000):
+        sut.receive(message(str(ts)))
+
+    # Then
+    assert 150 < sut.stats()["sampled"] < 250
+    assert sut.stats()["active"] == sut.stats()["sampled"]
+
+
+def test_traces_waiting_for_dispatch_are_bounded():
+    # Given
+    sut = Tracer(ListExporter(), sample_rate=1.0, max_active=10)
+    slack_events = [message(str(ts)) for ts in range(20)]
+
+    # When
+    for slack_event in slack_events:
+        sut.receive(slack_event)
+
+    # Then
+    assert 10 == sut.stats()["active"]
+    assert NULL_TRACE is sut.dispatch(slack_events[0])
+    assert NULL_TRACE is not sut.dispatch(slack_events[-1])
+
+
+def test_spans_of_a_failing_step_record_the_error():
+    # Given
+    exporter = ListExporter()
+    sut = Tracer(exporter, sample_rate=1.0)
+    slack_event = message()
+    sut.receive(slack_event)
+    trace = sut.dispatch(slack_event)
+
+    # When
+    with pytest.raises(ValueError):
+        with trace.span("callback"):
+            raise ValueError("boom")
+    trace.finish()
+
+    # Then
+    assert "ValueError('boom')" == exporter.spans[-1].attributes["error"]
+
+
+@pytest.fixture
+def collector():
+    bodies = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            bodies.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1/traces", bodies
+    server.shutdown()
+    server.server_close()
+
+
+def test_otlp_exporter_sends_batches_to_the_collector(collector):
+    # Given
+    endpoint, bodies = collector
+    exporter = OtlpHttpExporter(endpoint, service_name="test-bot", batch_size=4, flush_interval=60)
+    sut = Tracer(exporter, sample_rate=1.0)
+
+    # When
+    for ts in ["1.0", "2.0"]:
+        slack_event = message(ts)
+        sut.receive(slack_event)
+        sut.dispatch(slack_event).finish()
+    sut.shutdown()
+
+    # Then
+    assert 2 == len(bodies)
+    assert 6 == exporter.sent
+    resource_spans = bodies[0]["resourceSpans"][0]
+    assert {"key": "service.name", "value": {"stringValue": "test-bot"}} in resource_spans["resource"]["attributes"]
+    spans = resource_spans["scopeSpans"][0]["spans"]
+    assert 4 == len(spans)
+    assert "event" == spans[0]["name"] and "parentSpanId" not in spans[0]
+    assert spans[0]["spanId"] == spans[1]["parentSpanId"]
+    assert 32 == len(spans[0]["traceId"])
+    assert "1000000000" == spans[0]["startTimeUnixNano"]
+
+
+def test_otlp_exporter_sends_spans_exported_after_a_shutdown(collector):
+    # Given
+    endpoint, bodies = collector
+    exporter = OtlpHttpExporter(endpoint, flush_interval=60)
+    sut = Tracer(exporter, sample_rate=1.0)
+
+    # When
+    for ts in ["1.0", "2.0"]:
+        slack_event = message(ts)
+        sut.receive(slack_event)
+        sut.dispatch(slack_event).finish()
+        sut.shutdown()
+
+    # Then
+    assert 2 == len(bodies)
+    assert 6 == exporter.sent
+
+
+def test_otlp_exporter_sends_spans_from_a_forked_process(collector):
+    # Given
+    endpoint, bodies = collector
+    exporter = OtlpHttpExporter(endpoint, flush_interval=60)
+    sut = Tracer(exporter, sample_rate=1.0)
+    # as a forked process sees the thread of its parent
+    exporter._thread = threading.Thread(target=lambda: None)  # pylint: disable=protected-access
+    exporter._thread.start()  # pylint: disable=protected-access
+    exporter._thread.join()  # pylint: disable=protected-access
+
+    # When
+    sut.resume(("0" * 32, "1" * 16)).finish()
+    sut.shutdown()
+
+    # Then
+    assert 1 == exporter.sent
+    span = bodies[0]["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert ("worker", "0" * 32, "1" * 16) == (span["name"], span["traceId"], span["parentSpanId"])
+
+
+def test_only_traces_handed_over_are_resumed():
+    # Given
+    sut = Tracer(ListExporter(), sample_rate=1.0)
+
+    # When / Then
+    assert NULL_TRACE is sut.resume(NULL_TRACE.context)
+    assert NULL_TRACE is Tracer(sample_rate=1.0).resume(("0" * 32, "1" * 16))
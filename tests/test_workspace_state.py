@@ -0,0 +1,160 @@
+from simple_slack_bot.simple_slack_bot import SimpleSlackBot
+from simple_slack_bot.workspace_state import WorkspaceState
+from tests.common.mocks import MockPythonSlackclient
+
+
+class CountingPythonSlackclient(MockPythonSlackclient):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.list_calls = 0
+
+    def channels_list(self):
+        self.list_calls += 1
+        return super().channels_list()
+
+    def groups_list(self):
+        self.list_calls += 1
+        return super().groups_list()
+
+    def users_list(self):
+        self.list_calls += 1
+        return super().users_list()
+
+
+def make_python_slackclient():
+    return CountingPythonSlackclient(
+        injectable_public_channels=["C1", "C2"],
+        injectable_channel_names=["general", "random"],
+        injectable_private_channels=["G1"],
+        injectable_user_ids=["U1", "U2"],
+        injectable_user_names=["alice", "bob"],
+    )
+
+
+def test_load_takes_a_snapshot_and_bumps_the_version():
+    # Given
+    sut = WorkspaceState()
+
+    # When
+    sut.load(make_python_slackclient())
+
+    # Then
+    assert sut.synced is True
+    assert 1 == sut.version
+    assert ["U1", "U2"] == list(sut.users)
+    assert ["C1", "C2"] == list(sut.channels)
+    assert ["G1"] == list(sut.groups)
+
+
+def test_events_are_ignored_until_a_snapshot_is_loaded():
+    # Given
+    sut = WorkspaceState()
+
+    # When
+    applied = sut.apply({"type": "team_join", "user": {"id": "U3", "name": "carol"}})
+
+    # Then
+    assert applied is False
+    assert {} == sut.users
+
+
+def test_user_events_add_and_update_users():
+    # Given
+    sut = WorkspaceState()
+    sut.load(make_python_slackclient())
+
+    # When
+    sut.apply({"type": "team_join", "user": {"id": "U3", "name": "carol"}})
+    sut.apply({"type": "user_change", "user": {"id": "U1", "name": "alicia"}})
+
+    # Then
+    assert "carol" == sut.user("U3")["name"]
+    assert "alicia" == sut.user("U1")["name"]
+    assert 3 == sut.version
+    assert 2 == sut.stats()["applied"]
+
+
+def test_channel_events_create_rename_archive_and_delete_channels():
+    # Given
+    sut = WorkspaceState()
+    sut.load(make_python_slackclient())
+
+    # When
+    sut.apply({"type": "channel_created", "channel": {"id": "C3", "name": "new"}})
+    sut.apply({"type": "channel_rename", "channel": {"id": "C1", "name": "town-square"}})
+    sut.apply({"type": "channel_archive", "channel": "C2", "user": "U1"})
+    sut.apply({"type": "channel_deleted", "channel": "C3"})
+    sut.apply({"type": "group_joined", "channel": {"id": "G2", "name": "secret", "members": ["U1"]}})
+
+    # Then
+    assert ["C1", "C2"] == list(sut.channels)
+    assert "town-square" == sut.channel("C1")["name"]
+    assert ["alice", "bob"] == sut.channel("C1")["members"]
+    assert sut.channel("C2")["is_archived"] is True
+    assert ["G1", "G2"] == list(sut.groups)
+
+
+def test_member_events_update_channel_members():
+    # Given
+    sut = WorkspaceState()
+    sut.load(make_python_slackclient())
+
+    # When
+    sut.apply({"type": "member_left_channel", "channel": "C1", "user": "alice"})
+    sut.apply({"type": "member_joined_channel", "channel": "C1", "user": "U3"})
+    repeated = sut.apply({"type": "member_joined_channel", "channel": "C1", "user": "U3"})
+
+    # Then
+    assert ["bob", "U3"] == sut.channel("C1")["members"]
+    assert repeated is False
+
+
+def test_check_reports_drift_and_adopts_the_fresh_snapshot():
+    # Given
+    sut = WorkspaceState()
+    python_slackclient = make_python_slackclient()
+    sut.load(python_slackclient)
+    sut.apply({"type": "channel_rename", "channel": {"id": "C1", "name": "missed-the-rename-back"}})
+
+    # When
+    drift = sut.check(python_slackclient)
+    no_drift = sut.check(python_slackclient)
+
+    # Then
+    assert 1 == drift
+    assert 0 == no_drift
+    assert "general" == sut.channel("C1")["name"]
+    assert {"checks": 2, "drift": 1} == {key: sut.stats()[key] for key in ("checks", "drift")}
+
+
+def test_helpers_read_the_workspace_state_once_synced():
+    # Given
+    sut = SimpleSlackBot("mock slack bot token")
+    python_slackclient = make_python_slackclient()
+    sut._python_slackclient = python_slackclient
+    sut.sync_workspace()
+    calls_after_snapshot = python_slackclient.list_calls
+
+    # When
+    sut.enqueue_slack_event({"type": "team_join", "user": {"id": "U3", "name": "carol"}})
+    sut.enqueue_slack_event({"type": "channel_created", "channel": {"id": "C3", "name": "new"}})
+
+    # Then
+    assert ["U1", "U2", "U3"] == sut.helper_get_user_ids()
+    assert "U3" == sut.helper_user_name_to_user_id("carol")
+    assert "C3" == sut.helper_channel_name_to_channel_id("new")
+    assert ["G1"] == sut.helper_get_private_channel_ids()
+    assert calls_after_snapshot == python_slackclient.list_calls
+
+
+def test_sync_workspace_schedules_one_consistency_check():
+    # Given
+    sut = SimpleSlackBot("mock slack bot token", workspace_state=WorkspaceState(check_interval=60))
+    sut._python_slackclient = make_python_slackclient()
+
+    # When
+    sut.sync_workspace()
+    sut.sync_workspace()
+
+    # Then
+    assert ["workspace state check"] == [job.name for job in sut._job_scheduler.jobs()]